@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Atomic File Writes
+Every file the extractors and tools write for others to read (outputs,
+summaries, sidecars, shards, published copies, metrics), including
+src/extract_sheet1_complete.py's output, goes through ``atomic_write``: the
+data is written to a temp file next to the target and moved over it with
+os.replace, so a reader (the app, watch_extract.py, a second run) sees the
+old file or the new one, never half of one. The temp file is removed if
+the write fails or is interrupted.
+
+Not covered: NDJSON output, which is streamed record by record as rows are
+read; the benchmark_*.py and load_test_service.py reports; the legacy
+src/extract_sheet1_workout.py. The extraction cache keeps its own
+mkstemp-based write, since its entries are private to the cache directory.
+"""
+
+import os
+from typing import Union
+
+
+def atomic_write(path: str, data: Union[str, bytes]):
+    """
+    Replace ``path`` with ``data`` in one step.
+
+    Args:
+        path: File to write
+        data: Text (written as UTF-8) or bytes
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
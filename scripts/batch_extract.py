@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Batch Workout Extraction
+Runs WorkoutExtractor over a directory (or glob) of workbooks, spreading
+files across a process pool. Each file gets its own JSON output; failures
+are recorded per file and never stop the batch. A combined summary is
+written next to the outputs.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from atomic_write import atomic_write
+from extract_workouts import READERS, extract_to_ndjson, extract_workbook, write_json
+from extraction_cache import DEFAULT_MAX_BYTES, ExtractionCache
+from layout_specs import load_layouts
+from sqlite_export import SQLiteExporter
+
+SUMMARY_FILENAME = "batch-summary.json"
+
+
+def collect_workbooks(source: str) -> List[str]:
+    """Resolve a directory or glob pattern to a sorted list of xlsx files."""
+    if os.path.isdir(source):
+        paths = glob.glob(os.path.join(source, "*.xlsx"))
+    else:
+        paths = glob.glob(source, recursive=True)
+
+    # Skip Excel lock files (~$name.xlsx) left behind by open workbooks
+    return sorted(p for p in paths if os.path.isfile(p) and not os.path.basename(p).startswith("~$"))
+
+
+def output_paths(workbooks: List[str], output_dir: str) -> List[str]:
+    """One <stem>.json per workbook, de-duplicating stems from different folders."""
+    seen: Dict[str, int] = {}
+    paths = []
+    for workbook in workbooks:
+        stem = Path(workbook).stem
+        seen[stem] = seen.get(stem, 0) + 1
+        name = stem if seen[stem] == 1 else f"{stem}-{seen[stem]}"
+        paths.append(os.path.join(output_dir, f"{name}.json"))
+    return paths
+
+
+def extract_one(excel_path: str, output_path: str, streaming: bool = True,
+                cache_dir: Optional[str] = None, cache_max_bytes: int = DEFAULT_MAX_BYTES,
+                reader: str = "openpyxl", ndjson: bool = False, layouts: Sequence[str] = ()) -> Dict[str, Any]:
+    """Extract one workbook to JSON (or NDJSON). Runs inside a pool worker; never raises."""
+    started = time.perf_counter()
+    result: Dict[str, Any] = {"input": excel_path, "output": output_path}
+    cache = ExtractionCache(cache_dir, cache_max_bytes) if cache_dir else None
+
+    try:
+        # Keep per-sheet progress lines out of the batch log
+        with contextlib.redirect_stdout(io.StringIO()):
+            if ndjson:
+                records = extract_to_ndjson(excel_path, output_path, streaming, cache, reader, layouts=layouts)
+            else:
+                # Slots objects rather than dicts until written (see workout_model.py)
+                program = extract_workbook(excel_path, streaming=streaming, cache=cache, reader=reader, model=True,
+                                           layouts=layouts)
+                write_json(program, output_path)
+
+        if ndjson:
+            result.update({"status": "ok", "records": records})
+        else:
+            result.update({
+                "status": "ok",
+                "sheets": len(program.sheets),
+                "exercises": program.exercise_count(),
+            })
+    except Exception as e:
+        result.update({"status": "failed", "error": f"{type(e).__name__}: {e}"})
+
+    if cache is not None:
+        result["cache"] = "hit" if cache.hits else "miss"
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_batch(source: str, output_dir: str, workers: Optional[int] = None,
+              streaming: bool = True, cache_dir: Optional[str] = None,
+              cache_max_bytes: int = DEFAULT_MAX_BYTES, reader: str = "openpyxl",
+              ndjson_path: Optional[str] = None, sqlite_path: Optional[str] = None,
+              layouts: Sequence[str] = ()) -> Dict[str, Any]:
+    """
+    Extract every workbook matched by ``source`` into ``output_dir``.
+
+    Args:
+        source: Directory of .xlsx files or a glob pattern
+        output_dir: Directory for per-file JSON and the batch summary
+        workers: Pool size (defaults to the CPU count; 1 runs in-process)
+        streaming: Open workbooks read-only (constant memory per worker)
+        cache_dir: Optional extraction cache shared by all workers
+        cache_max_bytes: Size cap of the extraction cache
+        reader: "openpyxl" or "fast" (see fast_xlsx.py)
+        ndjson_path: Append every workbook's exercise records to this one
+            NDJSON file instead of writing per-file JSON
+        sqlite_path: Also load every per-file JSON into this SQLite database
+            (one athlete per workbook, one transaction for the whole batch)
+        layouts: Extra layout spec files or directories (see layout_specs.py);
+            checked once here so a bad spec fails the batch, not every file
+
+    Returns:
+        The summary dict that is also written to ``batch-summary.json``
+    """
+    workbooks = collect_workbooks(source)
+    layouts = tuple(layouts)
+    load_layouts(layouts)
+    outputs = output_paths(workbooks, output_dir)
+    ndjson = ndjson_path is not None
+    if ndjson and sqlite_path:
+        raise ValueError("ndjson_path and sqlite_path cannot be combined")
+    if ndjson:
+        # Workers write per-workbook parts that are appended to one file as they finish
+        outputs = [os.path.splitext(output)[0] + ".ndjson.part" for output in outputs]
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(workbooks)
+    combined = open(ndjson_path, 'wb') if ndjson else None
+    exporter = SQLiteExporter(sqlite_path) if sqlite_path else None
+
+    def finish(i: int, result: Dict[str, Any]):
+        results[i] = result
+        if exporter is not None and result["status"] == "ok":
+            # Loaded as workbooks finish, while the pool keeps extracting
+            with open(outputs[i], 'r', encoding='utf-8') as f:
+                exporter.add(Path(outputs[i]).stem, json.load(f), workbooks[i])
+        if combined is not None and os.path.exists(outputs[i]):
+            if result["status"] == "ok":
+                with open(outputs[i], 'rb') as part:
+                    shutil.copyfileobj(part, combined)
+                result["output"] = ndjson_path
+            os.unlink(outputs[i])
+        _print_result(result)
+
+    try:
+        if workers == 1:
+            for i, (workbook, output) in enumerate(zip(workbooks, outputs)):
+                finish(i, extract_one(workbook, output, streaming, cache_dir, cache_max_bytes, reader, ndjson,
+                                      layouts))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(extract_one, workbook, output, streaming, cache_dir, cache_max_bytes,
+                                reader, ndjson, layouts): i
+                    for i, (workbook, output) in enumerate(zip(workbooks, outputs))
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # The worker process itself died (e.g. killed by the OOM killer)
+                        result = {"input": workbooks[i], "output": outputs[i],
+                                  "status": "failed", "error": f"{type(e).__name__}: {e}"}
+                    finish(i, result)
+    except BaseException:
+        if exporter is not None:
+            exporter.abort()
+        raise
+    finally:
+        if combined is not None:
+            combined.close()
+    if exporter is not None:
+        exporter.close()
+
+    failed = [r for r in results if r["status"] != "ok"]
+    summary = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "source": source,
+        "workers": workers,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "total": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "files": results,
+    }
+    if ndjson:
+        summary["ndjson"] = ndjson_path
+        summary["records"] = sum(r.get("records", 0) for r in results)
+    if exporter is not None:
+        summary["sqlite"] = sqlite_path
+        summary["sqlite_rows"] = exporter.counts
+    if cache_dir:
+        summary["cache_hits"] = sum(1 for r in results if r.get("cache") == "hit")
+        summary["cache_misses"] = sum(1 for r in results if r.get("cache") == "miss")
+
+    atomic_write(os.path.join(output_dir, SUMMARY_FILENAME), json.dumps(summary, indent=2, ensure_ascii=False))
+
+    return summary
+
+
+def _print_result(result: Dict[str, Any]):
+    """One progress line per finished workbook."""
+    name = os.path.basename(result["input"])
+    if result["status"] == "ok" and "records" in result:
+        print(f"  ✅ {name}: {result['records']} records ({result['seconds']}s)")
+    elif result["status"] == "ok":
+        print(f"  ✅ {name}: {result['exercises']} exercises ({result['seconds']}s)")
+    else:
+        print(f"  ❌ {name}: {result['error']}")
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Extract workout data from many workbooks in parallel")
+    parser.add_argument("source", help="Directory of .xlsx files or a glob pattern (quote it)")
+    parser.add_argument("-o", "--output-dir", default="extracted",
+                        help="Directory for per-file JSON and batch-summary.json")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--no-streaming", dest="streaming", action="store_false",
+                        help="Load workbooks fully instead of read-only streaming")
+    parser.add_argument("--reader", choices=READERS, default="openpyxl",
+                        help="'fast' reads values straight from the sheet XML, falling back to openpyxl")
+    parser.add_argument("--ndjson", default=None, metavar="PATH",
+                        help="Write all exercise records to one NDJSON file instead of per-file JSON")
+    parser.add_argument("--sqlite", default=None, metavar="PATH",
+                        help="Also load every workbook into normalized tables in this SQLite file")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Skip workbooks whose content was already extracted")
+    parser.add_argument("--layouts", action="append", default=[], metavar="SPEC",
+                        help="Extra layout spec file or directory (see layout_specs.py); may be repeated")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="Cache size cap; least recently used entries are evicted")
+    args = parser.parse_args()
+    if args.ndjson and args.sqlite:
+        parser.error("--sqlite needs the per-file JSON outputs and cannot be combined with --ndjson")
+
+    print("🏋️  Starting batch extraction...")
+    print(f"📂 Input: {args.source}")
+    print(f"📝 Output: {args.output_dir}")
+    print("-" * 80)
+
+    summary = run_batch(args.source, args.output_dir, args.workers, args.streaming,
+                        args.cache_dir, args.cache_max_mb * 1024 * 1024, args.reader, args.ndjson,
+                        args.sqlite, args.layouts)
+
+    print("\n" + "=" * 80)
+    print("📊 BATCH SUMMARY")
+    print("=" * 80)
+    print(f"Workbooks: {summary['total']}  Succeeded: {summary['succeeded']}  Failed: {summary['failed']}")
+    print(f"Workers: {summary['workers']}  Elapsed: {summary['elapsed_seconds']}s")
+    if args.ndjson:
+        print(f"Records: {summary['records']} written to {args.ndjson}")
+    if args.sqlite:
+        rows = summary["sqlite_rows"]
+        print(f"SQLite: {rows['exercises']} exercises, {rows['sets']} sets written to {args.sqlite}")
+    if args.cache_dir:
+        print(f"Cache: {summary['cache_hits']} hit(s), {summary['cache_misses']} miss(es)")
+
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
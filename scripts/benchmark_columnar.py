@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Columnar Export Benchmark
+Compares the pretty-printed workout-data.json against compact JSON and the
+columnar export: bytes on disk, gzipped bytes (what the PWA transfers), the
+time to parse the text, and the time to get back the nested structure (for
+the columnar file that is parse plus decode).
+"""
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from columnar_export import decode, dumps, encode
+from extract_workouts import WorkoutExtractor
+from synthetic_workbook import build_workbook
+
+DEFAULT_INPUT = str(Path(__file__).resolve().parent.parent / "src" / "workout-data.json")
+
+
+def best_time(fn: Callable[[], Any], repeat: int) -> float:
+    """Best wall time of ``repeat`` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def compare(label: str, workout_data: Dict[str, Any], repeat: int) -> List[Dict[str, Any]]:
+    """One result row per encoding of ``workout_data``."""
+    encodings = {
+        "json (indent=2)": (json.dumps(workout_data, indent=2, ensure_ascii=False), lambda doc: doc),
+        "json (compact)": (json.dumps(workout_data, ensure_ascii=False, separators=(",", ":")), lambda doc: doc),
+        "columnar": (dumps(encode(workout_data)), decode),
+    }
+
+    results = []
+    for name, (text, to_nested) in encodings.items():
+        assert to_nested(json.loads(text)) == workout_data, f"{name} does not round-trip"
+        raw = text.encode("utf-8")
+        results.append({
+            "data": label,
+            "encoding": name,
+            "bytes": len(raw),
+            "gzip_bytes": len(gzip.compress(raw, 9)),
+            "parse_ms": round(best_time(lambda: json.loads(text), repeat) * 1000, 3),
+            "load_ms": round(best_time(lambda: to_nested(json.loads(text)), repeat) * 1000, 3),
+        })
+    return results
+
+
+def synthetic_data(days: int) -> Dict[str, Any]:
+    """Workout data extracted from a synthetic workbook with ``days`` days per sheet."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        excel_path = str(Path(tmp_dir) / "synthetic.xlsx")
+        build_workbook(excel_path, days=days, exercises_per_day=10)
+        with contextlib.redirect_stdout(io.StringIO()):
+            extractor = WorkoutExtractor(excel_path, streaming=True)
+            workout_data = extractor.extract_all_sheets()
+            extractor.close()
+    return workout_data
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Compare JSON and columnar export size and load time")
+    parser.add_argument("inputs", nargs="*", default=[DEFAULT_INPUT],
+                        help="workout-data.json files to compare (default: src/workout-data.json)")
+    parser.add_argument("--synthetic-days", type=int, nargs="*", default=[],
+                        help="Also compare synthetic extractions with these days per sheet")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per load measurement")
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = []
+    for path in args.inputs:
+        with open(path, 'r', encoding='utf-8') as f:
+            results.extend(compare(Path(path).name, json.load(f), args.repeat))
+    for days in args.synthetic_days:
+        results.extend(compare(f"synthetic-{days}d", synthetic_data(days), args.repeat))
+
+    print(f"{'data':<22} {'encoding':<16} {'bytes':>10} {'gzip':>9} {'parse ms':>9} {'load ms':>9}")
+    print("-" * 80)
+    for r in results:
+        print(f"{r['data'][:22]:<22} {r['encoding']:<16} {r['bytes']:>10,} {r['gzip_bytes']:>9,} "
+              f"{r['parse_ms']:>9.3f} {r['load_ms']:>9.3f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
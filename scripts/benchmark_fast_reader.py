@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Fast Reader Benchmark
+Times WorkoutExtractor with openpyxl (full and read-only) against the fast
+xlsx reader on real workbooks, or on synthetic ones when no paths are given.
+Every run's output is compared with the openpyxl result, so a speedup never
+hides a difference in the extracted data.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from extract_workouts import WorkoutExtractor
+from synthetic_workbook import build_workbook
+
+MODES = [
+    ("openpyxl", {"reader": "openpyxl", "streaming": False}),
+    ("openpyxl-ro", {"reader": "openpyxl", "streaming": True}),
+    ("fast", {"reader": "fast"}),
+]
+
+
+def time_extraction(excel_path: str, repeat: int, **options) -> Dict[str, Any]:
+    """Best wall time of ``repeat`` full extractions, plus the extracted data."""
+    best = float("inf")
+    fallbacks: List[str] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            extractor = WorkoutExtractor(excel_path, **options)
+            workout_data = extractor.extract_all_sheets()
+            extractor.close()
+        best = min(best, time.perf_counter() - started)
+        fallbacks = list(getattr(extractor.workbook, "fallbacks", []))
+    return {"seconds": best, "workout_data": workout_data, "fallbacks": fallbacks}
+
+
+def benchmark(excel_path: str, repeat: int) -> List[Dict[str, Any]]:
+    """One result per reader mode for a single workbook."""
+    results = []
+    baseline = None
+    for mode, options in MODES:
+        run = time_extraction(excel_path, repeat, **options)
+        if baseline is None:
+            baseline = run
+        results.append({
+            "workbook": excel_path,
+            "mode": mode,
+            "seconds": round(run["seconds"], 4),
+            "speedup": round(baseline["seconds"] / run["seconds"], 2),
+            "identical": run["workout_data"] == baseline["workout_data"],
+            "fallback_sheets": run["fallbacks"],
+        })
+    return results
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Benchmark the fast xlsx reader against openpyxl")
+    parser.add_argument("workbooks", nargs="*",
+                        help="Workbooks to time (default: generate synthetic ones)")
+    parser.add_argument("--days", type=int, nargs="+", default=[20, 80, 320],
+                        help="Days per sheet for each synthetic workbook")
+    parser.add_argument("--exercises-per-day", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode; the best time is kept")
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        workbooks = args.workbooks
+        if not workbooks:
+            workbooks = []
+            for days in args.days:
+                excel_path = str(Path(tmp_dir) / f"synthetic-{days}.xlsx")
+                build_workbook(excel_path, days, args.exercises_per_day)
+                workbooks.append(excel_path)
+
+        for excel_path in workbooks:
+            results.extend(benchmark(excel_path, args.repeat))
+
+    print(f"{'workbook':<28} {'mode':<12} {'seconds':>9} {'speedup':>8} {'identical':>10}")
+    print("-" * 71)
+    for r in results:
+        print(f"{Path(r['workbook']).name[:28]:<28} {r['mode']:<12} {r['seconds']:>9.3f} "
+              f"{r['speedup']:>7.2f}x {str(r['identical']):>10}")
+        if r["fallback_sheets"]:
+            print(f"  ↪ fell back to openpyxl for: {', '.join(r['fallback_sheets'])}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+    return 0 if all(r["identical"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Workout Model Memory Benchmark
+Compares the memory a batch of extracted workbooks holds as plain dicts
+with the same batch held as workout_model slots objects.
+
+Each synthetic workbook is extracted once and written as JSON. The batch
+is then loaded back in two ways while tracemalloc records what stays
+alive:
+
+    dicts  json.load() of every output: one dict per exercise and week and
+           a fresh string per cell, as the extractors used to build
+    model  Program.from_dict() of the same outputs: slots objects with
+           repeated strings interned across the whole batch
+
+Both structures serialize to the same bytes; the time each takes to write
+(the model through to_dict()) is reported as well.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from extract_workouts import extract_workbook
+from synthetic_workbook import build_workbook
+from workout_model import Program, to_dict
+
+
+def retained_bytes(load: Callable[[], List[Any]]) -> Dict[str, Any]:
+    """Bytes still allocated after ``load()`` returns (its result kept alive)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        batch = load()
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"batch": batch, "retained_bytes": retained}
+
+
+def write_seconds(batch: List[Any]) -> float:
+    """Time to serialize every structure as workout-data.json would be written."""
+    started = time.perf_counter()
+    for data in batch:
+        json.dump(to_dict(data), io.StringIO(), indent=2, ensure_ascii=False)
+    return time.perf_counter() - started
+
+
+def run(workbooks: int, days: int, exercises_per_day: int, weeks: int) -> Dict[str, Any]:
+    """Build and extract ``workbooks`` athletes, then compare both in-memory forms."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        outputs = []
+        exercises = 0
+        for i in range(workbooks):
+            # Vary the size and fill so athletes do not share every results string
+            excel_path = os.path.join(tmp_dir, f"athlete-{i}.xlsx")
+            build_workbook(excel_path, days=days + i % 7, exercises_per_day=exercises_per_day, weeks=weeks,
+                           results_fill=0.5 + (i % 5) / 10)
+            with contextlib.redirect_stdout(io.StringIO()):
+                program = extract_workbook(excel_path, streaming=True, model=True)
+            exercises += program.exercise_count()
+            output = Path(tmp_dir) / f"athlete-{i}.json"
+            output.write_text(json.dumps(to_dict(program), indent=2, ensure_ascii=False),
+                              encoding='utf-8')
+            outputs.append(output)
+        del program
+
+        def load_dicts():
+            return [json.loads(path.read_text(encoding='utf-8')) for path in outputs]
+
+        def load_model():
+            return [Program.from_dict(json.loads(path.read_text(encoding='utf-8'))) for path in outputs]
+
+        results = {"workbooks": workbooks, "exercises": exercises}
+        for name, load in (("dicts", load_dicts), ("model", load_model)):
+            measured = retained_bytes(load)
+            results[name] = {
+                "retained_bytes": measured["retained_bytes"],
+                "bytes_per_exercise": round(measured["retained_bytes"] / exercises, 1),
+                "write_seconds": round(write_seconds(measured["batch"]), 3),
+            }
+            del measured
+        results["saved"] = round(1 - results["model"]["retained_bytes"] / results["dicts"]["retained_bytes"], 3)
+    return results
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Compare dict vs slots-model memory for a batch of workbooks")
+    parser.add_argument("--workbooks", type=int, default=40, help="Athletes (workbooks) in the batch")
+    parser.add_argument("--days", type=int, default=20, help="Days per sheet (varies by up to +6 per workbook)")
+    parser.add_argument("--exercises-per-day", type=int, default=10)
+    parser.add_argument("--weeks", type=int, default=6)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    print(f"🏋️  Extracting {args.workbooks} synthetic workbooks...")
+    results = run(args.workbooks, args.days, args.exercises_per_day, args.weeks)
+
+    print(f"\n{'form':<8} {'retained MB':>12} {'bytes/exercise':>15} {'write s':>8}")
+    print("-" * 46)
+    for name in ("dicts", "model"):
+        r = results[name]
+        print(f"{name:<8} {r['retained_bytes'] / 1e6:>12.2f} {r['bytes_per_exercise']:>15.1f} "
+              f"{r['write_seconds']:>8.3f}")
+    print(f"\n📊 {results['exercises']:,} exercises; the model holds {results['saved']:.0%} less")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
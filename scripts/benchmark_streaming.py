@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Streaming Memory Benchmark
+Compares peak memory of WorkoutExtractor in full mode and streaming mode
+on synthetic workbooks of growing size.
+
+Working memory is the tracemalloc peak minus what is still alive once the
+extractor is closed (the extracted data itself), i.e. the cost of loading
+and walking the workbook. In streaming mode it should stay flat.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict
+
+from extract_workouts import WorkoutExtractor
+from synthetic_workbook import build_workbook
+
+
+def measure(excel_path: str, streaming: bool) -> Dict[str, Any]:
+    """Run one extraction and return its memory profile in bytes."""
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractor = WorkoutExtractor(excel_path, streaming=streaming)
+        workout_data = extractor.extract_all_sheets()
+        extractor.close()
+    del extractor
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "peak_bytes": peak,
+        "output_bytes": retained,
+        "working_bytes": peak - retained,
+        "sheets": len(workout_data["sheets"]),
+    }
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Benchmark streaming vs full workbook loading")
+    parser.add_argument("--days", type=int, nargs="+", default=[5, 20, 80, 320],
+                        help="Days per sheet for each workbook size")
+    parser.add_argument("--exercises-per-day", type=int, default=10)
+    parser.add_argument("--weeks", type=int, default=4)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for days in args.days:
+            excel_path = str(Path(tmp_dir) / f"synthetic-{days}.xlsx")
+            build_workbook(excel_path, days, args.exercises_per_day, args.weeks)
+            rows = days * (args.exercises_per_day + 2)
+
+            for streaming in (False, True):
+                profile = measure(excel_path, streaming)
+                profile.update({"days": days, "rows_per_sheet": rows,
+                                "mode": "streaming" if streaming else "full"})
+                results.append(profile)
+
+    print(f"{'mode':<10} {'rows/sheet':>10} {'peak MB':>10} {'output MB':>10} {'working MB':>11}")
+    print("-" * 55)
+    for r in results:
+        print(f"{r['mode']:<10} {r['rows_per_sheet']:>10} "
+              f"{r['peak_bytes'] / 1e6:>10.2f} {r['output_bytes'] / 1e6:>10.2f} "
+              f"{r['working_bytes'] / 1e6:>11.2f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Extraction Benchmark Suite
+Runs every extractor against synthetic workbooks at several scales and
+records wall time, peak memory and rows per second:
+
+    workout_extractor   WorkoutExtractor, all four sheets (openpyxl, read-only, fast reader)
+    extract_sheet1      scripts/extract_sheet1.py extract_sheet1_data (openpyxl, fast reader)
+    sheet1_complete     src/extract_sheet1_complete.py extract_sheet1_data
+
+Results are saved as JSON together with the versions they were measured
+with. Passing an earlier results file as --baseline prints the change per
+case and flags slowdowns, so regressions are visible between versions.
+"""
+
+import argparse
+import contextlib
+import gc
+import importlib.util
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import openpyxl
+
+from extract_sheet1 import extract_sheet1_data
+from extract_workouts import EXTRACTOR_VERSION, WorkoutExtractor
+from layout_schema import sheet_dimension
+from synthetic_workbook import build_workbook
+
+SUITE_VERSION = 1
+SHEET1_COMPLETE_PATH = Path(__file__).resolve().parent.parent / "src" / "extract_sheet1_complete.py"
+
+# Workbook parameters per scale (see synthetic_workbook.build_workbook)
+SCALES = {
+    "small": {"days": 5, "exercises_per_day": 8, "weeks": 4},
+    "medium": {"days": 40, "exercises_per_day": 10, "weeks": 4, "results_fill": 0.75},
+    "large": {"days": 160, "exercises_per_day": 10, "weeks": 6, "results_fill": 0.5,
+              "padding_columns": 20, "padding_rows": 200},
+}
+
+
+def _load_sheet1_complete():
+    """Import src/extract_sheet1_complete.py without putting src/ on sys.path."""
+    spec = importlib.util.spec_from_file_location("extract_sheet1_complete", SHEET1_COMPLETE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _workout_extractor(**options) -> Callable[[str], Any]:
+    def run(excel_path: str):
+        extractor = WorkoutExtractor(excel_path, **options)
+        try:
+            return extractor.extract_all_sheets()
+        finally:
+            extractor.close()
+    return run
+
+
+def cases() -> List[Dict[str, Any]]:
+    """Every (extractor, variant) pair the suite runs, with the sheets it reads."""
+    sheet1_complete = _load_sheet1_complete()
+    all_sheets = ["Sheet1", "Sheet2", "Sheet3", "Sheet4"]
+    return [
+        {"extractor": "workout_extractor", "variant": "openpyxl", "sheets": all_sheets,
+         "run": _workout_extractor()},
+        {"extractor": "workout_extractor", "variant": "openpyxl-ro", "sheets": all_sheets,
+         "run": _workout_extractor(streaming=True)},
+        {"extractor": "workout_extractor", "variant": "fast", "sheets": all_sheets,
+         "run": _workout_extractor(reader="fast")},
+        {"extractor": "extract_sheet1", "variant": "openpyxl", "sheets": ["Sheet1"],
+         "run": extract_sheet1_data},
+        {"extractor": "extract_sheet1", "variant": "fast", "sheets": ["Sheet1"],
+         "run": lambda path: extract_sheet1_data(path, reader="fast")},
+        {"extractor": "sheet1_complete", "variant": "openpyxl", "sheets": ["Sheet1"],
+         "run": sheet1_complete.extract_sheet1_data},
+    ]
+
+
+def count_rows(excel_path: str) -> Dict[str, int]:
+    """Rows per sheet, including formatted-but-empty padding rows."""
+    workbook = openpyxl.load_workbook(excel_path, read_only=True)
+    try:
+        return {sheet.title: sheet_dimension(sheet)[0] for sheet in workbook.worksheets}
+    finally:
+        workbook.close()
+
+
+def measure(run: Callable[[str], Any], excel_path: str, repeat: int) -> Dict[str, float]:
+    """Best wall time over ``repeat`` runs, then peak memory of one traced run."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            run(excel_path)
+        best = min(best, time.perf_counter() - started)
+
+    # Traced separately: tracemalloc slows allocation-heavy code down a lot
+    gc.collect()
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            run(excel_path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def run_suite(scales: List[str], repeat: int, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Build one workbook per scale and run every case against it."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in scales:
+            params = SCALES[scale]
+            excel_path = str(Path(tmp_dir) / f"{scale}.xlsx")
+            build_workbook(excel_path, **params)
+            rows = count_rows(excel_path)
+
+            for case in cases():
+                if only and case["extractor"] not in only:
+                    continue
+                case_rows = sum(rows[name] for name in case["sheets"])
+                timing = measure(case["run"], excel_path, repeat)
+                results.append({
+                    "scale": scale,
+                    "workbook": params,
+                    "extractor": case["extractor"],
+                    "variant": case["variant"],
+                    "rows": case_rows,
+                    "seconds": round(timing["seconds"], 6),
+                    "rows_per_second": round(case_rows / timing["seconds"]),
+                    "peak_bytes": timing["peak_bytes"],
+                })
+
+    return {
+        "suite_version": SUITE_VERSION,
+        "extractor_version": EXTRACTOR_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "openpyxl": openpyxl.__version__,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Per-case change against a baseline run.
+
+    Args:
+        threshold: Relative slowdown (0.1 = 10%) above which a case is flagged
+    """
+    previous = {(r["scale"], r["extractor"], r["variant"]): r for r in baseline["results"]}
+    changes = []
+    for r in current["results"]:
+        before = previous.get((r["scale"], r["extractor"], r["variant"]))
+        if before is None:
+            continue
+        time_change = r["seconds"] / before["seconds"] - 1
+        memory_change = r["peak_bytes"] / before["peak_bytes"] - 1 if before["peak_bytes"] else 0.0
+        changes.append({
+            "scale": r["scale"],
+            "extractor": r["extractor"],
+            "variant": r["variant"],
+            "time_change": round(time_change, 4),
+            "memory_change": round(memory_change, 4),
+            "regression": time_change > threshold or memory_change > threshold,
+        })
+    return changes
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Benchmark all extractors on synthetic workbooks")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"],
+                        help="Workbook sizes to run (default: small medium)")
+    parser.add_argument("--only", nargs="+", choices=["workout_extractor", "extract_sheet1", "sheet1_complete"],
+                        help="Run only these extractors")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (best is kept)")
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown or memory growth flagged as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    print("🏋️  Running extraction benchmark suite...")
+    report = run_suite(args.scales, args.repeat, args.only)
+
+    print(f"{'scale':<7} {'extractor':<18} {'variant':<12} {'rows':>8} {'seconds':>9} {'rows/s':>9} {'peak MB':>8}")
+    print("-" * 77)
+    for r in report["results"]:
+        print(f"{r['scale']:<7} {r['extractor']:<18} {r['variant']:<12} {r['rows']:>8} "
+              f"{r['seconds']:>9.4f} {r['rows_per_second']:>9,} {r['peak_bytes'] / 1e6:>8.2f}")
+
+    regressions = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        report["baseline"] = {"path": args.baseline, "created": baseline.get("created"),
+                              "extractor_version": baseline.get("extractor_version")}
+        report["changes"] = compare(report, baseline, args.threshold)
+        print(f"\n📊 Against {args.baseline} ({baseline.get('created')}):")
+        for c in report["changes"]:
+            flag = "⚠️ " if c["regression"] else "  "
+            print(f"{flag}{c['scale']:<7} {c['extractor']:<18} {c['variant']:<12} "
+                  f"time {c['time_change']:+.1%}  memory {c['memory_change']:+.1%}")
+        regressions = sum(1 for c in report["changes"] if c["regression"])
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
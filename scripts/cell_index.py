@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Inverted Cell Index
+One pass over every sheet of a workbook builds a map from normalized cell
+text to the cells holding it:
+
+    cells[normalized text] -> list of [sheet, row, column, text]
+
+Text is normalized by collapsing whitespace and case-folding, so
+"WEEK 2", "Week  2" and "week 2" share one entry; ``text`` keeps the cell
+as displayed. Rows and columns are 1-based, as in openpyxl.
+
+The index is stored in an ExtractionCache keyed by the workbook's content
+hash, so the inspect/check tools in src/ query it ("where are the WEEK
+headers", "where is this exercise") without reloading the workbook or
+scanning the grid again until the file changes.
+"""
+
+import argparse
+import os
+import re
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from extraction_cache import ExtractionCache
+
+INDEX_FORMAT = "cell-index"
+INDEX_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                                 "workout-tracker", "cell-index")
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+WEEK_HEADER = r"^week\s*\d+"
+DAY_HEADER = r"^day\s*\d+"
+
+
+class CellHit(NamedTuple):
+    """One indexed cell."""
+    sheet: str
+    row: int
+    column: int
+    text: str
+
+
+def cell_text(value: Any) -> str:
+    """Cell value as displayed: stripped, with whole floats shown as ints (4.0 -> "4")."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def normalize(text: str) -> str:
+    """Index key for a cell or a query: whitespace collapsed, case-folded."""
+    return " ".join(text.split()).casefold()
+
+
+def build_cell_index(excel_path: str) -> Dict[str, Any]:
+    """
+    Read every sheet once and index its non-empty cells.
+
+    Returns:
+        JSON-serialisable index: ``sheets`` (title and dimensions) and
+        ``cells`` (see module docstring)
+    """
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    sheets = []
+    cells: Dict[str, List[List[Any]]] = {}
+    try:
+        for s, sheet in enumerate(workbook.worksheets):
+            # Sized from the cells read, not the <dimension> tag (which can be
+            # stale); rows come out ragged, as long as their last cell
+            sheet.reset_dimensions()
+            max_row = max_column = 0
+            for r, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+                if row:
+                    max_row, max_column = r, max(max_column, len(row))
+                for c, value in enumerate(row, start=1):
+                    if value is None:
+                        continue
+                    text = cell_text(value)
+                    if text:
+                        cells.setdefault(normalize(text), []).append([s, r, c, text])
+            sheets.append({"title": sheet.title, "max_row": max_row, "max_column": max_column})
+    finally:
+        workbook.close()
+
+    return {"format": INDEX_FORMAT, "version": INDEX_VERSION, "sheets": sheets, "cells": cells}
+
+
+class CellIndex:
+    """Queries against a built (or cached) cell index."""
+
+    def __init__(self, data: Dict[str, Any], cached: bool = False):
+        self.data = data
+        self.sheets = data["sheets"]
+        self.cached = cached
+        self._titles = [sheet["title"] for sheet in self.sheets]
+        self._grid: Optional[Dict[tuple, str]] = None
+
+    def _hits(self, entries: List[List[Any]], sheet: Optional[str]) -> List[CellHit]:
+        # Workbook order, then row and column
+        return [CellHit(self._titles[s], r, c, text) for s, r, c, text in sorted(entries)
+                if sheet is None or self._titles[s] == sheet]
+
+    def find(self, text: str, sheet: Optional[str] = None) -> List[CellHit]:
+        """Cells whose whole text equals ``text`` (after normalization)."""
+        return self._hits(self.data["cells"].get(normalize(text), []), sheet)
+
+    def search(self, pattern: str, sheet: Optional[str] = None) -> List[CellHit]:
+        """
+        Cells whose normalized text matches a regular expression.
+
+        Only the distinct texts are matched, not every cell, so this stays
+        fast on large grids.
+        """
+        regex = re.compile(pattern)
+        entries = [entry for key, matched in self.data["cells"].items() if regex.search(key)
+                   for entry in matched]
+        return self._hits(entries, sheet)
+
+    def contains(self, text: str, sheet: Optional[str] = None) -> List[CellHit]:
+        """Cells whose text contains ``text`` (after normalization)."""
+        return self.search(re.escape(normalize(text)), sheet)
+
+    def week_headers(self, sheet: Optional[str] = None) -> List[CellHit]:
+        """"WEEK N" (Sheets 1-3) and "Week 1-2" (Sheet4) header cells."""
+        return self.search(WEEK_HEADER, sheet)
+
+    def day_headers(self, sheet: Optional[str] = None) -> List[CellHit]:
+        """"DAY N" / "Day N" header cells."""
+        return self.search(DAY_HEADER, sheet)
+
+    def value(self, sheet: str, row: int, column: int) -> str:
+        """Displayed text of one cell ("" when empty), for previews."""
+        if self._grid is None:
+            self._grid = {(self._titles[s], r, c): text
+                          for entries in self.data["cells"].values() for s, r, c, text in entries}
+        return self._grid.get((sheet, row, column), "")
+
+    def row_values(self, sheet: str, row: int, first_column: int, last_column: int) -> List[str]:
+        """Displayed texts of ``first_column``..``last_column`` (inclusive) in one row."""
+        return [self.value(sheet, row, column) for column in range(first_column, last_column + 1)]
+
+
+def load_cell_index(excel_path: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> CellIndex:
+    """
+    The cell index of a workbook, built once per distinct file content.
+
+    Args:
+        cache_dir: Where indexes are cached; None always rebuilds
+    """
+    if cache_dir is None:
+        return CellIndex(build_cell_index(excel_path))
+
+    cache = ExtractionCache(cache_dir, cache_max_bytes)
+    data = cache.get_or_extract(excel_path, "cell_index", str(INDEX_VERSION), {},
+                                lambda: build_cell_index(excel_path))
+    return CellIndex(data, cached=cache.hits > 0)
+
+
+def add_cache_arguments(parser: argparse.ArgumentParser):
+    """--cache-dir / --no-cache, shared by the inspect tools."""
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Where cell indexes are cached (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Rebuild the cell index instead of using the cache")
+
+
+def print_hits(hits: List[CellHit]):
+    """One line per cell: sheet, coordinate and text."""
+    from openpyxl.utils import get_column_letter
+
+    for hit in hits:
+        print(f"  {hit.sheet}!{get_column_letter(hit.column)}{hit.row}: {hit.text}")
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Query a workbook through its cached cell index")
+    parser.add_argument("excel_path")
+    parser.add_argument("--sheet", default=None, help="Only report cells on this sheet")
+    parser.add_argument("--weeks", action="store_true", help="List WEEK headers")
+    parser.add_argument("--days", action="store_true", help="List DAY headers")
+    parser.add_argument("--find", action="append", default=[], metavar="TEXT",
+                        help="Cells whose whole text is TEXT, e.g. an exercise name (repeatable)")
+    parser.add_argument("--contains", action="append", default=[], metavar="TEXT",
+                        help="Cells containing TEXT (repeatable)")
+    parser.add_argument("--search", action="append", default=[], metavar="REGEX",
+                        help="Cells whose normalized text matches REGEX (repeatable)")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+
+    index = load_cell_index(args.excel_path, None if args.no_cache else args.cache_dir)
+    total = sum(len(entries) for entries in index.data["cells"].values())
+    print(f"📂 {args.excel_path}: {total:,} cells, {len(index.data['cells']):,} distinct "
+          f"({'cached' if index.cached else 'indexed'})")
+
+    queries = [("WEEK headers", index.week_headers(args.sheet)) if args.weeks else None,
+               ("DAY headers", index.day_headers(args.sheet)) if args.days else None]
+    queries += [(f"= {text!r}", index.find(text, args.sheet)) for text in args.find]
+    queries += [(f"contains {text!r}", index.contains(text, args.sheet)) for text in args.contains]
+    queries += [(f"~ /{pattern}/", index.search(pattern, args.sheet)) for pattern in args.search]
+    for label, hits in filter(None, queries):
+        print(f"\n{label}: {len(hits)} cell(s)")
+        print_hits(hits)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Columnar Workout Export
+Stores workout data as column arrays with one shared string table instead of
+a tree of repeated key names and strings. Every string value is replaced by
+its index in ``strings`` (most frequent first, so common values get the
+shortest indexes); ``null`` stays ``null``. Pump ratings are kept as raw
+values because they may be numbers.
+
+Layout (all tables are dicts of equally long columns):
+    sheets           sheet_name, program_name, days (day count)
+    days             day_name, week_range, layout (0 = weeks, 1 = blocks), groups (count)
+    weeks            week_number, exercises (count)
+    blocks           block_name, exercises (count)
+    week_exercises   exercise_id, exercise_name, tempo, sets_reps, rest, results
+    block_exercises  exercise_name, week_1_2.tempo ... week_3_4.pump_rating
+                     (layouts with other week ranges cannot be encoded)
+
+Counts link each row to the rows of the next table in order, so decoding is
+a single sequential walk. ``decode(encode(data)) == data``, key order included.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from itertools import islice
+from typing import Any, Dict, Iterator, List
+
+from atomic_write import atomic_write
+from ndjson_sink import week_range_keys
+
+FORMAT_NAME = "workout-columnar"
+FORMAT_VERSION = 1
+
+WEEK_EXERCISE_FIELDS = ("exercise_id", "exercise_name", "tempo", "sets_reps", "rest", "results")
+BLOCK_RANGES = ("week_1_2", "week_3_4")
+BLOCK_RANGE_FIELDS = ("tempo", "sets", "reps", "results", "pump_rating")
+BLOCK_EXERCISE_FIELDS = ("exercise_name",) + tuple(
+    f"{week_range}.{field}" for week_range in BLOCK_RANGES for field in BLOCK_RANGE_FIELDS)
+
+# Columns holding strings (or null); everything else is stored as-is
+STRING_COLUMNS = {
+    "sheets": ("sheet_name", "program_name"),
+    "days": ("day_name", "week_range"),
+    "weeks": (),
+    "blocks": ("block_name",),
+    "week_exercises": WEEK_EXERCISE_FIELDS,
+    "block_exercises": tuple(f for f in BLOCK_EXERCISE_FIELDS if not f.endswith(".pump_rating")),
+}
+
+TABLE_COLUMNS = {
+    "sheets": ("sheet_name", "program_name", "days"),
+    "days": ("day_name", "week_range", "layout", "groups"),
+    "weeks": ("week_number", "exercises"),
+    "blocks": ("block_name", "exercises"),
+    "week_exercises": WEEK_EXERCISE_FIELDS,
+    "block_exercises": BLOCK_EXERCISE_FIELDS,
+}
+
+LAYOUT_WEEKS = 0
+LAYOUT_BLOCKS = 1
+
+
+def _empty_tables() -> Dict[str, Dict[str, List[Any]]]:
+    return {table: {column: [] for column in columns} for table, columns in TABLE_COLUMNS.items()}
+
+
+def encode(workout_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert extracted workout data into the columnar format.
+
+    Args:
+        workout_data: Structure produced by WorkoutExtractor.extract_all_sheets()
+
+    Returns:
+        JSON-serialisable columnar document
+    """
+    tables = _empty_tables()
+    sheets, days, weeks, blocks = tables["sheets"], tables["days"], tables["weeks"], tables["blocks"]
+    week_exercises, block_exercises = tables["week_exercises"], tables["block_exercises"]
+
+    for sheet in workout_data["sheets"]:
+        sheets["sheet_name"].append(sheet["sheet_name"])
+        sheets["program_name"].append(sheet["program_name"])
+        sheets["days"].append(len(sheet["days"]))
+
+        for day in sheet["days"]:
+            days["day_name"].append(day["day_name"])
+            if "blocks" in day:
+                days["week_range"].append(day["week_range"])
+                days["layout"].append(LAYOUT_BLOCKS)
+                days["groups"].append(len(day["blocks"]))
+                for block in day["blocks"]:
+                    blocks["block_name"].append(block["block_name"])
+                    blocks["exercises"].append(len(block["exercises"]))
+                    for exercise in block["exercises"]:
+                        if week_range_keys(exercise) != BLOCK_RANGES:
+                            raise ValueError(f"The columnar format holds the week ranges {', '.join(BLOCK_RANGES)} "
+                                             f"only; {exercise['exercise_name']!r} has "
+                                             f"{', '.join(week_range_keys(exercise))}")
+                        block_exercises["exercise_name"].append(exercise["exercise_name"])
+                        for week_range in BLOCK_RANGES:
+                            for field in BLOCK_RANGE_FIELDS:
+                                block_exercises[f"{week_range}.{field}"].append(exercise[week_range][field])
+            else:
+                days["week_range"].append(None)
+                days["layout"].append(LAYOUT_WEEKS)
+                days["groups"].append(len(day["weeks"]))
+                for week in day["weeks"]:
+                    weeks["week_number"].append(week["week_number"])
+                    weeks["exercises"].append(len(week["exercises"]))
+                    for exercise in week["exercises"]:
+                        for field in WEEK_EXERCISE_FIELDS:
+                            week_exercises[field].append(exercise[field])
+
+    strings = _string_table(tables)
+    index = {value: i for i, value in enumerate(strings)}
+    for table, columns in STRING_COLUMNS.items():
+        for column in columns:
+            tables[table][column] = [None if value is None else index[value]
+                                     for value in tables[table][column]]
+
+    return {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "program_name": workout_data["program_name"],
+        "strings": strings,
+        **tables,
+    }
+
+
+def decode(columnar: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild the nested workout data from a columnar document."""
+    if columnar.get("format") != FORMAT_NAME or columnar.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Not a {FORMAT_NAME} v{FORMAT_VERSION} document")
+
+    strings = columnar["strings"]
+
+    def rows(table: str) -> Iterator[tuple]:
+        """Row tuples of a table, in TABLE_COLUMNS order, with strings resolved."""
+        columns = columnar[table]
+        text = set(STRING_COLUMNS[table])
+        resolved = [[None if v is None else strings[v] for v in columns[name]] if name in text else columns[name]
+                    for name in TABLE_COLUMNS[table]]
+        return zip(*resolved)
+
+    days, weeks, blocks = rows("days"), rows("weeks"), rows("blocks")
+    week_exercises, block_exercises = rows("week_exercises"), rows("block_exercises")
+
+    sheets = []
+    for sheet_name, program_name, day_count in rows("sheets"):
+        sheet = {"sheet_name": sheet_name, "program_name": program_name, "days": []}
+        for day_name, week_range, layout, groups in islice(days, day_count):
+            if layout == LAYOUT_BLOCKS:
+                day = {"day_name": day_name, "week_range": week_range, "blocks": [
+                    {"block_name": block_name,
+                     "exercises": [_block_exercise(row) for row in islice(block_exercises, count)]}
+                    for block_name, count in islice(blocks, groups)
+                ]}
+            else:
+                day = {"day_name": day_name, "weeks": [
+                    {"week_number": week_number,
+                     "exercises": [dict(zip(WEEK_EXERCISE_FIELDS, row)) for row in islice(week_exercises, count)]}
+                    for week_number, count in islice(weeks, groups)
+                ]}
+            sheet["days"].append(day)
+        sheets.append(sheet)
+
+    return {"program_name": columnar["program_name"], "sheets": sheets}
+
+
+def _block_exercise(row: tuple) -> Dict[str, Any]:
+    """Nest a flat block_exercises row back into its two week ranges."""
+    exercise = {"exercise_name": row[0]}
+    width = len(BLOCK_RANGE_FIELDS)
+    for i, week_range in enumerate(BLOCK_RANGES):
+        exercise[week_range] = dict(zip(BLOCK_RANGE_FIELDS, row[1 + i * width:1 + (i + 1) * width]))
+    return exercise
+
+
+def _string_table(tables: Dict[str, Dict[str, List[Any]]]) -> List[str]:
+    """Every distinct string value, most frequent first."""
+    counts: Counter = Counter()
+    for table, columns in STRING_COLUMNS.items():
+        for column in columns:
+            for value in tables[table][column]:
+                if value is None:
+                    continue
+                if not isinstance(value, str):
+                    raise ValueError(f"{table}.{column} holds a non-string value: {value!r}")
+                counts[value] += 1
+    return [value for value, _ in counts.most_common()]
+
+
+def dumps(columnar: Dict[str, Any]) -> str:
+    """Compact JSON text of a columnar document."""
+    return json.dumps(columnar, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_columnar(workout_data: Dict[str, Any], output_path: str):
+    """Encode and write atomically."""
+    atomic_write(output_path, dumps(encode(workout_data)))
+    print(f"✅ Columnar data saved to {output_path}")
+
+
+def read_columnar(path: str) -> Dict[str, Any]:
+    """Load a columnar file and return the nested workout data."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return decode(json.load(f))
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Convert workout-data.json to or from the columnar format")
+    parser.add_argument("input", help="workout-data.json (or a columnar file with --decode)")
+    parser.add_argument("output", help="Where to write the converted file")
+    parser.add_argument("--decode", action="store_true", help="Convert a columnar file back to nested JSON")
+    args = parser.parse_args()
+
+    if args.decode:
+        from extract_workouts import write_json
+        write_json(read_columnar(args.input), args.output)
+    else:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            workout_data = json.load(f)
+        write_columnar(workout_data, args.output)
+
+    before, after = os.path.getsize(args.input), os.path.getsize(args.output)
+    print(f"📦 {before:,} bytes -> {after:,} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,18 +2,49 @@
 """
 Extract workout data from Sheet 1 ("Davey Jone's Pump") of workout Excel file.
 Handles complex multi-week, multi-day layout with exercise details.
+
+Every week takes the exercise ID and name from columns A/B. Its tempo,
+sets/reps, rest and results come from the four columns starting at its
+"WEEK N" header cell (Week 1: D-G, Week 2: I-L in the coach export); see
+week_engine.py. tests/fixtures/sheet1-synthetic.json pins the output.
 """
 
+import argparse
 import json
 import sys
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterator, List, Any, Optional, Union
+
+from atomic_write import atomic_write
+from extraction_cache import ExtractionCache
+from layout_schema import extract_with_layout
+from ndjson_sink import NDJSONWriter
+from run_metrics import MODES, NO_METRICS, metrics_mode, metrics_path_for, recorder_for
+from shard_output import write_shards
+from week_engine import extract_weeks
+from workout_model import Sheet1Day, Sheet1Exercise, Sheet1Program, Sheet1Week, to_dict
+
+# Part of the extraction cache key; bump when the output changes
+EXTRACTOR_VERSION = "1.1"
+
+
+def load_openpyxl():
+    """Import openpyxl on first use so cache hits never load it."""
+    try:
+        import openpyxl
+    except ImportError:
+        print("Error: openpyxl not installed. Install with: pip install openpyxl")
+        sys.exit(1)
+    return openpyxl
+
 
-try:
-    import openpyxl
-except ImportError:
-    print("Error: openpyxl not installed. Install with: pip install openpyxl")
-    sys.exit(1)
+def open_workbook(excel_path: str, reader: str = "openpyxl"):
+    """Open the workbook (values only) with openpyxl or the fast reader."""
+    openpyxl = load_openpyxl()  # the fast reader also borrows openpyxl's date helpers
+    if reader == "fast":
+        import fast_xlsx
+        return fast_xlsx.load_workbook(excel_path, data_only=True)
+    return openpyxl.load_workbook(excel_path, data_only=True)
 
 
 def clean_cell_value(value: Any) -> Optional[str]:
@@ -24,14 +55,6 @@ def clean_cell_value(value: Any) -> Optional[str]:
     return value_str if value_str else None
 
 
-def is_day_header(row_values: List[Any]) -> Optional[str]:
-    """Check if row is a day header (e.g., 'DAY 1: Upper Pull/Lower Push')."""
-    first_cell = clean_cell_value(row_values[0])
-    if first_cell and first_cell.upper().startswith('DAY '):
-        return first_cell
-    return None
-
-
 def extract_day_number(day_header: str) -> int:
     """Extract day number from header like 'DAY 1: Upper Pull/Lower Push'."""
     try:
@@ -43,115 +66,102 @@ def extract_day_number(day_header: str) -> int:
         return 0
 
 
-def parse_exercise_row(row_values: List[Any], col_offset: int = 0) -> Optional[Dict[str, str]]:
-    """
-    Parse exercise row with structure:
-    [ID, Exercise Name, Tempo, Sets/Reps, Rest, (optional) Results]
-
-    Args:
-        row_values: List of cell values
-        col_offset: Column offset for Week 2 (if applicable)
-    """
-    # Adjust for column offset
-    idx_id = col_offset
-    idx_name = col_offset + 1
-    idx_tempo = col_offset + 2
-    idx_sets = col_offset + 3
-    idx_rest = col_offset + 4
-    idx_results = col_offset + 5 if len(row_values) > col_offset + 5 else None
-
-    exercise_id = clean_cell_value(row_values[idx_id]) if idx_id < len(row_values) else None
-    exercise_name = clean_cell_value(row_values[idx_name]) if idx_name < len(row_values) else None
-
-    # Check if this is a valid exercise row (has ID like A1, B1, etc.)
-    if not exercise_id or not exercise_name:
-        return None
+def is_exercise_row(exercise_id: Any, exercise_name: Any) -> bool:
+    """Check if a row is an exercise row (ID like A1, B1, etc. plus a name)."""
+    exercise_id = clean_cell_value(exercise_id)
+    if not exercise_id or not clean_cell_value(exercise_name):
+        return False
 
     # Validate ID format (should be letter + number)
-    if not any(c.isalpha() for c in exercise_id) or not any(c.isdigit() for c in exercise_id):
-        return None
+    return any(c.isalpha() for c in exercise_id) and any(c.isdigit() for c in exercise_id)
 
-    tempo = clean_cell_value(row_values[idx_tempo]) if idx_tempo < len(row_values) else ""
-    sets_reps = clean_cell_value(row_values[idx_sets]) if idx_sets < len(row_values) else ""
-    rest = clean_cell_value(row_values[idx_rest]) if idx_rest < len(row_values) else ""
-    results = clean_cell_value(row_values[idx_results]) if idx_results and idx_results < len(row_values) else ""
 
-    return {
-        "id": exercise_id,
-        "name": exercise_name,
-        "tempo": tempo or "",
-        "setsReps": sets_reps or "",
-        "rest": rest or "",
-        "results": results or ""
-    }
+def format_exercise(values: Dict[str, Any]) -> Sheet1Exercise:
+    """
+    Format one projected exercise row with structure:
+    [ID, Exercise Name, Tempo, Sets/Reps, Rest, Results]
+    """
+    return Sheet1Exercise(
+        clean_cell_value(values["exercise_id"]),
+        clean_cell_value(values["exercise_name"]),
+        clean_cell_value(values["tempo"]) or "",
+        clean_cell_value(values["sets_reps"]) or "",
+        clean_cell_value(values["rest"]) or "",
+        clean_cell_value(values["results"]) or ""
+    )
 
 
-def extract_week_data(sheet: Any, week_num: int, col_offset: int = 0) -> Dict[str, Any]:
+def build_week_data(week_num: int, days: List[Dict[str, Any]]) -> Sheet1Week:
     """
-    Extract data for a specific week.
+    Build one week's output from the single-pass engine's day list.
 
     Args:
-        sheet: openpyxl worksheet object
-        week_num: Week number (1 or 2)
-        col_offset: Column offset (0 for Week 1, ~6-7 for Week 2)
+        week_num: Week number (from the "WEEK N" header)
+        days: Days returned by ``week_engine.extract_weeks``
     """
-    week_data = {
-        "week": week_num,
-        "days": []
-    }
-
-    current_day = None
-    current_exercises = []
-
-    # Iterate through rows
-    for row_idx, row in enumerate(sheet.iter_rows(min_row=1, values_only=True), start=1):
-        if not any(row):  # Skip empty rows
-            continue
-
-        # Check if this is a day header
-        day_header = is_day_header(row)
-        if day_header:
-            # Save previous day if exists
-            if current_day and current_exercises:
-                current_day["exercises"] = current_exercises
-                week_data["days"].append(current_day)
-
-            # Start new day
-            current_day = {
-                "dayNumber": extract_day_number(day_header),
-                "dayName": day_header,
-                "exercises": []
-            }
-            current_exercises = []
-            continue
-
-        # Try to parse as exercise row
-        if current_day:
-            exercise = parse_exercise_row(row, col_offset)
-            if exercise:
-                current_exercises.append(exercise)
-
-    # Save last day if exists
-    if current_day and current_exercises:
-        current_day["exercises"] = current_exercises
-        week_data["days"].append(current_day)
+    week_data = Sheet1Week(week_num)
+
+    for day in days:
+        exercises = [format_exercise(values) for values in day["weeks"].get(week_num, [])]
+        if exercises:
+            week_data.days.append(Sheet1Day(extract_day_number(day["header"]), day["header"], exercises))
 
     return week_data
 
 
-def extract_sheet1_data(excel_path: str) -> Dict[str, Any]:
+def sheet1_records(workout_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Flatten extracted Sheet 1 data into one NDJSON record per exercise."""
+    for week in workout_data["weeks"]:
+        for day in week["days"]:
+            for position, exercise in enumerate(day["exercises"]):
+                yield {"program": workout_data["program"], "week": week["week"],
+                       "dayNumber": day["dayNumber"], "dayName": day["dayName"],
+                       "position": position, **exercise}
+
+
+def record_sink(program: str, sink: Callable[[Dict[str, Any]], None]) -> Callable:
+    """Adapt a record sink to the week engine's ``sink(day, week_number, values)``."""
+    positions: Dict[tuple, int] = {}
+
+    def emit(day: Dict[str, Any], week_num: int, values: Dict[str, Any]):
+        key = (id(day), week_num)
+        position = positions.get(key, 0)
+        positions[key] = position + 1
+        sink({"program": program, "week": week_num,
+              "dayNumber": extract_day_number(day["header"]), "dayName": day["header"],
+              "position": position, **format_exercise(values).json()})
+
+    return emit
+
+
+def extract_sheet1_data(excel_path: str, reader: str = "openpyxl",
+                        layout_cache: Optional[ExtractionCache] = None,
+                        sink: Optional[Callable[[Dict[str, Any]], None]] = None,
+                        metrics=NO_METRICS, model: bool = False) -> Union[Dict[str, Any], Sheet1Program]:
     """
     Extract workout data from Sheet 1.
 
+    Every row is read once; each exercise row is projected into all
+    "WEEK N" column blocks at the same time. With a layout cache, the
+    sheet is read from its first day through the layout schema cached for
+    its header structure (see layout_schema.py).
+
     Args:
         excel_path: Path to Excel file
+        reader: "openpyxl" or "fast" (see fast_xlsx.py)
+        layout_cache: Optional cache of detected layout schemas
+        sink: Optional record callback (e.g. an NDJSONWriter); exercises
+            are then streamed to it as rows are read instead of collected
+        metrics: Optional recorder (see run_metrics.py) for per-phase timings
+        model: Return the workout_model objects instead of dicts
 
     Returns:
-        Dictionary with structured workout data
+        Dictionary (or Sheet1Program) with structured workout data
     """
     try:
         # Load workbook
-        workbook = openpyxl.load_workbook(excel_path, data_only=True)
+        with metrics.phase("load_workbook"):
+            workbook = open_workbook(excel_path, reader)
 
         # Get first sheet (Sheet 1)
         sheet = workbook.worksheets[0]
@@ -161,53 +171,42 @@ def extract_sheet1_data(excel_path: str) -> Dict[str, Any]:
         print(f"Sheet dimensions: {sheet.max_row} rows x {sheet.max_column} columns")
 
         # Initialize output structure
-        output = {
-            "program": sheet_name,
-            "weeks": []
-        }
-
-        # Extract Week 1 data (columns 0-5 typically)
-        print("\nExtracting Week 1 data...")
-        week1_data = extract_week_data(sheet, week_num=1, col_offset=0)
-        if week1_data["days"]:
-            output["weeks"].append(week1_data)
-            print(f"  Found {len(week1_data['days'])} days")
-
-        # Extract Week 2 data (columns 6-11 typically)
-        # Try to detect Week 2 column offset by looking for "WEEK 2" header
-        week2_col_offset = None
-        for row in sheet.iter_rows(min_row=1, max_row=10, values_only=True):
-            for col_idx, cell in enumerate(row):
-                if cell and "WEEK 2" in str(cell).upper():
-                    week2_col_offset = col_idx
-                    break
-            if week2_col_offset:
-                break
-
-        if week2_col_offset:
-            print(f"\nExtracting Week 2 data (column offset: {week2_col_offset})...")
-            week2_data = extract_week_data(sheet, week_num=2, col_offset=week2_col_offset)
-            if week2_data["days"]:
-                output["weeks"].append(week2_data)
-                print(f"  Found {len(week2_data['days'])} days")
+        output = Sheet1Program(sheet_name)
+
+        engine_sink = record_sink(sheet_name, sink) if sink is not None else None
+        with metrics.phase("extract_sheet", sheet=sheet_name):
+            if layout_cache is not None:
+                extracted = extract_with_layout(sheet, layout_cache, is_exercise=is_exercise_row, sink=engine_sink)
+            else:
+                # Single pass over the sheet for all weeks
+                extracted = extract_weeks(metrics.count_rows(sheet.iter_rows(min_row=1, values_only=True)),
+                                          is_exercise=is_exercise_row, sink=engine_sink)
+
+        with metrics.phase("build_weeks", sheet=sheet_name):
+            for week_num in extracted["weeks"]:
+                print(f"\nExtracting Week {week_num} data...")
+                week_data = build_week_data(week_num, extracted["days"])
+                if week_data.days:
+                    output.weeks.append(week_data)
+                    print(f"  Found {len(week_data.days)} days")
 
         workbook.close()
 
         # Summary
-        total_days = sum(len(week["days"]) for week in output["weeks"])
+        total_days = sum(len(week.days) for week in output.weeks)
         total_exercises = sum(
-            len(day["exercises"])
-            for week in output["weeks"]
-            for day in week["days"]
+            len(day.exercises)
+            for week in output.weeks
+            for day in week.days
         )
 
         print(f"\n✓ Extraction complete!")
-        print(f"  Program: {output['program']}")
-        print(f"  Weeks: {len(output['weeks'])}")
+        print(f"  Program: {output.program}")
+        print(f"  Weeks: {len(output.weeks)}")
         print(f"  Total Days: {total_days}")
         print(f"  Total Exercises: {total_exercises}")
 
-        return output
+        return output if model else to_dict(output)
 
     except FileNotFoundError:
         print(f"Error: File not found: {excel_path}")
@@ -221,9 +220,32 @@ def extract_sheet1_data(excel_path: str) -> Dict[str, Any]:
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Extract Sheet 1 workout data")
+    parser.add_argument("excel_path", nargs="?",
+                        default="/Users/britainsaluri/Downloads/Argh Let's Get Huge Matey.xlsx")
+    parser.add_argument("output_path", nargs="?",
+                        default="/Users/britainsaluri/workout-tracker/src/sheet1-workout-data.json")
+    parser.add_argument("--format", choices=("json", "ndjson"), default="json",
+                        help="ndjson writes one flat exercise record per line while parsing")
+    parser.add_argument("--reader", choices=("openpyxl", "fast"), default="openpyxl",
+                        help="'fast' reads values straight from the sheet XML, falling back to openpyxl")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Reuse results for byte-identical workbooks from this cache directory")
+    parser.add_argument("--cache-max-mb", type=int, default=512,
+                        help="Cache size cap; least recently used entries are evicted")
+    parser.add_argument("--shards", action="store_true",
+                        help="json format: also write one file per week with a <output>.catalog.json "
+                             "(see shard_output.py)")
+    parser.add_argument("--metrics", nargs="?", const="full", choices=MODES, default=None,
+                        help="Write per-phase timings to <output>.metrics.json ('time' skips memory "
+                             "tracing); also enabled by WORKOUT_METRICS=1")
+    args = parser.parse_args()
+    if args.shards and args.format != "json":
+        parser.error("--shards is only supported by the json format")
+
     # File paths
-    excel_path = "/Users/britainsaluri/Downloads/Argh Let's Get Huge Matey.xlsx"
-    output_path = "/Users/britainsaluri/workout-tracker/src/sheet1-workout-data.json"
+    excel_path = args.excel_path
+    output_path = args.output_path
 
     print("=" * 60)
     print("Sheet 1 Workout Data Extractor")
@@ -236,18 +258,55 @@ def main():
         print(f"❌ Error: Input file not found: {excel_path}")
         sys.exit(1)
 
-    # Extract data
-    workout_data = extract_sheet1_data(excel_path)
-
-    # Save to JSON
     output_dir = Path(output_path).parent
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(workout_data, f, indent=2, ensure_ascii=False)
+    metrics = recorder_for("extract_sheet1", metrics_mode(args.metrics))
+    run_details = {"input": excel_path, "output": output_path, "output_format": args.format, "reader": args.reader,
+                   "cached": bool(args.cache_dir), "shards": args.shards}
+
+    # Extract data
+    if args.format == "ndjson" and not args.cache_dir:
+        with NDJSONWriter(output_path) as writer:
+            extract_sheet1_data(excel_path, args.reader, sink=writer, metrics=metrics)
+        print(f"\n✓ {writer.records} exercise records saved to: {output_path}")
+        if metrics.enabled:
+            metrics.write(metrics_path_for(output_path), **run_details)
+        return 0
+
+    if args.cache_dir:
+        cache = ExtractionCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+        # Layout schemas outlive any one workbook; keep them apart from results
+        layout_cache = ExtractionCache(str(Path(args.cache_dir) / "layouts"))
+        with metrics.phase("cache"):
+            workout_data = cache.get_or_extract(
+                excel_path, "extract_sheet1", EXTRACTOR_VERSION, {},
+                lambda: extract_sheet1_data(excel_path, args.reader, layout_cache, metrics=metrics))
+        stats = cache.stats()
+        print(f"Cache: {stats['hits']} hit(s), {stats['misses']} miss(es)")
+    else:
+        workout_data = extract_sheet1_data(excel_path, args.reader, metrics=metrics, model=args.format == "json")
+
+    if args.format == "ndjson":
+        # Cached results are whole structures; flatten them into the same records
+        with metrics.phase("write_ndjson"), NDJSONWriter(output_path) as writer:
+            writer.write_all(sheet1_records(workout_data))
+        print(f"\n✓ {writer.records} exercise records saved to: {output_path}")
+        if metrics.enabled:
+            metrics.write(metrics_path_for(output_path), **run_details)
+        return 0
+
+    # Save to JSON
+    with metrics.phase("write_json"):
+        atomic_write(output_path, json.dumps(to_dict(workout_data), indent=2, ensure_ascii=False))
 
     print(f"\n✓ Data saved to: {output_path}")
     print(f"  File size: {Path(output_path).stat().st_size:,} bytes")
+    if args.shards:
+        with metrics.phase("write_shards"):
+            write_shards(to_dict(workout_data), output_path)
+    if metrics.enabled:
+        metrics.write(metrics_path_for(output_path), **run_details)
 
     return 0
 
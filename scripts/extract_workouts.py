@@ -2,272 +2,483 @@
 """
 Workout Data Extraction Script
 Extracts workout data from Excel file and converts to structured JSON format.
-Handles multiple sheets with different layouts (Sheet1-4).
+Handles multiple sheets with different layouts (Sheet1-4), each described by
+a declarative layout spec (see layout_specs.py).
 """
 
-import openpyxl
+import argparse
 import json
-from datetime import datetime
-from typing import Dict, List, Any, Optional
-import re
+import os
+from itertools import chain
+from typing import Callable, Dict, Iterator, List, Any, Optional, Sequence, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+
+from atomic_write import atomic_write
+from columnar_export import BLOCK_RANGES, write_columnar
+from extraction_cache import ExtractionCache
+from field_parsers import parsed_fields
+from json_delta import DEFAULT_KEEP, write_with_delta
+from layout_specs import (BLOCK, BLOCKS, DAY, EXERCISE, WEEK_HEADER, WEEK_RANGE, LayoutSpec, LayoutSpecError,
+                          load_layouts)
+from lookup_index import index_path_for, write_index
+from ndjson_sink import NDJSONWriter, exercise_records, iter_records
+from publish_artifacts import publish
+from run_metrics import MODES, NO_METRICS, metrics_mode, metrics_path_for, recorder_for
+from shard_output import catalog_path_for, shard_paths, write_shards
+from sqlite_export import export_sqlite
+from workout_model import (Block, BlockDay, BlockExercise, Day, Exercise, Model, Program, Sheet, Week, WeekValues,
+                           to_dict)
+
+# Bump whenever the output structure or value formatting changes;
+# it is part of the extraction cache key.
+EXTRACTOR_VERSION = "1.1"
+
+# "fast" reads cell values straight from the sheet XML (see fast_xlsx.py)
+READERS = ("openpyxl", "fast")
 
 
 class WorkoutExtractor:
     """Extract and structure workout data from Excel workbook."""
 
-    def __init__(self, excel_path: str):
-        self.excel_path = excel_path
-        self.workbook = openpyxl.load_workbook(excel_path)
-        self.workout_data = {
-            "program_name": "Argh Let's Get Huge Matey",
-            "sheets": []
-        }
-
-    def extract_all_sheets(self) -> Dict[str, Any]:
-        """Extract data from all sheets in the workbook."""
-        for sheet_name in self.workbook.sheetnames[:4]:  # Process Sheet1-4
-            print(f"Processing {sheet_name}...")
-            ws = self.workbook[sheet_name]
-
-            if sheet_name == "Sheet4":
-                sheet_data = self._extract_sheet4(ws, sheet_name)
-            else:
-                sheet_data = self._extract_standard_sheet(ws, sheet_name)
+    def __init__(self, excel_path: str, streaming: bool = False, reader: str = "openpyxl",
+                 sink: Optional[Callable[[Dict[str, Any]], None]] = None, parse_fields: bool = False,
+                 metrics=NO_METRICS, layouts: Sequence[str] = ()):
+        if reader not in READERS:
+            raise ValueError(f"Unknown reader {reader!r}; expected one of {', '.join(READERS)}")
 
+        self.excel_path = excel_path
+        self.reader = reader
+        # With a sink, each exercise is handed over as flat records while its
+        # row is parsed (see ndjson_sink.py); workout_data then only keeps
+        # the sheet/day/week skeleton, so memory does not grow with the sheet.
+        self.sink = sink
+        # Also emit typed results/sets/reps/tempo/rest under "parsed" (see field_parsers.py)
+        self.parse_fields = parse_fields
+        # Built-in layout specs plus any extra spec files/directories (see layout_specs.py)
+        self.layout_paths = tuple(layouts)
+        self.layouts = load_layouts(self.layout_paths)
+        self._sheet: Optional[Sheet] = None
+        self._positions: Dict[int, int] = {}
+        # Phase timings (see run_metrics.py); the per-row hooks are only
+        # installed when the recorder is enabled
+        self.metrics = metrics
+        metrics.instrument(self, "_add_exercise_to_day", "_parse_sheet4_exercise")
+        # Imported here so cache hits never load openpyxl at all
+        if reader == "fast":
+            import fast_xlsx
+
+            # The fast reader always streams rows straight from the zip
+            self.streaming = True
+            with metrics.phase("load_workbook"):
+                self.workbook = fast_xlsx.load_workbook(excel_path)
+        else:
+            import openpyxl
+
+            self.streaming = streaming
+            # Read-only mode parses each worksheet lazily as its rows are walked,
+            # so memory stays flat no matter how long the sheet is.
+            with metrics.phase("load_workbook"):
+                self.workbook = openpyxl.load_workbook(excel_path, read_only=streaming)
+        # Built as workout_model objects; dicts only when serialized
+        self.program = Program("Argh Let's Get Huge Matey")
+
+    @property
+    def workout_data(self) -> Dict[str, Any]:
+        """Everything extracted so far, as plain dicts."""
+        return to_dict(self.program)
+
+    def extract_all_sheets(self, sheet_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Extract data from all sheets in the workbook, as plain dicts.
+
+        Args:
+            sheet_workers: When > 1, extract each sheet in its own worker
+                process; results are merged back in workbook order
+        """
+        return to_dict(self.extract_model(sheet_workers))
+
+    def extract_model(self, sheet_workers: Optional[int] = None) -> Program:
+        """Like extract_all_sheets(), but return the workout_model objects (see write_json)."""
+        sheet_names = self.workbook.sheetnames[:4]  # Process Sheet1-4
+
+        if sheet_workers and sheet_workers > 1 and self.sink is not None:
+            raise ValueError("A sink cannot be combined with sheet workers")
+        if sheet_workers and sheet_workers > 1:
+            workers = min(sheet_workers, len(sheet_names))
+            # Worker processes are not instrumented; only the pool as a whole is timed
+            with self.metrics.phase("extract_sheets"), ProcessPoolExecutor(max_workers=workers) as pool:
+                # map() yields in submission order, i.e. the original sheet order
+                results = list(pool.map(_extract_sheet_in_worker,
+                                        [self.excel_path] * len(sheet_names), sheet_names,
+                                        [self.reader] * len(sheet_names),
+                                        [self.parse_fields] * len(sheet_names),
+                                        [self.layout_paths] * len(sheet_names)))
+        else:
+            results = (self.extract_sheet_model(sheet_name) for sheet_name in sheet_names)
+
+        for sheet_data in results:
             if sheet_data:
-                self.workout_data["sheets"].append(sheet_data)
+                self.program.sheets.append(sheet_data)
 
-        return self.workout_data
+        return self.program
 
-    def _extract_standard_sheet(self, ws, sheet_name: str) -> Dict[str, Any]:
-        """Extract data from Sheet1, Sheet2, Sheet3 (standard format)."""
-        rows = list(ws.iter_rows(values_only=True))
+    def extract_sheet(self, sheet_name: str) -> Dict[str, Any]:
+        """Extract a single sheet by name, as plain dicts."""
+        return to_dict(self.extract_sheet_model(sheet_name))
 
-        # Get program name from first row
-        program_name = None
-        for cell in rows[0]:
-            if cell and isinstance(cell, str) and cell.strip():
-                program_name = cell.strip()
-                break
+    def extract_sheet_model(self, sheet_name: str) -> Sheet:
+        """Extract a single sheet by name, with the layout spec that applies to it."""
+        print(f"Processing {sheet_name}...")
+        with self.metrics.phase("extract_sheet", sheet=sheet_name):
+            ws = self.workbook[sheet_name]
+            layout = self.layouts.for_sheet(sheet_name)
 
-        sheet_data = {
-            "sheet_name": sheet_name,
-            "program_name": program_name,
-            "days": []
-        }
+            if layout.layout == BLOCKS:
+                return self._extract_block_sheet(ws, sheet_name, layout)
+            return self._extract_week_sheet(ws, sheet_name, layout)
+
+    def _extract_week_sheet(self, ws, sheet_name: str, layout: LayoutSpec) -> Sheet:
+        """Extract a sheet with "WEEK N" column blocks (Sheet1-3)."""
+        program_name, rows = self._program_rows(ws, layout)
+        sheet_data = Sheet(sheet_name, program_name)
+        self._start_sheet(sheet_data)
 
         current_day = None
-        week_headers = []
-
-        for i, row in enumerate(rows):
-            # Detect week headers (e.g., WEEK 1, WEEK 2, etc.)
-            if row[3] and isinstance(row[3], str) and "WEEK" in str(row[3]).upper():
-                week_headers = self._extract_week_headers(row)
-                continue
-
-            # Detect day header
-            if row[0] and isinstance(row[0], str) and "DAY" in str(row[0]).upper():
-                if current_day:
-                    sheet_data["days"].append(current_day)
-
-                current_day = {
-                    "day_name": str(row[0]).strip(),
-                    "weeks": self._initialize_weeks(week_headers)
-                }
-                continue
-
-            # Extract exercise data
-            if current_day and row[0] and isinstance(row[0], str):
-                exercise_id = str(row[0]).strip()
-                if re.match(r'^[A-Z]\d+$', exercise_id):  # Match A1, B2, etc.
-                    self._add_exercise_to_day(current_day, row, week_headers)
+        week_numbers: List[int] = []
+
+        for kind, label, values in layout.read(rows):
+            if kind is EXERCISE:
+                if current_day is not None:
+                    self._add_exercise_to_day(current_day, label, values)
+            elif kind is DAY:
+                if current_day is not None:
+                    sheet_data.days.append(current_day)
+                current_day = Day(label, [Week(number) for number in week_numbers])
+            elif kind is WEEK_HEADER:
+                week_numbers = [number for number, _ in label]
 
         # Add last day
-        if current_day:
-            sheet_data["days"].append(current_day)
+        if current_day is not None:
+            sheet_data.days.append(current_day)
 
         return sheet_data
 
-    def _extract_sheet4(self, ws, sheet_name: str) -> Dict[str, Any]:
-        """Extract data from Sheet4 (different format)."""
-        rows = list(ws.iter_rows(values_only=True))
-
-        sheet_data = {
-            "sheet_name": sheet_name,
-            "program_name": "Britanica",
-            "days": []
-        }
+    def _extract_block_sheet(self, ws, sheet_name: str, layout: LayoutSpec) -> Sheet:
+        """Extract a sheet of days split into blocks, with week range columns (Sheet4)."""
+        program_name, rows = self._program_rows(ws, layout)
+        sheet_data = Sheet(sheet_name, program_name)
+        self._start_sheet(sheet_data)
 
         current_day = None
         current_block = None
+        block_day = None
         week_range = None
 
-        for i, row in enumerate(rows):
-            # Detect week range
-            if row[0] and isinstance(row[0], str) and "Week" in str(row[0]):
-                week_range = str(row[0]).strip()
-                continue
-
-            # Detect day header
-            if row[0] and isinstance(row[0], str) and "Day" in str(row[0]):
-                if current_day:
-                    sheet_data["days"].append(current_day)
-
-                current_day = {
-                    "day_name": str(row[0]).strip(),
-                    "week_range": week_range,
-                    "blocks": []
-                }
-                continue
-
-            # Detect block header
-            if row[0] and isinstance(row[0], str) and "Block" in str(row[0]):
-                current_block = {
-                    "block_name": str(row[0]).strip(),
-                    "exercises": []
-                }
-                if current_day:
-                    current_day["blocks"].append(current_block)
-                continue
-
-            # Extract exercise data for Sheet4
-            if current_block and row[0] and isinstance(row[0], str) and not any(x in str(row[0]) for x in ["Block", "Day", "Week"]):
-                exercise = self._parse_sheet4_exercise(row)
-                if exercise:
-                    current_block["exercises"].append(exercise)
+        for kind, label, values in layout.read(rows):
+            if kind is EXERCISE:
+                if current_block is not None:
+                    exercise = self._parse_sheet4_exercise(label, values, layout.range_keys)
+                    self._collect(block_day, current_block, exercise)
+            elif kind is WEEK_RANGE:
+                week_range = label
+            elif kind is DAY:
+                if current_day is not None:
+                    sheet_data.days.append(current_day)
+                current_day = BlockDay(label, week_range)
+            elif kind is BLOCK:
+                current_block = Block(label)
+                if current_day is not None:
+                    current_day.blocks.append(current_block)
+                block_day = current_day
 
         # Add last day
-        if current_day:
-            sheet_data["days"].append(current_day)
+        if current_day is not None:
+            sheet_data.days.append(current_day)
 
         return sheet_data
 
-    def _extract_week_headers(self, row: tuple) -> List[Dict[str, Any]]:
-        """Extract week information from header row."""
-        weeks = []
-        week_positions = {}
-
-        for i, cell in enumerate(row):
-            if cell and isinstance(cell, str) and "WEEK" in str(cell).upper():
-                week_num = re.search(r'\d+', str(cell))
-                if week_num:
-                    weeks.append({
-                        "week_number": int(week_num.group()),
-                        "column_start": i
-                    })
-
-        return weeks
-
-    def _initialize_weeks(self, week_headers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Initialize week structure for a day."""
-        return [{
-            "week_number": week["week_number"],
-            "exercises": []
-        } for week in week_headers]
-
-    def _add_exercise_to_day(self, current_day: Dict[str, Any], row: tuple, week_headers: List[Dict[str, Any]]):
-        """Add exercise data to current day for each week."""
-        exercise_id = str(row[0]).strip()
-        exercise_name = str(row[1]).strip() if row[1] else ""
-
-        # For each week, extract exercise data
-        for week_idx, week in enumerate(week_headers):
-            # Calculate column offset for this week
-            col_offset = week["column_start"]
-
-            tempo = self._safe_get_value(row, col_offset)
-            sets_reps = self._safe_get_value(row, col_offset + 1)
-            rest = self._safe_get_value(row, col_offset + 2)
-            results = self._safe_get_value(row, col_offset + 3)
-
-            exercise = {
-                "exercise_id": exercise_id,
-                "exercise_name": exercise_name,
-                "tempo": self._format_tempo(tempo),
-                "sets_reps": str(sets_reps) if sets_reps else "",
-                "rest": str(rest) if rest else "",
-                "results": str(results) if results else ""
-            }
-
-            # Add to appropriate week
-            if week_idx < len(current_day["weeks"]):
-                current_day["weeks"][week_idx]["exercises"].append(exercise)
-
-    def _parse_sheet4_exercise(self, row: tuple) -> Optional[Dict[str, Any]]:
-        """Parse exercise data from Sheet4 format."""
-        exercise_name = str(row[0]).strip() if row[0] else ""
-
-        if not exercise_name or len(exercise_name) < 3:
-            return None
-
-        return {
-            "exercise_name": exercise_name,
-            "week_1_2": {
-                "tempo": self._format_tempo(self._safe_get_value(row, 2)),
-                "sets": str(self._safe_get_value(row, 3)) if row[3] else "",
-                "reps": str(self._safe_get_value(row, 4)) if row[4] else "",
-                "results": str(self._safe_get_value(row, 5)) if row[5] else "",
-                "pump_rating": self._safe_get_value(row, 7)
-            },
-            "week_3_4": {
-                "tempo": self._format_tempo(self._safe_get_value(row, 9)),
-                "sets": str(self._safe_get_value(row, 10)) if row[10] else "",
-                "reps": str(self._safe_get_value(row, 11)) if row[11] else "",
-                "results": str(self._safe_get_value(row, 12)) if row[12] else "",
-                "pump_rating": self._safe_get_value(row, 14)
-            }
-        }
-
-    def _safe_get_value(self, row: tuple, index: int) -> Any:
-        """Safely get value from row at index."""
-        try:
-            if index < len(row):
-                value = row[index]
-                # Handle datetime objects
-                if isinstance(value, datetime):
-                    return value.strftime("%m-%d")
-                return value
-            return None
-        except IndexError:
-            return None
-
-    def _format_tempo(self, tempo: Any) -> str:
-        """Format tempo value consistently."""
-        if tempo is None:
-            return ""
-        if isinstance(tempo, (int, float)):
-            # Convert 211.0 to "211", 311.0 to "311", etc.
-            return str(int(tempo))
-        return str(tempo)
+    def _program_rows(self, ws, layout: LayoutSpec) -> Tuple[Optional[str], Iterator[tuple]]:
+        """The program name (from the spec, else the first text cell of row 1) and the sheet's rows."""
+        rows = self._iter_rows(ws)
+        if layout.program_name is not None:
+            return layout.program_name, rows
+
+        first_row = next(rows, ())
+        program_name = None
+        for cell in first_row:
+            if cell and isinstance(cell, str) and cell.strip():
+                program_name = cell.strip()
+                break
+        return program_name, chain((first_row,), rows)
+
+    def _iter_rows(self, ws):
+        """
+        Yield row value tuples one at a time.
+
+        In streaming mode the <dimension> tag is ignored, since a stale or
+        too-small one cuts rows off; rows then come out ragged (as long as
+        their last cell), which the projectors already allow for.
+        """
+        if self.streaming:
+            ws.reset_dimensions()
+        return self.metrics.count_rows(ws.iter_rows(values_only=True))
+
+    def _add_exercise_to_day(self, current_day: Day, exercise_id: str, values: Tuple[str, List[tuple]]):
+        """Add a projected exercise row to each week of the current day."""
+        exercise_name, weeks = values
+        for week, week_values in zip(current_day.weeks, weeks):
+            self._collect(current_day, week, Exercise(exercise_id, exercise_name, *week_values))
+
+    def _start_sheet(self, sheet_data: Sheet):
+        """Remember the sheet being parsed, for the records handed to the sink."""
+        self._sheet = sheet_data
+        self._positions = {}
+
+    def _collect(self, day: Optional[Model], group: Model, exercise: Model):
+        """Append an exercise to its week/block, or hand it to the sink."""
+        if self.parse_fields:
+            exercise.add_parsed(parsed_fields)
+        if self.sink is None or day is None:
+            group.exercises.append(exercise)
+            return
+
+        position = self._positions.get(id(group), 0)
+        self._positions[id(group)] = position + 1
+        for record in exercise_records(self._sheet.json(), day.json(), group.json(), to_dict(exercise), position):
+            self.sink(record)
+
+    def _parse_sheet4_exercise(self, exercise_name: str, ranges: List[tuple],
+                               range_keys: Tuple[str, ...]) -> BlockExercise:
+        """Build a block exercise from its projected week range values."""
+        return BlockExercise(exercise_name, [WeekValues(*values) for values in ranges], range_keys)
 
     def save_to_json(self, output_path: str):
         """Save extracted data to JSON file."""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(self.workout_data, f, indent=2, ensure_ascii=False)
-        print(f"✅ Data saved to {output_path}")
+        write_json(self.program, output_path)
+
+    def save_to_columnar(self, output_path: str):
+        """Save extracted data in the compact columnar format (see columnar_export.py)."""
+        write_columnar(self.workout_data, output_path)
 
     def close(self):
         """Close the workbook."""
         self.workbook.close()
 
 
+def write_json(workout_data: Union[Dict[str, Any], Program], output_path: str):
+    """
+    Write extracted data as pretty-printed JSON (atomically, see atomic_write.py).
+
+    Plain dicts and workout_model objects give the same bytes; objects are
+    turned into dicts only for the duration of the write.
+    """
+    atomic_write(output_path, json.dumps(to_dict(workout_data), indent=2, ensure_ascii=False))
+    print(f"✅ Data saved to {output_path}")
+
+
+def extract_workbook(excel_path: str, streaming: bool = False, sheet_workers: Optional[int] = None,
+                     cache: Optional[ExtractionCache] = None, reader: str = "openpyxl",
+                     parse_fields: bool = False, metrics=NO_METRICS,
+                     model: bool = False, layouts: Sequence[str] = ()) -> Union[Dict[str, Any], Program]:
+    """
+    Extract all sheets of a workbook, going through the cache when given.
+
+    Streaming, sheet workers and the reader only change how the workbook is
+    read, not the output, so they are not part of the cache key;
+    parse_fields and extra layout specs (by content) are. A cache lookup is recorded as a "cache" phase, with
+    the extraction phases nested in it on a miss.
+
+    With ``model``, the workout_model Program is returned instead of dicts
+    (cached dicts are loaded back into it); write_json() accepts either.
+    """
+    def extract():
+        extractor = WorkoutExtractor(excel_path, streaming=streaming, reader=reader, parse_fields=parse_fields,
+                                     metrics=metrics, layouts=layouts)
+        try:
+            program = extractor.extract_model(sheet_workers=sheet_workers)
+            return program if model and cache is None else to_dict(program)
+        finally:
+            extractor.close()
+
+    if cache is None:
+        return extract()
+    options = {"parse_fields": True} if parse_fields else {}
+    if layouts:
+        options["layouts"] = load_layouts(tuple(layouts)).fingerprint()
+    with metrics.phase("cache"):
+        workout_data = cache.get_or_extract(excel_path, "extract_workouts", EXTRACTOR_VERSION, options, extract)
+    return Program.from_dict(workout_data) if model else workout_data
+
+
+def extract_to_ndjson(excel_path: str, output_path: str, streaming: bool = False,
+                      cache: Optional[ExtractionCache] = None, reader: str = "openpyxl",
+                      append: bool = False, parse_fields: bool = False, metrics=NO_METRICS,
+                      layouts: Sequence[str] = ()) -> int:
+    """
+    Write one flat record per exercise to ``output_path`` as NDJSON.
+
+    Without a cache, records are written while rows are parsed and only the
+    sheet/day skeleton is held in memory. A cached structure is flattened
+    into the same records.
+
+    Returns:
+        Number of records written
+    """
+    with NDJSONWriter(output_path, append=append) as writer:
+        if cache is not None:
+            workout_data = extract_workbook(excel_path, streaming, cache=cache, reader=reader,
+                                            parse_fields=parse_fields, metrics=metrics, layouts=layouts)
+            with metrics.phase("write_ndjson"):
+                writer.write_all(iter_records(workout_data))
+        else:
+            # Records are written from inside the sheet phases here
+            extractor = WorkoutExtractor(excel_path, streaming=streaming, reader=reader, sink=writer,
+                                         parse_fields=parse_fields, metrics=metrics, layouts=layouts)
+            try:
+                extractor.extract_all_sheets()
+            finally:
+                extractor.close()
+        return writer.records
+
+
+def _extract_sheet_in_worker(excel_path: str, sheet_name: str, reader: str = "openpyxl",
+                             parse_fields: bool = False, layouts: Tuple[str, ...] = ()) -> Sheet:
+    """Process pool entry point: open the workbook read-only and parse one sheet."""
+    # Read-only mode only parses the worksheet XML that is actually iterated
+    extractor = WorkoutExtractor(excel_path, streaming=True, reader=reader, parse_fields=parse_fields,
+                                 layouts=layouts)
+    try:
+        return extractor.extract_sheet_model(sheet_name)
+    finally:
+        extractor.close()
+
+
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Extract workout data from an Excel workbook")
+    parser.add_argument("excel_path", nargs="?",
+                        default="/Users/britainsaluri/Downloads/Argh Let's Get Huge Matey.xlsx")
+    parser.add_argument("output_path", nargs="?",
+                        default="/Users/britainsaluri/workout-tracker/src/workout-data.json")
+    parser.add_argument("--format", choices=("json", "ndjson", "columnar", "sqlite"), default="json",
+                        help="ndjson writes one flat exercise record per line while parsing; "
+                             "columnar stores column arrays with a shared string table; "
+                             "sqlite adds the workbook to normalized tables (see sqlite_export.py)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Open the workbook read-only and walk rows lazily (constant memory)")
+    parser.add_argument("--sheet-workers", type=int, default=None,
+                        help="Extract each sheet in its own worker process")
+    parser.add_argument("--reader", choices=READERS, default="openpyxl",
+                        help="'fast' reads values straight from the sheet XML, falling back to openpyxl")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Reuse results for byte-identical workbooks from this cache directory")
+    parser.add_argument("--cache-max-mb", type=int, default=512,
+                        help="Cache size cap; least recently used entries are evicted")
+    parser.add_argument("--parse-fields", action="store_true",
+                        help="Also emit typed results, sets/reps, tempo and rest under 'parsed'")
+    parser.add_argument("--no-index", action="store_true",
+                        help="Skip the <output>.index.json lookup sidecar (json and columnar formats)")
+    parser.add_argument("--delta", action="store_true",
+                        help="json format: also write a versioned JSON Patch delta from the output being "
+                             "replaced (see json_delta.py)")
+    parser.add_argument("--keep-deltas", type=int, default=DEFAULT_KEEP,
+                        help="Deltas kept in the <output>.version.json chain")
+    parser.add_argument("--shards", action="store_true",
+                        help="json/columnar formats: also split the output into per-program, per-week "
+                             "shards with a <output>.catalog.json (see shard_output.py)")
+    parser.add_argument("--publish", default=None, metavar="SITE_DIR",
+                        help="json/columnar formats: also publish the output and its index under "
+                             "content-hashed names into SITE_DIR (see publish_artifacts.py)")
+    parser.add_argument("--layouts", action="append", default=[], metavar="SPEC",
+                        help="Extra layout spec file or directory, after the built-in layouts/ "
+                             "(see layout_specs.py); may be repeated")
+    parser.add_argument("--metrics", nargs="?", const="full", choices=MODES, default=None,
+                        help="Write per-phase timings to <output>.metrics.json ('time' skips memory "
+                             "tracing); also enabled by WORKOUT_METRICS=1")
+    args = parser.parse_args()
+    if args.parse_fields and args.format == "columnar":
+        parser.error("--parse-fields is not supported by the columnar format")
+    if args.delta and args.format != "json":
+        parser.error("--delta is only supported by the json format")
+    if args.publish and args.format not in ("json", "columnar"):
+        parser.error("--publish is only supported by the json and columnar formats")
+    if args.shards and args.format not in ("json", "columnar"):
+        parser.error("--shards is only supported by the json and columnar formats")
+    if args.format == "columnar":
+        # Checked up front: write_columnar would only fail after the whole extraction
+        try:
+            specs = load_layouts(tuple(args.layouts)).specs
+        except LayoutSpecError as e:
+            parser.error(str(e))
+        for spec in specs:
+            if spec.range_keys and spec.range_keys != BLOCK_RANGES:
+                parser.error(f"the columnar format holds the week ranges {', '.join(BLOCK_RANGES)} only; "
+                             f"{spec.source} has {', '.join(spec.range_keys)}")
+
     # Paths
-    excel_path = "/Users/britainsaluri/Downloads/Argh Let's Get Huge Matey.xlsx"
-    output_path = "/Users/britainsaluri/workout-tracker/src/workout-data.json"
+    excel_path = args.excel_path
+    output_path = args.output_path
 
     print("🏋️  Starting workout data extraction...")
     print(f"📂 Input: {excel_path}")
     print(f"📝 Output: {output_path}")
     print("-" * 80)
 
+    metrics = recorder_for("extract_workouts", metrics_mode(args.metrics))
+    run_details = {"input": excel_path, "output": output_path, "output_format": args.format, "reader": args.reader,
+                   "streaming": args.streaming, "sheet_workers": args.sheet_workers,
+                   "parse_fields": args.parse_fields, "cached": bool(args.cache_dir), "layouts": args.layouts,
+                   "shards": args.shards}
+
     # Extract data
-    extractor = WorkoutExtractor(excel_path)
-    workout_data = extractor.extract_all_sheets()
+    cache = ExtractionCache(args.cache_dir, args.cache_max_mb * 1024 * 1024) if args.cache_dir else None
+    if args.format == "ndjson":
+        records = extract_to_ndjson(excel_path, output_path, args.streaming, cache, args.reader,
+                                    parse_fields=args.parse_fields, metrics=metrics, layouts=args.layouts)
+        print(f"\n✅ {records} exercise records saved to {output_path}")
+        if metrics.enabled:
+            metrics.write(metrics_path_for(output_path), **run_details)
+        return
+
+    workout_data = extract_workbook(excel_path, args.streaming, args.sheet_workers, cache, args.reader,
+                                    args.parse_fields, metrics=metrics, layouts=args.layouts)
 
     # Save to JSON
-    extractor.save_to_json(output_path)
+    if args.format == "sqlite":
+        with metrics.phase("write_sqlite"):
+            athlete = os.path.splitext(os.path.basename(excel_path))[0]
+            counts = export_sqlite([(athlete, workout_data, excel_path)], output_path)
+        print(f"\n✅ {counts['exercises']} exercises, {counts['sets']} sets saved to {output_path}")
+        if metrics.enabled:
+            metrics.write(metrics_path_for(output_path), **run_details)
+        return
+
+    if args.format == "columnar":
+        with metrics.phase("write_columnar"):
+            write_columnar(workout_data, output_path)
+    else:
+        with metrics.phase("write_json"):
+            if args.delta:
+                write_with_delta(workout_data, output_path, args.keep_deltas)
+            else:
+                write_json(workout_data, output_path)
+    if not args.no_index:
+        # Built from the in-memory data just written; paths also fit the decoded columnar file
+        with metrics.phase("write_index"):
+            write_index(workout_data, index_path_for(output_path))
+    catalog = None
+    if args.shards:
+        with metrics.phase("write_shards"):
+            catalog = write_shards(workout_data, output_path)
+    if args.publish:
+        with metrics.phase("publish"):
+            published = [output_path] if args.no_index else [output_path, index_path_for(output_path)]
+            if catalog is not None:
+                published += [catalog_path_for(output_path)] + shard_paths(catalog, output_path)
+            manifest = publish(published, args.publish)
+        print(f"📦 Published to {args.publish} (revision {manifest['revision']})")
+    if metrics.enabled:
+        metrics.write(metrics_path_for(output_path), **run_details)
 
     # Print summary
     print("\n" + "=" * 80)
@@ -288,7 +499,11 @@ def main():
                 for block in day['blocks']:
                     print(f"      {block['block_name']}: {len(block['exercises'])} exercises")
 
-    extractor.close()
+    if cache:
+        stats = cache.stats()
+        print(f"\n🗄️  Cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+              f"{stats['entries']} entries, {stats['bytes'] / 1e6:.1f} MB")
+
     print("\n✅ Extraction complete!")
 
 
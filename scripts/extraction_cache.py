@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Extraction Cache
+Stores extracted JSON structures on disk keyed by the workbook's content
+hash, the extractor version and the layout options, so unchanged workbooks
+are never parsed twice. The cache has a size cap and evicts least recently
+used entries. This module deliberately does not import openpyxl.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+ENTRY_SUFFIX = ".json"
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Disk cache of extraction results with LRU eviction."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key_for(self, excel_path: str, namespace: str, version: str,
+                options: Optional[Dict[str, Any]] = None) -> str:
+        """Cache key from workbook content, extractor name/version and options."""
+        parts = [
+            file_sha256(excel_path),
+            namespace,
+            version,
+            json.dumps(options or {}, sort_keys=True),
+        ]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached structure for ``key``, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        # Touch the entry: modification time is the LRU clock
+        os.utime(path, None)
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: Any):
+        """Store a structure atomically, then evict down to the size cap."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        self._evict()
+
+    def get_or_extract(self, excel_path: str, namespace: str, version: str,
+                       options: Optional[Dict[str, Any]], extract: Callable[[], Any]) -> Any:
+        """Return the cached result, calling ``extract()`` and storing it on a miss."""
+        key = self.key_for(excel_path, namespace, version, options)
+        data = self.get(key)
+        if data is None:
+            data = extract()
+            self.put(key, data)
+        return data
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters for this instance plus current cache size."""
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+        }
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def _entries(self):
+        """(path, size, mtime) for every cache entry."""
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(ENTRY_SUFFIX) and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits its cap."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        for path, size, _ in sorted(entries, key=lambda e: e[2]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                continue  # evicted concurrently by another process
+            total -= size
+            self.evictions += 1
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Workout Extraction Service
+A small HTTP service (asyncio, standard library only) that accepts a
+workbook upload and answers with the workout-data.json structure, so other
+tools do not have to shell out to extract_workouts.py.
+
+    POST /extract[?reader=fast&parse_fields=1]   body: the .xlsx bytes
+    GET  /health                                 load and cache counters
+
+Parsing is CPU-bound and runs in a process pool; the event loop only moves
+bytes. Up to ``--workers`` uploads are parsed at once and ``--max-queue``
+more wait for a slot. Beyond that the service answers 503 with
+Retry-After right away, instead of letting the backlog grow. Each request
+gets ``--timeout`` seconds, counting the wait for a slot, and is answered
+504 when they run out. A parse that is already running cannot be
+interrupted, so its slot stays taken until the worker finishes.
+
+A worker that dies (killed for memory, a crash in a native library) breaks
+the whole process pool. The upload it was parsing is answered 500, and the
+pool is replaced before the next job is submitted. /health reports
+"degraded" while no working pool is available.
+
+Results are kept in memory for ``--cache-ttl`` seconds, keyed by the
+upload's SHA-256 and options. Identical uploads that arrive while one is
+being parsed wait for that parse instead of starting another.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import os
+import signal
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from extract_workouts import EXTRACTOR_VERSION, READERS, extract_workbook
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_CACHE_TTL = 60.0
+DEFAULT_CACHE_ENTRIES = 64
+HEADER_LIMIT = 64 * 1024
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           411: "Length Required", 413: "Payload Too Large", 422: "Unprocessable Entity",
+           500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+class HTTPError(Exception):
+    """An error answered with a JSON body and the given status."""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def extract_payload(payload: bytes, reader: str = "openpyxl", parse_fields: bool = False) -> bytes:
+    """
+    Process pool entry point: parse an uploaded workbook.
+
+    The JSON is encoded here, in the worker, so the event loop never
+    serialises large structures.
+
+    Returns:
+        UTF-8 JSON of the workout-data structure
+    """
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        # Per-sheet progress lines would interleave across workers
+        with contextlib.redirect_stdout(io.StringIO()):
+            workout_data = extract_workbook(path, streaming=True, reader=reader, parse_fields=parse_fields)
+    finally:
+        os.unlink(path)
+    return json.dumps(workout_data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ResultCache:
+    """Short-lived results, dropped after ``ttl`` seconds or when over ``max_entries`` (oldest first)."""
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, max_entries: int = DEFAULT_CACHE_ENTRIES,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, body = entry
+        if expires <= self.clock():
+            del self._entries[key]
+            return None
+        return body
+
+    def put(self, key: str, body: bytes):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = (self.clock() + self.ttl, body)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _Job:
+    """A parse in flight, shared by identical uploads; runs unless all their deadlines passed."""
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        self.task: Optional[asyncio.Future] = None
+
+
+class ExtractionService:
+    """Request handling, admission control and caching around one executor."""
+
+    def __init__(self, workers: int = 2, max_queue: int = 8, timeout: float = DEFAULT_TIMEOUT,
+                 cache_ttl: float = DEFAULT_CACHE_TTL, cache_entries: int = DEFAULT_CACHE_ENTRIES,
+                 max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES, executor: Optional[Executor] = None,
+                 job: Callable[..., bytes] = extract_payload,
+                 executor_factory: Optional[Callable[[], Executor]] = None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.max_upload_bytes = max_upload_bytes
+        self.cache = ResultCache(cache_ttl, cache_entries)
+        self.executor = executor
+        self.executor_factory = executor_factory or (lambda: ProcessPoolExecutor(max_workers=self.workers))
+        self.pool_broken = False
+        self.job = job
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: Dict[str, _Job] = {}
+        self.admitted = 0  # requests holding or waiting for a worker slot
+        self.running = 0
+        self.counters = {"requests": 0, "cache_hits": 0, "coalesced": 0, "rejected": 0, "timeouts": 0,
+                         "failed": 0, "pool_restarts": 0}
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """Create the executor (unless one was given) and start listening."""
+        if self.executor is None:
+            self.executor = self.executor_factory()
+        self._slots = asyncio.Semaphore(self.workers)
+        return await asyncio.start_server(self.handle_connection, host, port, limit=HEADER_LIMIT)
+
+    def close(self):
+        if self.executor is not None:
+            # Queued parses are dropped; running ones finish before the workers exit
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    # -- HTTP ---------------------------------------------------------------
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection (keep-alive) until the client closes it."""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    await self._respond(writer, e.status, {"error": str(e)}, e.headers, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    status, payload, extra = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload, extra = e.status, {"error": str(e)}, e.headers
+                await self._respond(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise HTTPError(400, "Incomplete request")
+            return None  # client closed an idle keep-alive connection
+        except asyncio.LimitOverrunError:
+            raise HTTPError(400, "Request headers too large")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        body = b""
+        if method == "POST":
+            if "chunked" in headers.get("transfer-encoding", "").lower():
+                raise HTTPError(411, "Send the upload with a Content-Length")
+            try:
+                length = int(headers["content-length"])
+            except (KeyError, ValueError):
+                raise HTTPError(411, "Content-Length required")
+            if length > self.max_upload_bytes:
+                raise HTTPError(413, f"Upload exceeds {self.max_upload_bytes} bytes")
+            body = await reader.readexactly(length)
+        return method, target, headers, body
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: Any,
+                       headers: Dict[str, str], keep_alive: bool):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                 "Content-Type: application/json; charset=utf-8",
+                 f"Content-Length: {len(body)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, Any, Dict[str, str]]:
+        """Route one request; returns (status, JSON payload or bytes, extra headers)."""
+        url = urlsplit(target)
+        if url.path == "/health":
+            if method != "GET":
+                raise HTTPError(405, "Use GET")
+            return 200, self.health(), {}
+        if url.path != "/extract":
+            raise HTTPError(404, f"No route for {url.path}")
+        if method != "POST":
+            raise HTTPError(405, "Use POST with the workbook as the request body")
+
+        query = parse_qs(url.query)
+        reader = query.get("reader", ["openpyxl"])[0]
+        if reader not in READERS:
+            raise HTTPError(400, f"Unknown reader {reader!r}; expected one of {', '.join(READERS)}")
+        parse_fields = query.get("parse_fields", ["0"])[0].lower() in ("1", "true", "yes")
+        if not body:
+            raise HTTPError(400, "Empty upload")
+
+        self.counters["requests"] += 1
+        result, source = await self.extract(body, reader, parse_fields)
+        return 200, result, {"X-Cache": source, "X-Extractor-Version": EXTRACTOR_VERSION}
+
+    # -- Jobs ---------------------------------------------------------------
+
+    async def extract(self, payload: bytes, reader: str = "openpyxl", parse_fields: bool = False) -> Tuple[bytes, str]:
+        """
+        Extracted JSON for an upload, from the cache, a parse already in
+        flight, or a new job.
+
+        Returns:
+            (JSON bytes, "hit" | "coalesced" | "miss")
+        """
+        key = hashlib.sha256(payload).hexdigest() + f":{reader}:{int(parse_fields)}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.counters["cache_hits"] += 1
+            return cached, "hit"
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        job = self._in_flight.get(key)
+        if job is not None:
+            self.counters["coalesced"] += 1
+            job.deadline = max(job.deadline, deadline)
+            return await self._wait(asyncio.shield(job.task), self.timeout), "coalesced"
+
+        if self.admitted >= self.workers + self.max_queue:
+            self.counters["rejected"] += 1
+            raise HTTPError(503, "All workers busy and the queue is full", {"Retry-After": "1"})
+
+        self.admitted += 1
+        job = _Job(deadline)
+        self._in_flight[key] = job
+        job.task = asyncio.ensure_future(self._run(key, job, payload, reader, parse_fields))
+        # Retrieve the outcome even when every waiter has timed out, so it is not logged as lost
+        job.task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return await self._wait(asyncio.shield(job.task), self.timeout), "miss"
+
+    async def _run(self, key: str, job: "_Job", payload: bytes, reader: str, parse_fields: bool) -> bytes:
+        """Wait for a worker slot, then parse in the executor; waiters time out independently."""
+        loop = asyncio.get_running_loop()
+        try:
+            await self._slots.acquire()
+            try:
+                if loop.time() >= job.deadline:
+                    # Everyone waiting for this job has already been answered 504
+                    raise asyncio.TimeoutError()
+                self.running += 1
+                try:
+                    executor = self._usable_executor()
+                    # Awaited in full: the slot stays taken until the worker is really done
+                    result = await loop.run_in_executor(executor, self.job, payload, reader, parse_fields)
+                except BrokenExecutor:
+                    self._replace_executor(executor)
+                    raise
+                finally:
+                    self.running -= 1
+            finally:
+                self._slots.release()
+        finally:
+            self.admitted -= 1
+            self._in_flight.pop(key, None)
+        self.cache.put(key, result)
+        return result
+
+    def _is_broken(self) -> bool:
+        # ProcessPoolExecutor marks itself broken as soon as a worker dies, even between jobs
+        return self.pool_broken or bool(getattr(self.executor, "_broken", False))
+
+    def _usable_executor(self) -> Executor:
+        """The executor, replaced first if it is broken (raises BrokenExecutor if that fails)."""
+        if self._is_broken():
+            self._replace_executor(self.executor)
+            if self.pool_broken:
+                raise BrokenExecutor("process pool could not be restarted")
+        return self.executor
+
+    def _replace_executor(self, broken: Executor):
+        """Swap in a new pool for ``broken``, once, however many jobs saw it fail."""
+        if broken is not self.executor and not self.pool_broken:
+            return  # another job already replaced it
+        self.pool_broken = True
+        # Jobs still queued on the dead pool fail with BrokenExecutor themselves
+        broken.shutdown(wait=False, cancel_futures=True)
+        try:
+            self.executor = self.executor_factory()
+        except Exception as e:
+            print(f"⚠️  Could not restart the worker pool: {e}", file=sys.stderr)
+            return
+        self.pool_broken = False
+        self.counters["pool_restarts"] += 1
+
+    async def _wait(self, awaitable, timeout: float):
+        try:
+            return await asyncio.wait_for(awaitable, max(timeout, 0))
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+            raise HTTPError(504, f"Extraction did not finish within {self.timeout:g}s")
+        except HTTPError:
+            raise
+        except BrokenExecutor as e:
+            self.counters["failed"] += 1
+            raise HTTPError(500, f"Worker pool failed: {e}")
+        except Exception as e:
+            self.counters["failed"] += 1
+            raise HTTPError(422, f"Could not extract workbook: {type(e).__name__}: {e}")
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "degraded" if self._is_broken() else "ok",
+            "extractor_version": EXTRACTOR_VERSION,
+            "workers": self.workers,
+            "running": self.running,
+            "queued": self.admitted - self.running,
+            "max_queue": self.max_queue,
+            "cache_entries": len(self.cache),
+            **self.counters,
+        }
+
+
+async def serve(service: ExtractionService, host: str, port: int):
+    server = await service.start(host, port)
+    stop = asyncio.Event()
+    # SIGTERM shuts the pool down too, so no worker processes are left behind
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        service.close()
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Serve workbook extraction over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2,
+                        help="Worker processes, i.e. uploads parsed at once")
+    parser.add_argument("--max-queue", type=int, default=8,
+                        help="Uploads waiting for a worker before new ones get 503")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="Seconds per request, including the wait for a worker")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL,
+                        help="Seconds a result is reused for identical uploads (0 disables)")
+    parser.add_argument("--cache-entries", type=int, default=DEFAULT_CACHE_ENTRIES)
+    parser.add_argument("--max-upload-mb", type=int, default=DEFAULT_MAX_UPLOAD_BYTES // (1024 * 1024))
+    args = parser.parse_args()
+
+    service = ExtractionService(args.workers, args.max_queue, args.timeout, args.cache_ttl, args.cache_entries,
+                                args.max_upload_mb * 1024 * 1024)
+    print(f"🏋️  Extraction service on http://{args.host}:{args.port} "
+          f"({args.workers} workers, queue {args.max_queue}, timeout {args.timeout:g}s)")
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,615 @@
+#!/usr/bin/env python3
+"""
+Fast-Path xlsx Reader
+Reads worksheet values straight from the xlsx zip with an incremental expat
+parser, skipping openpyxl's Cell/style object construction entirely. Rows
+come out as plain value tuples with the same shape as openpyxl's
+``iter_rows(values_only=True)`` in read-only mode.
+
+Value conversion mirrors openpyxl (shared/inline strings, int/float casting,
+booleans, errors, ISO dates and date-styled serial numbers). Anything the
+fast path does not handle (array/data-table formulas, shared formulas that
+need translating, broken packages) falls back to openpyxl transparently.
+
+FastWorkbook duck-types the parts of openpyxl's Workbook the extractors use:
+``sheetnames``, ``worksheets``, ``wb[name]``, ``ws.title``, ``ws.max_row``,
+``ws.max_column``, ``ws.iter_rows(...)`` and ``close()``.
+"""
+
+import io
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from xml.parsers import expat
+
+from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import MAC_EPOCH, WINDOWS_EPOCH, from_excel, from_ISO8601
+
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+# expat reports namespaced names as "<uri> <local>"
+_C = f"{NS_MAIN} c"
+_ROW = f"{NS_MAIN} row"
+_V = f"{NS_MAIN} v"
+_F = f"{NS_MAIN} f"
+_T = f"{NS_MAIN} t"
+_IS = f"{NS_MAIN} is"
+_SI = f"{NS_MAIN} si"
+_RPH = f"{NS_MAIN} rPh"
+_DIMENSION = f"{NS_MAIN} dimension"
+_SHEET_DATA = f"{NS_MAIN} sheetData"
+
+CHUNK_SIZE = 64 * 1024
+CELL_REF = re.compile(r'([A-Z]+)(\d+)')
+CELL_REF_ATTR = re.compile(rb'<(?:\w+:)?c\b[^>]*?\br="([A-Z]+)(\d+)"')
+CELL_TAG = re.compile(rb'<(?:\w+:)?c[\s>/]')
+NAMESPACE_DECL = re.compile(rb'(xmlns(:\w+)?="[^"]*")')
+# Plain markup as Excel and openpyxl write it: r, s, t attributes in that
+# order and at most a <v> holding no entities. Everything else goes to expat.
+PLAIN_ROW = re.compile(rb'<row\b([^>]*?)(?:/>|>(.*?)</row>)', re.DOTALL)
+PLAIN_CELL = re.compile(rb'<c r="([A-Z]+)\d+"(?: s="(\d+)")?(?: t="(\w+)")?\s*(?:/>|>(?:<v>([^<&]*)</v>)?</c>)')
+ROW_NUMBER = re.compile(rb'\br="(\d+)"')
+
+
+class FallbackRequired(Exception):
+    """The fast path met something only openpyxl handles."""
+
+
+class _StopParsing(Exception):
+    """Internal: stop an expat parse early."""
+
+
+def column_index(letters: str) -> int:
+    """Convert column letters to a 1-based index ("A" -> 1, "AA" -> 27)."""
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - 64
+    return index
+
+
+def parse_range(ref: str) -> Tuple[int, int]:
+    """Max (row, column) of a range like "A1:O50" (or a single cell "A1")."""
+    match = CELL_REF.fullmatch(ref.split(":")[-1].replace("$", ""))
+    if not match:
+        raise FallbackRequired(f"unreadable dimension {ref!r}")
+    return int(match.group(2)), column_index(match.group(1))
+
+
+def sheet_parts(zf: zipfile.ZipFile) -> List[Dict[str, str]]:
+    """Worksheet names and their part paths, in workbook order."""
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{{{NS_PKG_REL}}}Relationship")}
+
+    parts = []
+    for sheet in workbook.iter(f"{{{NS_MAIN}}}sheet"):
+        target = targets[sheet.get(f"{{{NS_REL}}}id")]
+        # Targets are relative to xl/ unless they start with "/"
+        path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+        parts.append({"name": sheet.get("name"), "part": path})
+    return parts
+
+
+def _new_parser() -> Any:
+    parser = expat.ParserCreate(namespace_separator=" ")
+    parser.buffer_text = True
+    return parser
+
+
+def _feed(parser: Any, stream, completed: List) -> Iterator[Any]:
+    """Push a zip member through an expat parser, yielding finished items."""
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        parser.Parse(chunk, not chunk)
+        if completed:
+            yield from completed
+            completed.clear()
+        if not chunk:
+            return
+
+
+def read_shared_strings(zf: zipfile.ZipFile) -> List[str]:
+    """Shared string table as plain text (runs joined, phonetic hints dropped)."""
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+
+    strings: List[str] = []
+    parts: List[str] = []
+    state = {"text": None, "phonetic": 0}
+
+    def start(name, attrs):
+        if name == _T and not state["phonetic"]:
+            state["text"] = []
+        elif name == _RPH:
+            state["phonetic"] += 1
+        elif name == _SI:
+            parts.clear()
+
+    def end(name):
+        if name == _T and state["text"] is not None:
+            parts.append("".join(state["text"]))
+            state["text"] = None
+        elif name == _RPH:
+            state["phonetic"] -= 1
+        elif name == _SI:
+            strings.append("".join(parts).replace("x005F_", ""))
+
+    def chars(data):
+        if state["text"] is not None:
+            state["text"].append(data)
+
+    parser = _new_parser()
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = chars
+    with zf.open("xl/sharedStrings.xml") as stream:
+        for _ in _feed(parser, stream, []):
+            pass
+    return strings
+
+
+def read_date_styles(zf: zipfile.ZipFile) -> Tuple[set, set]:
+    """Indexes of cell styles (cellXfs) that format numbers as dates / durations."""
+    if "xl/styles.xml" not in zf.namelist():
+        return set(), set()
+
+    root = ET.fromstring(zf.read("xl/styles.xml"))
+    custom = {
+        int(fmt.get("numFmtId")): fmt.get("formatCode")
+        for fmt in root.iterfind(f"{{{NS_MAIN}}}numFmts/{{{NS_MAIN}}}numFmt")
+    }
+
+    date_formats, timedelta_formats = set(), set()
+    for idx, xf in enumerate(root.iterfind(f"{{{NS_MAIN}}}cellXfs/{{{NS_MAIN}}}xf")):
+        num_fmt_id = int(xf.get("numFmtId", 0))
+        fmt = custom[num_fmt_id] if num_fmt_id in custom else builtin_format_code(num_fmt_id)
+        if is_date_format(fmt):
+            date_formats.add(idx)
+        if is_timedelta_format(fmt):
+            timedelta_formats.add(idx)
+    return date_formats, timedelta_formats
+
+
+class FastWorkbook:
+    """Values-only workbook backed by the raw xlsx zip."""
+
+    def __init__(self, filename: str, data_only: bool = False):
+        self.filename = filename
+        self.data_only = data_only
+        self._zip = zipfile.ZipFile(filename)
+        try:
+            workbook = ET.fromstring(self._zip.read("xl/workbook.xml"))
+            pr = workbook.find(f"{{{NS_MAIN}}}workbookPr")
+            date1904 = pr is not None and pr.get("date1904") in ("1", "true")
+            self.epoch = MAC_EPOCH if date1904 else WINDOWS_EPOCH
+            self.date_formats, self.timedelta_formats = read_date_styles(self._zip)
+            self.worksheets = [FastWorksheet(self, p["name"], p["part"]) for p in sheet_parts(self._zip)]
+        except Exception:
+            self._zip.close()
+            raise
+        self._shared_strings: Optional[List[str]] = None
+        self.fallbacks: List[str] = []
+
+    @property
+    def sheetnames(self) -> List[str]:
+        return [ws.title for ws in self.worksheets]
+
+    @property
+    def shared_strings(self) -> List[str]:
+        if self._shared_strings is None:
+            self._shared_strings = read_shared_strings(self._zip)
+        return self._shared_strings
+
+    def __getitem__(self, name: str) -> "FastWorksheet":
+        for ws in self.worksheets:
+            if ws.title == name:
+                return ws
+        raise KeyError(f"Worksheet {name} does not exist.")
+
+    def close(self):
+        self._zip.close()
+
+
+class FastWorksheet:
+    """One worksheet of a FastWorkbook; rows are parsed on demand."""
+
+    def __init__(self, parent: FastWorkbook, title: str, part: str):
+        self.parent = parent
+        self.title = title
+        self.part = part
+        self._max_row: Optional[int] = None
+        self._max_column: Optional[int] = None
+        # False after reset_dimensions(): the sheet is then sized from its cells
+        self._declared = True
+        self._columns: Dict[Any, int] = {}
+
+    @property
+    def max_row(self) -> int:
+        self._load_dimensions()
+        return self._max_row
+
+    @property
+    def max_column(self) -> int:
+        self._load_dimensions()
+        return self._max_column
+
+    def calculate_dimension(self, force: bool = False) -> str:
+        """Kept for openpyxl compatibility; dimensions are always known here."""
+        self._load_dimensions()
+        return f"A1:{_column_letters(self._max_column)}{self._max_row}"
+
+    def reset_dimensions(self):
+        """
+        Forget the <dimension> tag, like openpyxl's read-only worksheets:
+        unbounded rows are no longer padded to it, and max_row/max_column
+        are measured from the cells.
+        """
+        self._max_row = self._max_column = None
+        self._declared = False
+
+    def iter_rows(self, min_row: Optional[int] = None, max_row: Optional[int] = None,
+                  min_col: Optional[int] = None, max_col: Optional[int] = None,
+                  values_only: bool = True) -> Iterator[tuple]:
+        """
+        Row value tuples, padded with None, like openpyxl's read-only iter_rows.
+
+        Without max_row/max_col every row and cell in the XML is read, even
+        past a <dimension> tag that is too small (a row wider than the tag
+        comes out wider); rows are padded to the tag's size when it is larger.
+        """
+        if not values_only:
+            yield from self._openpyxl_rows(min_row, max_row, min_col, max_col, values_only=False)
+            return
+
+        min_row = min_row or 1
+        min_col = min_col or 1
+
+        yielded = 0
+        try:
+            for row in self._fast_rows(min_row, max_row, min_col, max_col):
+                yield row
+                yielded += 1
+        except FallbackRequired:
+            self.parent.fallbacks.append(self.title)
+            rows = self._openpyxl_rows(min_row, max_row, min_col, max_col)
+            yield from islice(rows, yielded, None)
+
+    def _load_dimensions(self):
+        """Read <dimension ref>, or scan every cell reference when it is missing or reset."""
+        if self._max_row is not None:
+            return
+        if not self._declared:
+            self._scan_dimensions()
+            return
+
+        found: Dict[str, Any] = {}
+
+        def start(name, attrs):
+            if name == _DIMENSION:
+                found["ref"] = attrs.get("ref")
+            elif name == _SHEET_DATA:
+                raise _StopParsing  # <dimension> always precedes <sheetData>
+
+        parser = _new_parser()
+        parser.StartElementHandler = start
+        with self.parent._zip.open(self.part) as stream:
+            try:
+                for _ in _feed(parser, stream, []):
+                    pass
+            except _StopParsing:
+                pass
+
+        if found.get("ref"):
+            self._max_row, self._max_column = parse_range(found["ref"])
+        else:
+            self._scan_dimensions()
+
+    def _scan_dimensions(self):
+        """Size an undeclared sheet from the cell references in its XML."""
+        xml = self.parent._zip.read(self.part)
+        # Only cells count; openpyxl ignores empty <row/> elements
+        refs = CELL_REF_ATTR.findall(xml)
+        letters = {col for col, _ in refs}
+        max_col = max((column_index(col.decode()) for col in letters), default=0)
+        max_row = max((int(row) for row in {row for _, row in refs}), default=0)
+
+        if len(refs) != len(CELL_TAG.findall(xml)):
+            raise FallbackRequired("cells without references")
+        self._max_row, self._max_column = max_row, max_col
+
+    def _fast_rows(self, min_row: int, max_row: Optional[int], min_col: int,
+                   max_col: Optional[int]) -> Iterator[tuple]:
+        # Unbounded sides pad to the declared size but never cut at it
+        known = self._declared or self._max_row is not None
+        last_row = max_row or (self.max_row if known else 0)
+        width = (max_col or (self.max_column if known else 0)) - min_col + 1
+        empty = (None,) * max(width, 0)
+        expected = min_row
+        seen_row = seen_col = 0
+
+        for row_idx, cells in self._parse_rows():
+            if row_idx < min_row:
+                continue
+            if max_row is not None and row_idx > max_row:
+                break
+            if not cells:
+                # Empty <row> elements are padding, filled in below if needed
+                continue
+            while expected < row_idx:
+                yield empty
+                expected += 1
+            if max_col is None:
+                row_max = max(col for col, _ in cells)
+                seen_col = max(seen_col, row_max)
+                values = [None] * max(width, row_max - min_col + 1)
+            else:
+                values = [None] * width
+            for col, value in cells:
+                if min_col <= col and (max_col is None or col <= max_col):
+                    values[col - min_col] = value
+            seen_row = row_idx
+            yield tuple(values)
+            expected += 1
+
+        while expected <= last_row:
+            yield empty
+            expected += 1
+
+        if max_row is None and max_col is None and min_row == 1 and min_col == 1:
+            # A full read has measured the sheet
+            self._max_row = max(self._max_row or 0, seen_row)
+            self._max_column = max(self._max_column or 0, seen_col)
+
+    def _parse_rows(self) -> Iterator[Tuple[int, List[Tuple[int, Any]]]]:
+        """
+        Yield (row number, [(column, value), ...]) for each <row> element.
+
+        sheetData is cut into segments of complete rows. Segments holding only
+        plain cells (the usual case) are decoded with regexes; a segment with
+        formulas, inline strings, entities or other markup goes through expat.
+        """
+        with self.parent._zip.open(self.part) as stream:
+            buffer = b""
+            while True:
+                start = buffer.find(b"<sheetData")
+                if start >= 0 and buffer.find(b">", start) >= 0:
+                    break
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    # Prefixed markup (<x:sheetData>) or no sheetData at all
+                    with self.parent._zip.open(self.part) as whole:
+                        yield from self._expat_rows(whole)
+                    return
+                buffer += chunk
+
+            open_end = buffer.index(b">", start) + 1
+            if buffer[open_end - 2:open_end] == b"/>":
+                return
+            # Segments are parsed standalone, so they need the root's namespaces
+            declarations = {prefix: decl for decl, prefix in NAMESPACE_DECL.findall(buffer[:start])}
+            wrapper = b"<sheetData " + b" ".join(declarations.values()) + b">"
+            buffer = buffer[open_end:]
+
+            while True:
+                end = buffer.find(b"</sheetData>")
+                if end >= 0:
+                    yield from self._segment_rows(buffer[:end], wrapper)
+                    return
+                cut = buffer.rfind(b"</row>")
+                if cut >= 0:
+                    cut += len(b"</row>")
+                    yield from self._segment_rows(buffer[:cut], wrapper)
+                    buffer = buffer[cut:]
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    raise FallbackRequired("unterminated sheetData")
+                buffer += chunk
+
+    def _segment_rows(self, segment: bytes, wrapper: bytes) -> List[Tuple[int, List[Tuple[int, Any]]]]:
+        """Rows of one segment: regex lane when possible, expat otherwise."""
+        rows = self._regex_rows(segment)
+        if rows is None:
+            document = wrapper + segment + b"</sheetData>"
+            rows = list(self._expat_rows(io.BytesIO(document)))
+        return rows
+
+    def _regex_rows(self, segment: bytes) -> Optional[List[Tuple[int, List[Tuple[int, Any]]]]]:
+        """Decode a segment of plain rows, or None if any of it is not plain."""
+        workbook = self.parent
+        shared_strings = workbook.shared_strings
+        date_formats = workbook.date_formats
+        timedelta_formats = workbook.timedelta_formats
+        epoch = workbook.epoch
+        columns = self._columns
+
+        rows = []
+        for row_match in PLAIN_ROW.finditer(segment):
+            number = ROW_NUMBER.search(row_match.group(1))
+            if number is None:
+                return None
+            body = row_match.group(2)
+            cells = []
+            if body:
+                matches = PLAIN_CELL.findall(body)
+                # Any cell the pattern skipped has markup only expat handles
+                if len(matches) != body.count(b"<c"):
+                    return None
+                for letters, style, data_type, value in matches:
+                    col = columns.get(letters) or columns.setdefault(letters, column_index(letters.decode()))
+                    if not value or data_type == b"inlineStr":
+                        cells.append((col, None))
+                    elif data_type in (b"", b"n"):
+                        value = float(value) if (b"." in value or b"E" in value or b"e" in value) else int(value)
+                        if style and int(style) in date_formats:
+                            try:
+                                value = from_excel(value, epoch, timedelta=int(style) in timedelta_formats)
+                            except (OverflowError, ValueError):
+                                value = "#VALUE!"
+                        cells.append((col, value))
+                    elif data_type == b"s":
+                        cells.append((col, shared_strings[int(value)]))
+                    elif data_type == b"b":
+                        cells.append((col, bool(int(value))))
+                    elif data_type == b"d":
+                        cells.append((col, from_ISO8601(value.decode())))
+                    else:
+                        cells.append((col, value.decode("utf-8")))  # "str" and "e"
+            rows.append((int(number.group(1)), cells))
+
+        if len(rows) != segment.count(b"<row"):
+            return None
+        return rows
+
+    def _expat_rows(self, stream) -> Iterator[Tuple[int, List[Tuple[int, Any]]]]:
+        """Decode every <row> in an XML stream with expat (handles any markup)."""
+        workbook = self.parent
+        shared_strings = workbook.shared_strings
+        data_only = workbook.data_only
+        date_formats = workbook.date_formats
+        timedelta_formats = workbook.timedelta_formats
+        epoch = workbook.epoch
+        columns = self._columns
+
+        completed: List[Tuple[int, List[Tuple[int, Any]]]] = []
+        row_cells: List[Tuple[int, Any]] = []
+        # Parse state shared by the expat callbacks
+        row = col = style = phonetic = 0
+        data_type = "n"
+        text: Optional[List[str]] = None
+        v_text = f_text = f_type = None
+        inline: Optional[List[str]] = None
+
+        def start(name, attrs):
+            nonlocal row, col, style, data_type, text, v_text, f_text, f_type, inline, phonetic, row_cells
+            if name == _C:
+                ref = attrs.get("r")
+                if ref:
+                    letters = ref.rstrip("0123456789")
+                    col = columns.get(letters) or columns.setdefault(letters, column_index(letters))
+                else:
+                    col += 1
+                data_type = attrs.get("t", "n")
+                style = int(attrs.get("s") or 0)
+                v_text = f_text = f_type = inline = None
+            elif name == _V:
+                text = []
+            elif name == _ROW:
+                row = int(attrs.get("r") or row + 1)
+                col = 0
+                row_cells = []
+            elif name == _F:
+                text = []
+                f_type = attrs.get("t")
+                if not data_only and f_type in ("array", "dataTable"):
+                    raise FallbackRequired("array/data-table formula")
+            elif name == _T:
+                if inline is not None and not phonetic:
+                    text = []
+            elif name == _IS:
+                inline = []
+            elif name == _RPH:
+                phonetic += 1
+
+        def end(name):
+            nonlocal text, v_text, f_text, phonetic
+            if name == _V:
+                v_text = "".join(text)
+                text = None
+            elif name == _C:
+                row_cells.append((col, cell_value()))
+            elif name == _ROW:
+                completed.append((row, row_cells))
+            elif name == _F:
+                f_text = "".join(text)
+                text = None
+            elif name == _T:
+                if text is not None:
+                    inline.append("".join(text))
+                    text = None
+            elif name == _RPH:
+                phonetic -= 1
+
+        def chars(data):
+            if text is not None:
+                text.append(data)
+
+        def cell_value() -> Any:
+            # Same decisions, in the same order, as openpyxl's WorkSheetParser.parse_cell
+            if not data_only and f_text is not None:
+                if f_type == "shared" and not f_text:
+                    raise FallbackRequired("shared formula needs translating")
+                return "=" + f_text
+
+            if data_type == "inlineStr":
+                return "".join(inline) if inline is not None else None
+            value = v_text or None
+            if value is None:
+                return None
+            if data_type == "n":
+                value = float(value) if ("." in value or "E" in value or "e" in value) else int(value)
+                if style in date_formats:
+                    try:
+                        return from_excel(value, epoch, timedelta=style in timedelta_formats)
+                    except (OverflowError, ValueError):
+                        return "#VALUE!"
+                return value
+            if data_type == "s":
+                return shared_strings[int(value)]
+            if data_type == "b":
+                return bool(int(value))
+            if data_type == "d":
+                return from_ISO8601(value)
+            return value  # "str" and "e"
+
+        parser = _new_parser()
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        parser.CharacterDataHandler = chars
+        yield from _feed(parser, stream, completed)
+
+    def _openpyxl_rows(self, min_row, max_row, min_col, max_col, values_only=True) -> Iterator[tuple]:
+        """Same rows via openpyxl read-only mode (the fallback path)."""
+        import openpyxl
+
+        wb = openpyxl.load_workbook(self.parent.filename, read_only=True, data_only=self.parent.data_only)
+        try:
+            ws = wb[self.title]
+            if max_row is None and max_col is None:
+                # Sized from the cells like the fast path, which never cuts at
+                # the tag but still pads to it
+                ws.reset_dimensions()
+                ws.calculate_dimension(force=True)
+                if self._declared and self._max_row is not None:
+                    max_row = max(ws.max_row, self._max_row)
+                    max_col = max(ws.max_column, self._max_column)
+            elif ws.max_column is None:
+                ws.calculate_dimension(force=True)
+            yield from ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col,
+                                    max_col=max_col, values_only=values_only)
+        finally:
+            wb.close()
+
+
+def _column_letters(index: int) -> str:
+    letters = ""
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters or "A"
+
+
+def load_workbook(filename: str, data_only: bool = False):
+    """
+    Open a workbook with the fast reader, or with openpyxl (read-only) when
+    the package cannot be read directly.
+    """
+    try:
+        return FastWorkbook(filename, data_only=data_only)
+    except (KeyError, ET.ParseError, FallbackRequired, zipfile.BadZipFile):
+        import openpyxl
+        return openpyxl.load_workbook(filename, read_only=True, data_only=data_only)
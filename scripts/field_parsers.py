@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Typed Field Parsers
+Parses the free-text exercise cells (results, sets/reps, tempo, rest) into
+typed values once, at extraction time, so clients can read numbers instead
+of re-parsing strings on every request.
+
+Formats seen in the coach workbooks:
+    results    "115x10,115x7,95x10", "42.5x10", "35x15, 25x14", "50x18,", "7,3"
+    sets_reps  "4x10-12", "2x10ea", "2x12-15 ea", "2x25 sec ea", "2xMax Reps", "4 x Max", "4x8"
+    sets       "4.0", "3,4", "03-04"                          (Sheet4)
+    reps       "08-12", "8e", "16 ea.", "20 +", "Failure"    (Sheet4)
+    tempo      "311", "211221", "CTRL", "NA"
+    rest       "1m", "1-2m", "1:30m", "30s", "01:30:00"
+
+The parsers are memoized: the same few strings repeat across every week
+and day, so each distinct value is parsed once per process.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from ndjson_sink import week_range_keys
+
+PARSE_CACHE_SIZE = 4096
+
+NUMBER = r'\d+(?:\.\d+)?'
+SET_RESULT = re.compile(rf'^\s*(?:({NUMBER}|BW)\s*[x×*]\s*)?({NUMBER})\s*$', re.IGNORECASE)
+SETS_PREFIX = re.compile(r'^\s*(\d+)\s*x\s*(.*)$', re.IGNORECASE)
+COUNT_RANGE = re.compile(rf'({NUMBER})\s*(?:[-,–]\s*({NUMBER}))?')
+OPEN_ENDED = re.compile(rf'{NUMBER}\s*\+')
+EACH_SIDE = re.compile(r'\d\s*e(?:a(?:ch)?)?\b|\bea(?:ch)?\b', re.IGNORECASE)
+SECONDS = re.compile(r'\d\s*(?:s|sec|secs|seconds)\b', re.IGNORECASE)
+TO_FAILURE = re.compile(r'max|fail', re.IGNORECASE)
+TEMPO = re.compile(r'^[\d\s-]+$')
+REST_RANGE = re.compile(r'^\s*([\d:.]+)\s*(?:-\s*([\d:.]+))?\s*(m|min|mins|minutes|s|sec|secs|seconds)?\s*$',
+                        re.IGNORECASE)
+
+
+def _number(text: str):
+    """int for whole numbers ("4.0" -> 4), float otherwise."""
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_results(text: str) -> Tuple[Tuple[Any, int], ...]:
+    """
+    Logged sets as (weight, reps) pairs.
+
+    Empty entries (trailing commas) are skipped; an entry without a weight
+    ("7", "BWx12") has weight None. Entries that are not sets are dropped.
+    """
+    sets = []
+    for entry in (text or "").split(","):
+        match = SET_RESULT.match(entry)
+        if not match:
+            continue
+        weight, reps = match.groups()
+        if weight is not None and weight.upper() == "BW":
+            weight = None
+        sets.append((None if weight is None else _number(weight), int(float(reps))))
+    return tuple(sets)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_count(text: str) -> Tuple[Optional[int], Optional[int]]:
+    """A count or count range ("4.0", "3,4", "03-04", "10-12") as (min, max)."""
+    match = COUNT_RANGE.search(text or "")
+    if not match:
+        return None, None
+    low = int(float(match.group(1)))
+    high = int(float(match.group(2))) if match.group(2) else low
+    return low, high
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _reps(text: str) -> Tuple[Optional[int], Optional[int], str, bool, bool]:
+    reps_min, reps_max = parse_count(text)
+    if OPEN_ENDED.search(text):
+        reps_max = None
+    unit = "seconds" if SECONDS.search(text) else "reps"
+    return reps_min, reps_max, unit, bool(EACH_SIDE.search(text)), bool(TO_FAILURE.search(text))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _sets_reps(text: str) -> Tuple[Optional[int], str]:
+    match = SETS_PREFIX.match(text)
+    if not match:
+        return None, text
+    return int(match.group(1)), match.group(2)
+
+
+def parse_reps(text: str) -> Dict[str, Any]:
+    """
+    A rep prescription without the set count.
+
+    Returns:
+        Dict with ``reps_min``/``reps_max`` (None when open-ended or to
+        failure), ``rep_unit`` ("reps" or "seconds" for timed holds),
+        ``each_side`` and ``to_failure``
+    """
+    reps_min, reps_max, unit, each_side, to_failure = _reps(text or "")
+    return {"reps_min": reps_min, "reps_max": reps_max, "rep_unit": unit,
+            "each_side": each_side, "to_failure": to_failure}
+
+
+def parse_sets_reps(text: str) -> Dict[str, Any]:
+    """A "SETSxREPS" prescription: ``sets_min``/``sets_max`` plus parse_reps() fields."""
+    sets, reps = _sets_reps(text or "")
+    return {"sets_min": sets, "sets_max": sets, **parse_reps(reps)}
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_tempo(text: str) -> Optional[Tuple[int, ...]]:
+    """Tempo digits ("311" -> (3, 1, 1)), or None for notes like "CTRL" or "NA"."""
+    if not text or not TEMPO.match(text):
+        return None
+    digits = tuple(int(c) for c in text if c.isdigit())
+    return digits or None
+
+
+def _duration_seconds(text: str, unit: Optional[str]) -> int:
+    parts = text.split(":")
+    if len(parts) == 3:
+        # Excel turns a typed "1:30" into the time of day 01:30:00, so the
+        # hour and minute fields are really minutes and seconds
+        return int(parts[0]) * 60 + int(parts[1])
+    if len(parts) == 2:
+        return int(parts[0]) * 60 + int(parts[1])
+    value = float(parts[0])
+    if unit and unit.lower().startswith("m"):
+        value *= 60
+    return int(round(value))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_rest(text: str) -> Tuple[Optional[int], Optional[int]]:
+    """Rest as (min, max) seconds; a bare number counts as seconds."""
+    match = REST_RANGE.match(text or "")
+    if not match:
+        return None, None
+    low, high, unit = match.groups()
+    try:
+        low_seconds = _duration_seconds(low, unit)
+        return low_seconds, _duration_seconds(high, unit) if high else low_seconds
+    except ValueError:
+        return None, None
+
+
+def _as_text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def parsed_fields(values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Typed form of one exercise's (or one Sheet4 week range's) text fields.
+
+    Standard exercises carry ``sets_reps``; Sheet4 week ranges carry
+    separate ``sets`` and ``reps`` cells. Both produce the same keys.
+    """
+    if "sets_reps" in values:
+        prescription = parse_sets_reps(_as_text(values["sets_reps"]))
+    else:
+        sets_min, sets_max = parse_count(_as_text(values.get("sets")))
+        prescription = {"sets_min": sets_min, "sets_max": sets_max, **parse_reps(_as_text(values.get("reps")))}
+
+    tempo = parse_tempo(_as_text(values.get("tempo")))
+    rest_min, rest_max = parse_rest(_as_text(values.get("rest")))
+    return {
+        **prescription,
+        "tempo": None if tempo is None else list(tempo),
+        "rest_min_seconds": rest_min,
+        "rest_max_seconds": rest_max,
+        "results": [{"weight": weight, "reps": reps}
+                    for weight, reps in parse_results(_as_text(values.get("results")))],
+    }
+
+
+def add_parsed_fields(exercise: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach ``parsed`` next to the raw fields of an extracted exercise (in place)."""
+    range_keys = week_range_keys(exercise)
+    if range_keys:
+        for key in range_keys:
+            exercise[key]["parsed"] = parsed_fields(exercise[key])
+    else:
+        exercise["parsed"] = parsed_fields(exercise)
+    return exercise
+
+
+def parse_workout_data(workout_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Add parsed fields to every exercise of an already-built workout-data structure."""
+    for sheet in workout_data["sheets"]:
+        for day in sheet["days"]:
+            for group in day.get("weeks", []) + day.get("blocks", []):
+                for exercise in group["exercises"]:
+                    add_parsed_fields(exercise)
+    return workout_data
+
+
+def cache_info() -> Dict[str, Dict[str, int]]:
+    """Memoization stats per parser."""
+    parsers = (parse_results, parse_count, _reps, _sets_reps, parse_tempo, parse_rest)
+    return {parser.__name__.lstrip("_"): parser.cache_info()._asdict() for parser in parsers}
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Incremental Workout Extraction
+Fingerprints each worksheet part inside the xlsx zip and re-parses only the
+sheets whose fingerprint changed since the last run. Fresh sheet objects are
+spliced into the existing workout-data.json in place of the old ones, so the
+result is identical to a full run while unchanged sheets cost almost nothing.
+
+Fingerprint state is kept next to the output in <output>.sheets.json.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import zipfile
+from typing import Any, Dict, Optional
+
+from atomic_write import atomic_write
+from extract_workouts import EXTRACTOR_VERSION, WorkoutExtractor, write_json
+from fast_xlsx import read_shared_strings, sheet_parts
+from json_delta import DEFAULT_KEEP, write_with_delta
+
+STATE_SUFFIX = ".sheets.json"
+MAX_SHEETS = 4  # WorkoutExtractor processes Sheet1-4
+
+# Element names may carry a namespace prefix (<x:c>, <x:v>) in files from other writers
+SHARED_STRING_CELL = re.compile(rb'<(?:\w+:)?c\b[^>]*\bt="s"[^>]*>\s*<(?:\w+:)?v>(\d+)</(?:\w+:)?v>')
+
+
+def sheet_fingerprints(excel_path: str) -> Dict[str, str]:
+    """
+    Fingerprint every worksheet from its raw XML plus the shared strings it
+    references, so an edit in one tab does not invalidate the others even
+    though Excel rewrites sharedStrings.xml on every save. The shared strings
+    are read with the fast reader's namespace-aware parser, as the text the
+    extractors see.
+    """
+    with zipfile.ZipFile(excel_path) as zf:
+        names = set(zf.namelist())
+        shared = [text.encode("utf-8") for text in read_shared_strings(zf)]
+        # Styles decide which numbers are dates, so they feed every fingerprint
+        styles = hashlib.sha256(zf.read("xl/styles.xml")).hexdigest() if "xl/styles.xml" in names else ""
+
+        fingerprints = {}
+        for sheet in sheet_parts(zf):
+            xml = zf.read(sheet["part"])
+            digest = hashlib.sha256()
+            digest.update(f"{EXTRACTOR_VERSION}\0{styles}\0".encode("utf-8"))
+            digest.update(xml)
+            for match in SHARED_STRING_CELL.finditer(xml):
+                index = int(match.group(1))
+                digest.update(b"\0")
+                digest.update(shared[index] if index < len(shared) else b"")
+            fingerprints[sheet["name"]] = digest.hexdigest()
+    return fingerprints
+
+
+def load_state(output_path: str) -> Optional[Dict[str, Any]]:
+    """Previous output plus its fingerprints, or None when a full run is needed."""
+    state_path = output_path + STATE_SUFFIX
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        with open(output_path, 'r', encoding='utf-8') as f:
+            workout_data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    if state.get("extractor_version") != EXTRACTOR_VERSION:
+        return None
+    return {"fingerprints": state.get("fingerprints", {}), "workout_data": workout_data}
+
+
+def save_state(output_path: str, fingerprints: Dict[str, str]):
+    """Record the fingerprints the current output was built from (atomically)."""
+    state_path = output_path + STATE_SUFFIX
+    atomic_write(state_path, json.dumps({"extractor_version": EXTRACTOR_VERSION, "fingerprints": fingerprints},
+                                        indent=2))
+
+
+def extract_incremental(excel_path: str, output_path: str,
+                        previous: Optional[Dict[str, Any]] = None, reader: str = "openpyxl",
+                        delta: bool = False, keep_deltas: int = DEFAULT_KEEP) -> Dict[str, Any]:
+    """
+    Bring ``output_path`` up to date with ``excel_path``.
+
+    Args:
+        excel_path: Workbook to extract
+        output_path: workout-data.json to update in place
+        previous: Already-loaded state (``{"fingerprints", "workout_data"}``);
+            read from disk when omitted
+        reader: "openpyxl" (read-only) or "fast" for the changed sheets
+        delta: Also write a versioned JSON Patch delta from the previous
+            output (see json_delta.py), keeping ``keep_deltas`` of them
+
+    Returns:
+        ``{"workout_data", "fingerprints", "changed", "reused", "written"}``
+    """
+    fingerprints = sheet_fingerprints(excel_path)
+    sheet_names = list(fingerprints)[:MAX_SHEETS]
+    fingerprints = {name: fingerprints[name] for name in sheet_names}
+
+    if previous is None:
+        previous = load_state(output_path)
+
+    old_sheets: Dict[str, Any] = {}
+    if previous is not None:
+        old_fingerprints = previous["fingerprints"]
+        for sheet in previous["workout_data"].get("sheets", []):
+            if old_fingerprints.get(sheet["sheet_name"]) == fingerprints.get(sheet["sheet_name"]):
+                old_sheets[sheet["sheet_name"]] = sheet
+
+    changed = [name for name in sheet_names if name not in old_sheets]
+    reused = [name for name in sheet_names if name in old_sheets]
+    unchanged = previous is not None and not changed and \
+        [s["sheet_name"] for s in previous["workout_data"]["sheets"]] == sheet_names
+
+    if unchanged:
+        return {"workout_data": previous["workout_data"], "fingerprints": fingerprints,
+                "changed": [], "reused": reused, "written": False}
+
+    new_sheets: Dict[str, Any] = {}
+    if changed:
+        extractor = WorkoutExtractor(excel_path, streaming=True, reader=reader)
+        try:
+            for name in changed:
+                new_sheets[name] = extractor.extract_sheet(name)
+            workout_data = extractor.workout_data
+        finally:
+            extractor.close()
+    else:
+        workout_data = {key: value for key, value in previous["workout_data"].items() if key != "sheets"}
+
+    # Splice fresh sheets into the old ones, keeping workbook order
+    workout_data["sheets"] = [new_sheets.get(name) or old_sheets[name] for name in sheet_names]
+
+    if delta:
+        write_with_delta(workout_data, output_path, keep_deltas)
+    else:
+        write_json(workout_data, output_path)
+    save_state(output_path, fingerprints)
+
+    return {"workout_data": workout_data, "fingerprints": fingerprints,
+            "changed": changed, "reused": reused, "written": True}
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Re-extract only the worksheets that changed")
+    parser.add_argument("excel_path", nargs="?",
+                        default="/Users/britainsaluri/Downloads/Argh Let's Get Huge Matey.xlsx")
+    parser.add_argument("output_path", nargs="?",
+                        default="/Users/britainsaluri/workout-tracker/src/workout-data.json")
+    parser.add_argument("--delta", action="store_true",
+                        help="Also write a versioned JSON Patch delta from the previous output")
+    parser.add_argument("--keep-deltas", type=int, default=DEFAULT_KEEP,
+                        help="Deltas kept in the <output>.version.json chain")
+    args = parser.parse_args()
+
+    print("🏋️  Starting incremental extraction...")
+    print(f"📂 Input: {args.excel_path}")
+    print(f"📝 Output: {args.output_path}")
+    print("-" * 80)
+
+    report = extract_incremental(args.excel_path, args.output_path, delta=args.delta, keep_deltas=args.keep_deltas)
+
+    print(f"Re-parsed: {', '.join(report['changed']) or 'none'}")
+    print(f"Reused:    {', '.join(report['reused']) or 'none'}")
+    if not report["written"]:
+        print("\n✅ Output already up to date")
+    else:
+        print("\n✅ Extraction complete!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
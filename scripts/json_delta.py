@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Versioned JSON Patch Deltas
+Writes workout-data.json together with a compact delta from the previous
+output, so a client that already holds the previous version downloads a
+few kilobytes of changes instead of the whole file.
+
+Deltas are RFC 6902 JSON Patch documents computed by a structural diff.
+Lists of sheets, days, weeks, blocks and exercises are matched by their
+sheet name, day name, week number, block name and exercise ID (exercise
+name on Sheet4) rather than by position, so an inserted day or a reordered
+exercise does not turn into a rewrite of everything after it. Repeated
+keys (the workbooks repeat "DAY 1" headers) are told apart by occurrence.
+
+Files next to the output (``workout-data.json``):
+
+    workout-data.version.json             current version plus the recent
+                                          delta chain, newest last
+    workout-data.delta.<from>-<to>.json   {"from", "to", "patch": [...]}
+
+A version is the first 16 hex digits of the SHA-256 of the output file's
+bytes, so clients can check their copy. The patch is verified before it
+is written: applying it to the previous output must reproduce the new
+output byte for byte, otherwise the delta falls back to replacing the
+whole document. A delta no smaller than the output itself (e.g. after
+switching on --parse-fields) is not written and the chain starts over.
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import sys
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from atomic_write import atomic_write
+from workout_model import to_dict
+
+DELTA_FORMAT = "workout-delta"
+VERSION_FORMAT = "workout-version"
+FORMAT_VERSION = 1
+DEFAULT_KEEP = 7
+
+# List key -> item fields identifying an item (the first one that is set)
+LIST_KEYS = {
+    "sheets": ("sheet_name",),
+    "days": ("day_name",),
+    "weeks": ("week_number",),
+    "blocks": ("block_name",),
+    "exercises": ("exercise_id", "exercise_name"),
+}
+
+
+class PatchError(ValueError):
+    """A patch operation does not fit the document it is applied to."""
+
+
+def document_text(workout_data: Any) -> str:
+    """The exact text write_json() writes for ``workout_data``."""
+    return json.dumps(to_dict(workout_data), indent=2, ensure_ascii=False)
+
+
+def text_version(text: str) -> str:
+    """Version of an output file from its text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def version_path_for(output_path: str) -> str:
+    """Sidecar path: workout-data.json -> workout-data.version.json."""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}.version{ext or '.json'}"
+
+
+def delta_path_for(output_path: str, from_version: str, to_version: str) -> str:
+    """Delta path: workout-data.json -> workout-data.delta.<from>-<to>.json."""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}.delta.{from_version}-{to_version}{ext or '.json'}"
+
+
+# ---------------------------------------------------------------------------
+# Structural diff
+# ---------------------------------------------------------------------------
+
+def diff(old: Any, new: Any) -> List[Dict[str, Any]]:
+    """
+    JSON Patch operations turning ``old`` into ``new``.
+
+    Args:
+        old: Previous workout-data structure (plain dicts and lists)
+        new: New workout-data structure
+
+    Returns:
+        RFC 6902 operations (add, remove, replace, move), in order
+    """
+    ops: List[Dict[str, Any]] = []
+    _diff(old, new, "", None, ops)
+    return ops
+
+
+def _diff(old: Any, new: Any, path: str, key: Optional[str], ops: List[Dict[str, Any]]):
+    if type(old) is type(new) and old == new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict) and _same_key_order(old, new):
+        for name in old:
+            if name not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(name)}"})
+        for name, value in new.items():
+            child = f"{path}/{_escape(name)}"
+            if name in old:
+                _diff(old[name], value, child, name, ops)
+            else:
+                ops.append({"op": "add", "path": child, "value": value})
+        return
+    if isinstance(old, list) and isinstance(new, list) and key in LIST_KEYS:
+        _diff_list(old, new, path, LIST_KEYS[key], ops)
+        return
+    ops.append({"op": "replace", "path": path, "value": new})
+
+
+def _same_key_order(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+    """
+    True when patching key by key keeps ``new``'s key order: shared keys in
+    the same order and added keys (appended by "add") at the end.
+    """
+    shared = [name for name in old if name in new]
+    return list(new) == shared + [name for name in new if name not in old]
+
+
+def _diff_list(old: List[Any], new: List[Any], path: str, fields: Tuple[str, ...], ops: List[Dict[str, Any]]):
+    """Match items by key: remove, reorder, add, then diff the matched pairs."""
+    old_keys, new_keys = _item_keys(old, fields), _item_keys(new, fields)
+    kept, added = set(new_keys), set(new_keys) - set(old_keys)
+
+    # Highest index first, so earlier removals do not shift later ones
+    for i in reversed(range(len(old))):
+        if old_keys[i] not in kept:
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+
+    current = [k for k in old_keys if k in kept]
+    target = [k for k in new_keys if k not in added]
+    for j, item_key in enumerate(target):
+        if current[j] != item_key:
+            i = current.index(item_key, j)
+            ops.append({"op": "move", "from": f"{path}/{i}", "path": f"{path}/{j}"})
+            current.insert(j, current.pop(i))
+
+    # Lowest index first: everything before an insertion is already in place
+    for j, item_key in enumerate(new_keys):
+        if item_key in added:
+            ops.append({"op": "add", "path": f"{path}/{j}", "value": new[j]})
+
+    old_items = dict(zip(old_keys, old))
+    for j, item_key in enumerate(new_keys):
+        if item_key not in added:
+            _diff(old_items[item_key], new[j], f"{path}/{j}", None, ops)
+
+
+def _item_keys(items: List[Any], fields: Tuple[str, ...]) -> List[Tuple[Any, int]]:
+    """(identifying value, occurrence) per item; items without one fall back to their JSON."""
+    seen: Counter = Counter()
+    keys = []
+    for item in items:
+        value = None
+        if isinstance(item, dict):
+            value = next((item[f] for f in fields if item.get(f) is not None), None)
+        if value is None:
+            value = json.dumps(item, sort_keys=True)
+        keys.append((value, seen[value]))
+        seen[value] += 1
+    return keys
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+# ---------------------------------------------------------------------------
+# Applying patches
+# ---------------------------------------------------------------------------
+
+def apply_patch(document: Any, ops: List[Dict[str, Any]], in_place: bool = False) -> Any:
+    """
+    Apply RFC 6902 operations (add, remove, replace, move, copy, test).
+
+    Returns the patched document; the input is copied first unless
+    ``in_place``. Raises PatchError when a path does not resolve.
+    """
+    if not in_place:
+        document = copy.deepcopy(document)
+    for op in ops:
+        kind = op.get("op")
+        if kind == "add":
+            document = _add(document, op["path"], copy.deepcopy(op["value"]))
+        elif kind == "remove":
+            _remove(document, op["path"])
+        elif kind == "replace":
+            document = _replace(document, op["path"], copy.deepcopy(op["value"]))
+        elif kind == "move":
+            value = _remove(document, op["from"])
+            document = _add(document, op["path"], value)
+        elif kind == "copy":
+            document = _add(document, op["path"], copy.deepcopy(_get(document, op["from"])))
+        elif kind == "test":
+            if _get(document, op["path"]) != op["value"]:
+                raise PatchError(f"test failed at {op['path']!r}")
+        else:
+            raise PatchError(f"unknown operation {kind!r}")
+    return document
+
+
+def _tokens(path: str) -> List[str]:
+    if path and not path.startswith("/"):
+        raise PatchError(f"bad JSON pointer {path!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in path.split("/")[1:]]
+
+
+def _index(container: list, token: str, path: str, appending: bool = False) -> int:
+    if appending and token == "-":
+        return len(container)
+    if not token.isdigit() or int(token) > len(container) - (0 if appending else 1):
+        raise PatchError(f"index {token!r} out of range at {path!r}")
+    return int(token)
+
+
+def _parent(document: Any, path: str) -> Tuple[Any, str]:
+    tokens = _tokens(path)
+    if not tokens:
+        raise PatchError("the document root has no parent")
+    return _get(document, "".join(f"/{_escape(t)}" for t in tokens[:-1])), tokens[-1]
+
+
+def _get(document: Any, path: str) -> Any:
+    value = document
+    for token in _tokens(path):
+        if isinstance(value, list):
+            value = value[_index(value, token, path)]
+        elif isinstance(value, dict) and token in value:
+            value = value[token]
+        else:
+            raise PatchError(f"no value at {path!r}")
+    return value
+
+
+def _add(document: Any, path: str, value: Any) -> Any:
+    if not path:
+        return value
+    parent, token = _parent(document, path)
+    if isinstance(parent, list):
+        parent.insert(_index(parent, token, path, appending=True), value)
+    elif isinstance(parent, dict):
+        parent[token] = value
+    else:
+        raise PatchError(f"cannot add at {path!r}")
+    return document
+
+
+def _replace(document: Any, path: str, value: Any) -> Any:
+    if not path:
+        return value
+    parent, token = _parent(document, path)
+    if isinstance(parent, list):
+        parent[_index(parent, token, path)] = value
+    elif isinstance(parent, dict) and token in parent:
+        # Assigning keeps the key where it was
+        parent[token] = value
+    else:
+        raise PatchError(f"no value at {path!r}")
+    return document
+
+
+def _remove(document: Any, path: str) -> Any:
+    parent, token = _parent(document, path)
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, token, path))
+    if isinstance(parent, dict) and token in parent:
+        return parent.pop(token)
+    raise PatchError(f"no value at {path!r}")
+
+
+# ---------------------------------------------------------------------------
+# Versioned output
+# ---------------------------------------------------------------------------
+
+def load_version_info(output_path: str) -> Optional[Dict[str, Any]]:
+    """The version sidecar of ``output_path``, or None."""
+    try:
+        with open(version_path_for(output_path), 'r', encoding='utf-8') as f:
+            info = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return info if info.get("format") == VERSION_FORMAT else None
+
+
+def write_with_delta(workout_data: Any, output_path: str, keep: int = DEFAULT_KEEP) -> Dict[str, Any]:
+    """
+    Write ``workout_data`` like write_json() and record a delta from the
+    output it replaces.
+
+    Args:
+        workout_data: Plain dicts or a workout_model Program
+        output_path: workout-data.json to replace
+        keep: Deltas kept in the version chain; older delta files are deleted
+
+    Returns:
+        The version sidecar that was written. Its last ``deltas`` entry is
+        the new delta, unless there was no previous output or it was
+        already identical.
+    """
+    text = document_text(workout_data)
+    version = text_version(text)
+
+    previous_text = None
+    if os.path.exists(output_path):
+        with open(output_path, 'r', encoding='utf-8') as f:
+            previous_text = f.read()
+    previous_version = text_version(previous_text) if previous_text is not None else None
+
+    info = load_version_info(output_path)
+    listed = info.get("deltas", []) if info else []
+    # A chain only continues from the version its sidecar says is on disk
+    deltas = list(listed) if info and info.get("version") == previous_version else []
+
+    if previous_version == version and info is not None and info.get("version") == version:
+        print(f"✅ {output_path} unchanged (version {version})")
+        return info
+
+    if previous_text is not None and previous_version != version:
+        previous = json.loads(previous_text)
+        new = json.loads(text)
+        patch = diff(previous, new)
+        patched = apply_patch(previous, patch, in_place=True)
+        if json.dumps(patched, indent=2, ensure_ascii=False) != text:
+            patch = [{"op": "replace", "path": "", "value": new}]
+
+        delta_path = delta_path_for(output_path, previous_version, version)
+        delta_text = json.dumps({"format": DELTA_FORMAT, "version": FORMAT_VERSION, "from": previous_version,
+                                 "to": version, "patch": patch}, ensure_ascii=False, separators=(",", ":"))
+        delta_bytes = len(delta_text.encode("utf-8"))
+        if delta_bytes < len(text.encode("utf-8")):
+            atomic_write(delta_path, delta_text)
+            deltas.append({"from": previous_version, "to": version, "file": os.path.basename(delta_path),
+                           "bytes": delta_bytes, "operations": len(patch)})
+        else:
+            # Not worth fetching; the chain restarts and clients download the file
+            print(f"⚠️  Delta from {previous_version} is no smaller than the output; chain restarted")
+            deltas = []
+
+    kept = deltas[-keep:] if keep > 0 else []
+    info = {
+        "format": VERSION_FORMAT,
+        "version": version,
+        "bytes": len(text.encode("utf-8")),
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "deltas": kept,
+    }
+    # Output before sidecar: clients learn of a version only once its file is in place
+    atomic_write(output_path, text)
+    atomic_write(version_path_for(output_path), json.dumps(info, indent=2))
+    kept_files = {entry["file"] for entry in kept}
+    for entry in listed + deltas:
+        stale = os.path.join(os.path.dirname(output_path), entry["file"])
+        if entry["file"] not in kept_files and os.path.exists(stale):
+            os.unlink(stale)
+
+    print(f"✅ Data saved to {output_path} (version {version})")
+    if kept and kept[-1]["to"] == version and previous_version != version:
+        print(f"✅ Delta from {previous_version}: {kept[-1]['operations']} operation(s), {kept[-1]['bytes']:,} bytes")
+    return info
+
+
+def delta_chain(info: Dict[str, Any], from_version: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    The deltas that bring ``from_version`` up to ``info["version"]``, in
+    order; [] when already current, None when the chain does not reach back.
+    """
+    if from_version == info["version"]:
+        return []
+    chain: List[Dict[str, Any]] = []
+    target = info["version"]
+    for entry in reversed(info.get("deltas", [])):
+        if entry["to"] != target:
+            break
+        chain.append(entry)
+        if entry["from"] == from_version:
+            return chain[::-1]
+        target = entry["from"]
+    return None
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Diff two workout-data.json files or apply a delta")
+    sub = parser.add_subparsers(dest="command", required=True)
+    diff_parser = sub.add_parser("diff", help="Print the JSON Patch from OLD to NEW")
+    diff_parser.add_argument("old")
+    diff_parser.add_argument("new")
+    apply_parser = sub.add_parser("apply", help="Apply a delta file to a workout-data.json")
+    apply_parser.add_argument("document")
+    apply_parser.add_argument("delta")
+    apply_parser.add_argument("-o", "--output", help="Write here instead of printing")
+    args = parser.parse_args()
+
+    if args.command == "diff":
+        with open(args.old, 'r', encoding='utf-8') as f:
+            old = json.load(f)
+        with open(args.new, 'r', encoding='utf-8') as f:
+            new = json.load(f)
+        print(json.dumps(diff(old, new), indent=2, ensure_ascii=False))
+        return 0
+
+    with open(args.document, 'r', encoding='utf-8') as f:
+        text = f.read()
+    with open(args.delta, 'r', encoding='utf-8') as f:
+        delta = json.load(f)
+    if delta.get("format") != DELTA_FORMAT or delta.get("from") != text_version(text):
+        print(f"❌ {args.delta} does not apply to version {text_version(text)}")
+        return 1
+    patched = document_text(apply_patch(json.loads(text), delta["patch"], in_place=True))
+    if args.output:
+        atomic_write(args.output, patched)
+        print(f"✅ Version {text_version(patched)} saved to {args.output}")
+    else:
+        print(patched)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Layout Detection and Cached Layout Schemas
+Detects where a week-column sheet (Sheet1 layout) keeps its day header rows,
+its "WEEK N" column blocks and each block's tempo/sets/rest/results columns,
+and records that as a compact JSON schema.
+
+Schemas are cached under a structural fingerprint: what the rows above the
+first day say about the layout (where the first day starts, and the week
+columns each WEEK or label row sets), ignoring free text such as the
+program name and anything below the headers. Every workbook made from one
+template therefore shares a schema, however many days or rows it has. A
+read starts at the schema's first day with its week columns. The rows
+themselves are read by ``week_engine.extract_weeks``, the same engine as an
+uncached read, so day headers and later WEEK or label rows are handled
+identically on both paths.
+
+The cached part of a schema follows from the header rows, which are read
+for the fingerprint anyway, so neither a hit nor a miss runs the
+detect_layout pass: both cost the header rows plus one read from the first
+day, about the same as an uncached read (see scripts/README.md).
+detect_layout's full description of a sheet is for the command line.
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from atomic_write import atomic_write
+from extraction_cache import ExtractionCache
+from week_engine import (DEFAULT_WEEK_COLUMNS, WeekColumns, extract_weeks, header_columns, has_exercise_id,
+                         is_day_header, required_width)
+
+# Bump when the schema format or the detection rules change
+SCHEMA_VERSION = 2
+HEADER_SCAN_ROWS = 20
+KEY_PREFIX = "layout-"
+# Schema keys that hold for every workbook of a template; the rest describe one sheet's body
+CACHED_KEYS = ("version", "fingerprint", "weeks", "first_row")
+
+
+class LayoutMismatch(Exception):
+    """A cached schema does not describe the sheet being read."""
+
+
+def header_rows(sheet) -> List[tuple]:
+    """Rows above (and including) the first day header, at most HEADER_SCAN_ROWS."""
+    rows = []
+    for row in sheet.iter_rows(max_row=HEADER_SCAN_ROWS, values_only=True):
+        rows.append(row)
+        if row and is_day_header(row[0]):
+            break
+    return rows
+
+
+def sheet_dimension(sheet) -> List[int]:
+    """[max_row, max_column] of a read-only sheet, measured from its cells (not the <dimension> tag)."""
+    sheet.reset_dimensions()
+    sheet.calculate_dimension(force=True)
+    return [sheet.max_row, sheet.max_column]
+
+
+def header_structure(headers: Sequence[Sequence[Any]]) -> List[Any]:
+    """
+    Per header row: "day" for the day header, the ``[week, tempo, sets_reps,
+    rest, results]`` lists a WEEK or label row sets, else None.
+    """
+    weeks: List[WeekColumns] = list(DEFAULT_WEEK_COLUMNS)
+    structure: List[Any] = []
+    for row in headers:
+        if row and is_day_header(row[0]):
+            structure.append("day")
+            continue
+        found = header_columns(row, weeks) if row else []
+        if found:
+            weeks = found
+        structure.append([list(w) for w in found] or None)
+    return structure
+
+
+def layout_fingerprint(headers: Sequence[Sequence[Any]]) -> str:
+    """Structural fingerprint: schema version and the header rows' structure."""
+    payload = json.dumps([SCHEMA_VERSION, header_structure(headers)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def header_schema(headers: Sequence[Sequence[Any]]) -> Dict[str, Any]:
+    """
+    The cached part of a schema (CACHED_KEYS), from ``header_rows`` output
+    that ends at the first day header.
+    """
+    weeks: List[WeekColumns] = list(DEFAULT_WEEK_COLUMNS)
+    for row in headers[:-1]:
+        weeks = (header_columns(row, weeks) if row else []) or weeks
+    return {"version": SCHEMA_VERSION, "fingerprint": layout_fingerprint(headers),
+            "weeks": [list(w) for w in weeks], "first_row": len(headers)}
+
+
+def detect_layout(rows: Iterable[Sequence[Any]]) -> Dict[str, Any]:
+    """
+    Walk a whole sheet once and describe its layout.
+
+    Args:
+        rows: Row value tuples from row 1, as from ``iter_rows(values_only=True)``
+
+    Returns:
+        Schema dict: ``weeks`` (columns in effect at the first day, as
+        ``[week, tempo, sets_reps, rest, results]`` lists), ``week_changes``
+        (later header rows that move the columns), ``day_rows``,
+        ``first_row``/``last_row`` and ``max_column`` (1-based, inclusive)
+    """
+    weeks: List[WeekColumns] = list(DEFAULT_WEEK_COLUMNS)
+    initial = weeks
+    week_changes: List[Dict[str, Any]] = []
+    day_rows: List[int] = []
+    last_row = 0
+
+    for row_number, row in enumerate(rows, start=1):
+        if not row or all(cell is None for cell in row):
+            continue
+        last_row = row_number
+
+        first = row[0]
+        if is_day_header(first):
+            day_rows.append(row_number)
+            continue
+        if day_rows and has_exercise_id(first, row[1] if len(row) > 1 else None):
+            continue
+
+        header_weeks = header_columns(row, weeks)
+        if header_weeks:
+            weeks = header_weeks
+            if day_rows:
+                week_changes.append({"row": row_number, "weeks": [list(w) for w in weeks]})
+            else:
+                initial = weeks
+
+    all_weeks = list(initial) + [WeekColumns(*w) for c in week_changes for w in c["weeks"]]
+
+    return {
+        "version": SCHEMA_VERSION,
+        "weeks": [list(w) for w in initial],
+        "week_changes": week_changes,
+        "day_rows": day_rows,
+        "first_row": day_rows[0] if day_rows else 0,
+        "last_row": last_row,
+        "max_column": required_width(all_weeks),
+    }
+
+
+def read_with_layout(rows: Iterable[Sequence[Any]], schema: Dict[str, Any],
+                     is_exercise: Callable[[Any, Any], bool] = has_exercise_id,
+                     sink: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    Extract the days of a sheet from rows starting at the schema's first_row.
+
+    The rows go through ``week_engine.extract_weeks`` (``sink`` works the
+    same way there), starting from the schema's ``weeks``. Raises
+    LayoutMismatch when the first row is not a day header.
+    """
+    weeks = [WeekColumns(*w) for w in schema["weeks"]]
+    return extract_weeks(_from_first_day(rows, schema["first_row"]), is_exercise, weeks, sink)
+
+
+def _from_first_day(rows: Iterable[Sequence[Any]], first_row: int) -> Iterable[Sequence[Any]]:
+    """Pass the rows on, raising LayoutMismatch if one comes before a day header."""
+    rows = iter(rows)
+    for row_number, row in enumerate(rows, start=first_row):
+        if not row or all(cell is None for cell in row):
+            continue
+        if not is_day_header(row[0]):
+            raise LayoutMismatch(f"row {row_number} is no longer a day header")
+        yield row
+        break
+    yield from rows
+
+
+def extract_with_layout(sheet, cache: Optional[ExtractionCache] = None,
+                        is_exercise: Callable[[Any, Any], bool] = has_exercise_id,
+                        sink: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    Extract a week-column sheet through a (cached) layout schema.
+
+    Args:
+        sheet: openpyxl (or fast_xlsx) worksheet
+        cache: Where schemas are kept; without one the schema is built from the header rows every time
+        is_exercise: Predicate on (ID cell, name cell) selecting exercise rows
+        sink: Optional per-exercise callback, as in ``week_engine.extract_weeks``
+
+    Returns:
+        Same structure as ``week_engine.extract_weeks``
+    """
+    headers = header_rows(sheet)
+    if not (headers and headers[-1] and is_day_header(headers[-1][0])):
+        # No day header in the scanned rows: the headers do not pin down first_row
+        return extract_weeks(sheet.iter_rows(values_only=True), is_exercise, sink=sink)
+
+    key = KEY_PREFIX + layout_fingerprint(headers)
+    schema = cache.get(key) if cache is not None else None
+    if schema is not None:
+        try:
+            # A mismatch is raised before the first day, so sink has not been called yet
+            return read_with_layout(_layout_rows(sheet, schema), schema, is_exercise, sink)
+        except LayoutMismatch:
+            pass  # the entry does not fit this sheet after all: rebuild it below
+
+    # The cached keys follow from the header rows alone, so a miss needs no detection pass
+    schema = header_schema(headers)
+    if cache is not None:
+        cache.put(key, schema)
+    return read_with_layout(_layout_rows(sheet, schema), schema, is_exercise, sink)
+
+
+def _layout_rows(sheet, schema: Dict[str, Any]) -> Iterable[tuple]:
+    """Rows from the first day on, full width: a later WEEK row may move the columns anywhere."""
+    if not schema["first_row"]:
+        return iter(())
+    return sheet.iter_rows(min_row=schema["first_row"], values_only=True)
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Detect and print the layout schema of a week-column sheet")
+    parser.add_argument("excel_path")
+    parser.add_argument("--sheet", default=None, help="Worksheet name (default: the first sheet)")
+    parser.add_argument("-o", "--output", default=None, help="Write the schema to this JSON file")
+    args = parser.parse_args()
+
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(args.excel_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[args.sheet] if args.sheet else workbook.worksheets[0]
+        sheet.reset_dimensions()
+        schema = detect_layout(sheet.iter_rows(values_only=True))
+        schema["fingerprint"] = layout_fingerprint(header_rows(sheet))
+    finally:
+        workbook.close()
+
+    text = json.dumps(schema, indent=2)
+    if args.output:
+        atomic_write(args.output, text + "\n")
+        print(f"✅ Layout schema saved to {args.output}")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Declarative Sheet Layout Specs
+Describes where each workbook format keeps its rows and columns in a JSON
+spec file (see layouts/) instead of hardcoding positions in the extractor,
+so a new coach template is a spec file rather than a code change.
+
+A spec is compiled once into a row classifier (the first ``rows`` rule
+whose column holds a matching text cell decides the row's kind) and
+itemgetter projectors that pull every week's cells out of an exercise row
+with one call. ``LayoutSpec.read(rows)`` does both in a single pass.
+
+Two layouts exist:
+
+    weeks   "WEEK N" header rows give each week's start column; exercise
+            rows are projected into every week at fixed offsets from it
+            (Sheet1-3)
+    blocks  "Week", "Day" and "Block" label rows; exercise rows hold one
+            group of columns per week range, any number of ranges (Sheet4)
+
+A rule tests one column with any of ``contains`` (plus ``ignore_case``),
+``pattern`` (regex on the stripped cell) and ``min_length`` (stripped
+length). Specs without ``sheets`` are the default layout; the others apply
+to the sheets they name. Specs loaded later override earlier ones.
+
+Usage:
+    python layout_specs.py [SPEC_OR_DIR ...]    # validate and list layouts
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from workout_model import Exercise, WeekValues
+
+LAYOUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "layouts")
+
+WEEKS = "weeks"
+BLOCKS = "blocks"
+
+# Row kinds (compared by identity in the read loop)
+WEEK_HEADER = "week_header"
+WEEK_RANGE = "week_range"
+DAY = "day"
+BLOCK = "block"
+EXERCISE = "exercise"
+ROW_KINDS = {kind: kind for kind in (WEEK_HEADER, WEEK_RANGE, DAY, BLOCK, EXERCISE)}
+
+# Layout -> (required row kinds, optional row kinds)
+LAYOUT_ROWS = {
+    WEEKS: ({WEEK_HEADER, DAY, EXERCISE}, set()),
+    BLOCKS: ({DAY, BLOCK, EXERCISE}, {WEEK_RANGE}),
+}
+
+# Projected fields, in the order the model constructors take them
+WEEK_FIELDS = tuple(slot for slot, _ in Exercise.FIELDS if slot not in Exercise.OPTIONAL)[2:]
+RANGE_FIELDS = tuple(slot for slot, _ in WeekValues.FIELDS if slot not in WeekValues.OPTIONAL)
+
+# Range keys become the NDJSON/SQLite week labels ("week_1_2" -> "1-2")
+RANGE_KEY_PATTERN = re.compile(r'^week_\d+(_\d+)*$')
+
+
+class LayoutSpecError(ValueError):
+    """A layout spec is malformed."""
+
+
+def cell_value(value: Any) -> Any:
+    """A cell as the extractor reports it: dates as "MM-DD", anything else unchanged."""
+    if isinstance(value, datetime):
+        return value.strftime("%m-%d")
+    return value
+
+
+def format_tempo(value: Any) -> str:
+    """Tempo cells: 211.0 -> "211", empty -> ""."""
+    value = cell_value(value)
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)):
+        return str(int(value))
+    return str(value)
+
+
+def format_text(value: Any) -> str:
+    """Prescription and results cells as text; empty cells give ""."""
+    value = cell_value(value)
+    return str(value) if value else ""
+
+
+FORMATS: Dict[str, Callable[[Any], Any]] = {"tempo": format_tempo, "text": format_text, "raw": cell_value}
+
+
+def compile_matcher(rule: Dict[str, Any], source: str = "<spec>") -> Callable[[str], bool]:
+    """Build the test a rule applies to a text cell."""
+    tests: List[Callable[[str], bool]] = []
+    if "contains" in rule:
+        needle = rule["contains"]
+        if rule.get("ignore_case"):
+            needle = needle.upper()
+            tests.append(lambda cell: needle in cell.upper())
+        else:
+            tests.append(lambda cell: needle in cell)
+    if "pattern" in rule:
+        try:
+            match = re.compile(rule["pattern"]).match
+        except re.error as e:
+            raise LayoutSpecError(f"{source}: bad pattern {rule['pattern']!r}: {e}") from e
+        tests.append(lambda cell: match(cell.strip()) is not None)
+    if "min_length" in rule:
+        min_length = rule["min_length"]
+        tests.append(lambda cell: len(cell.strip()) >= min_length)
+    if not tests:
+        raise LayoutSpecError(f"{source}: {rule['kind']} rule needs contains, pattern or min_length")
+    if len(tests) == 1:
+        return tests[0]
+    return lambda cell: all(test(cell) for test in tests)
+
+
+def compile_classifier(rules: Sequence[Dict[str, Any]],
+                       source: str = "<spec>") -> Callable[[Sequence[Any]], Tuple[Optional[str], Optional[str]]]:
+    """
+    Build ``classify(row) -> (kind, label)`` from ordered rules.
+
+    The label is the matching cell, stripped; rows no rule matches give
+    ``(None, None)``. Only text cells can match.
+    """
+    compiled = []
+    for rule in rules:
+        kind = ROW_KINDS.get(rule.get("kind")) if isinstance(rule, dict) else None
+        if kind is None:
+            raise LayoutSpecError(f"{source}: row rule {rule!r} has no known kind")
+        column = rule.get("column", 0)
+        if not isinstance(column, int) or column < 0:
+            raise LayoutSpecError(f"{source}: {kind} rule column must be a non-negative integer")
+        compiled.append((kind, column, compile_matcher(rule, source)))
+    compiled = tuple(compiled)
+
+    def classify(row: Sequence[Any]) -> Tuple[Optional[str], Optional[str]]:
+        width = len(row)
+        for kind, column, test in compiled:
+            if column < width:
+                cell = row[column]
+                if isinstance(cell, str) and test(cell):
+                    return kind, cell.strip()
+        return None, None
+
+    return classify
+
+
+def compile_projector(columns: Sequence[int], formats: Sequence[Callable[[Any], Any]],
+                      group: int) -> Callable[[Sequence[Any]], List[tuple]]:
+    """
+    Build ``project(row)``: the formatted cells at ``columns``, split into
+    tuples of ``group`` values (one per week or week range).
+    """
+    if not columns:
+        return lambda row: []
+    getter = itemgetter(*columns)
+    if len(columns) == 1:
+        single = getter
+        getter = lambda row: (single(row),)  # noqa: E731 (itemgetter of one index returns the bare item)
+    width = max(columns) + 1
+    formats = tuple(formats)
+    starts = range(0, len(columns), group)
+
+    def project(row: Sequence[Any]) -> List[tuple]:
+        if len(row) < width:
+            row = tuple(row) + (None,) * (width - len(row))
+        values = [fmt(value) for fmt, value in zip(formats, getter(row))]
+        return [tuple(values[start:start + group]) for start in starts]
+
+    return project
+
+
+class LayoutSpec:
+    """A compiled layout spec (see module docstring)."""
+
+    def __init__(self, spec: Dict[str, Any], source: str = "<spec>"):
+        self.spec = spec
+        self.source = source
+        self.name = _require(spec, "name", str, source)
+        self.layout = _require(spec, "layout", str, source)
+        if self.layout not in LAYOUT_ROWS:
+            raise LayoutSpecError(f"{source}: unknown layout {self.layout!r}; expected one of "
+                                  f"{', '.join(LAYOUT_ROWS)}")
+        sheets = spec.get("sheets")
+        self.sheets = None if sheets is None else frozenset(sheets)
+        # None: use the first text cell of the sheet's first row
+        self.program_name: Optional[str] = spec.get("program_name")
+
+        rules = _require(spec, "rows", list, source)
+        self.classify = compile_classifier(rules, source)
+        required, optional = LAYOUT_ROWS[self.layout]
+        kinds = {rule["kind"] for rule in rules}
+        if not required <= kinds or not kinds <= required | optional:
+            raise LayoutSpecError(f"{source}: {self.layout} layouts take rows of kind "
+                                  f"{', '.join(sorted(required))} (optional: {', '.join(sorted(optional)) or '-'})")
+
+        self.range_keys: Tuple[str, ...] = ()
+        if self.layout == WEEKS:
+            header = next(rule for rule in rules if rule["kind"] == WEEK_HEADER)
+            self._is_week_label = compile_matcher(header, source)
+            self._week_number = re.compile(header.get("number", r'\d+'))
+            self.name_column = spec.get("name_column", 1)
+            fields = _fields(_require(spec, "week_fields", list, source), WEEK_FIELDS, "offset", source)
+            self._week_offsets = [offset for offset, _ in fields]
+            self._week_formats = [fmt for _, fmt in fields]
+        else:
+            columns, formats = [], []
+            for week_range in _require(spec, "week_ranges", list, source):
+                key = _require(week_range, "key", str, source)
+                if not RANGE_KEY_PATTERN.match(key) or key in self.range_keys:
+                    raise LayoutSpecError(f"{source}: week range key {key!r} must be unique and "
+                                          f"look like week_1_2")
+                self.range_keys += (sys.intern(key),)
+                for column, fmt in _fields(_require(week_range, "fields", list, source), RANGE_FIELDS,
+                                           "column", source):
+                    columns.append(column)
+                    formats.append(fmt)
+            if not self.range_keys:
+                raise LayoutSpecError(f"{source}: week_ranges is empty")
+            self._project_ranges = compile_projector(columns, formats, len(RANGE_FIELDS))
+
+    def applies_to(self, sheet_name: str) -> bool:
+        """True for the sheets this spec names (every sheet for a default spec)."""
+        return self.sheets is None or sheet_name in self.sheets
+
+    def week_columns(self, row: Sequence[Any]) -> List[Tuple[int, int]]:
+        """(week number, start column) for every week label in a header row."""
+        weeks = []
+        for column, cell in enumerate(row):
+            if isinstance(cell, str) and self._is_week_label(cell):
+                number = self._week_number.search(cell)
+                if number:
+                    weeks.append((int(number.group()), column))
+        return weeks
+
+    def read(self, rows: Iterable[Sequence[Any]]) -> Iterator[Tuple[str, Any, Any]]:
+        """
+        Classify every row and project exercise rows in the same pass.
+
+        Yields:
+            ``(kind, label, values)`` per classified row. Week header rows
+            carry their ``week_columns()`` as the label. Exercise rows carry
+            ``(name, [values per week])`` in weeks layouts and ``[values per
+            week range]`` in blocks layouts, each values tuple in model
+            constructor order. Other rows carry None.
+        """
+        classify = self.classify
+        if self.layout == BLOCKS:
+            project_ranges = self._project_ranges
+            for row in rows:
+                kind, label = classify(row)
+                if kind is EXERCISE:
+                    yield kind, label, project_ranges(row)
+                elif kind is not None:
+                    yield kind, label, None
+            return
+
+        name_column = self.name_column
+        group = len(WEEK_FIELDS)
+        project = compile_projector([], [], group)
+        for row in rows:
+            kind, label = classify(row)
+            if kind is EXERCISE:
+                name = row[name_column] if name_column < len(row) else None
+                yield kind, label, (str(name).strip() if name else "", project(row))
+            elif kind is WEEK_HEADER:
+                weeks = self.week_columns(row)
+                # Recompiled only when a header row moves the weeks
+                project = compile_projector([start + offset for _, start in weeks for offset in self._week_offsets],
+                                            self._week_formats * len(weeks), group)
+                yield kind, weeks, None
+            elif kind is not None:
+                yield kind, label, None
+
+
+class Layouts:
+    """The compiled specs in effect, in load order."""
+
+    def __init__(self, specs: Sequence[LayoutSpec]):
+        self.specs = list(specs)
+        if not any(spec.sheets is None for spec in self.specs):
+            raise LayoutSpecError("no default layout (a spec without 'sheets')")
+
+    def for_sheet(self, sheet_name: str) -> LayoutSpec:
+        """The last loaded spec naming ``sheet_name``, else the last default spec."""
+        for spec in reversed(self.specs):
+            if spec.sheets is not None and sheet_name in spec.sheets:
+                return spec
+        return next(spec for spec in reversed(self.specs) if spec.sheets is None)
+
+    def fingerprint(self) -> str:
+        """Digest of every spec, for cache keys."""
+        payload = json.dumps([spec.spec for spec in self.specs], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def spec_files(paths: Iterable[str]) -> List[str]:
+    """Spec files for a mix of files and directories (directories: *.json, sorted)."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".json"))
+        else:
+            files.append(path)
+    return files
+
+
+def read_spec(path: str) -> LayoutSpec:
+    """Load and compile one spec file."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            spec = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise LayoutSpecError(f"{path}: {e}") from e
+    return LayoutSpec(spec, path)
+
+
+@lru_cache(maxsize=32)
+def load_layouts(paths: Tuple[str, ...] = ()) -> Layouts:
+    """
+    Compile the built-in specs plus any extra spec files or directories.
+
+    Compiled once per process for each distinct ``paths`` tuple.
+    """
+    return Layouts([read_spec(path) for path in spec_files((LAYOUT_DIR,) + tuple(paths))])
+
+
+def _require(spec: Any, key: str, kind: type, source: str) -> Any:
+    value = spec.get(key) if isinstance(spec, dict) else None
+    if not isinstance(value, kind):
+        raise LayoutSpecError(f"{source}: {key!r} must be a {kind.__name__}")
+    return value
+
+
+def _fields(fields: List[Dict[str, Any]], names: Sequence[str], position: str,
+            source: str) -> List[Tuple[int, Callable[[Any], Any]]]:
+    """(column or offset, formatter) for each of ``names``, in that order."""
+    by_name = {}
+    for field in fields:
+        name = _require(field, "field", str, source)
+        index = field.get(position)
+        fmt = FORMATS.get(field.get("format", "text"))
+        if name not in names or not isinstance(index, int) or index < 0 or fmt is None:
+            raise LayoutSpecError(f"{source}: bad field {field!r}; expected one of {', '.join(names)} with a "
+                                  f"non-negative {position} and a format of {', '.join(FORMATS)}")
+        by_name[name] = (index, fmt)
+    missing = [name for name in names if name not in by_name]
+    if missing:
+        raise LayoutSpecError(f"{source}: missing fields {', '.join(missing)}")
+    return [by_name[name] for name in names]
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Validate layout specs and list the layouts in effect")
+    parser.add_argument("paths", nargs="*", help="Extra spec files or directories (after the built-in layouts)")
+    args = parser.parse_args()
+
+    try:
+        layouts = load_layouts(tuple(args.paths))
+    except LayoutSpecError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"📂 {len(layouts.specs)} layout spec(s)")
+    for spec in layouts.specs:
+        sheets = ", ".join(sorted(spec.sheets)) if spec.sheets is not None else "(default)"
+        ranges = f", week ranges {', '.join(spec.range_keys)}" if spec.range_keys else ""
+        print(f"  - {spec.name}: {spec.layout} layout for {sheets}{ranges}  [{spec.source}]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
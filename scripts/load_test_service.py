@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Extraction Service Load Test
+Fires concurrent workbook uploads at extraction_service.py and reports
+throughput, status codes (including 503 rejections and 504 timeouts),
+cache hits, and p50/p90/p99 latency.
+
+Without --url a service is started on a free local port for the run.
+Uploads cycle through --distinct synthetic workbooks (or the given
+--workbook files), so the share of cache hits can be controlled.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from synthetic_workbook import build_workbook
+
+SERVICE_PATH = Path(__file__).resolve().parent / "extraction_service.py"
+
+
+async def http_request(host: str, port: int, method: str, path: str,
+                       body: bytes = b"") -> Tuple[int, Dict[str, str], bytes]:
+    """One HTTP/1.1 request on its own connection; returns (status, headers, body)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n"
+                f"Content-Type: application/vnd.openxmlformats-officedocument.spreadsheetml.sheet\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+        status_line = (await reader.readline()).decode("latin-1")
+        status = int(status_line.split(" ", 2)[1])
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+        payload = await reader.readexactly(int(headers.get("content-length", 0)))
+        return status, headers, payload
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list (None when empty)."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, Any]:
+    values = sorted(seconds)
+    summary = {f"p{p}_ms": percentile(values, p) for p in (50, 90, 99)}
+    summary["max_ms"] = values[-1] if values else None
+    return {key: None if value is None else round(value * 1000, 1) for key, value in summary.items()}
+
+
+async def run_load(host: str, port: int, payloads: List[bytes], requests: int, concurrency: int,
+                   query: str = "") -> Dict[str, Any]:
+    """Send ``requests`` uploads from ``concurrency`` clients; each client waits for its answer."""
+    results: List[Tuple[int, str, float]] = []
+    next_request = iter(range(requests))
+    path = "/extract" + (f"?{query}" if query else "")
+
+    async def client():
+        for i in next_request:
+            started = time.perf_counter()
+            try:
+                status, headers, _ = await http_request(host, port, "POST", path, payloads[i % len(payloads)])
+                source = headers.get("x-cache", "")
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+                status, source = 0, ""
+            results.append((status, source, time.perf_counter() - started))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ok = [seconds for status, _, seconds in results if status == 200]
+    return {
+        "requests": len(results),
+        "concurrency": concurrency,
+        "distinct_workbooks": len(payloads),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(results) / elapsed, 2),
+        "ok_throughput_rps": round(len(ok) / elapsed, 2),
+        "status": {str(status): count for status, count in sorted(Counter(s for s, _, _ in results).items())},
+        "cache": dict(Counter(source for status, source, _ in results if status == 200)),
+        "latency_ok": latency_summary(ok),
+        "latency_all": latency_summary([seconds for _, _, seconds in results]),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_service(port: int, service_args: List[str]) -> subprocess.Popen:
+    """Start extraction_service.py and wait until /health answers."""
+    process = subprocess.Popen([sys.executable, str(SERVICE_PATH), "--port", str(port), *service_args],
+                               stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Service exited with code {process.returncode}")
+        try:
+            status, _, _ = asyncio.run(http_request("127.0.0.1", port, "GET", "/health"))
+            if status == 200:
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Service did not start within 30s")
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Load-test the extraction service with concurrent uploads")
+    parser.add_argument("--url", default=None, help="Running service, e.g. http://127.0.0.1:8765 "
+                                                    "(default: start one for the run)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workbook", action="append", default=[], help="Upload this file (repeatable)")
+    parser.add_argument("--distinct", type=int, default=4,
+                        help="Synthetic workbooks to cycle through when no --workbook is given")
+    parser.add_argument("--days", type=int, default=10, help="Days per synthetic workbook")
+    parser.add_argument("--reader", choices=("openpyxl", "fast"), default="openpyxl")
+    parser.add_argument("--workers", type=int, default=None, help="Workers of the started service")
+    parser.add_argument("--max-queue", type=int, default=None, help="Queue size of the started service")
+    parser.add_argument("--cache-ttl", type=float, default=None, help="Cache TTL of the started service")
+    parser.add_argument("--output", help="JSON file for the report")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = args.workbook or [
+            build_workbook(os.path.join(tmp_dir, f"load-{i}.xlsx"), days=args.days + i, exercises_per_day=8, weeks=4)
+            for i in range(args.distinct)]
+        payloads = [Path(path).read_bytes() for path in paths]
+
+    process = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = "127.0.0.1", _free_port()
+        service_args = []
+        for flag, value in (("--workers", args.workers), ("--max-queue", args.max_queue),
+                            ("--cache-ttl", args.cache_ttl)):
+            if value is not None:
+                service_args += [flag, str(value)]
+        print("🚀 Starting extraction service...")
+        process = start_service(port, service_args)
+
+    print(f"🏋️  {args.requests} uploads, {args.concurrency} concurrent, "
+          f"{len(payloads)} distinct workbook(s) -> http://{host}:{port}")
+    try:
+        report = asyncio.run(run_load(host, port, payloads, args.requests, args.concurrency,
+                                      f"reader={args.reader}"))
+        _, _, health = asyncio.run(http_request(host, port, "GET", "/health"))
+        report["service"] = json.loads(health)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=60)
+
+    latency = report["latency_ok"]
+    print(f"\n📊 {report['throughput_rps']} req/s ({report['ok_throughput_rps']} ok/s) in "
+          f"{report['elapsed_seconds']}s")
+    print(f"   Status: {report['status']}   Cache: {report['cache']}")
+    print(f"   Latency (200s): p50 {latency['p50_ms']} ms, p90 {latency['p90_ms']} ms, "
+          f"p99 {latency['p99_ms']} ms, max {latency['max_ms']} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Report saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Workout Lookup Index
+A sidecar file written next to workout-data.json that turns lookups into
+direct indexing instead of walking sheets → days → weeks → exercises:
+
+    programs[sheet].days[day].weeks[week].exercises[exercise_id]
+        -> list of [sheet, day, week, exercise] array positions
+    programs[sheet].days[day].counts[week]
+        -> number of exercises
+    names[exercise_name]
+        -> every [sheet, day, week, exercise_id] key using that name
+
+Days are keyed by their 1-based position (the workbooks repeat "DAY 1"
+headers). Sheet4 keys weeks as "1-2"/"3-4", uses "<block>#<position>" as
+the exercise ID, and its paths point into ``blocks`` instead of ``weeks``.
+An ID listed twice in a week (a workbook typo) has two paths.
+
+The index is built from the in-memory structure when the output is written,
+so it never re-reads the workbook or the JSON file.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+from atomic_write import atomic_write
+from ndjson_sink import block_week_ranges
+
+INDEX_FORMAT = "workout-index"
+INDEX_VERSION = 1
+
+
+def index_path_for(output_path: str) -> str:
+    """Sidecar path: workout-data.json -> workout-data.index.json."""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}.index{ext or '.json'}"
+
+
+def sheet4_week(range_key: str) -> str:
+    """"week_1_2" -> "1-2", matching the NDJSON records."""
+    return range_key[len("week_"):].replace("_", "-")
+
+
+def build_index(workout_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the lookup index for an extracted workout-data structure.
+
+    Args:
+        workout_data: Structure produced by WorkoutExtractor.extract_all_sheets()
+
+    Returns:
+        JSON-serialisable index (see module docstring)
+    """
+    programs: Dict[str, Any] = {}
+    names: Dict[str, List[List[str]]] = {}
+
+    for s, sheet in enumerate(workout_data["sheets"]):
+        program = sheet["sheet_name"]
+        days: Dict[str, Any] = {}
+        programs[program] = {"sheet": s, "program_name": sheet["program_name"], "days": days}
+
+        for d, day in enumerate(sheet["days"]):
+            day_key = str(d + 1)
+            weeks: Dict[str, Any] = {}
+            counts: Dict[str, int] = {}
+
+            if "blocks" in day:
+                layout = "blocks"
+                for range_key in block_week_ranges(day["blocks"]):
+                    week_key = sheet4_week(range_key)
+                    exercises: Dict[str, List[List[int]]] = {}
+                    for b, block in enumerate(day["blocks"]):
+                        for e, exercise in enumerate(block["exercises"]):
+                            exercise_id = f"{block['block_name']}#{e}"
+                            exercises.setdefault(exercise_id, []).append([s, d, b, e])
+                            names.setdefault(exercise["exercise_name"], []).append(
+                                [program, day_key, week_key, exercise_id])
+                    weeks[week_key] = {"range": range_key, "exercises": exercises}
+                    counts[week_key] = sum(len(block["exercises"]) for block in day["blocks"])
+            else:
+                layout = "weeks"
+                for w, week in enumerate(day["weeks"]):
+                    week_key = str(week["week_number"])
+                    exercises = {}
+                    for e, exercise in enumerate(week["exercises"]):
+                        exercises.setdefault(exercise["exercise_id"], []).append([s, d, w, e])
+                        names.setdefault(exercise["exercise_name"], []).append(
+                            [program, day_key, week_key, exercise["exercise_id"]])
+                    weeks[week_key] = {"week": w, "exercises": exercises}
+                    counts[week_key] = len(week["exercises"])
+
+            days[day_key] = {"day": d, "day_name": day["day_name"], "layout": layout,
+                             "counts": counts, "weeks": weeks}
+
+    return {
+        "format": INDEX_FORMAT,
+        "version": INDEX_VERSION,
+        "program_name": workout_data["program_name"],
+        "programs": programs,
+        "names": names,
+    }
+
+
+def lookup(workout_data: Dict[str, Any], index: Dict[str, Any], program: str, day: int,
+           week: Any, exercise_id: str) -> List[Dict[str, Any]]:
+    """
+    Exercises at (program, day, week, exercise_id) via the index.
+
+    Sheet4 entries are the exercise's values for that week range.
+    """
+    day_entry = index["programs"][program]["days"][str(day)]
+    week_entry = day_entry["weeks"][str(week)]
+    found = []
+    for s, d, g, e in week_entry["exercises"].get(exercise_id, []):
+        groups = workout_data["sheets"][s]["days"][d][day_entry["layout"]]
+        exercise = groups[g]["exercises"][e]
+        found.append(exercise[week_entry["range"]] if day_entry["layout"] == "blocks" else exercise)
+    return found
+
+
+def write_index(workout_data: Dict[str, Any], index_path: str):
+    """Write the index atomically."""
+    atomic_write(index_path, json.dumps(build_index(workout_data), ensure_ascii=False, separators=(",", ":")))
+    print(f"✅ Lookup index saved to {index_path}")
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Build the lookup index for an existing workout-data.json")
+    parser.add_argument("input", help="workout-data.json")
+    parser.add_argument("output", nargs="?", default=None,
+                        help="Index path (default: <input>.index.json next to the input)")
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        workout_data = json.load(f)
+    write_index(workout_data, args.output or index_path_for(args.input))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+NDJSON Output Sink
+Flat exercise records, one JSON object per line, written while a workbook
+is being parsed instead of after the whole nested structure is built.
+
+Every record carries the sheet, program, day and week (plus the block on
+Sheet4) and its position inside that week or block, so a line can be
+loaded on its own. Sheet4 exercises hold one entry per week range
+("week_1_2", "week_3_4" with the built-in layout) and produce one record
+per range ("1-2" and "3-4").
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# Week ranges of the built-in Sheet4 layout (layouts/sheet4.json)
+SHEET4_WEEK_RANGES = ("week_1_2", "week_3_4")
+
+
+def week_range_keys(exercise: Dict[str, Any]) -> Tuple[str, ...]:
+    """The week range keys of a Sheet4 exercise dict, in order ("week_1_2", ...)."""
+    return tuple(key for key in exercise if key.startswith("week_"))
+
+
+def block_week_ranges(blocks: Iterable[Dict[str, Any]]) -> Tuple[str, ...]:
+    """
+    Week range keys used by any exercise of a day's blocks, in order;
+    the built-in ranges for a day without exercises.
+    """
+    keys: Dict[str, None] = {}
+    for block in blocks:
+        for exercise in block["exercises"]:
+            keys.update(dict.fromkeys(week_range_keys(exercise)))
+    return tuple(keys) or SHEET4_WEEK_RANGES
+
+
+def exercise_records(sheet: Dict[str, Any], day: Dict[str, Any], group: Dict[str, Any],
+                     exercise: Dict[str, Any], position: int) -> List[Dict[str, Any]]:
+    """
+    Flat records for one parsed exercise.
+
+    Args:
+        sheet: Sheet dict (``sheet_name``, ``program_name``)
+        day: Day dict the exercise belongs to
+        group: The week (standard sheets) or block (Sheet4) holding the exercise
+        exercise: Exercise dict as built by WorkoutExtractor
+        position: Index of the exercise within ``group``
+    """
+    base = {"sheet": sheet["sheet_name"], "program": sheet["program_name"], "day": day["day_name"]}
+    if "week_number" in group:
+        return [{**base, "week": group["week_number"], "position": position, **exercise}]
+
+    records = []
+    for key in week_range_keys(exercise):
+        records.append({
+            **base,
+            "block": group["block_name"],
+            "week": key[len("week_"):].replace("_", "-"),
+            "position": position,
+            "exercise_id": None,
+            "exercise_name": exercise["exercise_name"],
+            **exercise[key],
+        })
+    return records
+
+
+def iter_records(workout_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Flatten an already-built workout-data structure into NDJSON records."""
+    for sheet in workout_data["sheets"]:
+        for day in sheet["days"]:
+            for group in day.get("weeks", []) + day.get("blocks", []):
+                for position, exercise in enumerate(group["exercises"]):
+                    yield from exercise_records(sheet, day, group, exercise, position)
+
+
+class NDJSONWriter:
+    """Writes records to a file as they arrive; usable as an extractor sink."""
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self.records = 0
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def __call__(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str))
+        self._file.write("\n")
+        self.records += 1
+
+    def write_all(self, records: Iterable[Dict[str, Any]]):
+        for record in records:
+            self(record)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> "NDJSONWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
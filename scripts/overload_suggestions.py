@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Offline Progressive-Overload Suggestions
+Computes the week-to-week weight suggestions of src/utils/weightSuggestions.js
+for every exercise of every extracted workbook at once, so they can be
+precomputed during the nightly extraction instead of on the phone.
+
+All exercises are padded into (exercise x set) NumPy arrays and the
+averages, rep-range scores, failed-set counts and adjustments are computed
+in one pass. The rules, rounding and messages follow SuggestionEngine
+exactly; ``suggest(items)`` returns what ``calculateSuggestedWeight`` would
+for each item (minus ``calculatedAt`` being per call), plus a ``stats``
+block with hit rate, failed sets and rep/weight standard deviation.
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from atomic_write import atomic_write
+from field_parsers import parse_results
+from lookup_index import sheet4_week
+from ndjson_sink import week_range_keys
+from workout_files import load_workouts
+
+# SuggestionEngine.version
+ENGINE_VERSION = "1.0.0"
+
+COMPOUND_KEYWORDS = (
+    'squat', 'deadlift', 'bench', 'press', 'overhead',
+    'row', 'pull', 'chin', 'dip', 'lunge',
+    'leg press', 'thrust', 'rdl', 'clean', 'snatch', 'jerk'
+)
+
+LEVELS = ("EXCEEDED", "STRONG", "MAINTAINED", "STRUGGLED", "FAILED")
+TYPES = ("COMPOUND", "ISOLATION")
+
+# (amount, reason, confidence) per exercise type and performance level,
+# as in SuggestionEngine.calculateAdjustment
+ADJUSTMENTS = {
+    "COMPOUND": {
+        "EXCEEDED": (10, "Crushed it! Time to level up.", "high"),
+        "STRONG": (5, "Great work! Small bump.", "high"),
+        "MAINTAINED": (0, "Master this weight first.", "medium"),
+        "STRUGGLED": (0, "Let's nail this weight.", "low"),
+        "FAILED": (-5, "Let's dial it back and reduce weight.", "low"),
+    },
+    "ISOLATION": {
+        "EXCEEDED": (5, "Perfect form! Moving up.", "high"),
+        "STRONG": (2.5, "Solid progress! Slight increase.", "high"),
+        "MAINTAINED": (0, "Keep building at this weight.", "medium"),
+        "STRUGGLED": (0, "Focus on control here.", "low"),
+        "FAILED": (-2.5, "Drop weight, reduce and perfect technique.", "medium"),
+    },
+}
+
+AMOUNTS = np.array([[ADJUSTMENTS[t][level][0] for level in LEVELS] for t in TYPES], dtype=float)
+
+# Where a suggestion belongs, copied from its week transition
+CONTEXT_KEYS = ("sheet", "day", "block", "from_week", "to_week", "exercise_id", "exercise_name")
+
+INVALID_WEIGHT = "Invalid weight value: weight must be positive"
+INVALID_TARGET = "Invalid target range format"
+
+SET_PREFIX = re.compile(r'^\d+x', re.IGNORECASE)
+RANGE = re.compile(r'(\d+)-(\d+)')
+SINGLE = re.compile(r'(\d+)')
+
+
+@lru_cache(maxsize=4096)
+def _parse_range_text(text: str) -> Optional[Tuple[int, int]]:
+    cleaned = SET_PREFIX.sub('', text, count=1)
+    match = RANGE.search(cleaned)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    match = SINGLE.search(cleaned)
+    if match:
+        value = int(match.group(1))
+        return value, value
+    if 'max' in cleaned.lower():
+        return 1, 100
+    return None
+
+
+def parse_rep_range(target: Any) -> Optional[Tuple[int, int]]:
+    """
+    (min, max) reps of a week-2 target, as SuggestionEngine._parseRepRange.
+
+    Accepts the target string ("3x18-20", "10ea", "Max") or the ``parsed``
+    object written by ``extract_workouts.py --parse-fields``.
+    """
+    if isinstance(target, dict):
+        if target.get("reps_min") is not None:
+            reps_max = target.get("reps_max")
+            return target["reps_min"], target["reps_min"] if reps_max is None else reps_max
+        return (1, 100) if target.get("to_failure") else None
+    if not target or not isinstance(target, str):
+        return None
+    return _parse_range_text(target)
+
+
+@lru_cache(maxsize=4096)
+def classify_exercise(exercise_id: str) -> str:
+    """"COMPOUND" or "ISOLATION", as SuggestionEngine._classifyExerciseById."""
+    if not exercise_id:
+        return "ISOLATION"
+    normalized = exercise_id.lower()
+    return "COMPOUND" if any(keyword in normalized for keyword in COMPOUND_KEYWORDS) else "ISOLATION"
+
+
+def _js_round(values: np.ndarray, scale: float = 1) -> np.ndarray:
+    """Math.round(x * scale) / scale (halves round up, like JavaScript)."""
+    return np.floor(values * scale + 0.5) / scale
+
+
+def _row_sums(values: np.ndarray) -> np.ndarray:
+    """Left-to-right row sums; the last cumsum column adds in the same order as Array.reduce."""
+    if values.shape[1] == 0:
+        return np.zeros(values.shape[0])
+    return np.cumsum(values, axis=1)[:, -1]
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """Pause the cyclic GC while building many small acyclic dicts."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _number(value: float):
+    """JSON number as JavaScript would print it (145 rather than 145.0)."""
+    return int(value) if value.is_integer() else value
+
+
+def suggest(items: List[Dict[str, Any]], calculated_at: Optional[str] = None) -> List[Optional[Dict[str, Any]]]:
+    """
+    Suggestions for many exercises in one vectorized pass.
+
+    Args:
+        items: Dicts with ``exercise_id``, ``sets`` (week-1 sets as
+            ``{"weight", "reps", "completed"?}``) and ``target`` (week-2 rep
+            target string or parsed fields)
+        calculated_at: Timestamp stamped on every suggestion (default: now)
+
+    Returns:
+        One entry per item: the suggestion dict, None where the JS engine
+        returns null, or ``{"error": message}`` where it throws
+    """
+    calculated_at = calculated_at or datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+
+    # Per-item checks the JS engine does before any math
+    rows, ranges = [], []
+    for i, item in enumerate(items):
+        sets = item.get("sets") or []
+        if not item.get("exercise_id") or not sets:
+            continue
+        if any("weight" in s and (s["weight"] is None or s["weight"] <= 0) for s in sets):
+            results[i] = {"error": INVALID_WEIGHT}
+            continue
+        rows.append(i)
+        ranges.append(parse_rep_range(item.get("target")))
+
+    if not rows:
+        return results
+
+    # Flatten every set once, then scatter into padded (exercise x set) arrays
+    counts = [len(items[i]["sets"]) for i in rows]
+    flat = [s for i in rows for s in items[i]["sets"]]
+    row_index = np.repeat(np.arange(len(rows)), counts)
+    col_index = np.arange(len(flat)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    shape = (len(rows), max(counts))
+    weight = np.zeros(shape)
+    reps = np.zeros(shape)
+    present = np.zeros(shape, dtype=bool)
+    has_completed = np.zeros(shape, dtype=bool)
+    completed = np.zeros(shape, dtype=bool)
+    weight[row_index, col_index] = [s.get("weight") or 0 for s in flat]
+    reps[row_index, col_index] = [s.get("reps") or 0 for s in flat]
+    present[row_index, col_index] = True
+    has_completed[row_index, col_index] = ["completed" in s for s in flat]
+    completed[row_index, col_index] = [bool(s.get("completed")) for s in flat]
+
+    # completedSets: positive weight and reps, not explicitly incomplete
+    keep = present & (weight > 0) & (reps > 0) & (~has_completed | completed)
+    kept = keep.sum(axis=1)
+
+    low = np.array([r[0] if r else 0 for r in ranges], dtype=float)[:, None]
+    high = np.array([r[1] if r else 0 for r in ranges], dtype=float)[:, None]
+    valid_range = np.array([r is not None and r[1] != 0 for r in ranges])
+
+    safe_kept = np.maximum(kept, 1)
+    avg_weight = _row_sums(np.where(keep, weight, 0)) / safe_kept
+    avg_reps = _row_sums(np.where(keep, reps, 0)) / safe_kept
+
+    # analyzePerformance: a set without a truthy ``completed`` counts as failed
+    failed = (keep & (~completed | (reps < low))).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(reps >= high, 100.0,
+                          np.where(reps <= low, 25.0, 25 + (reps - low) / (high - low) * 75))
+    avg_score = _row_sums(np.where(keep, scores, 0)) / safe_kept
+    level = np.select([failed > 0, avg_score >= 100, avg_score >= 75, avg_score >= 50],
+                      [4, 0, 1, 2], default=3)
+    kind = np.array([TYPES.index(classify_exercise(items[i]["exercise_id"])) for i in rows])
+
+    suggested = _js_round(avg_weight + AMOUNTS[kind, level], 2)
+    increase = suggested - avg_weight
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentage = np.where(avg_weight > 0, increase / avg_weight * 100, 0)
+
+    # Extra statistics for the nightly report
+    hits = (keep & (reps >= high)).sum(axis=1)
+    rep_std = np.sqrt(_row_sums(np.where(keep, (reps - avg_reps[:, None]) ** 2, 0)) / safe_kept)
+    weight_std = np.sqrt(_row_sums(np.where(keep, (weight - avg_weight[:, None]) ** 2, 0)) / safe_kept)
+
+    # Back to Python scalars in bulk; per-element NumPy indexing is slow
+    columns = zip(kept.tolist(), valid_range.tolist(), kind.tolist(), level.tolist(), keep.tolist(),
+                  _js_round(avg_weight, 2).tolist(), _js_round(avg_reps, 10).tolist(), suggested.tolist(),
+                  _js_round(increase, 2).tolist(), _js_round(percentage, 10).tolist(),
+                  _js_round(avg_score).tolist(), (hits / safe_kept).round(4).tolist(), failed.tolist(),
+                  rep_std.round(4).tolist(), weight_std.round(4).tolist())
+
+    for r, (n, valid, k, lv, kept_mask, avg_w, avg_r, sug, inc, pct, score, hit_rate, failed_sets,
+            rep_sd, weight_sd) in enumerate(columns):
+        if n == 0:
+            continue
+        i = rows[r]
+        if not valid:
+            results[i] = {"error": INVALID_TARGET}
+            continue
+
+        item = items[i]
+        _, reason, confidence = ADJUSTMENTS[TYPES[k]][LEVELS[lv]]
+        results[i] = {
+            "exerciseId": item["exercise_id"],
+            "week1Results": {
+                "sets": [s for s, keep_set in zip(item["sets"], kept_mask) if keep_set],
+                "avgWeight": _number(avg_w),
+                "avgReps": _number(avg_r),
+                "targetRange": f"{ranges[r][0]}-{ranges[r][1]}",
+            },
+            "week2Target": item.get("target"),
+            "suggestedWeight": _number(sug),
+            "increaseAmount": _number(inc),
+            "increasePercentage": _number(pct),
+            "reason": reason,
+            "confidence": confidence,
+            "warning": f"Based on {n} of {len(item['sets'])} sets" if n < 2 else None,
+            "note": "Suggestion based on 1 set" if n == 1 else None,
+            "calculatedAt": calculated_at,
+            "version": ENGINE_VERSION,
+            "stats": {
+                "level": LEVELS[lv],
+                "score": _number(score),
+                "hitRate": hit_rate,
+                "failedSets": failed_sets,
+                "repStd": rep_sd,
+                "weightStd": weight_sd,
+            },
+        }
+    return results
+
+
+def _logged_sets(results: Any) -> List[Dict[str, Any]]:
+    """Week-1 sets from a results cell; entries without a weight are left unweighted."""
+    if isinstance(results, list):
+        pairs = [(s["weight"], s["reps"]) for s in results]
+    else:
+        pairs = parse_results("" if results is None else str(results))
+    sets = []
+    for weight, reps in pairs:
+        logged = {"reps": reps, "completed": True}
+        if weight is not None:
+            logged["weight"] = weight
+        sets.append(logged)
+    return sets
+
+
+def week_transitions(workout_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    One suggestion item per exercise and consecutive week pair.
+
+    Standard sheets pair week N's results with week N+1's sets/reps (by
+    position, which is how the extractor lays out every week). Sheet4 pairs
+    each week range with the next (weeks 1-2 with weeks 3-4). Parsed fields
+    are used when present.
+    """
+    for sheet in workout_data["sheets"]:
+        for day in sheet["days"]:
+            context = {"sheet": sheet["sheet_name"], "day": day["day_name"]}
+            weeks = day.get("weeks", [])
+            for before, after in zip(weeks, weeks[1:]):
+                for previous, following in zip(before["exercises"], after["exercises"]):
+                    parsed = previous.get("parsed")
+                    target = following.get("parsed") or following.get("sets_reps")
+                    yield {
+                        **context,
+                        "from_week": str(before["week_number"]),
+                        "to_week": str(after["week_number"]),
+                        "exercise_id": previous["exercise_id"],
+                        "exercise_name": previous["exercise_name"],
+                        "sets": _logged_sets(parsed["results"] if parsed else previous.get("results")),
+                        "target": target,
+                    }
+
+            for block in day.get("blocks", []):
+                for position, exercise in enumerate(block["exercises"]):
+                    range_keys = week_range_keys(exercise)
+                    for first, second in zip(range_keys, range_keys[1:]):
+                        before, after = exercise[first], exercise[second]
+                        parsed = before.get("parsed")
+                        yield {
+                            **context,
+                            "block": block["block_name"],
+                            "from_week": sheet4_week(first),
+                            "to_week": sheet4_week(second),
+                            # Sheet4 has no exercise IDs; the block name and
+                            # position stand in for one, as in the NDJSON records
+                            "exercise_id": f"{block['block_name']}#{position}",
+                            "exercise_name": exercise["exercise_name"],
+                            "sets": _logged_sets(parsed["results"] if parsed else before.get("results")),
+                            "target": after.get("parsed") or after.get("reps"),
+                        }
+
+
+def suggest_many(workouts: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Suggestions for every week transition with logged results, for many
+    athletes in a single vectorized batch.
+
+    Args:
+        workouts: Athlete name -> extracted workout data
+    """
+    entries: List[Dict[str, Any]] = []
+    items: List[Dict[str, Any]] = []
+    with _gc_paused():
+        for athlete, workout_data in workouts.items():
+            for item in week_transitions(workout_data):
+                if item["sets"]:
+                    items.append(item)
+                    entries.append({"athlete": athlete, **{key: item[key] for key in CONTEXT_KEYS if key in item}})
+
+        suggestions = []
+        for entry, suggestion in zip(entries, suggest(items)):
+            if suggestion is not None:
+                entry["suggestion"] = suggestion
+                suggestions.append(entry)
+    return suggestions
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Precompute progressive-overload suggestions for extracted workouts")
+    parser.add_argument("inputs", nargs="*",
+                        default=["/Users/britainsaluri/workout-tracker/src/workout-data.json"],
+                        help="workout-data.json files, or directories of them (one per athlete)")
+    parser.add_argument("-o", "--output", default="suggestions.json", help="Where to write the suggestions")
+    args = parser.parse_args()
+
+    print("🏋️  Computing overload suggestions...")
+    workouts = {path.stem: data for path, data in load_workouts(args.inputs)}
+    print(f"📂 Inputs: {len(workouts)} file(s)")
+
+    started = time.perf_counter()
+    suggestions = suggest_many(workouts)
+    elapsed = time.perf_counter() - started
+
+    atomic_write(args.output, json.dumps({"version": ENGINE_VERSION, "suggestions": suggestions},
+                                         indent=2, ensure_ascii=False))
+
+    errors = sum(1 for s in suggestions if "error" in s["suggestion"])
+    print(f"✅ {len(suggestions)} suggestion(s) ({errors} invalid) in {elapsed * 1000:.1f} ms -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
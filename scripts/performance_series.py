@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Performance Time Series
+Merges many athletes' extraction outputs into per-exercise time series of
+logged performance. One row per session, i.e. per athlete, program, week,
+day and exercise with at least one logged set:
+
+    sets        sets parsed from ``results``
+    reps        total reps
+    top_weight  heaviest set (NaN when every set is bodyweight)
+    volume      sum of weight x reps over weighted sets (NaN when none)
+    e1rm        best estimated one-rep max over the sets (Epley,
+                weight x (1 + reps / 30); a single rep counts as is)
+
+Each input file is one athlete, named by its file stem. Files are read in
+one pass (optionally across worker processes). Per file, the sets become
+flat NumPy arrays that are reduced per session with ``reduceat``. The
+parent maps every file's string codes onto shared tables, sorts all rows
+by exercise, athlete, program, week and day, and writes one compressed
+``.npz``. The rows of exercise ``i`` are
+``offsets[i]:offsets[i + 1]``; ``PerformanceSeries`` loads the file and
+slices it.
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from atomic_write import atomic_write
+from field_parsers import parse_results
+from lookup_index import sheet4_week
+from ndjson_sink import week_range_keys
+from workout_files import input_files, load_workout
+
+SERIES_FORMAT = "performance-series"
+SERIES_VERSION = 1
+
+# String tables; each session column of the same name holds codes into it
+TABLES = ("athlete", "program", "exercise", "week")
+METRICS = ("sets", "reps", "top_weight", "volume", "e1rm")
+COLUMNS = TABLES + ("week_start", "day") + METRICS
+DTYPES = {"athlete": np.int32, "program": np.int32, "exercise": np.int32, "week": np.int32,
+          "week_start": np.int16, "day": np.int16, "sets": np.int16, "reps": np.int32,
+          "top_weight": np.float32, "volume": np.float32, "e1rm": np.float32}
+
+
+def _intern(table: Dict[str, int], value: str) -> int:
+    code = table.get(value)
+    if code is None:
+        code = table[value] = len(table)
+    return code
+
+
+def _empty_sessions(tables: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+    return {"tables": {kind: list(table) for kind, table in tables.items()},
+            **{column: np.zeros(0, DTYPES[column]) for column in COLUMNS if column != "athlete"}}
+
+
+def file_sessions(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Session rows of one extraction output.
+
+    Returns:
+        ``tables`` (this file's program, exercise and week strings) and one
+        array per session column; table columns hold codes into ``tables``.
+        None when the file is not workout data (see workout_files.py).
+    """
+    workout_data = load_workout(Path(path))
+    if workout_data is None:
+        return None
+
+    tables: Dict[str, Dict[str, int]] = {"program": {}, "exercise": {}, "week": {}}
+    keys: List[tuple] = []  # (program, exercise, week, week_start, day) per session
+    set_session: List[int] = []
+    weights: List[float] = []
+    reps: List[int] = []
+
+    def add(program: int, day: int, week: str, week_start: int, name: str, results: Any):
+        logged = parse_results("" if results is None else str(results))
+        if not logged:
+            return
+        session = len(keys)
+        keys.append((program, _intern(tables["exercise"], name), _intern(tables["week"], week), week_start, day))
+        for weight, count in logged:
+            set_session.append(session)
+            weights.append(np.nan if weight is None else weight)
+            reps.append(count)
+
+    for sheet in workout_data["sheets"]:
+        program = _intern(tables["program"], sheet.get("program_name") or sheet["sheet_name"])
+        for d, day in enumerate(sheet["days"], start=1):
+            for week in day.get("weeks", []):
+                for exercise in week["exercises"]:
+                    add(program, d, str(week["week_number"]), week["week_number"],
+                        exercise["exercise_name"], exercise.get("results"))
+            for block in day.get("blocks", []):
+                for exercise in block["exercises"]:
+                    for range_key in week_range_keys(exercise):
+                        label = sheet4_week(range_key)
+                        add(program, d, label, int(label.split("-")[0]),
+                            exercise["exercise_name"], exercise[range_key].get("results"))
+
+    if not keys:
+        return _empty_sessions(tables)
+
+    session = np.asarray(set_session, dtype=np.int64)
+    weight = np.asarray(weights, dtype=np.float64)
+    count = np.asarray(reps, dtype=np.float64)
+    # Sets were appended session by session, so every session is one contiguous run
+    starts = np.flatnonzero(np.r_[True, session[1:] != session[:-1]])
+    top_weight = np.fmax.reduceat(weight, starts)
+    volume = np.add.reduceat(np.nan_to_num(weight * count), starts)
+    e1rm = np.fmax.reduceat(np.where(count == 1, weight, weight * (1 + count / 30)), starts)
+
+    key_columns = np.asarray(keys, dtype=np.int64).T
+    return {
+        "tables": {kind: list(table) for kind, table in tables.items()},
+        **{column: values.astype(DTYPES[column])
+           for column, values in zip(("program", "exercise", "week", "week_start", "day"), key_columns)},
+        "sets": np.diff(np.r_[starts, len(session)]).astype(DTYPES["sets"]),
+        "reps": np.add.reduceat(count, starts).astype(DTYPES["reps"]),
+        "top_weight": top_weight.astype(DTYPES["top_weight"]),
+        "volume": np.where(np.isnan(top_weight), np.nan, volume).astype(DTYPES["volume"]),
+        "e1rm": e1rm.astype(DTYPES["e1rm"]),
+    }
+
+
+class SeriesBuilder:
+    """Collects per-file session arrays under shared string tables."""
+
+    def __init__(self):
+        self.tables: Dict[str, Dict[str, int]] = {kind: {} for kind in TABLES}
+        self._chunks: List[Dict[str, np.ndarray]] = []
+
+    def add(self, athlete: str, sessions: Dict[str, Any]):
+        """Add one file's ``file_sessions()`` result for ``athlete``."""
+        chunk = {column: sessions[column] for column in COLUMNS if column not in TABLES}
+        for kind in ("program", "exercise", "week"):
+            # Local code -> shared code, applied to the whole column at once
+            remap = np.array([_intern(self.tables[kind], value) for value in sessions["tables"][kind]],
+                             dtype=DTYPES[kind])
+            chunk[kind] = remap[sessions[kind]] if len(remap) else sessions[kind]
+        chunk["athlete"] = np.full(len(chunk["exercise"]), _intern(self.tables["athlete"], athlete),
+                                   dtype=DTYPES["athlete"])
+        self._chunks.append(chunk)
+
+    def build(self) -> Dict[str, np.ndarray]:
+        """All sessions sorted by exercise, athlete, program, week and day, plus ``offsets``."""
+        columns = {column: np.concatenate([chunk[column] for chunk in self._chunks] or [np.zeros(0, DTYPES[column])])
+                   for column in COLUMNS}
+        order = np.lexsort(tuple(columns[column] for column in
+                                 ("day", "week_start", "program", "athlete", "exercise")))
+        arrays = {column: values[order] for column, values in columns.items()}
+        arrays["offsets"] = np.searchsorted(arrays["exercise"], np.arange(len(self.tables["exercise"]) + 1))
+        for kind in TABLES:
+            arrays[f"{kind}_names"] = np.array(list(self.tables[kind]), dtype=str)
+        return arrays
+
+
+def write_series(arrays: Dict[str, np.ndarray], output_path: str):
+    """Write the arrays as one compressed ``.npz`` (atomically)."""
+    # A file object keeps numpy from appending ".npz" to the name
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, format=np.array(SERIES_FORMAT), version=np.array(SERIES_VERSION), **arrays)
+    atomic_write(output_path, buffer.getvalue())
+
+
+def aggregate(paths: List[str], output_path: Optional[str] = None, workers: int = 1) -> Dict[str, np.ndarray]:
+    """
+    Build the series of many extraction outputs (one athlete per file).
+
+    Args:
+        paths: workout-data JSON files; the file stem names the athlete
+        output_path: Also write the arrays to this ``.npz`` file
+        workers: Worker processes reading and reducing the files (1 runs in-process)
+
+    Returns:
+        The arrays as written (see module docstring)
+    """
+    builder = SeriesBuilder()
+    if workers == 1:
+        for path in paths:
+            sessions = file_sessions(path)
+            if sessions is not None:
+                builder.add(Path(path).stem, sessions)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() keeps input order, so codes do not depend on scheduling
+            for path, sessions in zip(paths, pool.map(file_sessions, paths, chunksize=16)):
+                if sessions is not None:
+                    builder.add(Path(path).stem, sessions)
+
+    arrays = builder.build()
+    if output_path:
+        write_series(arrays, output_path)
+    return arrays
+
+
+class PerformanceSeries:
+    """Lookups in a written series file."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+        self.names = {kind: [str(name) for name in arrays[f"{kind}_names"]] for kind in TABLES}
+        self._codes = {kind: {name: code for code, name in enumerate(names)} for kind, names in self.names.items()}
+
+    @classmethod
+    def load(cls, path: str) -> "PerformanceSeries":
+        with np.load(path) as data:
+            if str(data["format"]) != SERIES_FORMAT:
+                raise ValueError(f"{path} is not a {SERIES_FORMAT} file")
+            return cls({key: data[key] for key in data.files})
+
+    def exercise(self, name: str, athlete: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        One exercise's sessions (optionally of one athlete) as column arrays,
+        ordered by athlete, program, week and day. Unknown names give empty arrays.
+        """
+        code = self._codes["exercise"].get(name)
+        start, end = (0, 0) if code is None else self.arrays["offsets"][code:code + 2]
+        rows = {column: self.arrays[column][start:end] for column in COLUMNS}
+        if athlete is not None:
+            mask = rows["athlete"] == self._codes["athlete"].get(athlete, -1)
+            rows = {column: values[mask] for column, values in rows.items()}
+        return rows
+
+    def records(self, name: str, athlete: Optional[str] = None) -> List[Dict[str, Any]]:
+        """``exercise()`` rows as dicts with names instead of codes (NaN -> None)."""
+        rows = self.exercise(name, athlete)
+        records = []
+        for i in range(len(rows["exercise"])):
+            record = {}
+            for column in COLUMNS:
+                value = rows[column][i].item()
+                if column in TABLES:
+                    value = self.names[column][value]
+                elif isinstance(value, float):
+                    value = None if np.isnan(value) else round(value, 2)
+                record[column] = value
+            records.append(record)
+        return records
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Aggregate extraction outputs into per-exercise time series")
+    parser.add_argument("inputs", nargs="+", help="workout-data.json files, or directories of them (one per athlete)")
+    parser.add_argument("-o", "--output", default="performance-series.npz", help="Compressed NumPy archive to write")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Worker processes reading the files")
+    parser.add_argument("--exercise", metavar="NAME", help="Afterwards, print this exercise's series")
+    parser.add_argument("--athlete", help="Only print this athlete's sessions (with --exercise)")
+    args = parser.parse_args()
+
+    files = [str(path) for path in input_files(args.inputs)]
+    print("🏋️  Aggregating performance series...")
+    print(f"📂 Inputs: {len(files)} file(s)")
+
+    started = time.perf_counter()
+    arrays = aggregate(files, args.output, args.workers)
+    elapsed = time.perf_counter() - started
+    print(f"✅ {len(arrays['exercise']):,} sessions of {len(arrays['exercise_names']):,} exercises from "
+          f"{len(arrays['athlete_names']):,} athlete(s) in {elapsed:.2f}s -> {args.output} "
+          f"({os.path.getsize(args.output) / 1e6:.1f} MB)")
+
+    if args.exercise:
+        records = PerformanceSeries(arrays).records(args.exercise, args.athlete)
+        print(f"\n📊 {args.exercise}: {len(records)} session(s)")
+        for r in records:
+            print(f"  {r['athlete']} {r['program']} week {r['week']} day {r['day']}: {r['sets']} sets, "
+                  f"{r['reps']} reps, top {r['top_weight']}, volume {r['volume']}, e1RM {r['e1rm']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Publish Content-Hashed Data Artifacts
+Copies extraction outputs into the static site under content-hashed names
+(``data/workout-data.<hash>.json``) with a pre-gzipped sibling, and writes
+a manifest the app and the service worker use to find them:
+
+    data-manifest.json      logical name -> url, gzip_url, sha256, bytes,
+                            gzip_bytes; plus a ``revision`` over all hashes
+    precache-manifest.js    the same object as ``self.PRECACHE_MANIFEST``,
+                            imported by sw.js
+
+A hashed file never changes, so it can be cached forever and a client
+downloads it again only when its content changed. The service worker
+precaches every URL in the manifest under a cache named after the
+revision, copying files it already holds from older caches instead of
+fetching them again (see src/sw.js).
+
+Publishing merges into the existing manifest: only the given files are
+replaced. Hashed files that neither the new nor the previous manifest
+lists are deleted, so clients still running the previous service worker
+keep working until they update.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Set
+
+from atomic_write import atomic_write
+
+MANIFEST_FORMAT = "workout-precache"
+MANIFEST_VERSION = 1
+MANIFEST_NAME = "data-manifest.json"
+PRECACHE_SCRIPT = "precache-manifest.js"
+DATA_DIR = "data"
+HASH_LENGTH = 12
+
+# Names written by publish(); anything else in the data directory is left alone
+HASHED_NAME = re.compile(r'^.+\.[0-9a-f]{%d}\.[A-Za-z0-9]+(\.gz)?$' % HASH_LENGTH)
+
+
+def hashed_name(name: str, digest: str) -> str:
+    """"workout-data.json" + digest -> "workout-data.<first 12 hex digits>.json"."""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def load_manifest(site_dir: str) -> Optional[Dict[str, Any]]:
+    """The published manifest of ``site_dir``, or None."""
+    try:
+        with open(os.path.join(site_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return manifest if manifest.get("format") == MANIFEST_FORMAT else None
+
+
+def manifest_revision(files: Dict[str, Dict[str, Any]]) -> str:
+    """Digest of every published name and content hash."""
+    payload = json.dumps(sorted((name, entry["sha256"]) for name, entry in files.items()))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+
+
+def publish_file(path: str, site_dir: str, data_dir: str = DATA_DIR) -> Dict[str, Any]:
+    """
+    Write one file's hashed copy and gzip sibling (skipped when already there).
+
+    Returns:
+        Its manifest entry
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    url = f"{data_dir}/{hashed_name(os.path.basename(path), digest)}"
+    target = os.path.join(site_dir, url)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+
+    # Same name, same content: earlier publishes are kept as they are
+    if not os.path.exists(target):
+        atomic_write(target, data)
+    if not os.path.exists(target + ".gz"):
+        # mtime=0 keeps the .gz bytes stable across runs
+        atomic_write(target + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+
+    return {
+        "url": url,
+        "gzip_url": url + ".gz",
+        "sha256": digest,
+        "bytes": len(data),
+        "gzip_bytes": os.path.getsize(target + ".gz"),
+    }
+
+
+def publish(paths: Iterable[str], site_dir: str, data_dir: str = DATA_DIR) -> Dict[str, Any]:
+    """
+    Publish extraction outputs into a static site directory.
+
+    Args:
+        paths: Output files (e.g. workout-data.json and its index sidecar);
+            each is published under its base name
+        site_dir: Static site root (the directory sw.js is served from)
+        data_dir: Sub-directory for the hashed files
+
+    Returns:
+        The manifest that was written
+    """
+    previous = load_manifest(site_dir)
+    files: Dict[str, Dict[str, Any]] = {}
+    if previous is not None:
+        # Entries of files not published this time stay, if still on disk
+        files = {name: entry for name, entry in previous["files"].items()
+                 if os.path.exists(os.path.join(site_dir, entry["url"]))}
+    for path in paths:
+        files[os.path.basename(path)] = publish_file(path, site_dir, data_dir)
+
+    files = dict(sorted(files.items()))
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "version": MANIFEST_VERSION,
+        "revision": manifest_revision(files),
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "files": files,
+    }
+    if previous is not None and previous.get("revision") == manifest["revision"]:
+        # Nothing changed: leave both manifests (and the service worker) untouched
+        return previous
+
+    text = json.dumps(manifest, indent=2, ensure_ascii=False)
+    # Data files first, then the script sw.js imports, then the app manifest
+    atomic_write(os.path.join(site_dir, PRECACHE_SCRIPT),
+                 f"// Generated by scripts/publish_artifacts.py; do not edit.\n"
+                 f"self.PRECACHE_MANIFEST = {text};\n")
+    atomic_write(os.path.join(site_dir, MANIFEST_NAME), text)
+
+    referenced = _urls(manifest) | (_urls(previous) if previous is not None else set())
+    _prune(site_dir, data_dir, referenced)
+    return manifest
+
+
+def _urls(manifest: Dict[str, Any]) -> Set[str]:
+    return {url for entry in manifest["files"].values() for url in (entry["url"], entry["gzip_url"])}
+
+
+def _prune(site_dir: str, data_dir: str, referenced: Set[str]):
+    """Delete hashed files no manifest generation still refers to."""
+    directory = os.path.join(site_dir, data_dir)
+    for name in os.listdir(directory):
+        if HASHED_NAME.match(name) and f"{data_dir}/{name}" not in referenced:
+            os.unlink(os.path.join(directory, name))
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Publish extraction outputs under content-hashed names")
+    parser.add_argument("paths", nargs="+", help="Output files to publish (e.g. src/workout-data.json)")
+    parser.add_argument("--site", default="src", help="Static site root served with sw.js (default: src)")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Sub-directory for hashed files (default: data)")
+    args = parser.parse_args()
+
+    print("🏋️  Publishing data artifacts...")
+    print(f"📂 Site: {args.site}")
+    print("-" * 80)
+
+    previous = load_manifest(args.site)
+    manifest = publish(args.paths, args.site, args.data_dir)
+    unchanged = previous is not None and previous["revision"] == manifest["revision"]
+
+    for name, entry in manifest["files"].items():
+        print(f"  {name:<32} -> {entry['url']}  ({entry['bytes']:,} B, {entry['gzip_bytes']:,} B gzipped)")
+    if unchanged:
+        print(f"\n✅ Already published (revision {manifest['revision']})")
+    else:
+        print(f"\n✅ Revision {manifest['revision']} written to {os.path.join(args.site, MANIFEST_NAME)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
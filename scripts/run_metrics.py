@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Extraction Run Metrics
+Per-phase instrumentation for extraction runs: wall time, rows processed
+and tracemalloc peak for each phase (load_workbook, one entry per sheet,
+write_json, ...), plus the time spent in the per-row parse functions
+(``_add_exercise_to_day``, ``_parse_sheet4_exercise``) inside a sheet.
+
+Extractors take a recorder and default to NO_METRICS, whose phase() hands
+back one shared no-op context manager. Row counting and parse timing are
+attached by wrapping the iterator and the bound methods only when a
+recorder is enabled, so a disabled run executes the same per-row code as
+before.
+
+Enable with ``--metrics`` or ``WORKOUT_METRICS=1``; ``time`` instead of
+``full``/``1`` skips tracemalloc, which slows allocation-heavy code down.
+The report is written to ``<output>.metrics.json``.
+"""
+
+import json
+import os
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from atomic_write import atomic_write
+
+METRICS_ENV = "WORKOUT_METRICS"
+METRICS_FORMAT = "workout-metrics"
+METRICS_VERSION = 1
+# --metrics values: "full" also traces memory, "time" only measures time
+MODES = ("full", "time")
+
+
+def metrics_path_for(output_path: str) -> str:
+    """Report path: workout-data.json -> workout-data.metrics.json."""
+    root, _ = os.path.splitext(output_path)
+    return f"{root}.metrics.json"
+
+
+def metrics_mode(flag: Optional[str] = None) -> Optional[str]:
+    """
+    Resolve the metrics mode from the command-line flag, then the environment.
+
+    Returns:
+        "full", "time", or None when metrics are off
+    """
+    value = flag if flag is not None else os.environ.get(METRICS_ENV, "")
+    value = value.strip().lower()
+    if value in ("", "0", "false", "no", "off"):
+        return None
+    if value == "time":
+        return "time"
+    return "full"
+
+
+class Recorder:
+    """Collects phase timings for one extraction run."""
+
+    enabled = True
+
+    def __init__(self, extractor: str, memory: bool = True):
+        self.extractor = extractor
+        self.phases: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._started = time.perf_counter()
+        self._peak = 0
+        # Only stop tracemalloc if this recorder started it
+        self._owns_tracing = memory and not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+        self.memory = memory and tracemalloc.is_tracing()
+
+    @contextmanager
+    def phase(self, name: str, sheet: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Time a phase. Nested phases are recorded as their own entries and
+        count towards the enclosing phase's peak.
+
+        ``peak_bytes`` is the highest traced memory during the phase,
+        including what earlier phases still hold; ``net_bytes`` is how much
+        the phase left allocated.
+        """
+        entry: Dict[str, Any] = {"name": name}
+        if sheet is not None:
+            entry["sheet"] = sheet
+        entry["seconds"] = 0.0
+        entry["_peak"] = 0
+        self.phases.append(entry)
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            entry["_current"] = current
+            # reset_peak() below would lose the enclosing phase's peak so far
+            self._carry_peak(peak)
+            tracemalloc.reset_peak()
+        self._stack.append(entry)
+        started = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry["seconds"] = round(time.perf_counter() - started, 6)
+            self._stack.pop()
+            peak = entry.pop("_peak")
+            started_bytes = entry.pop("_current", None)
+            if self.memory:
+                current, traced_peak = tracemalloc.get_traced_memory()
+                peak = max(peak, traced_peak)
+                entry["peak_bytes"] = peak
+                entry["net_bytes"] = current - started_bytes
+                self._carry_peak(peak)
+            if "functions" in entry:
+                # Time in the sheet loop that was not spent in the parse functions
+                parse_seconds = sum(f["seconds"] for f in entry["functions"].values())
+                entry["iteration_seconds"] = round(entry["seconds"] - parse_seconds, 6)
+                for stats in entry["functions"].values():
+                    stats["seconds"] = round(stats["seconds"], 6)
+
+    def _carry_peak(self, peak: int):
+        if self._stack:
+            self._stack[-1]["_peak"] = max(self._stack[-1]["_peak"], peak)
+        self._peak = max(self._peak, peak)
+
+    def count_rows(self, rows: Iterable) -> Iterator:
+        """Pass rows through, adding them to the innermost open phase's ``rows``."""
+        entry = self._stack[-1]
+        entry.setdefault("rows", 0)
+        for row in rows:
+            entry["rows"] += 1
+            yield row
+
+    def timed(self, func: Callable, name: Optional[str] = None) -> Callable:
+        """Wrap a per-row function so its calls and time add up in the open phase."""
+        name = name or func.__name__
+        stack = self._stack
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            started = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = clock() - started
+                stats = stack[-1].setdefault("functions", {}).setdefault(name, {"calls": 0, "seconds": 0.0})
+                stats["calls"] += 1
+                stats["seconds"] += elapsed
+
+        return wrapper
+
+    def instrument(self, obj: Any, *method_names: str):
+        """Replace bound methods on one instance with timed() wrappers."""
+        for method_name in method_names:
+            setattr(obj, method_name, self.timed(getattr(obj, method_name), method_name))
+
+    def report(self, **extra: Any) -> Dict[str, Any]:
+        """Machine-readable report; ``extra`` adds run details (input, output, reader, ...)."""
+        report = {
+            "format": METRICS_FORMAT,
+            "version": METRICS_VERSION,
+            "extractor": self.extractor,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "memory_traced": self.memory,
+            **extra,
+            "total_seconds": round(time.perf_counter() - self._started, 6),
+            "phases": self.phases,
+        }
+        if self.memory:
+            report["peak_bytes"] = max(self._peak, tracemalloc.get_traced_memory()[1])
+        return report
+
+    def write(self, path: str, **extra: Any) -> Dict[str, Any]:
+        """Write the report atomically and stop tracing."""
+        report = self.report(**extra)
+        self.close()
+        atomic_write(path, json.dumps(report, indent=2))
+        print(f"⏱️  Metrics saved to {path}")
+        return report
+
+    def close(self):
+        """Stop tracemalloc if this recorder started it."""
+        if self._owns_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._owns_tracing = False
+        self.memory = False
+
+
+class _DisabledRecorder:
+    """Stand-in used when metrics are off: every hook is a no-op."""
+
+    enabled = False
+    _NULL_PHASE = nullcontext()
+
+    def phase(self, name: str, sheet: Optional[str] = None):
+        return self._NULL_PHASE
+
+    def count_rows(self, rows: Iterable) -> Iterable:
+        return rows
+
+    def instrument(self, obj: Any, *method_names: str):
+        pass
+
+    def close(self):
+        pass
+
+
+NO_METRICS = _DisabledRecorder()
+
+
+def recorder_for(extractor: str, mode: Optional[str]):
+    """A Recorder for ``mode`` ("full"/"time"), or NO_METRICS when mode is None."""
+    if mode is None:
+        return NO_METRICS
+    return Recorder(extractor, memory=(mode == "full"))
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Sharded Workout Output
+Splits an output into one file per program and week, next to the output,
+plus a small catalog the app reads first:
+
+    workout-data.catalog.json
+        programs[sheet].weeks[week] -> file, bytes, exercises
+    workout-data.shard.<sheet>.<week>.json
+        the output restricted to that program and week
+
+A shard has the same shape as the document it was cut from. For an
+extract_workouts.py output, it is ``{"program_name", "sheets": [sheet]}``
+with every day kept (so day positions still match) but only that week's
+entry in ``weeks``, or only that week range in each Sheet4 exercise.
+For a Sheet1 output (extract_sheet1.py), it is the document with one entry
+in ``weeks``. Weeks are keyed like the lookup index: "1", "2", ... and
+"1-2"/"3-4" on Sheet4.
+
+A session shows one program, one week and one day, so its first paint
+needs the catalog and one shard instead of the whole file. Shards are
+written from the in-memory structure right after the output, by
+``--shards`` on extract_workouts.py and extract_sheet1.py.
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+from typing import Any, Dict, Iterator, List, Tuple
+
+from atomic_write import atomic_write
+from lookup_index import sheet4_week
+from ndjson_sink import block_week_ranges
+
+CATALOG_FORMAT = "workout-catalog"
+CATALOG_VERSION = 1
+
+
+def catalog_path_for(output_path: str) -> str:
+    """Sidecar path: workout-data.json -> workout-data.catalog.json."""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}.catalog{ext or '.json'}"
+
+
+def shard_path_for(output_path: str, program_key: str, week: str) -> str:
+    """workout-data.json, "Sheet1", "2" -> workout-data.shard.Sheet1.2.json."""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}.shard.{program_key}.{week}{ext or '.json'}"
+
+
+def _program_keys(names: List[str]) -> List[str]:
+    """File-name-safe, unique keys for sheet names ("Week 1 Pump" -> "Week-1-Pump")."""
+    keys: List[str] = []
+    for name in names:
+        key = re.sub(r'[^A-Za-z0-9_-]+', '-', name).strip('-') or "program"
+        base, n = key, 2
+        while key in keys:
+            key, n = f"{base}-{n}", n + 1
+        keys.append(key)
+    return keys
+
+
+def _ordered(keys) -> List[Any]:
+    return list(dict.fromkeys(keys))
+
+
+def _sheet_weeks(sheet: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any], int]]:
+    """(week key, sheet restricted to that week, exercise count) for one output sheet."""
+    days = sheet["days"]
+    if any("blocks" in day for day in days):
+        ranges = _ordered(key for day in days for key in block_week_ranges(day["blocks"]))
+        for range_key in ranges:
+            count = 0
+            shard_days = []
+            for day in days:
+                blocks = []
+                for block in day["blocks"]:
+                    exercises = [{"exercise_name": exercise["exercise_name"], range_key: exercise[range_key]}
+                                 for exercise in block["exercises"] if range_key in exercise]
+                    count += len(exercises)
+                    blocks.append({**block, "exercises": exercises})
+                shard_days.append({**day, "blocks": blocks})
+            yield sheet4_week(range_key), {**sheet, "days": shard_days}, count
+    else:
+        numbers = _ordered(week["week_number"] for day in days for week in day["weeks"])
+        for number in numbers:
+            shard_days = [{**day, "weeks": [week for week in day["weeks"] if week["week_number"] == number]}
+                          for day in days]
+            count = sum(len(week["exercises"]) for day in shard_days for week in day["weeks"])
+            yield str(number), {**sheet, "days": shard_days}, count
+
+
+def _sheet1_names(workout_data: Dict[str, Any]) -> Tuple[str, str, List[str]]:
+    """
+    (sheet name, program name, day names) of a Sheet1 output: extract_sheet1.py
+    writes ``program``/``dayName``, src/sheet1-workout-data.json has
+    ``sheet_name``/``program_name``/``day_name``.
+    """
+    program_name = workout_data.get("program_name", workout_data.get("program"))
+    days = _ordered(day.get("day_name", day.get("dayName"))
+                    for week in workout_data["weeks"] for day in week["days"])
+    return workout_data.get("sheet_name", "Sheet1"), program_name, days
+
+
+def build_shards(workout_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Cut an output into program/week shards.
+
+    Args:
+        workout_data: An extract_workouts.py structure (``sheets``) or an
+            Sheet1 structure (``weeks``)
+
+    Yields:
+        {"program", "key", "program_name", "days", "week", "exercises", "shard"}
+        for every program and week, in document order; ``key`` is the
+        sheet name made safe for file names
+    """
+    if "sheets" in workout_data:
+        sheets = workout_data["sheets"]
+        for key, sheet in zip(_program_keys([s["sheet_name"] for s in sheets]), sheets):
+            days = [day["day_name"] for day in sheet["days"]]
+            for week, shard_sheet, count in _sheet_weeks(sheet):
+                yield {"program": sheet["sheet_name"], "key": key, "program_name": sheet["program_name"],
+                       "days": days, "week": week, "exercises": count,
+                       "shard": {**workout_data, "sheets": [shard_sheet]}}
+    else:
+        sheet_name, program_name, days = _sheet1_names(workout_data)
+        [key] = _program_keys([sheet_name])
+        for week in workout_data["weeks"]:
+            yield {"program": sheet_name, "key": key, "program_name": program_name, "days": days,
+                   "week": str(week["week"]),
+                   "exercises": sum(len(day["exercises"]) for day in week["days"]),
+                   "shard": {**workout_data, "weeks": [week]}}
+
+
+def _write_json(data: Any, path: str) -> int:
+    """Write compact JSON atomically; returns the size."""
+    text = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    atomic_write(path, text)
+    return len(text)
+
+
+def write_shards(workout_data: Dict[str, Any], output_path: str) -> Dict[str, Any]:
+    """
+    Write the shards and catalog of an output next to it.
+
+    Shard files the new catalog does not list (weeks or programs that are
+    gone) are deleted.
+
+    Args:
+        workout_data: The structure written to output_path
+        output_path: Path of the full output (need not exist)
+
+    Returns:
+        The catalog
+    """
+    programs: Dict[str, Any] = {}
+    written = set()
+    for entry in build_shards(workout_data):
+        program = programs.setdefault(entry["program"], {
+            "program_name": entry["program_name"], "days": entry["days"], "weeks": {}})
+        path = shard_path_for(output_path, entry["key"], entry["week"])
+        program["weeks"][entry["week"]] = {"file": os.path.basename(path),
+                                           "bytes": _write_json(entry["shard"], path),
+                                           "exercises": entry["exercises"]}
+        written.add(os.path.abspath(path))
+
+    catalog = {
+        "format": CATALOG_FORMAT,
+        "version": CATALOG_VERSION,
+        "source": {"file": os.path.basename(output_path),
+                   "bytes": os.path.getsize(output_path) if os.path.exists(output_path) else None},
+        "program_name": workout_data.get("program_name", workout_data.get("program")),
+        "programs": programs,
+    }
+    catalog_path = catalog_path_for(output_path)
+    _write_json(catalog, catalog_path)
+
+    root, ext = os.path.splitext(output_path)
+    for path in glob.glob(glob.escape(f"{root}.shard.") + "*" + (ext or ".json")):
+        if os.path.abspath(path) not in written:
+            os.unlink(path)
+
+    shards = sum(len(program["weeks"]) for program in programs.values())
+    print(f"✅ {shards} shards and catalog saved to {catalog_path}")
+    return catalog
+
+
+def shard_paths(catalog: Dict[str, Any], output_path: str) -> List[str]:
+    """Paths of every shard listed in a catalog written for output_path."""
+    directory = os.path.dirname(output_path)
+    return [os.path.join(directory, week["file"])
+            for program in catalog["programs"].values() for week in program["weeks"].values()]
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Split an existing workout output into program/week shards")
+    parser.add_argument("input", help="workout-data.json or sheet1-workout-data.json")
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        workout_data = json.load(f)
+    catalog = write_shards(workout_data, args.input)
+
+    for name, program in catalog["programs"].items():
+        sizes = ", ".join(f"{week} ({entry['bytes']:,} B)" for week, entry in program["weeks"].items())
+        print(f"  {name}: {sizes}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
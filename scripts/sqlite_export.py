@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+SQLite Export
+Normalized tables for extracted workout data, so questions like "every
+Barbell Bench result across all athletes and weeks" are indexed lookups
+instead of walks over every JSON file:
+
+    athletes   one row per workout-data structure (one workbook / athlete)
+    programs   one per sheet                         -> athletes
+    days       one per day, by 1-based position      -> programs
+    weeks      week "1", "2", ... or Sheet4 "1-2"    -> days
+    exercises  one per exercise and week, raw text fields plus the
+               parsed prescription (see field_parsers.py)  -> weeks
+    sets       logged sets parsed from ``results``   -> exercises
+
+Row IDs are assigned here rather than by SQLite, so each table is written
+with one executemany() per athlete, all inside a single transaction. The
+database uses WAL mode; the secondary indexes are built after the rows are
+in, which is faster than maintaining them during the load. Re-exporting an
+athlete replaces their rows.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from field_parsers import parsed_fields
+from lookup_index import sheet4_week
+from ndjson_sink import block_week_ranges
+from workout_files import input_files, load_workout
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS athletes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    source TEXT,
+    program_name TEXT
+);
+CREATE TABLE IF NOT EXISTS programs (
+    id INTEGER PRIMARY KEY,
+    athlete_id INTEGER NOT NULL REFERENCES athletes(id),
+    position INTEGER NOT NULL,
+    sheet TEXT NOT NULL,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS days (
+    id INTEGER PRIMARY KEY,
+    program_id INTEGER NOT NULL REFERENCES programs(id),
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    week_range TEXT
+);
+CREATE TABLE IF NOT EXISTS weeks (
+    id INTEGER PRIMARY KEY,
+    day_id INTEGER NOT NULL REFERENCES days(id),
+    week TEXT NOT NULL,
+    week_start INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exercises (
+    id INTEGER PRIMARY KEY,
+    week_id INTEGER NOT NULL REFERENCES weeks(id),
+    position INTEGER NOT NULL,
+    block TEXT,
+    code TEXT,
+    name TEXT NOT NULL,
+    tempo TEXT,
+    sets_reps TEXT,
+    sets TEXT,
+    reps TEXT,
+    rest TEXT,
+    results TEXT,
+    pump_rating TEXT,
+    sets_min INTEGER,
+    sets_max INTEGER,
+    reps_min INTEGER,
+    reps_max INTEGER,
+    rest_min_seconds INTEGER,
+    rest_max_seconds INTEGER
+);
+CREATE TABLE IF NOT EXISTS sets (
+    exercise_id INTEGER NOT NULL REFERENCES exercises(id),
+    set_number INTEGER NOT NULL,
+    weight REAL,
+    reps INTEGER NOT NULL,
+    PRIMARY KEY (exercise_id, set_number)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_exercises_name ON exercises(name)",
+    "CREATE INDEX IF NOT EXISTS idx_exercises_week ON exercises(week_id)",
+    "CREATE INDEX IF NOT EXISTS idx_weeks_day ON weeks(day_id, week_start)",
+    "CREATE INDEX IF NOT EXISTS idx_weeks_week ON weeks(week_start, day_id)",
+    "CREATE INDEX IF NOT EXISTS idx_days_program ON days(program_id, position)",
+    "CREATE INDEX IF NOT EXISTS idx_programs_name ON programs(name)",
+    "CREATE INDEX IF NOT EXISTS idx_programs_athlete ON programs(athlete_id, sheet)",
+)
+
+TABLES = ("athletes", "programs", "days", "weeks", "exercises")
+
+INSERTS = {
+    "athletes": "INSERT INTO athletes VALUES (?, ?, ?, ?)",
+    "programs": "INSERT INTO programs VALUES (?, ?, ?, ?, ?)",
+    "days": "INSERT INTO days VALUES (?, ?, ?, ?, ?)",
+    "weeks": "INSERT INTO weeks VALUES (?, ?, ?, ?)",
+    "exercises": "INSERT INTO exercises VALUES (" + ", ".join(["?"] * 19) + ")",
+    "sets": "INSERT INTO sets VALUES (?, ?, ?, ?)",
+}
+
+HISTORY_QUERY = """
+SELECT a.name AS athlete, p.sheet, p.name AS program, d.position AS day, d.name AS day_name,
+       w.week, e.code, e.position, e.results, s.set_number, s.weight, s.reps
+FROM exercises e
+JOIN weeks w ON w.id = e.week_id
+JOIN days d ON d.id = w.day_id
+JOIN programs p ON p.id = d.program_id
+JOIN athletes a ON a.id = p.athlete_id
+LEFT JOIN sets s ON s.exercise_id = e.id
+WHERE e.name = ?
+ORDER BY a.name, p.position, w.week_start, d.position, e.position, s.set_number
+"""
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None or value == "" else str(value)
+
+
+class SQLiteExporter:
+    """Bulk-loads workout-data structures into one SQLite file, in one transaction."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # Durable at COMMIT under WAL, without an fsync per page write
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        self.conn.execute("BEGIN")
+        self._next = {table: self.conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+                      for table in TABLES}
+        self.counts = {table: 0 for table in (*TABLES, "sets")}
+
+    def _id(self, table: str) -> int:
+        row_id = self._next[table]
+        self._next[table] += 1
+        return row_id
+
+    def add(self, athlete: str, workout_data: Dict[str, Any], source: Optional[str] = None):
+        """Queue one athlete's rows and insert them, replacing any earlier export of that athlete."""
+        self._delete_athlete(athlete)
+        rows: Dict[str, List[Tuple]] = {table: [] for table in INSERTS}
+        athlete_id = self._id("athletes")
+        rows["athletes"].append((athlete_id, athlete, source, workout_data.get("program_name")))
+
+        for p, sheet in enumerate(workout_data["sheets"]):
+            program_id = self._id("programs")
+            rows["programs"].append((program_id, athlete_id, p, sheet["sheet_name"], sheet.get("program_name")))
+            for d, day in enumerate(sheet["days"], start=1):
+                day_id = self._id("days")
+                rows["days"].append((day_id, program_id, d, day["day_name"], day.get("week_range")))
+                if "blocks" in day:
+                    self._add_block_day(rows, day_id, day)
+                else:
+                    for week in day["weeks"]:
+                        week_id = self._id("weeks")
+                        rows["weeks"].append((week_id, day_id, str(week["week_number"]), week["week_number"]))
+                        for e, exercise in enumerate(week["exercises"]):
+                            self._add_exercise(rows, week_id, e, None, exercise.get("exercise_id"),
+                                               exercise["exercise_name"], exercise)
+
+        for table, statement in INSERTS.items():
+            if rows[table]:
+                self.conn.executemany(statement, rows[table])
+                self.counts[table] += len(rows[table])
+
+    def _add_block_day(self, rows: Dict[str, List[Tuple]], day_id: int, day: Dict[str, Any]):
+        """Sheet4: one week row per range, exercises numbered across blocks in the range."""
+        for range_key in block_week_ranges(day["blocks"]):
+            week = sheet4_week(range_key)
+            week_id = self._id("weeks")
+            rows["weeks"].append((week_id, day_id, week, int(week.split("-")[0])))
+            for block in day["blocks"]:
+                for e, exercise in enumerate(block["exercises"]):
+                    self._add_exercise(rows, week_id, e, block["block_name"], f"{block['block_name']}#{e}",
+                                       exercise["exercise_name"], exercise[range_key])
+
+    def _add_exercise(self, rows: Dict[str, List[Tuple]], week_id: int, position: int, block: Optional[str],
+                      code: Optional[str], name: str, values: Dict[str, Any]):
+        parsed = values.get("parsed") or parsed_fields(values)
+        exercise_id = self._id("exercises")
+        rows["exercises"].append((
+            exercise_id, week_id, position, block, code, name,
+            _text(values.get("tempo")), _text(values.get("sets_reps")), _text(values.get("sets")),
+            _text(values.get("reps")), _text(values.get("rest")), _text(values.get("results")),
+            _text(values.get("pump_rating")),
+            parsed["sets_min"], parsed["sets_max"], parsed["reps_min"], parsed["reps_max"],
+            parsed["rest_min_seconds"], parsed["rest_max_seconds"],
+        ))
+        for n, logged in enumerate(parsed["results"], start=1):
+            rows["sets"].append((exercise_id, n, logged["weight"], logged["reps"]))
+
+    def _delete_athlete(self, athlete: str):
+        row = self.conn.execute("SELECT id FROM athletes WHERE name = ?", (athlete,)).fetchone()
+        if row is None:
+            return
+        programs = "SELECT id FROM programs WHERE athlete_id = :a"
+        days = f"SELECT id FROM days WHERE program_id IN ({programs})"
+        weeks = f"SELECT id FROM weeks WHERE day_id IN ({days})"
+        exercises = f"SELECT id FROM exercises WHERE week_id IN ({weeks})"
+        for statement in (f"DELETE FROM sets WHERE exercise_id IN ({exercises})",
+                          f"DELETE FROM exercises WHERE week_id IN ({weeks})",
+                          f"DELETE FROM weeks WHERE day_id IN ({days})",
+                          f"DELETE FROM days WHERE program_id IN ({programs})",
+                          "DELETE FROM programs WHERE athlete_id = :a",
+                          "DELETE FROM athletes WHERE id = :a"):
+            self.conn.execute(statement, {"a": row[0]})
+
+    def close(self):
+        """Build the indexes, commit and refresh the planner statistics."""
+        # One statement at a time: executescript() would commit first
+        for statement in INDEXES:
+            self.conn.execute(statement)
+        self.conn.execute("COMMIT")
+        self.conn.execute("ANALYZE")
+        self.conn.close()
+
+    def abort(self):
+        """Roll back everything added since the exporter was opened."""
+        self.conn.execute("ROLLBACK")
+        self.conn.close()
+
+    def __enter__(self) -> "SQLiteExporter":
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def export_sqlite(workouts: Iterable[Tuple[str, Dict[str, Any], Optional[str]]], db_path: str) -> Dict[str, int]:
+    """
+    Export (athlete, workout_data, source) triples in one transaction.
+
+    Returns:
+        Rows written per table
+    """
+    with SQLiteExporter(db_path) as exporter:
+        for athlete, workout_data, source in workouts:
+            exporter.add(athlete, workout_data, source)
+    return exporter.counts
+
+
+def exercise_history(db_path: str, exercise_name: str) -> List[Dict[str, Any]]:
+    """Every logged set of an exercise across athletes, programs and weeks (one row per set)."""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(row) for row in conn.execute(HISTORY_QUERY, (exercise_name,))]
+    finally:
+        conn.close()
+
+
+def _load(files: List[Path]):
+    for path in files:
+        workout_data = load_workout(path)
+        if workout_data is not None:
+            yield path.stem, workout_data, str(path)
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Export extracted workout data into a normalized SQLite file")
+    parser.add_argument("inputs", nargs="+", help="workout-data.json files, or directories of them (one per athlete)")
+    parser.add_argument("-o", "--output", default="workouts.sqlite", help="SQLite database to create or update")
+    parser.add_argument("--history", metavar="EXERCISE", help="Afterwards, print every logged set of this exercise")
+    args = parser.parse_args()
+
+    files = input_files(args.inputs)
+    print("🏋️  Exporting to SQLite...")
+    print(f"📂 Inputs: {len(files)} file(s)")
+
+    started = time.perf_counter()
+    counts = export_sqlite(_load(files), args.output)
+    elapsed = time.perf_counter() - started
+    print(f"✅ {counts['exercises']:,} exercises, {counts['sets']:,} sets from {counts['athletes']} athlete(s) "
+          f"in {elapsed:.2f}s -> {args.output} ({os.path.getsize(args.output) / 1e6:.1f} MB)")
+
+    if args.history:
+        rows = exercise_history(args.output, args.history)
+        print(f"\n📊 {args.history}: {len(rows)} row(s)")
+        for row in rows:
+            print(f"  {row['athlete']} {row['sheet']} day {row['day']} week {row['week']}: "
+                  f"{row['weight'] if row['weight'] is not None else '-'} x {row['reps'] or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Synthetic Workbook Generator
+Builds xlsx workbooks with the same layouts the extractors understand
+(Sheet1-3 week-column layout, Sheet4 block layout) at any scale.
+Used by the benchmarks so they do not depend on a real athlete export.
+
+Scale knobs: days, exercises per day, weeks, Sheet4 blocks and exercises
+per block, the share of week cells with logged results, and formatted but
+empty padding cells (columns to the right of the data and rows below it),
+which real exports carry from cell styling and which readers still walk.
+"""
+
+import argparse
+import os
+import re
+import sys
+import zipfile
+from typing import Any, Dict, List, Optional
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Border, PatternFill, Side
+
+
+EXERCISE_NAMES = [
+    "Barbell Bench", "DB Shrug", "Barbell Back Squat", "Incline Pec Fly",
+    "DB Split Squat", "Lat Pulldown", "Seated Cable Row", "Leg Press Machine",
+    "BB RDL", "Lying Leg Curls", "EZ Bar Curls", "Cable Press Down",
+]
+TEMPOS = [211, 121, 311, 221]
+SETS_REPS = ["2x18-20", "3x18-20", "4x10-12", "4x12-15", "3x8-10"]
+RESTS = ["1m", "", "1-2m", "90s"]
+
+WEEK_COLUMN_START = 3
+WEEK_COLUMN_STRIDE = 5
+
+INLINE_STRING_CELL = re.compile(rb'<c ([^>]*?)t="inlineStr"([^>]*)><is><t(?: [^>]*)?>(.*?)</t></is></c>', re.DOTALL)
+SST_CONTENT_TYPE = b"application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"
+SST_REL_TYPE = b"http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"
+
+
+PADDING_FILL = PatternFill("solid", fgColor="FFF2CC")
+PADDING_BORDER = Border(bottom=Side(style="thin"))
+
+
+def _results(sets: int, seed: int) -> str:
+    """Build a results string like '115x10,115x7,95x10'."""
+    weight = 50 + (seed * 5) % 150
+    return ",".join(f"{weight}x{10 + (seed + s) % 6}" for s in range(sets))
+
+
+def _is_filled(seed: int, results_fill: float) -> bool:
+    """Deterministically fill about ``results_fill`` of the results cells."""
+    return (seed * 37) % 100 < results_fill * 100
+
+
+def standard_sheet_rows(program_name: str, days: int, exercises_per_day: int,
+                        weeks: int, results_fill: float = 1.0) -> List[List[Any]]:
+    """Rows for the Sheet1-3 layout: one column block per week."""
+    width = WEEK_COLUMN_START + WEEK_COLUMN_STRIDE * weeks
+    rows = [[program_name] + [None] * (width - 1)]
+
+    header = [None] * width
+    for week in range(weeks):
+        header[WEEK_COLUMN_START + WEEK_COLUMN_STRIDE * week] = f"WEEK {week + 1}"
+    rows.append(header)
+
+    for day in range(1, days + 1):
+        rows.append([f"DAY {day}: Synthetic Day {day}"] + [None] * (width - 1))
+        for ex in range(exercises_per_day):
+            seed = day * 31 + ex
+            row = [
+                f"{chr(ord('A') + ex // 2 % 26)}{ex % 2 + 1}",
+                EXERCISE_NAMES[seed % len(EXERCISE_NAMES)],
+            ] + [None] * (width - 2)
+            for week in range(weeks):
+                col = WEEK_COLUMN_START + WEEK_COLUMN_STRIDE * week
+                sets_reps = SETS_REPS[(seed + week) % len(SETS_REPS)]
+                row[col] = TEMPOS[seed % len(TEMPOS)]
+                row[col + 1] = sets_reps
+                row[col + 2] = RESTS[seed % len(RESTS)]
+                if _is_filled(seed + week, results_fill):
+                    row[col + 3] = _results(int(sets_reps[0]), seed + week)
+            rows.append(row)
+        rows.append([None] * width)
+
+    return rows
+
+
+def block_sheet_rows(days: int, blocks_per_day: int, exercises_per_block: int,
+                     results_fill: float = 1.0) -> List[List[Any]]:
+    """Rows for the Sheet4 layout: day -> block -> exercise, two week ranges."""
+    width = 15
+    rows = [["Week 1,2"] + [None] * 8 + ["Week 3,4"] + [None] * 5]
+
+    for day in range(1, days + 1):
+        rows.append([f"Day {day}: Synthetic Day {day}"] + [None] * (width - 1))
+        for block in range(1, blocks_per_day + 1):
+            rows.append([f"Block {block}"] + [None] * (width - 1))
+            for ex in range(exercises_per_block):
+                seed = day * 17 + block * 5 + ex
+                rows.append([
+                    EXERCISE_NAMES[seed % len(EXERCISE_NAMES)], None,
+                    TEMPOS[seed % len(TEMPOS)], 4, "08-12",
+                    _results(3, seed) if _is_filled(seed, results_fill) else None, None, 6,
+                    None,
+                    TEMPOS[(seed + 1) % len(TEMPOS)], 4, "06-10", "", None, None,
+                ])
+
+    return rows
+
+
+def _append_padded(ws, rows: List[List[Any]], padding_columns: int, padding_rows: int):
+    """Append rows, then formatted-but-empty cells right of and below them."""
+    width = max(len(row) for row in rows) if rows else 0
+
+    def padding(count: int) -> List[WriteOnlyCell]:
+        cells = []
+        for _ in range(count):
+            cell = WriteOnlyCell(ws, value=None)
+            cell.fill = PADDING_FILL
+            cell.border = PADDING_BORDER
+            cells.append(cell)
+        return cells
+
+    for row in rows:
+        if padding_columns:
+            row = row + [None] * (width - len(row)) + padding(padding_columns)
+        ws.append(row)
+    for _ in range(padding_rows):
+        ws.append(padding(width + padding_columns))
+
+
+def build_workbook(output_path: str, days: int = 5, exercises_per_day: int = 8,
+                   weeks: int = 4, shared_strings: bool = True, results_fill: float = 1.0,
+                   blocks_per_day: Optional[int] = None, exercises_per_block: int = 3,
+                   padding_columns: int = 0, padding_rows: int = 0) -> str:
+    """
+    Write a four-sheet workbook matching the layouts WorkoutExtractor expects.
+
+    Args:
+        output_path: Where to write the xlsx file
+        days: Days per sheet
+        exercises_per_day: Exercise rows per day on Sheet1-3
+        weeks: "WEEK N" column blocks on Sheet1-3
+        shared_strings: Store text in a shared string table, as Excel does
+        results_fill: Share (0-1) of results cells with logged sets
+        blocks_per_day: Sheet4 blocks per day (default: exercises_per_day // 3)
+        exercises_per_block: Sheet4 exercises per block
+        padding_columns: Formatted empty cells appended to every row
+        padding_rows: Formatted empty rows appended to every sheet
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+
+    programs = ["Davey Jone's Pump", "Swole Seven Seas", "Swole Seven Seas"]
+    for index, program_name in enumerate(programs, start=1):
+        ws = workbook.create_sheet(f"Sheet{index}")
+        _append_padded(ws, standard_sheet_rows(program_name, days, exercises_per_day, weeks, results_fill),
+                       padding_columns, padding_rows)
+
+    ws = workbook.create_sheet("Sheet4")
+    if blocks_per_day is None:
+        blocks_per_day = max(1, exercises_per_day // 3)
+    _append_padded(ws, block_sheet_rows(days, blocks_per_day, exercises_per_block, results_fill),
+                   padding_columns, padding_rows)
+
+    workbook.save(output_path)
+    if shared_strings:
+        use_shared_strings(output_path)
+    return output_path
+
+
+def use_shared_strings(path: str):
+    """
+    Rewrite openpyxl's inline strings into a shared string table, the way
+    Excel itself stores text, so readers are exercised on realistic files.
+    """
+    table: Dict[bytes, int] = {}
+
+    def to_shared(match):
+        index = table.setdefault(match.group(3), len(table))
+        return b'<c ' + match.group(1) + b't="s"' + match.group(2) + b'><v>' + str(index).encode() + b'</v></c>'
+
+    tmp_path = path + ".tmp"
+    with zipfile.ZipFile(path) as src, zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as dst:
+        for item in src.infolist():
+            data = src.read(item.filename)
+            if item.filename.startswith("xl/worksheets/"):
+                data = INLINE_STRING_CELL.sub(to_shared, data)
+            elif item.filename == "[Content_Types].xml":
+                data = data.replace(b"</Types>", b'<Override PartName="/xl/sharedStrings.xml" ContentType="'
+                                    + SST_CONTENT_TYPE + b'"/></Types>')
+            elif item.filename == "xl/_rels/workbook.xml.rels":
+                data = data.replace(b"</Relationships>", b'<Relationship Id="rIdSST" Type="' + SST_REL_TYPE
+                                    + b'" Target="sharedStrings.xml"/></Relationships>')
+            dst.writestr(item, data)
+
+        items = b"".join(b"<si><t>" + text + b"</t></si>" for text in table)
+        dst.writestr("xl/sharedStrings.xml", (
+            b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="%d" uniqueCount="%d">'
+            % (len(table), len(table)) + items + b"</sst>"))
+    os.replace(tmp_path, path)
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic workout workbook")
+    parser.add_argument("output", help="Path of the xlsx file to write")
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--exercises-per-day", type=int, default=8)
+    parser.add_argument("--weeks", type=int, default=4)
+    parser.add_argument("--blocks-per-day", type=int, default=None, help="Sheet4 blocks per day")
+    parser.add_argument("--exercises-per-block", type=int, default=3, help="Sheet4 exercises per block")
+    parser.add_argument("--results-fill", type=float, default=1.0,
+                        help="Share of results cells with logged sets (0-1)")
+    parser.add_argument("--padding-columns", type=int, default=0,
+                        help="Formatted empty cells appended to every row")
+    parser.add_argument("--padding-rows", type=int, default=0,
+                        help="Formatted empty rows appended to every sheet")
+    args = parser.parse_args()
+
+    build_workbook(args.output, args.days, args.exercises_per_day, args.weeks,
+                   results_fill=args.results_fill, blocks_per_day=args.blocks_per_day,
+                   exercises_per_block=args.exercises_per_block,
+                   padding_columns=args.padding_columns, padding_rows=args.padding_rows)
+    print(f"✅ Workbook written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
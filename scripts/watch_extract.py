@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Watch Mode Extraction
+Keeps running while coaches edit the workbook and refreshes
+workout-data.json after each save:
+
+    1. The workbook's size and modification time are polled (no extra
+       dependencies; network drives and synced folders work too).
+    2. A change starts a debounce window; further saves inside it restart
+       the window, so a burst of saves leads to one refresh.
+    3. The refresh goes through incremental_extract with the previous
+       fingerprints and workout data kept in memory: only the worksheets
+       whose fingerprint changed are parsed, and nothing is read back from
+       disk.
+    4. workout-data.json, its fingerprint state and the lookup index are
+       each rewritten atomically (temp file + rename), so the app never
+       reads a half-written file.
+
+A save that is caught mid-write (truncated zip) is skipped; the next
+modification time change triggers another attempt.
+"""
+
+import argparse
+import os
+import sys
+import time
+import zipfile
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from extract_workouts import READERS
+from incremental_extract import extract_incremental
+from json_delta import DEFAULT_KEEP
+from lookup_index import index_path_for, write_index
+
+DEFAULT_DEBOUNCE = 0.75
+DEFAULT_INTERVAL = 0.25
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None while it does not exist (e.g. mid-rename)."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class WorkbookWatcher:
+    """Debounced re-extraction of one workbook into one output file."""
+
+    def __init__(self, excel_path: str, output_path: str, debounce: float = DEFAULT_DEBOUNCE,
+                 reader: str = "openpyxl", index: bool = True,
+                 clock: Callable[[], float] = time.monotonic, delta: bool = False,
+                 keep_deltas: int = DEFAULT_KEEP):
+        self.excel_path = excel_path
+        self.output_path = output_path
+        self.debounce = debounce
+        self.reader = reader
+        self.index = index
+        self.clock = clock
+        # Versioned JSON Patch per refresh (see json_delta.py)
+        self.delta = delta
+        self.keep_deltas = keep_deltas
+        # Last extracted {"fingerprints", "workout_data"}; None until the first refresh
+        self.state: Optional[Dict[str, Any]] = None
+        self.refreshes = 0
+        self._seen = file_signature(excel_path)
+        self._extracted: Optional[Tuple[int, int]] = None
+        self._changed_at: Optional[float] = None
+
+    def refresh(self) -> Dict[str, Any]:
+        """
+        Bring the outputs up to date now.
+
+        Returns:
+            extract_incremental() report plus ``seconds``
+        """
+        started = time.perf_counter()
+        signature = file_signature(self.excel_path)
+        # The first refresh reads the previous output from disk; later ones reuse memory
+        report = extract_incremental(self.excel_path, self.output_path, previous=self.state, reader=self.reader,
+                                     delta=self.delta, keep_deltas=self.keep_deltas)
+        if report["written"] and self.index:
+            write_index(report["workout_data"], index_path_for(self.output_path))
+
+        self.state = {"fingerprints": report["fingerprints"], "workout_data": report["workout_data"]}
+        self._extracted = signature
+        self.refreshes += 1
+        report["seconds"] = round(time.perf_counter() - started, 4)
+        return report
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """
+        One watch step: note workbook changes and refresh once the debounce
+        window has passed without further saves.
+
+        Returns:
+            The refresh report, or None when nothing was extracted
+        """
+        now = self.clock()
+        signature = file_signature(self.excel_path)
+        if signature != self._seen:
+            self._seen = signature
+            self._changed_at = now
+            return None
+        if self._changed_at is None or signature is None or now - self._changed_at < self.debounce:
+            return None
+
+        self._changed_at = None
+        if signature == self._extracted:
+            return None  # saved back to the state already extracted
+        try:
+            return self.refresh()
+        except (zipfile.BadZipFile, KeyError, EOFError) as e:
+            # Caught mid-write; the save that completes it changes the signature again
+            print(f"⚠️  Skipped unreadable workbook ({type(e).__name__}: {e})")
+            return None
+
+    def run(self, interval: float = DEFAULT_INTERVAL, max_refreshes: Optional[int] = None,
+            on_refresh: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """Refresh once, then poll every ``interval`` seconds until interrupted."""
+        report = self.refresh()
+        if on_refresh:
+            on_refresh(report)
+        while max_refreshes is None or self.refreshes < max_refreshes:
+            time.sleep(interval)
+            report = self.poll()
+            if report is not None and on_refresh:
+                on_refresh(report)
+
+
+def _print_refresh(report: Dict[str, Any]):
+    stamp = datetime.now().strftime("%H:%M:%S")
+    if not report["written"]:
+        print(f"[{stamp}] ✅ Up to date ({report['seconds'] * 1000:.0f} ms)")
+        return
+    print(f"[{stamp}] ✅ Re-parsed {', '.join(report['changed']) or 'none'}; "
+          f"reused {', '.join(report['reused']) or 'none'} ({report['seconds'] * 1000:.0f} ms)")
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Re-extract workout data whenever the workbook is saved")
+    parser.add_argument("excel_path", nargs="?",
+                        default="/Users/britainsaluri/Downloads/Argh Let's Get Huge Matey.xlsx")
+    parser.add_argument("output_path", nargs="?",
+                        default="/Users/britainsaluri/workout-tracker/src/workout-data.json")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                        help="Seconds without further saves before re-extracting (default 0.75)")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="Seconds between checks of the workbook (default 0.25)")
+    parser.add_argument("--reader", choices=READERS, default="openpyxl",
+                        help="'fast' reads values straight from the sheet XML, falling back to openpyxl")
+    parser.add_argument("--no-index", action="store_true", help="Do not rewrite the <output>.index.json sidecar")
+    parser.add_argument("--delta", action="store_true",
+                        help="Also write a versioned JSON Patch delta on every refresh")
+    parser.add_argument("--keep-deltas", type=int, default=DEFAULT_KEEP,
+                        help="Deltas kept in the <output>.version.json chain")
+    args = parser.parse_args()
+
+    print("🏋️  Watching workbook for changes (Ctrl+C to stop)...")
+    print(f"📂 Input: {args.excel_path}")
+    print(f"📝 Output: {args.output_path}")
+    print("-" * 80)
+
+    watcher = WorkbookWatcher(args.excel_path, args.output_path, args.debounce, args.reader,
+                              index=not args.no_index, delta=args.delta, keep_deltas=args.keep_deltas)
+    try:
+        watcher.run(args.interval, on_refresh=_print_refresh)
+    except KeyboardInterrupt:
+        print(f"\n👋 Stopped after {watcher.refreshes} refresh(es)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
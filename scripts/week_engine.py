@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Single-Pass Multi-Week Extraction Engine
+Walks a week-column sheet (Sheet1 layout) exactly once and projects every
+exercise row into all "WEEK N" column blocks at the same time.
+
+Layout:
+    - A header row with one "WEEK N" cell per week; that cell's column holds
+      the week's tempo, followed by sets/reps, rest and results
+    - Optionally a label row ("TEMPO | SETS/REPS | REST | RESULTS") placing
+      each week's sub-columns when they are not the four after "WEEK N"
+    - "DAY N: ..." rows in column A start a new day
+    - Exercise rows carry the ID in column A and the name in column B
+
+extract_weeks owns these row rules; layout_schema's cached reads go
+through it too, so both paths return the same data.
+"""
+
+import re
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+WEEK_HEADER_PATTERN = re.compile(r'\s*WEEK\s*(\d+)', re.IGNORECASE)
+
+# Labels of a week block's sub-columns, e.g. "TEMPO | SETS/REPS | REST | RESULTS"
+SUB_COLUMN_LABELS = (
+    ("tempo", re.compile(r'\s*TEMPO', re.IGNORECASE)),
+    ("sets_reps", re.compile(r'\s*(SETS|REPS)', re.IGNORECASE)),
+    ("rest", re.compile(r'\s*REST\b', re.IGNORECASE)),
+    ("results", re.compile(r'\s*(RESULT|WEIGHT)', re.IGNORECASE)),
+)
+
+
+class WeekColumns(NamedTuple):
+    """Column indexes (0-based) of one week's block."""
+    week_number: int
+    tempo: int
+    sets_reps: int
+    rest: int
+    results: int
+
+
+# Used when a sheet has no "WEEK N" header at all (Week 1 in columns D-G)
+DEFAULT_WEEK_COLUMNS = (WeekColumns(1, 3, 4, 5, 6),)
+
+EXERCISE_FIELDS = ("tempo", "sets_reps", "rest", "results")
+
+
+def find_week_columns(row: Sequence[Any]) -> List[WeekColumns]:
+    """Return one WeekColumns per "WEEK N" cell in a header row."""
+    weeks = []
+    for col, cell in enumerate(row):
+        if isinstance(cell, str):
+            match = WEEK_HEADER_PATTERN.match(cell)
+            if match:
+                weeks.append(WeekColumns(int(match.group(1)), col, col + 1, col + 2, col + 3))
+    return weeks
+
+
+def find_sub_columns(row: Sequence[Any], weeks: Sequence[WeekColumns]) -> List[WeekColumns]:
+    """
+    Week columns re-positioned by a label row, or [] when the row does not
+    label all four sub-columns of every week block.
+    """
+    labelled = []
+    for i, week in enumerate(weeks):
+        end = weeks[i + 1].tempo if i + 1 < len(weeks) else len(row)
+        columns: Dict[str, int] = {}
+        for col in range(week.tempo, min(end, len(row))):
+            cell = row[col]
+            if not isinstance(cell, str):
+                continue
+            for field, pattern in SUB_COLUMN_LABELS:
+                if field not in columns and pattern.match(cell):
+                    columns[field] = col
+                    break
+        if len(columns) != len(SUB_COLUMN_LABELS):
+            return []
+        labelled.append(WeekColumns(week.week_number, columns["tempo"], columns["sets_reps"],
+                                    columns["rest"], columns["results"]))
+    return labelled
+
+
+def header_columns(row: Sequence[Any], weeks: Sequence[WeekColumns]) -> List[WeekColumns]:
+    """Week columns a WEEK or label row sets (given the current ones), or []."""
+    return find_week_columns(row) or find_sub_columns(row, weeks)
+
+
+def is_day_header(cell: Any) -> bool:
+    """Check if a column A value is a day header (e.g. 'DAY 1: Upper Pull')."""
+    return isinstance(cell, str) and cell.strip().upper().startswith('DAY ')
+
+
+def has_exercise_id(exercise_id: Any, exercise_name: Any) -> bool:
+    """Default exercise row check: non-empty ID and name, ID not a sub-header."""
+    if exercise_id is None or exercise_name is None:
+        return False
+    exercise_id = str(exercise_id).strip().upper()
+    if not exercise_id or not str(exercise_name).strip():
+        return False
+    return "TEMPO" not in exercise_id and "SETS" not in exercise_id
+
+
+def extract_weeks(rows: Iterable[Sequence[Any]],
+                  is_exercise: Callable[[Any, Any], bool] = has_exercise_id,
+                  default_weeks: Sequence[WeekColumns] = DEFAULT_WEEK_COLUMNS,
+                  sink: Optional[Callable[[Dict[str, Any], int, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Read every row once and route exercise rows to all week projections.
+
+    Args:
+        rows: Row value tuples, as from ``iter_rows(values_only=True)``
+        is_exercise: Predicate on (ID cell, name cell) selecting exercise rows
+        default_weeks: Week columns to use until a WEEK or label row is seen
+        sink: Optional ``sink(day, week_number, values)`` called for each
+            projected exercise as its row is read; exercises then are not
+            stored in the day
+
+    Returns:
+        ``{"weeks": [week numbers], "days": [...]}`` where each day is
+        ``{"header": str, "weeks": {week_number: [exercise values]}}`` and each
+        exercise value dict holds the raw cell values for ``exercise_id``,
+        ``exercise_name``, tempo, sets_reps, rest and results.
+    """
+    weeks: List[WeekColumns] = list(default_weeks)
+    projectors = compile_projectors(weeks)
+    width = required_width(weeks)
+    week_numbers: List[int] = []
+    days: List[Dict[str, Any]] = []
+    current_day: Optional[Dict[str, Any]] = None
+
+    for row in rows:
+        if not row:
+            continue
+
+        first = row[0]
+        if is_day_header(first):
+            current_day = {"header": str(first).strip(), "weeks": {}}
+            days.append(current_day)
+            continue
+
+        second = row[1] if len(row) > 1 else None
+        if current_day is not None and is_exercise(first, second):
+            add_exercise_row(row, current_day, weeks, projectors, width, week_numbers, sink)
+        elif current_day is None or not has_exercise_id(first, second):
+            # Rows with an exercise ID and name are never header rows, even
+            # when ``is_exercise`` turns them down
+            header_weeks = header_columns(row, weeks)
+            if header_weeks:
+                weeks = header_weeks
+                projectors = compile_projectors(weeks)
+                width = required_width(weeks)
+
+    return {"weeks": week_numbers, "days": days}
+
+
+def add_exercise_row(row: Sequence[Any], day: Dict[str, Any], weeks: Sequence[WeekColumns],
+                     projectors: Sequence[Callable], width: int, week_numbers: List[int],
+                     sink: Optional[Callable[[Dict[str, Any], int, Dict[str, Any]], None]] = None):
+    """Project one exercise row into every week of ``day`` (see extract_weeks)."""
+    if len(row) < width:
+        row = tuple(row) + (None,) * (width - len(row))
+
+    identity = {"exercise_id": row[0], "exercise_name": row[1]}
+    day_weeks = day["weeks"]
+    for week, project in zip(weeks, projectors):
+        exercise = dict(identity)
+        exercise.update(zip(EXERCISE_FIELDS, project(row)))
+        if sink is not None:
+            sink(day, week.week_number, exercise)
+        else:
+            day_weeks.setdefault(week.week_number, []).append(exercise)
+        if week.week_number not in week_numbers:
+            week_numbers.append(week.week_number)
+
+
+def compile_projectors(weeks: Sequence[WeekColumns]) -> List[Callable]:
+    """Build one itemgetter per week selecting its four exercise columns."""
+    return [itemgetter(w.tempo, w.sets_reps, w.rest, w.results) for w in weeks]
+
+
+def required_width(weeks: Sequence[WeekColumns]) -> int:
+    """Shortest row length all projections can index into."""
+    return max([2] + [w.results + 1 for w in weeks])
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Workout Output Files
+Finds the extraction outputs among the paths given to the tools that read
+many of them (overload_suggestions.py, sqlite_export.py,
+performance_series.py).
+
+A directory stands for the ``*.json`` files in it, one athlete per file,
+except the sidecars written next to an output. A sidecar is any file
+whose name starts with another file's name (up to its extension) plus a
+dot, such as workout-data.index.json, workout-data.json.sheets.json or
+workout-data.shard.Sheet1.1.json next to workout-data.json, or
+a.metrics.json next to a.ndjson. What is left is checked by content when
+it is loaded. Only a dict with ``sheets`` and no ``format`` key is workout
+data. Anything else, such as batch-summary.json or a stray metrics file,
+is skipped with a warning instead of failing the run.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def is_workout_data(data: Any) -> bool:
+    """True for an extract_workouts.py structure (sidecars all carry a ``format``)."""
+    return isinstance(data, dict) and "sheets" in data and "format" not in data
+
+
+def _root(path: Path) -> str:
+    """The name without its last extension: workout-data.index.json -> workout-data.index."""
+    return path.name.rsplit(".", 1)[0]
+
+
+def _outputs_in(directory: Path) -> List[Path]:
+    entries = [p for p in directory.iterdir() if p.is_file()]
+    roots = {_root(p) for p in entries} - {""}
+
+    def is_sidecar(path: Path) -> bool:
+        # Every dotted prefix shorter than the file's own root: a.json.sheets.json -> "a", "a.json"
+        parts = _root(path).split(".")
+        return any(".".join(parts[:n]) in roots for n in range(1, len(parts)))
+
+    return sorted(p for p in entries if p.suffix == ".json" and not is_sidecar(p))
+
+
+def input_files(paths: Iterable[str]) -> List[Path]:
+    """Files named on the command line, with directories expanded (see module docstring)."""
+    files: List[Path] = []
+    for path in map(Path, paths):
+        files.extend(_outputs_in(path) if path.is_dir() else [path])
+    return files
+
+
+def load_workout(path: Path) -> Optional[Dict[str, Any]]:
+    """The workout data in ``path``, or None (with a warning) for any other JSON."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not is_workout_data(data):
+        print(f"⚠️  Skipping {path}: not an extraction output", file=sys.stderr)
+        return None
+    return data
+
+
+def load_workouts(paths: Iterable[str]) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+    """(path, workout data) for every output in ``paths``; the file stem names the athlete."""
+    for path in input_files(paths):
+        data = load_workout(path)
+        if data is not None:
+            yield path, data
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Workout Data Model
+Compact in-memory form of extracted workouts. The extractors build these
+``__slots__`` objects instead of one dict per exercise and week: an object
+with slots has no per-instance ``__dict__``. Repeated strings (IDs, names,
+tempos, prescriptions, headers) are interned, so every week, day and
+workbook handled by one process shares a single copy of each.
+
+Dicts are produced only at serialization time: ``to_dict(obj)`` gives the
+nested plain dicts and lists the extractors used to return, and writers
+dump that (a transient copy of one workbook) rather than holding dicts for
+the whole run. Each class lists its slots and their output keys in
+``FIELDS`` (output order), so the JSON is exactly what was written before
+the model existed. Slots named in ``OPTIONAL`` are left out while they are
+None (the ``parsed`` fields added by --parse-fields).
+
+WorkoutExtractor output: Program -> Sheet -> Day (weeks) | BlockDay (Sheet4
+blocks) -> Week | Block -> Exercise | BlockExercise (-> WeekValues per week
+range). extract_sheet1.py output: Sheet1Program -> Sheet1Week -> Sheet1Day
+-> Sheet1Exercise. src/extract_sheet1_complete.py output: WeeksSheet ->
+NumberedWeek -> NumberedDay -> DayExercise.
+"""
+
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ndjson_sink import SHEET4_WEEK_RANGES, week_range_keys
+
+
+def text(value: str) -> str:
+    """Intern a repeated string (IDs, names, tempos, headers); other values pass through."""
+    return sys.intern(value) if type(value) is str else value
+
+
+class Model:
+    """Base of the model classes."""
+
+    __slots__ = ()
+    # (slot, output key) pairs in output order
+    FIELDS: Tuple[Tuple[str, str], ...] = ()
+    OPTIONAL: frozenset = frozenset()
+    # Slots holding model objects (or lists of them) -> loader for each one's dict
+    CHILDREN: Dict[str, Callable[[Dict[str, Any]], "Model"]] = {}
+
+    def json(self) -> Dict[str, Any]:
+        """This object's dict, with child objects left as they are."""
+        return {key: getattr(self, slot) for slot, key in self.FIELDS
+                if slot not in self.OPTIONAL or getattr(self, slot) is not None}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Model":
+        """
+        Rebuild an object (and its children) from its dict form, e.g. a cached
+        result. Constructors take their arguments in ``FIELDS`` order.
+        """
+        values = []
+        for slot, key in cls.FIELDS:
+            value = data.get(key)
+            loader = cls.CHILDREN.get(slot)
+            if loader is not None:
+                value = [loader(item) for item in value] if isinstance(value, list) else loader(value)
+            values.append(value)
+        return cls(*values)
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and all(getattr(self, slot) == getattr(other, slot)
+                                                 for slot, _ in self.FIELDS)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{key}={getattr(self, slot)!r}' for slot, key in self.FIELDS)})"
+
+
+def to_dict(value: Any) -> Any:
+    """Deep conversion of model objects (and lists of them) to plain dicts and lists."""
+    if isinstance(value, Model):
+        return {key: to_dict(item) for key, item in value.json().items()}
+    if isinstance(value, list):
+        return [to_dict(item) for item in value]
+    return value
+
+
+# ---------------------------------------------------------------------------
+# WorkoutExtractor (extract_workouts.py)
+# ---------------------------------------------------------------------------
+
+class Exercise(Model):
+    """One exercise in one week of a standard sheet."""
+
+    __slots__ = ("exercise_id", "exercise_name", "tempo", "sets_reps", "rest", "results", "parsed")
+    FIELDS = tuple((slot, slot) for slot in __slots__)
+    OPTIONAL = frozenset({"parsed"})
+
+    def __init__(self, exercise_id: str, exercise_name: str, tempo: str, sets_reps: str, rest: str,
+                 results: str, parsed: Optional[Dict[str, Any]] = None):
+        self.exercise_id = text(exercise_id)
+        self.exercise_name = text(exercise_name)
+        self.tempo = text(tempo)
+        self.sets_reps = text(sets_reps)
+        self.rest = text(rest)
+        self.results = results
+        self.parsed = parsed
+
+    def add_parsed(self, parse: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        self.parsed = parse(self.json())
+
+
+class WeekValues(Model):
+    """One Sheet4 week range (e.g. "week_1_2") of a block exercise."""
+
+    __slots__ = ("tempo", "sets", "reps", "results", "pump_rating", "parsed")
+    FIELDS = tuple((slot, slot) for slot in __slots__)
+    OPTIONAL = frozenset({"parsed"})
+
+    def __init__(self, tempo: str, sets: str, reps: str, results: str, pump_rating: Any,
+                 parsed: Optional[Dict[str, Any]] = None):
+        self.tempo = text(tempo)
+        self.sets = text(sets)
+        self.reps = text(reps)
+        self.results = results
+        self.pump_rating = pump_rating
+        self.parsed = parsed
+
+
+class BlockExercise(Model):
+    """
+    One Sheet4 exercise with its values for each week range, output as
+    ``{"exercise_name": ..., "week_1_2": {...}, "week_3_4": {...}}``.
+
+    The range keys come from the layout spec; exercises of one sheet share
+    a single keys tuple.
+    """
+
+    __slots__ = ("exercise_name", "range_keys", "ranges")
+    FIELDS = tuple((slot, slot) for slot in __slots__)
+
+    def __init__(self, exercise_name: str, ranges: Sequence[WeekValues],
+                 range_keys: Tuple[str, ...] = SHEET4_WEEK_RANGES):
+        self.exercise_name = text(exercise_name)
+        self.range_keys = range_keys
+        self.ranges = tuple(ranges)
+
+    def json(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"exercise_name": self.exercise_name}
+        data.update(zip(self.range_keys, self.ranges))
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BlockExercise":
+        keys = week_range_keys(data)
+        return cls(data.get("exercise_name"), [WeekValues.from_dict(data[key]) for key in keys],
+                   _RANGE_KEYS.setdefault(keys, keys))
+
+    def add_parsed(self, parse: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        for values in self.ranges:
+            values.parsed = parse(values.json())
+
+
+# Shared range key tuples of loaded block exercises
+_RANGE_KEYS: Dict[Tuple[str, ...], Tuple[str, ...]] = {SHEET4_WEEK_RANGES: SHEET4_WEEK_RANGES}
+
+
+class Week(Model):
+    """One week of a standard-sheet day."""
+
+    __slots__ = ("week_number", "exercises")
+    FIELDS = tuple((slot, slot) for slot in __slots__)
+    CHILDREN = {"exercises": Exercise.from_dict}
+
+    def __init__(self, week_number: int, exercises: Optional[List[Exercise]] = None):
+        self.week_number = week_number
+        self.exercises = [] if exercises is None else exercises
+
+
+class Block(Model):
+    """One Sheet4 block."""
+
+    __slots__ = ("block_name", "exercises")
+    FIELDS = tuple((slot, slot) for slot in __slots__)
+    CHILDREN = {"exercises": BlockExercise.from_dict}
+
+    def __init__(self, block_name: str, exercises: Optional[List[BlockExercise]] = None):
+        self.block_name = text(block_name)
+        self.exercises = [] if exercises is None else exercises
+
+
+class Day(Model):
+    """One day of a standard sheet, with its weeks."""
+
+    __slots__ = ("day_name", "weeks")
+    FIELDS = tuple((slot, slot) for slot in __slots__)
+    CHILDREN = {"weeks": Week.from_dict}
+
+    def __init__(self, day_name: str, weeks: Optional[List[Week]] = None):
+        self.day_name = text(day_name)
+        self.weeks = [] if weeks is None else weeks
+
+
+class BlockDay(Model):
+    """One Sheet4 day, with its week range header and blocks."""
+
+    __slots__ = ("day_name", "week_range", "blocks")
+    FIELDS = tuple((slot, slot) for slot in __slots__)
+    CHILDREN = {"blocks": Block.from_dict}
+
+    def __init__(self, day_name: str, week_range: Optional[str], blocks: Optional[List[Block]] = None):
+        self.day_name = text(day_name)
+        self.week_range = text(week_range)
+        self.blocks = [] if blocks is None else blocks
+
+
+def _day_from_dict(data: Dict[str, Any]) -> Model:
+    return (BlockDay if "blocks" in data else Day).from_dict(data)
+
+
+class Sheet(Model):
+    """One extracted worksheet."""
+
+    __slots__ = ("sheet_name", "program_name", "days")
+    FIELDS = tuple((slot, slot) for slot in __slots__)
+    CHILDREN = {"days": _day_from_dict}
+
+    def __init__(self, sheet_name: str, program_name: Optional[str], days: Optional[List[Model]] = None):
+        self.sheet_name = text(sheet_name)
+        self.program_name = text(program_name)
+        self.days = [] if days is None else days
+
+
+class Program(Model):
+    """A whole extracted workbook (the workout-data.json root)."""
+
+    __slots__ = ("program_name", "sheets")
+    FIELDS = tuple((slot, slot) for slot in __slots__)
+    CHILDREN = {"sheets": Sheet.from_dict}
+
+    def __init__(self, program_name: str, sheets: Optional[List[Sheet]] = None):
+        self.program_name = text(program_name)
+        self.sheets = [] if sheets is None else sheets
+
+    def exercise_count(self) -> int:
+        """Total exercise entries across week and block layouts."""
+        return sum(len(group.exercises) for sheet in self.sheets for day in sheet.days
+                   for group in (day.weeks if isinstance(day, Day) else day.blocks))
+
+
+# ---------------------------------------------------------------------------
+# Sheet 1 extractor (extract_sheet1.py)
+# ---------------------------------------------------------------------------
+
+class Sheet1Exercise(Model):
+    """One exercise of one Sheet 1 day and week."""
+
+    __slots__ = ("id", "name", "tempo", "sets_reps", "rest", "results")
+    FIELDS = (("id", "id"), ("name", "name"), ("tempo", "tempo"), ("sets_reps", "setsReps"),
+              ("rest", "rest"), ("results", "results"))
+
+    def __init__(self, id: str, name: str, tempo: str, sets_reps: str, rest: str, results: str):
+        self.id = text(id)
+        self.name = text(name)
+        self.tempo = text(tempo)
+        self.sets_reps = text(sets_reps)
+        self.rest = text(rest)
+        self.results = results
+
+
+class Sheet1Day(Model):
+    """One Sheet 1 day within a week."""
+
+    __slots__ = ("day_number", "day_name", "exercises")
+    FIELDS = (("day_number", "dayNumber"), ("day_name", "dayName"), ("exercises", "exercises"))
+    CHILDREN = {"exercises": Sheet1Exercise.from_dict}
+
+    def __init__(self, day_number: int, day_name: str, exercises: List[Sheet1Exercise]):
+        self.day_number = day_number
+        self.day_name = text(day_name)
+        self.exercises = exercises
+
+
+class Sheet1Week(Model):
+    """One Sheet 1 week."""
+
+    __slots__ = ("week", "days")
+    FIELDS = tuple((slot, slot) for slot in __slots__)
+    CHILDREN = {"days": Sheet1Day.from_dict}
+
+    def __init__(self, week: int, days: Optional[List[Sheet1Day]] = None):
+        self.week = week
+        self.days = [] if days is None else days
+
+
+class Sheet1Program(Model):
+    """The Sheet 1 extraction root."""
+
+    __slots__ = ("program", "weeks")
+    FIELDS = tuple((slot, slot) for slot in __slots__)
+    CHILDREN = {"weeks": Sheet1Week.from_dict}
+
+    def __init__(self, program: str, weeks: Optional[List[Sheet1Week]] = None):
+        self.program = text(program)
+        self.weeks = [] if weeks is None else weeks
+
+
+# ---------------------------------------------------------------------------
+# Complete Sheet 1 extractor (src/extract_sheet1_complete.py)
+# ---------------------------------------------------------------------------
+
+class DayExercise(Exercise):
+    """An Exercise that also records its day and week numbers."""
+
+    __slots__ = ("day", "week")
+    # No ``parsed`` here; the complete Sheet 1 extractor never parses fields
+    FIELDS = Exercise.FIELDS[:-1] + (("day", "day"), ("week", "week"))
+
+    def __init__(self, exercise_id: str, exercise_name: str, tempo: str, sets_reps: str, rest: str,
+                 results: str, day: int, week: int):
+        super().__init__(exercise_id, exercise_name, tempo, sets_reps, rest, results)
+        self.day = day
+        self.week = week
+
+
+class NumberedDay(Model):
+    """One day of one week, numbered by position."""
+
+    __slots__ = ("day", "day_name", "exercises")
+    FIELDS = tuple((slot, slot) for slot in __slots__)
+    CHILDREN = {"exercises": DayExercise.from_dict}
+
+    def __init__(self, day: int, day_name: str = "", exercises: Optional[List[DayExercise]] = None):
+        self.day = day
+        self.day_name = text(day_name)
+        self.exercises = [] if exercises is None else exercises
+
+
+class NumberedWeek(Model):
+    """One week and its numbered days."""
+
+    __slots__ = ("week", "days")
+    FIELDS = tuple((slot, slot) for slot in __slots__)
+    CHILDREN = {"days": NumberedDay.from_dict}
+
+    def __init__(self, week: int, days: Optional[List[NumberedDay]] = None):
+        self.week = week
+        self.days = [] if days is None else days
+
+
+class WeeksSheet(Model):
+    """The complete Sheet 1 extraction root."""
+
+    __slots__ = ("sheet_name", "program_name", "weeks")
+    FIELDS = tuple((slot, slot) for slot in __slots__)
+    CHILDREN = {"weeks": NumberedWeek.from_dict}
+
+    def __init__(self, sheet_name: str, program_name: str, weeks: Optional[List[NumberedWeek]] = None):
+        self.sheet_name = text(sheet_name)
+        self.program_name = text(program_name)
+        self.weeks = [] if weeks is None else weeks
@@ -1,33 +1,41 @@
 #!/usr/bin/env python3
 """
 Check all sheets in the Excel workbook to locate Week 2 data
+Week 2 cells are looked up in the cached cell index (scripts/cell_index.py)
+instead of probing every row x column of every sheet.
 """
 
-import openpyxl
+import argparse
 import sys
+from pathlib import Path
 
-def check_workbook_sheets(file_path):
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from cell_index import add_cache_arguments, load_cell_index
+
+# "WEEK 2" and "WEEK2" as in the original check, on normalized (lower-case) text
+WEEK2 = r"week ?2"
+
+def check_workbook_sheets(file_path, cache_dir=None):
     """List all sheets and preview their content"""
 
-    print(f"Loading workbook: {file_path}")
-    workbook = openpyxl.load_workbook(file_path, data_only=True)
+    print(f"Loading cell index: {file_path}")
+    index = load_cell_index(file_path, cache_dir)
 
-    print(f"\nTotal sheets in workbook: {len(workbook.worksheets)}")
+    print(f"\nTotal sheets in workbook: {len(index.sheets)}")
     print("=" * 80)
 
-    for idx, sheet in enumerate(workbook.worksheets, start=1):
-        print(f"\n### Sheet {idx}: {sheet.title} ###")
-        print(f"Dimensions: {sheet.max_row} rows x {sheet.max_column} columns")
+    for idx, sheet in enumerate(index.sheets, start=1):
+        title = sheet["title"]
+        print(f"\n### Sheet {idx}: {title} ###")
+        print(f"Dimensions: {sheet['max_row']} rows x {sheet['max_column']} columns")
 
         # Preview first 20 rows
         print("\nFirst 20 rows preview (Column A-F):")
         print("-" * 80)
 
-        for row_num in range(1, min(21, sheet.max_row + 1)):
+        for row_num in range(1, min(21, sheet["max_row"] + 1)):
             row_data = []
-            for col in range(1, min(7, sheet.max_column + 1)):
-                cell = sheet.cell(row_num, col)
-                value = str(cell.value).strip() if cell.value else ""
+            for value in index.row_values(title, row_num, 1, min(6, sheet["max_column"])):
                 if len(value) > 30:
                     value = value[:27] + "..."
                 row_data.append(value)
@@ -38,25 +46,23 @@ def check_workbook_sheets(file_path):
 
         # Check for Week 2 indicators
         print("\n--- Checking for Week 2 indicators ---")
-        week2_found = False
-        for row_num in range(1, sheet.max_row + 1):
-            for col in range(1, sheet.max_column + 1):
-                cell_value = str(sheet.cell(row_num, col).value or "").upper()
-                if "WEEK 2" in cell_value or "WEEK2" in cell_value:
-                    print(f"✓ Found 'Week 2' at Row {row_num}, Column {col}")
-                    week2_found = True
+        hits = index.search(WEEK2, title)
+        for hit in hits:
+            print(f"✓ Found 'Week 2' at Row {hit.row}, Column {hit.column}")
 
-        if not week2_found:
+        if not hits:
             print("✗ No 'Week 2' indicators found in this sheet")
 
         print("=" * 80)
 
-    workbook.close()
-
 if __name__ == "__main__":
-    input_file = "/Users/britainsaluri/Downloads/Argh Let's Get Huge Matey.xlsx"
+    parser = argparse.ArgumentParser(description="Preview every sheet and locate Week 2 headers")
+    parser.add_argument("input_file", nargs="?",
+                        default="/Users/britainsaluri/Downloads/Argh Let's Get Huge Matey.xlsx")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
     try:
-        check_workbook_sheets(input_file)
+        check_workbook_sheets(args.input_file, None if args.no_cache else args.cache_dir)
     except Exception as e:
         print(f"ERROR: {str(e)}")
         import traceback
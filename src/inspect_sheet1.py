@@ -1,42 +1,58 @@
 #!/usr/bin/env python3
 """
 Inspect Sheet 1 structure to understand layout
+Reads the workbook through the cached cell index (scripts/cell_index.py),
+so repeated runs on an unchanged file do not reload it.
 """
 
-import openpyxl
+import argparse
 import sys
+from pathlib import Path
 
-def inspect_sheet(file_path):
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from cell_index import add_cache_arguments, load_cell_index, print_hits
+
+def inspect_sheet(file_path, find=(), cache_dir=None):
     """Inspect sheet structure"""
 
-    print(f"Loading workbook: {file_path}")
-    workbook = openpyxl.load_workbook(file_path, data_only=True)
+    print(f"Loading cell index: {file_path}")
+    index = load_cell_index(file_path, cache_dir)
 
     # Get Sheet 1
-    sheet = workbook.worksheets[0]
-    print(f"\nSheet name: {sheet.title}")
-    print(f"Max rows: {sheet.max_row}")
-    print(f"Max columns: {sheet.max_column}")
+    sheet = index.sheets[0]
+    title = sheet["title"]
+    print(f"\nSheet name: {title}")
+    print(f"Max rows: {sheet['max_row']}")
+    print(f"Max columns: {sheet['max_column']}")
 
     print("\n=== First 100 rows (Column A-F) ===\n")
 
-    for row_num in range(1, min(101, sheet.max_row + 1)):
-        row_data = []
-        for col in range(1, 7):
-            cell = sheet.cell(row_num, col)
-            value = str(cell.value).strip() if cell.value else ""
-            row_data.append(value)
+    for row_num in range(1, min(101, sheet["max_row"] + 1)):
+        row_data = index.row_values(title, row_num, 1, 6)
 
         # Only print non-empty rows
         if any(row_data):
             print(f"Row {row_num:3d}: {' | '.join(row_data)}")
 
-    workbook.close()
+    print("\n=== WEEK headers ===")
+    print_hits(index.week_headers(title))
+    print("\n=== DAY headers ===")
+    print_hits(index.day_headers(title))
+
+    for text in find:
+        print(f"\n=== '{text}' (all sheets) ===")
+        print_hits(index.find(text))
 
 if __name__ == "__main__":
-    input_file = "/Users/britainsaluri/Downloads/Argh Let's Get Huge Matey.xlsx"
+    parser = argparse.ArgumentParser(description="Inspect the layout of Sheet 1")
+    parser.add_argument("input_file", nargs="?",
+                        default="/Users/britainsaluri/Downloads/Argh Let's Get Huge Matey.xlsx")
+    parser.add_argument("--find", action="append", default=[], metavar="TEXT",
+                        help="Also locate cells with this text, e.g. an exercise name (repeatable)")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
     try:
-        inspect_sheet(input_file)
+        inspect_sheet(args.input_file, args.find, None if args.no_cache else args.cache_dir)
     except Exception as e:
         print(f"ERROR: {str(e)}")
         import traceback
@@ -1,51 +1,64 @@
 #!/usr/bin/env python3
 """
 Inspect exact location of Week 2 data
+Uses the cached cell index (scripts/cell_index.py) to find the WEEK
+headers instead of assuming they sit in row 2.
 """
 
-import openpyxl
+import argparse
 import sys
+from pathlib import Path
 
-def inspect_week2(file_path):
+from openpyxl.utils import get_column_letter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from cell_index import add_cache_arguments, load_cell_index
+
+def inspect_week2(file_path, cache_dir=None):
     """Inspect Week 2 data location"""
 
-    print(f"Loading workbook: {file_path}")
-    workbook = openpyxl.load_workbook(file_path, data_only=True)
+    print(f"Loading cell index: {file_path}")
+    index = load_cell_index(file_path, cache_dir)
 
-    sheet = workbook.worksheets[0]
-    print(f"\nSheet name: {sheet.title}")
-    print(f"Max rows: {sheet.max_row}")
-    print(f"Max columns: {sheet.max_column}")
+    sheet = index.sheets[0]
+    title = sheet["title"]
+    print(f"\nSheet name: {title}")
+    print(f"Max rows: {sheet['max_row']}")
+    print(f"Max columns: {sheet['max_column']}")
 
-    print("\n=== Row 2 (Week headers) - All columns ===\n")
-    for col in range(1, 17):
-        cell = sheet.cell(2, col)
-        value = str(cell.value).strip() if cell.value else ""
-        col_letter = openpyxl.utils.get_column_letter(col)
+    headers = index.week_headers(title)
+    header_row = headers[0].row if headers else 2
+    for hit in headers:
+        if hit.row == header_row:
+            print(f"{hit.text} starts at column {get_column_letter(hit.column)} (index {hit.column})")
+
+    print(f"\n=== Row {header_row} (Week headers) - All columns ===\n")
+    for col, value in enumerate(index.row_values(title, header_row, 1, 16), start=1):
+        col_letter = get_column_letter(col)
         print(f"Column {col_letter} (index {col}): '{value}'")
 
-    print("\n=== Rows 3-6 - All columns (Day 1 data) ===\n")
-    for row_num in range(3, 7):
+    print(f"\n=== Rows {header_row + 1}-{header_row + 4} - All columns (Day 1 data) ===\n")
+    for row_num in range(header_row + 1, header_row + 5):
         row_data = []
-        for col in range(1, 17):
-            cell = sheet.cell(row_num, col)
-            value = str(cell.value).strip() if cell.value else ""
+        for value in index.row_values(title, row_num, 1, 16):
             if len(value) > 20:
                 value = value[:17] + "..."
             row_data.append(value)
 
         print(f"Row {row_num}:")
         for idx, val in enumerate(row_data, start=1):
-            col_letter = openpyxl.utils.get_column_letter(idx)
+            col_letter = get_column_letter(idx)
             if val:
                 print(f"  {col_letter}: {val}")
 
-    workbook.close()
-
 if __name__ == "__main__":
-    input_file = "/Users/britainsaluri/Downloads/Argh Let's Get Huge Matey.xlsx"
+    parser = argparse.ArgumentParser(description="Show where the Week 2 columns of Sheet 1 are")
+    parser.add_argument("input_file", nargs="?",
+                        default="/Users/britainsaluri/Downloads/Argh Let's Get Huge Matey.xlsx")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
     try:
-        inspect_week2(input_file)
+        inspect_week2(args.input_file, None if args.no_cache else args.cache_dir)
     except Exception as e:
         print(f"ERROR: {str(e)}")
         import traceback
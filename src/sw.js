@@ -1,16 +1,50 @@
 // Service Worker for PWA functionality
 const CACHE_NAME = 'workout-tracker-v1';
+const DATA_CACHE_PREFIX = 'workout-data-';
 const urlsToCache = [
   '/',
   '/index.html',
   '/manifest.json'
 ];
 
+// Content-hashed data files, written by scripts/publish_artifacts.py.
+// A changed manifest changes this script's imports, which updates the worker.
+self.PRECACHE_MANIFEST = { revision: 'none', files: {} };
+try {
+  importScripts('precache-manifest.js');
+} catch (error) {
+  // Not published: the manifest keeps its 'none' revision
+}
+const DATA_CACHE = DATA_CACHE_PREFIX + self.PRECACHE_MANIFEST.revision;
+// Nothing published yet: only the app shell is cached, and data is fetched as before
+const dataUrls = self.PRECACHE_MANIFEST.revision === 'none' ? [] : [
+  'data-manifest.json',
+  ...Object.values(self.PRECACHE_MANIFEST.files).map((file) => file.url)
+].map((url) => new URL(url, self.registration.scope).href);
+
+// Hashed files already cached by an earlier revision are copied, not downloaded
+async function precacheData() {
+  if (dataUrls.length === 0) {
+    return;
+  }
+  const cache = await caches.open(DATA_CACHE);
+  await Promise.all(dataUrls.map(async (url) => {
+    const cached = url.endsWith('/data-manifest.json') ? null : await caches.match(url);
+    const response = cached || await fetch(url, { cache: 'no-cache' });
+    if (!response.ok) {
+      throw new Error(`Failed to precache ${url}`);
+    }
+    await cache.put(url, response);
+  }));
+}
+
 // Install event
 self.addEventListener('install', (event) => {
   event.waitUntil(
-    caches.open(CACHE_NAME)
-      .then((cache) => cache.addAll(urlsToCache))
+    Promise.all([
+      caches.open(CACHE_NAME).then((cache) => cache.addAll(urlsToCache)),
+      precacheData()
+    ]).then(() => self.skipWaiting())
   );
 });
 
@@ -35,11 +69,11 @@ self.addEventListener('activate', (event) => {
     caches.keys().then((cacheNames) => {
       return Promise.all(
         cacheNames.map((cacheName) => {
-          if (cacheName !== CACHE_NAME) {
+          if (cacheName !== CACHE_NAME && cacheName !== DATA_CACHE) {
             return caches.delete(cacheName);
           }
         })
       );
-    })
+    }).then(() => self.clients.claim())
   );
-});
\ No newline at end of file
+});
@@ -0,0 +1,102 @@
+/**
+ * Columnar Workout Data Decoder
+ *
+ * Rebuilds the nested workout-data.json structure from the compact columnar
+ * export written by scripts/columnar_export.py. String values are indexes
+ * into a shared string table; each table row's count says how many rows of
+ * the next table belong to it, so decoding is one sequential walk.
+ *
+ * @module columnarData
+ */
+
+const FORMAT_NAME = 'workout-columnar';
+const FORMAT_VERSION = 1;
+const LAYOUT_BLOCKS = 1;
+
+const WEEK_EXERCISE_FIELDS = ['exercise_id', 'exercise_name', 'tempo', 'sets_reps', 'rest', 'results'];
+const BLOCK_RANGES = ['week_1_2', 'week_3_4'];
+const BLOCK_RANGE_FIELDS = ['tempo', 'sets', 'reps', 'results', 'pump_rating'];
+
+/**
+ * Decode a columnar document into the nested workout data structure
+ *
+ * @param {Object} doc - Parsed columnar JSON
+ * @returns {Object} Same shape as workout-data.json ({ program_name, sheets })
+ * @throws {Error} If the document is not a supported columnar export
+ *
+ * @example
+ * const doc = await (await fetch('workout-data.wcol.json')).json();
+ * const workoutData = decodeColumnar(doc);
+ */
+export function decodeColumnar(doc) {
+  if (!doc || doc.format !== FORMAT_NAME || doc.version !== FORMAT_VERSION) {
+    throw new Error(`Not a ${FORMAT_NAME} v${FORMAT_VERSION} document`);
+  }
+
+  const strings = doc.strings;
+  const text = (value) => (value === null ? null : strings[value]);
+  const cursor = { days: 0, weeks: 0, blocks: 0, weekExercises: 0, blockExercises: 0 };
+  const { sheets, days, weeks, blocks } = doc;
+  const weekExercises = doc.week_exercises;
+  const blockExercises = doc.block_exercises;
+
+  const result = [];
+  for (let s = 0; s < sheets.sheet_name.length; s++) {
+    const sheet = {
+      sheet_name: text(sheets.sheet_name[s]),
+      program_name: text(sheets.program_name[s]),
+      days: []
+    };
+
+    for (let d = 0; d < sheets.days[s]; d++) {
+      const i = cursor.days++;
+      const groups = days.groups[i];
+      let day;
+
+      if (days.layout[i] === LAYOUT_BLOCKS) {
+        day = { day_name: text(days.day_name[i]), week_range: text(days.week_range[i]), blocks: [] };
+        for (let g = 0; g < groups; g++) {
+          const b = cursor.blocks++;
+          const exercises = [];
+          for (let e = 0; e < blocks.exercises[b]; e++) {
+            const row = cursor.blockExercises++;
+            const exercise = { exercise_name: text(blockExercises.exercise_name[row]) };
+            for (const range of BLOCK_RANGES) {
+              exercise[range] = {};
+              for (const field of BLOCK_RANGE_FIELDS) {
+                const value = blockExercises[`${range}.${field}`][row];
+                exercise[range][field] = field === 'pump_rating' ? value : text(value);
+              }
+            }
+            exercises.push(exercise);
+          }
+          day.blocks.push({ block_name: text(blocks.block_name[b]), exercises });
+        }
+      } else {
+        day = { day_name: text(days.day_name[i]), weeks: [] };
+        for (let g = 0; g < groups; g++) {
+          const w = cursor.weeks++;
+          const exercises = [];
+          for (let e = 0; e < weeks.exercises[w]; e++) {
+            const row = cursor.weekExercises++;
+            const exercise = {};
+            for (const field of WEEK_EXERCISE_FIELDS) {
+              exercise[field] = text(weekExercises[field][row]);
+            }
+            exercises.push(exercise);
+          }
+          day.weeks.push({ week_number: weeks.week_number[w], exercises });
+        }
+      }
+
+      sheet.days.push(day);
+    }
+    result.push(sheet);
+  }
+
+  return { program_name: doc.program_name, sheets: result };
+}
+
+export default {
+  decodeColumnar
+};
@@ -0,0 +1,46 @@
+/**
+ * Data Manifest
+ *
+ * Resolves data files to the content-hashed copies published by
+ * scripts/publish_artifacts.py. data-manifest.json maps each logical name
+ * (e.g. "workout-data.json") to its hashed URL; the service worker
+ * precaches exactly those URLs, so the resolved URL is served from the
+ * cache after the first visit and is never stale. Names that were not
+ * published resolve to themselves.
+ *
+ * @module dataManifest
+ */
+
+const MANIFEST_FORMAT = 'workout-precache';
+const MANIFEST_URL = 'data-manifest.json';
+
+let manifestPromise = null;
+
+/**
+ * Load data-manifest.json once per page
+ *
+ * @returns {Promise<Object|null>} The manifest, or null when none is published
+ */
+export function loadDataManifest() {
+  if (!manifestPromise) {
+    manifestPromise = fetch(MANIFEST_URL)
+      .then((response) => (response.ok ? response.json() : null))
+      .then((manifest) => (manifest?.format === MANIFEST_FORMAT ? manifest : null))
+      .catch(() => null);
+  }
+  return manifestPromise;
+}
+
+/**
+ * URL to fetch a data file from
+ *
+ * @param {string} name - Logical file name, e.g. 'sheet1-workout-data.json'
+ * @returns {Promise<string>} The hashed URL, or name when it is not published
+ *
+ * @example
+ * const response = await fetch(await resolveDataUrl('workout-data.json'));
+ */
+export async function resolveDataUrl(name) {
+  const manifest = await loadDataManifest();
+  return manifest?.files[name]?.url ?? name;
+}
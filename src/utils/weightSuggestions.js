@@ -22,7 +22,7 @@ class SuggestionEngine {
    *
    * @param {string} exerciseId - Exercise identifier (e.g., "A1")
    * @param {Array<{weight: number, reps: number, completed: boolean}>} week1Results - Week 1 set results
-   * @param {string} week2Target - Week 2 target rep range (e.g., "3x18-20")
+   * @param {string|Object} week2Target - Week 2 target rep range (e.g., "3x18-20") or its parsed fields
    * @returns {Object|null} Suggestion object with weight, reason, and confidence, or null if insufficient data
    *
    * @example
@@ -267,15 +267,25 @@ class SuggestionEngine {
   /**
    * Parse rep range string into min/max object
    *
-   * @param {string} rangeStr - Rep range string (e.g., "18-20", "3x18-20", "10ea")
+   * @param {string|Object} rangeStr - Rep range string (e.g., "18-20", "3x18-20", "10ea"),
+   *   or the `parsed` object written by the extractor with --parse-fields
    * @returns {{min: number, max: number}|null} Parsed range or null if invalid
    *
    * @example
    * parseRepRange("18-20") // { min: 18, max: 20 }
    * parseRepRange("3x18-20") // { min: 18, max: 20 }
    * parseRepRange("10ea") // { min: 10, max: 10 }
+   * parseRepRange({ reps_min: 18, reps_max: 20, to_failure: false }) // { min: 18, max: 20 }
    */
   _parseRepRange(rangeStr) {
+    // Pre-parsed at extraction time: no string handling needed
+    if (rangeStr && typeof rangeStr === 'object') {
+      if (rangeStr.reps_min !== null && rangeStr.reps_min !== undefined) {
+        return { min: rangeStr.reps_min, max: rangeStr.reps_max ?? rangeStr.reps_min };
+      }
+      return rangeStr.to_failure ? { min: 1, max: 100 } : null;
+    }
+
     if (!rangeStr || typeof rangeStr !== 'string') {
       return null;
     }
@@ -0,0 +1,213 @@
+/**
+ * Workout Data Deltas
+ *
+ * Brings a cached copy of workout-data.json up to date with the JSON Patch
+ * deltas written by scripts/json_delta.py, instead of downloading the whole
+ * file again. workout-data.version.json names the current version (the first
+ * 16 hex digits of the file's SHA-256) and the recent delta chain; each
+ * workout-data.delta.<from>-<to>.json holds the RFC 6902 operations.
+ *
+ * @module workoutDelta
+ */
+
+const DELTA_FORMAT = 'workout-delta';
+const VERSION_FORMAT = 'workout-version';
+
+function unescapeToken(token) {
+  return token.replace(/~1/g, '/').replace(/~0/g, '~');
+}
+
+function resolveParent(doc, path) {
+  const tokens = path.split('/').slice(1).map(unescapeToken);
+  const last = tokens.pop();
+  let parent = doc;
+  for (const token of tokens) {
+    parent = parent?.[Array.isArray(parent) ? Number(token) : token];
+  }
+  if (parent === null || typeof parent !== 'object') {
+    throw new Error(`No value at ${path}`);
+  }
+  return { parent, last };
+}
+
+function listIndex(list, token, path, appending) {
+  if (appending && token === '-') {
+    return list.length;
+  }
+  const index = Number(token);
+  if (!/^\d+$/.test(token) || index > list.length - (appending ? 0 : 1)) {
+    throw new Error(`Index ${token} out of range at ${path}`);
+  }
+  return index;
+}
+
+function getValue(doc, path) {
+  if (path === '') {
+    return doc;
+  }
+  const { parent, last } = resolveParent(doc, path);
+  return Array.isArray(parent) ? parent[listIndex(parent, last, path, false)] : parent[last];
+}
+
+function addValue(doc, path, value) {
+  if (path === '') {
+    return value;
+  }
+  const { parent, last } = resolveParent(doc, path);
+  if (Array.isArray(parent)) {
+    parent.splice(listIndex(parent, last, path, true), 0, value);
+  } else {
+    parent[last] = value;
+  }
+  return doc;
+}
+
+function removeValue(doc, path) {
+  const { parent, last } = resolveParent(doc, path);
+  if (Array.isArray(parent)) {
+    return parent.splice(listIndex(parent, last, path, false), 1)[0];
+  }
+  if (!(last in parent)) {
+    throw new Error(`No value at ${path}`);
+  }
+  const value = parent[last];
+  delete parent[last];
+  return value;
+}
+
+function replaceValue(doc, path, value) {
+  if (path === '') {
+    return value;
+  }
+  const { parent, last } = resolveParent(doc, path);
+  if (Array.isArray(parent)) {
+    parent[listIndex(parent, last, path, false)] = value;
+  } else if (last in parent) {
+    // Assigning keeps the key where it was
+    parent[last] = value;
+  } else {
+    throw new Error(`No value at ${path}`);
+  }
+  return doc;
+}
+
+/**
+ * Apply RFC 6902 operations to a document, in place
+ *
+ * @param {Object} doc - Parsed workout-data.json (modified)
+ * @param {Array<Object>} patch - JSON Patch operations
+ * @returns {Object} The patched document (a new object only when the root is replaced)
+ * @throws {Error} If an operation does not fit the document
+ */
+export function applyPatch(doc, patch) {
+  for (const op of patch) {
+    switch (op.op) {
+      case 'add':
+        doc = addValue(doc, op.path, structuredClone(op.value));
+        break;
+      case 'remove':
+        removeValue(doc, op.path);
+        break;
+      case 'replace':
+        doc = replaceValue(doc, op.path, structuredClone(op.value));
+        break;
+      case 'move':
+        doc = addValue(doc, op.path, removeValue(doc, op.from));
+        break;
+      case 'copy':
+        doc = addValue(doc, op.path, structuredClone(getValue(doc, op.from)));
+        break;
+      case 'test':
+        if (JSON.stringify(getValue(doc, op.path)) !== JSON.stringify(op.value)) {
+          throw new Error(`Test failed at ${op.path}`);
+        }
+        break;
+      default:
+        throw new Error(`Unknown operation ${op.op}`);
+    }
+  }
+  return doc;
+}
+
+/**
+ * The deltas leading from a version to the current one
+ *
+ * @param {Object} versionInfo - Parsed workout-data.version.json
+ * @param {string} fromVersion - Version of the cached copy
+ * @returns {Array<Object>|null} Delta entries in order ([] when current), or
+ *   null when the chain does not reach back that far
+ */
+export function deltaChain(versionInfo, fromVersion) {
+  if (!versionInfo || versionInfo.format !== VERSION_FORMAT) {
+    return null;
+  }
+  if (fromVersion === versionInfo.version) {
+    return [];
+  }
+  const chain = [];
+  let target = versionInfo.version;
+  for (const entry of [...(versionInfo.deltas || [])].reverse()) {
+    if (entry.to !== target) {
+      break;
+    }
+    chain.unshift(entry);
+    if (entry.from === fromVersion) {
+      return chain;
+    }
+    target = entry.from;
+  }
+  return null;
+}
+
+/**
+ * Version of a workout-data.json text, like json_delta.text_version()
+ *
+ * @param {string} text - File contents
+ * @returns {Promise<string>} First 16 hex digits of the SHA-256 of its UTF-8 bytes
+ */
+export async function textVersion(text) {
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(text));
+  return Array.from(new Uint8Array(digest).slice(0, 8), (byte) => byte.toString(16).padStart(2, '0')).join('');
+}
+
+/**
+ * Fetch the current workout data, patching a cached copy when possible
+ *
+ * A full download is labelled with the hash of the text that arrived, not
+ * with the version file read before it: a run that finishes in between
+ * replaces workout-data.json, and the copy must not claim an older version
+ * (its next update would apply deltas to the wrong document).
+ *
+ * @param {string} dataUrl - URL of workout-data.json
+ * @param {Object|null} cached - { version, data } from the last call, or null
+ * @returns {Promise<Object>} { version, data, patched } where patched says
+ *   whether deltas were applied instead of downloading the full file
+ *
+ * @example
+ * const latest = await fetchWorkoutData('workout-data.json', JSON.parse(localStorage.workoutData || 'null'));
+ * localStorage.workoutData = JSON.stringify({ version: latest.version, data: latest.data });
+ */
+export async function fetchWorkoutData(dataUrl, cached) {
+  const base = dataUrl.replace(/\.json$/, '');
+  const versionInfo = await (await fetch(`${base}.version.json`, { cache: 'no-cache' })).json();
+  const chain = cached ? deltaChain(versionInfo, cached.version) : null;
+
+  if (chain) {
+    try {
+      let data = structuredClone(cached.data);
+      for (const entry of chain) {
+        const delta = await (await fetch(new URL(entry.file, new URL(dataUrl, location.href)))).json();
+        if (delta.format !== DELTA_FORMAT || delta.from !== entry.from) {
+          throw new Error(`Unexpected delta ${entry.file}`);
+        }
+        data = applyPatch(data, delta.patch);
+      }
+      return { version: versionInfo.version, data, patched: chain.length > 0 };
+    } catch (error) {
+      console.warn('Delta update failed, downloading the full workout data:', error);
+    }
+  }
+
+  const text = await (await fetch(dataUrl, { cache: 'no-cache' })).text();
+  return { version: await textVersion(text), data: JSON.parse(text), patched: false };
+}
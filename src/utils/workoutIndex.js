@@ -0,0 +1,94 @@
+/**
+ * Workout Lookup Index
+ *
+ * Direct lookups into workout-data.json through the sidecar index written by
+ * scripts/lookup_index.py (workout-data.index.json), instead of walking
+ * sheets → days → weeks → exercises. Days are keyed by their 1-based
+ * position; Sheet4 weeks are "1-2"/"3-4" with "<block>#<position>" IDs.
+ *
+ * @module workoutIndex
+ */
+
+const INDEX_FORMAT = 'workout-index';
+const INDEX_VERSION = 1;
+
+/**
+ * Check that a parsed index is one this module understands
+ *
+ * @param {Object} index - Parsed workout-data.index.json
+ * @returns {boolean} True if the index can be used
+ */
+export function isValidIndex(index) {
+  return !!index && index.format === INDEX_FORMAT && index.version === INDEX_VERSION;
+}
+
+function weekEntry(index, program, day, week) {
+  const dayEntry = index.programs[program]?.days[String(day)];
+  const entry = dayEntry?.weeks[String(week)];
+  return entry ? { dayEntry, entry } : null;
+}
+
+/**
+ * Find an exercise by program, day, week and exercise ID
+ *
+ * @param {Object} workoutData - Parsed workout-data.json
+ * @param {Object} index - Parsed workout-data.index.json
+ * @param {string} program - Sheet name (e.g., "Sheet1")
+ * @param {number} day - 1-based day position
+ * @param {number|string} week - Week number, or "1-2"/"3-4" on Sheet4
+ * @param {string} exerciseId - Exercise ID (e.g., "A1", or "Block 1#0" on Sheet4)
+ * @returns {Object|null} The exercise (Sheet4: its values for that week range), or null
+ *
+ * @example
+ * findExercise(data, index, 'Sheet1', 1, 2, 'A1')
+ * // Returns: { exercise_id: "A1", exercise_name: "Barbell Bench", ... }
+ */
+export function findExercise(workoutData, index, program, day, week, exerciseId) {
+  const found = weekEntry(index, program, day, week);
+  const paths = found?.entry.exercises[exerciseId];
+  if (!paths || paths.length === 0) {
+    return null;
+  }
+
+  const [s, d, g, e] = paths[0];
+  const layout = found.dayEntry.layout;
+  const exercise = workoutData.sheets[s].days[d][layout][g].exercises[e];
+  return layout === 'blocks' ? exercise[found.entry.range] : exercise;
+}
+
+/**
+ * Every place an exercise name is used, across all programs
+ *
+ * @param {Object} index - Parsed workout-data.index.json
+ * @param {string} exerciseName - Exercise name as in the workbook
+ * @returns {Array<{program: string, day: number, week: string, exerciseId: string}>} Occurrences
+ */
+export function findByName(index, exerciseName) {
+  return (index.names[exerciseName] || []).map(([program, day, week, exerciseId]) => ({
+    program,
+    day: parseInt(day, 10),
+    week,
+    exerciseId
+  }));
+}
+
+/**
+ * Number of exercises on a day in a given week
+ *
+ * @param {Object} index - Parsed workout-data.index.json
+ * @param {string} program - Sheet name
+ * @param {number} day - 1-based day position
+ * @param {number|string} week - Week number, or "1-2"/"3-4" on Sheet4
+ * @returns {number} Exercise count (0 if the day or week does not exist)
+ */
+export function getExerciseCount(index, program, day, week) {
+  const dayEntry = index.programs[program]?.days[String(day)];
+  return dayEntry?.counts[String(week)] ?? 0;
+}
+
+export default {
+  isValidIndex,
+  findExercise,
+  findByName,
+  getExerciseCount
+};
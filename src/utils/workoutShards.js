@@ -0,0 +1,119 @@
+/**
+ * Workout Shards
+ *
+ * Lazy loading through the per-program, per-week shards written by
+ * scripts/shard_output.py. <output>.catalog.json lists every program with
+ * its day names and, per week ("1", "2", ... or "1-2"/"3-4" on Sheet4),
+ * the shard file, its size and exercise count. A shard has the same shape
+ * as the full output, cut down to one program and one week, so it can be
+ * used wherever the full document was.
+ *
+ * Files are resolved through the data manifest, so published (content-hashed)
+ * shards are used when present.
+ *
+ * @module workoutShards
+ */
+
+import { resolveDataUrl } from './dataManifest.js';
+
+const CATALOG_FORMAT = 'workout-catalog';
+const CATALOG_VERSION = 1;
+
+async function fetchJson(name, baseUrl) {
+  const published = await resolveDataUrl(name);
+  const url = published === name ? new URL(name, new URL(baseUrl, location.href)) : published;
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`Failed to load ${name}: ${response.statusText}`);
+  }
+  return response.json();
+}
+
+/**
+ * Load a shard catalog
+ *
+ * @param {string} catalogUrl - e.g. 'sheet1-workout-data.catalog.json'
+ * @returns {Promise<Object|null>} The catalog, or null when there is none
+ */
+export async function loadCatalog(catalogUrl) {
+  try {
+    const catalog = await fetchJson(catalogUrl, catalogUrl);
+    return catalog.format === CATALOG_FORMAT && catalog.version === CATALOG_VERSION ? catalog : null;
+  } catch (error) {
+    return null;
+  }
+}
+
+/**
+ * Week keys of a program, in order
+ *
+ * @param {Object} catalog - Parsed catalog
+ * @param {string} program - Sheet name, e.g. 'Sheet1'
+ * @returns {Array<string>} Week keys
+ */
+export function catalogWeeks(catalog, program) {
+  return Object.keys(catalog.programs[program]?.weeks || {});
+}
+
+/**
+ * Load the shard of one program and week
+ *
+ * @param {Object} catalog - Parsed catalog
+ * @param {string} catalogUrl - URL the catalog was loaded from (shards sit next to it)
+ * @param {string} program - Sheet name
+ * @param {string|number} week - Week key
+ * @returns {Promise<Object|null>} The shard document, or null if the catalog has no such week
+ *
+ * @example
+ * const catalog = await loadCatalog('sheet1-workout-data.catalog.json');
+ * const shard = await loadShard(catalog, 'sheet1-workout-data.catalog.json', 'Sheet1', 1);
+ */
+export async function loadShard(catalog, catalogUrl, program, week) {
+  const entry = catalog.programs[program]?.weeks[String(week)];
+  return entry ? fetchJson(entry.file, catalogUrl) : null;
+}
+
+/**
+ * Shard loader for one program that fetches each week once
+ *
+ * Requests for a week already in flight share its promise, so switching
+ * weeks quickly does not download (and merge) the same shard twice. A
+ * failed request is forgotten, so the next call retries it.
+ *
+ * @param {Object} catalog - Parsed catalog
+ * @param {string} catalogUrl - URL the catalog was loaded from
+ * @param {string} program - Sheet name
+ * @returns {function(string|number): Promise<Object|null>} week -> loadShard() result
+ */
+export function createWeekLoader(catalog, catalogUrl, program) {
+  const pending = new Map();
+  return (week) => {
+    const key = String(week);
+    if (!pending.has(key)) {
+      const request = loadShard(catalog, catalogUrl, program, key);
+      pending.set(key, request);
+      request.catch(() => pending.delete(key));
+    }
+    return pending.get(key);
+  };
+}
+
+/**
+ * Add a Sheet1 shard's weeks to the weeks loaded so far
+ *
+ * @param {Object|null} workoutData - Document built from earlier shards, or null
+ * @param {Object} shard - A shard of sheet1-workout-data.json
+ * @returns {Object} The document with the shard's weeks, in week order;
+ *   weeks it already has are left alone
+ */
+export function mergeShard(workoutData, shard) {
+  if (!workoutData) {
+    return shard;
+  }
+  const added = shard.weeks.filter((week) => !workoutData.weeks.some((w) => w.week === week.week));
+  if (added.length > 0) {
+    workoutData.weeks.push(...added);
+    workoutData.weeks.sort((a, b) => a.week - b.week);
+  }
+  return workoutData;
+}
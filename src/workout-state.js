@@ -12,6 +12,7 @@
  */
 
 import { storage, STORES } from './storage.js';
+import { resolveDataUrl } from './utils/dataManifest.js';
 
 class WorkoutState {
   constructor() {
@@ -66,8 +67,8 @@ class WorkoutState {
       let workoutData;
 
       if (typeof source === 'string') {
-        // Load from URL or file path
-        const response = await fetch(source);
+        // Load from URL or file path (its hashed copy, if published)
+        const response = await fetch(await resolveDataUrl(source));
         if (!response.ok) {
           throw new Error(`Failed to load workout data: ${response.statusText}`);
         }
@@ -0,0 +1,17 @@
+"""Shared pytest fixtures for the Python extraction scripts."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from synthetic_workbook import build_workbook  # noqa: E402
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    """A small four-sheet synthetic workbook in the coach export layout."""
+    return build_workbook(str(tmp_path / "workbook.xlsx"), days=3, exercises_per_day=4, weeks=2)
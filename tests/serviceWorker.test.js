@@ -0,0 +1,144 @@
+/**
+ * Service Worker Precache Tests
+ *
+ * Runs src/sw.js in a sandbox with in-memory caches and a fake network:
+ * - A site that was never published (no precache-manifest.js, no
+ *   data-manifest.json) still installs and caches the app shell
+ * - A published revision precaches every manifest URL, copies files an
+ *   older revision already cached, and drops stale caches on activate
+ *
+ * Run with: node --experimental-detect-module --test tests/serviceWorker.test.js
+ */
+
+import { describe, it } from 'node:test';
+import assert from 'node:assert/strict';
+import fs from 'node:fs';
+import vm from 'node:vm';
+
+const SOURCE = fs.readFileSync(new URL('../src/sw.js', import.meta.url), 'utf8');
+const SCOPE = 'https://app.test/';
+
+const MANIFEST = {
+  revision: 'abc123def456',
+  files: {
+    'workout-data.json': { url: 'data/workout-data.111111111111.json' },
+    'sheet1-workout-data.json': { url: 'data/sheet1-workout-data.222222222222.json' }
+  }
+};
+
+/**
+ * Evaluate sw.js against fake caches/fetch
+ *
+ * @param {Object} options - { manifest, cached: {cacheName: [url]}, served: [path] }
+ * @returns {Object} { fire(type), fetched, caches }
+ */
+function loadWorker({ manifest = null, cached = {}, served = [] }) {
+  const stores = new Map(Object.entries(cached).map(([name, urls]) => [
+    name, new Map(urls.map((url) => [SCOPE + url, { ok: true, url: SCOPE + url }]))
+  ]));
+  const fetched = [];
+  const listeners = {};
+
+  const fetch = async (request) => {
+    const url = new URL(String(request), SCOPE).href;
+    fetched.push(url);
+    const path = url.slice(SCOPE.length);
+    return { ok: served.includes(path), status: served.includes(path) ? 200 : 404, url };
+  };
+
+  const open = async (name) => {
+    if (!stores.has(name)) {
+      stores.set(name, new Map());
+    }
+    const store = stores.get(name);
+    return {
+      put: async (url, response) => { store.set(String(url), response); },
+      addAll: async (urls) => {
+        for (const url of urls) {
+          const response = await fetch(url);
+          if (!response.ok) {
+            throw new Error(`addAll failed for ${url}`);
+          }
+          store.set(response.url, response);
+        }
+      }
+    };
+  };
+
+  const caches = {
+    open,
+    keys: async () => [...stores.keys()],
+    delete: async (name) => stores.delete(name),
+    match: async (request) => {
+      const url = new URL(String(request), SCOPE).href;
+      for (const store of stores.values()) {
+        if (store.has(url)) {
+          return store.get(url);
+        }
+      }
+      return undefined;
+    }
+  };
+
+  const self = {
+    registration: { scope: SCOPE },
+    clients: { claim: async () => {} },
+    skipWaiting: async () => {},
+    addEventListener: (type, listener) => { listeners[type] = listener; }
+  };
+  const importScripts = () => {
+    if (!manifest) {
+      throw new Error('NetworkError: precache-manifest.js returned 404');
+    }
+    self.PRECACHE_MANIFEST = structuredClone(manifest);
+  };
+
+  vm.runInNewContext(SOURCE, { self, caches, fetch, importScripts, URL, Promise, console });
+
+  async function fire(type) {
+    let pending = Promise.resolve();
+    listeners[type]({ waitUntil: (promise) => { pending = promise; } });
+    await pending;
+  }
+
+  return { fire, fetched, stores };
+}
+
+const SHELL = ['', 'index.html', 'manifest.json'];
+
+describe('service worker precache', () => {
+  it('installs with only the app shell when nothing was published', async () => {
+    const worker = loadWorker({ served: SHELL });
+
+    await worker.fire('install');
+    await worker.fire('activate');
+
+    assert.deepEqual(worker.fetched, SHELL.map((path) => SCOPE + path));
+    assert.deepEqual([...worker.stores.keys()], ['workout-tracker-v1']);
+  });
+
+  it('precaches a published revision and reuses files cached by the last one', async () => {
+    const reused = MANIFEST.files['workout-data.json'].url;
+    const fresh = MANIFEST.files['sheet1-workout-data.json'].url;
+    const worker = loadWorker({
+      manifest: MANIFEST,
+      cached: { 'workout-tracker-v1': SHELL, 'workout-data-000000000000': [reused, 'data-manifest.json'] },
+      served: [...SHELL, fresh, 'data-manifest.json']
+    });
+
+    await worker.fire('install');
+    await worker.fire('activate');
+
+    const dataFetches = worker.fetched.filter((url) => !SHELL.some((path) => url === SCOPE + path));
+    assert.deepEqual(dataFetches.sort(), [SCOPE + 'data-manifest.json', SCOPE + fresh].sort());
+    assert.deepEqual([...worker.stores.keys()], ['workout-tracker-v1', 'workout-data-abc123def456']);
+    assert.deepEqual([...worker.stores.get('workout-data-abc123def456').keys()].sort(),
+      ['data-manifest.json', reused, fresh].map((path) => SCOPE + path).sort());
+  });
+
+  it('fails the install when a published file is missing', async () => {
+    const worker = loadWorker({ manifest: MANIFEST, served: [...SHELL, 'data-manifest.json'] });
+
+    await assert.rejects(worker.fire('install'), /Failed to precache/);
+  });
+});
@@ -0,0 +1,33 @@
+"""Tests for scripts/atomic_write.py (temp file + os.replace writes)."""
+
+import os
+
+import pytest
+
+from atomic_write import atomic_write
+
+
+def test_writes_text_as_utf8_and_bytes_unchanged(tmp_path):
+    path = tmp_path / "out.json"
+
+    atomic_write(str(path), '{"name": "Übung"}\n')
+    assert path.read_bytes() == '{"name": "Übung"}\n'.encode("utf-8")
+
+    atomic_write(str(path), b"\x1f\x8b")
+    assert path.read_bytes() == b"\x1f\x8b"
+    assert os.listdir(tmp_path) == ["out.json"]
+
+
+def test_a_failed_write_keeps_the_old_file(tmp_path, monkeypatch):
+    path = tmp_path / "out.json"
+    path.write_text("old", encoding="utf-8")
+
+    def fail(src, dst):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(KeyboardInterrupt):
+        atomic_write(str(path), "new")
+
+    assert path.read_text(encoding="utf-8") == "old"
+    assert os.listdir(tmp_path) == ["out.json"]
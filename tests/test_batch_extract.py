@@ -0,0 +1,26 @@
+"""Tests for scripts/batch_extract.py (parallel batch extraction)."""
+
+import json
+import shutil
+
+from batch_extract import SUMMARY_FILENAME, run_batch
+
+
+def test_batch_collects_failures_and_writes_outputs(tmp_path, workbook_path):
+    source = tmp_path / "athletes"
+    source.mkdir()
+    shutil.copy(workbook_path, source / "alice.xlsx")
+    shutil.copy(workbook_path, source / "bob.xlsx")
+    (source / "broken.xlsx").write_bytes(b"not a zip file")
+    (source / "~$alice.xlsx").write_bytes(b"lock file")
+
+    output_dir = tmp_path / "out"
+    summary = run_batch(str(source), str(output_dir), workers=2)
+
+    assert summary["total"] == 3
+    assert summary["succeeded"] == 2
+    assert summary["failed"] == 1
+    assert [f["status"] for f in summary["files"]] == ["ok", "ok", "failed"]
+    assert json.loads((output_dir / "alice.json").read_text())["sheets"]
+    assert (output_dir / "bob.json").exists()
+    assert json.loads((output_dir / SUMMARY_FILENAME).read_text())["failed"] == 1
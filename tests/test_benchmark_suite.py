@@ -0,0 +1,51 @@
+"""Tests for the synthetic workbook knobs and the benchmark suite."""
+
+import contextlib
+import io
+
+from benchmark_suite import compare, count_rows, run_suite
+from extract_workouts import WorkoutExtractor
+from synthetic_workbook import build_workbook
+
+
+def extract(path, **options):
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractor = WorkoutExtractor(path, **options)
+        data = extractor.extract_all_sheets()
+        extractor.close()
+    return data
+
+
+def test_generator_scale_knobs(tmp_path):
+    plain = build_workbook(str(tmp_path / "plain.xlsx"), days=4, exercises_per_day=6, weeks=3)
+    padded = build_workbook(str(tmp_path / "padded.xlsx"), days=4, exercises_per_day=6, weeks=3,
+                            results_fill=0.5, blocks_per_day=2, exercises_per_block=5,
+                            padding_columns=8, padding_rows=25)
+
+    # Padding rows are styled cells, so they count even though they hold no values
+    assert count_rows(padded)["Sheet1"] >= count_rows(plain)["Sheet1"] + 25
+
+    data = extract(padded)
+    assert data == extract(padded, reader="fast")
+    exercises = [e for day in data["sheets"][0]["days"] for week in day["weeks"] for e in week["exercises"]]
+    filled = sum(1 for e in exercises if e["results"])
+    assert 0 < filled < len(exercises)
+    assert [len(b["exercises"]) for b in data["sheets"][3]["days"][0]["blocks"]] == [5, 5]
+
+
+def test_suite_reports_rows_time_and_memory():
+    report = run_suite(["small"], repeat=1, only=["extract_sheet1"])
+    assert {r["variant"] for r in report["results"]} == {"openpyxl", "fast"}
+    for r in report["results"]:
+        assert r["rows"] > 0 and r["seconds"] > 0 and r["peak_bytes"] > 0
+        assert abs(r["rows_per_second"] * r["seconds"] - r["rows"]) < r["rows"] * 0.01
+
+
+def test_compare_flags_slowdowns():
+    result = {"scale": "small", "extractor": "extract_sheet1", "variant": "fast"}
+    baseline = {"results": [{**result, "seconds": 1.0, "peak_bytes": 100}]}
+    current = {"results": [{**result, "seconds": 1.5, "peak_bytes": 100}]}
+
+    [change] = compare(current, baseline, threshold=0.1)
+    assert change["time_change"] == 0.5 and change["regression"]
+    assert not compare(baseline, baseline, threshold=0.1)[0]["regression"]
@@ -0,0 +1,73 @@
+"""Tests for the cached inverted cell index (scripts/cell_index.py)."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import openpyxl
+
+from cell_index import build_cell_index, load_cell_index, normalize
+from test_fast_xlsx import rewrite_sheet
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def test_index_matches_a_full_grid_scan(workbook_path):
+    index = load_cell_index(workbook_path, cache_dir=None)
+
+    workbook = openpyxl.load_workbook(workbook_path, data_only=True)
+    expected = []
+    for sheet in workbook.worksheets:
+        for row in sheet.iter_rows():
+            for cell in row:
+                if isinstance(cell.value, str) and "WEEK" in cell.value.upper():
+                    expected.append((sheet.title, cell.row, cell.column))
+    workbook.close()
+
+    assert [(h.sheet, h.row, h.column) for h in index.contains("week")] == expected
+    assert [h.text for h in index.week_headers("Sheet1")] == ["WEEK 1", "WEEK 2"]
+    assert index.value("Sheet1", 2, 4) == "WEEK 1"
+    assert index.value("Sheet1", 2, 5) == ""
+
+
+def test_index_ignores_a_too_small_dimension_tag(workbook_path):
+    expected = build_cell_index(workbook_path)
+    rewrite_sheet(workbook_path, lambda xml: xml.replace(
+        b"<sheetViews>", b'<dimension ref="A1:B2"/><sheetViews>', 1))
+
+    assert build_cell_index(workbook_path) == expected
+
+
+def test_queries_are_whitespace_and_case_insensitive(workbook_path):
+    index = load_cell_index(workbook_path, cache_dir=None)
+    name = index.value("Sheet1", 4, 2)
+
+    hits = index.find(f"  {name.upper()} ")
+    assert hits and all(normalize(hit.text) == normalize(name) for hit in hits)
+    assert {hit.sheet for hit in hits} <= {"Sheet1", "Sheet2", "Sheet3", "Sheet4"}
+    assert all(hit.sheet == "Sheet2" for hit in index.find(name, sheet="Sheet2"))
+    assert len(index.day_headers("Sheet1")) == 3
+
+
+def test_index_is_cached_by_content(workbook_path, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+
+    first = load_cell_index(workbook_path, cache_dir)
+    second = load_cell_index(workbook_path, cache_dir)
+    assert (first.cached, second.cached) == (False, True)
+    assert second.data == build_cell_index(workbook_path)
+
+    workbook = openpyxl.load_workbook(workbook_path)
+    workbook.worksheets[0]["A1"] = "Renamed Program"
+    workbook.save(workbook_path)
+    changed = load_cell_index(workbook_path, cache_dir)
+    assert not changed.cached
+    assert changed.find("renamed program")[0][:3] == ("Sheet1", 1, 1)
+
+
+def test_check_all_sheets_reports_week2_cells(workbook_path, tmp_path):
+    result = subprocess.run([sys.executable, str(SRC_DIR / "check_all_sheets.py"), workbook_path,
+                             "--cache-dir", str(tmp_path / "cache")],
+                            check=True, capture_output=True, text=True)
+    assert "✓ Found 'Week 2' at Row 2, Column 9" in result.stdout
+    assert "✗ No 'Week 2' indicators found in this sheet" in result.stdout  # Sheet4 uses "Week 1,2"
@@ -0,0 +1,70 @@
+"""Tests for the columnar export (scripts/columnar_export.py)."""
+
+import contextlib
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from columnar_export import FORMAT_NAME, decode, dumps, encode, read_columnar
+from extract_workouts import WorkoutExtractor
+
+WORKOUT_DATA = Path(__file__).resolve().parent.parent / "src" / "workout-data.json"
+
+
+def extract(workbook_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractor = WorkoutExtractor(workbook_path)
+        data = extractor.extract_all_sheets()
+        extractor.close()
+    return data
+
+
+def test_round_trip_keeps_values_and_key_order(workbook_path):
+    data = extract(workbook_path)
+    decoded = decode(json.loads(dumps(encode(data))))
+    assert json.dumps(decoded) == json.dumps(data)
+
+
+def test_real_export_round_trips_and_shrinks():
+    with open(WORKOUT_DATA, encoding="utf-8") as f:
+        data = json.load(f)
+    text = dumps(encode(data))
+
+    assert json.dumps(decode(json.loads(text))) == json.dumps(data)
+    assert len(text) < len(json.dumps(data, separators=(",", ":"))) / 2
+
+
+def test_string_table_is_deduplicated_most_frequent_first(workbook_path):
+    doc = encode(extract(workbook_path))
+    strings = doc["strings"]
+    assert len(strings) == len(set(strings))
+
+    counts = [0] * len(strings)
+    for table in ("week_exercises", "block_exercises"):
+        for column, values in doc[table].items():
+            if not column.endswith("pump_rating"):
+                for value in values:
+                    if value is not None:
+                        counts[value] += 1
+    assert counts[0] == max(counts)
+
+
+def test_decode_rejects_other_documents():
+    with pytest.raises(ValueError):
+        decode({"format": "something-else", "version": 1})
+    with pytest.raises(ValueError):
+        decode({"format": FORMAT_NAME, "version": 99})
+
+
+def test_extractor_saves_columnar_file(workbook_path, tmp_path):
+    output = tmp_path / "workouts.wcol.json"
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractor = WorkoutExtractor(workbook_path)
+        data = extractor.extract_all_sheets()
+        extractor.save_to_columnar(str(output))
+        extractor.close()
+
+    assert read_columnar(str(output)) == data
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,53 @@
+"""Tests for scripts/extract_workouts.py (WorkoutExtractor)."""
+
+from extract_workouts import WorkoutExtractor
+from test_fast_xlsx import rewrite_sheet
+
+
+def extract(path, **options):
+    extractor = WorkoutExtractor(path, **options)
+    try:
+        return extractor.extract_all_sheets()
+    finally:
+        extractor.close()
+
+
+def test_extracts_standard_and_block_sheets(workbook_path):
+    data = extract(workbook_path)
+
+    assert [s["sheet_name"] for s in data["sheets"]] == ["Sheet1", "Sheet2", "Sheet3", "Sheet4"]
+    sheet1 = data["sheets"][0]
+    assert sheet1["program_name"] == "Davey Jone's Pump"
+    assert len(sheet1["days"]) == 3
+    assert [w["week_number"] for w in sheet1["days"][0]["weeks"]] == [1, 2]
+    exercise = sheet1["days"][0]["weeks"][0]["exercises"][0]
+    assert exercise["exercise_id"] == "A1"
+    assert exercise["tempo"].isdigit()
+    assert data["sheets"][3]["days"][0]["blocks"][0]["exercises"][0]["week_1_2"]["results"]
+
+
+def test_streaming_mode_matches_full_mode(workbook_path):
+    assert extract(workbook_path, streaming=True) == extract(workbook_path)
+
+
+def test_per_sheet_workers_merge_in_sheet_order(workbook_path):
+    extractor = WorkoutExtractor(workbook_path, streaming=True)
+    try:
+        parallel = extractor.extract_all_sheets(sheet_workers=4)
+    finally:
+        extractor.close()
+
+    assert parallel == extract(workbook_path)
+
+
+def test_fast_reader_matches_openpyxl(workbook_path):
+    assert extract(workbook_path, reader="fast") == extract(workbook_path)
+
+
+def test_streaming_readers_ignore_a_too_small_dimension_tag(workbook_path):
+    expected = extract(workbook_path)
+    rewrite_sheet(workbook_path, lambda xml: xml.replace(
+        b"<sheetViews>", b'<dimension ref="A1:B2"/><sheetViews>', 1))
+
+    assert extract(workbook_path, streaming=True) == expected
+    assert extract(workbook_path, reader="fast") == expected
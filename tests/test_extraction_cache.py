@@ -0,0 +1,71 @@
+"""Tests for scripts/extraction_cache.py (content-addressed extraction cache)."""
+
+import os
+import subprocess
+import sys
+
+from conftest import SCRIPTS_DIR
+from extract_workouts import EXTRACTOR_VERSION, extract_workbook
+from extraction_cache import ExtractionCache
+
+
+def test_hit_returns_previous_result_without_extracting(tmp_path, workbook_path):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    first = extract_workbook(workbook_path, cache=cache)
+
+    calls = []
+    second = cache.get_or_extract(workbook_path, "extract_workouts", EXTRACTOR_VERSION, {},
+                                  lambda: calls.append(1))
+
+    assert second == first
+    assert calls == []
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_key_changes_with_content_version_and_options(tmp_path, workbook_path):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    other = tmp_path / "other.xlsx"
+    other.write_bytes(open(workbook_path, "rb").read() + b"\0")
+
+    keys = {
+        cache.key_for(workbook_path, "extract_workouts", "1", {}),
+        cache.key_for(str(other), "extract_workouts", "1", {}),
+        cache.key_for(workbook_path, "extract_workouts", "2", {}),
+        cache.key_for(workbook_path, "extract_workouts", "1", {"parse": True}),
+        cache.key_for(workbook_path, "extract_sheet1", "1", {}),
+    }
+    assert len(keys) == 5
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache"), max_bytes=2500)
+    payload = "x" * 1000
+    cache.put("a", payload)
+    cache.put("b", payload)
+    os.utime(cache._entry_path("a"), ns=(1, 1))
+    os.utime(cache._entry_path("b"), ns=(2, 2))
+    assert cache.get("a") == payload  # refreshes "a"
+
+    cache.put("c", payload)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == payload
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+
+
+def test_cache_hit_never_imports_openpyxl(tmp_path, workbook_path):
+    cache_dir = str(tmp_path / "cache")
+    extract_workbook(workbook_path, cache=ExtractionCache(cache_dir))
+
+    code = (
+        "import sys\n"
+        f"sys.path.insert(0, {str(SCRIPTS_DIR)!r})\n"
+        "from extract_workouts import extract_workbook\n"
+        "from extraction_cache import ExtractionCache\n"
+        f"data = extract_workbook({workbook_path!r}, cache=ExtractionCache({cache_dir!r}))\n"
+        "assert data['sheets']\n"
+        "print('openpyxl' in sys.modules)\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "False"
@@ -0,0 +1,154 @@
+"""Tests for the HTTP extraction service (scripts/extraction_service.py)."""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from extract_workouts import extract_workbook
+from extraction_service import ExtractionService
+from load_test_service import http_request, percentile
+
+
+def run_with_service(service, scenario):
+    """Start ``service`` on a free port, run ``scenario(port)`` against it, then shut down."""
+    async def main():
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await scenario(port)
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+    return asyncio.run(main())
+
+
+def test_upload_returns_extracted_json_then_cache_hit(workbook_path):
+    payload = open(workbook_path, "rb").read()
+    service = ExtractionService(workers=1, executor=ThreadPoolExecutor(1))
+
+    async def scenario(port):
+        first = await http_request("127.0.0.1", port, "POST", "/extract", payload)
+        second = await http_request("127.0.0.1", port, "POST", "/extract", payload)
+        bad = await http_request("127.0.0.1", port, "POST", "/extract", b"not a workbook")
+        missing = await http_request("127.0.0.1", port, "GET", "/nope")
+        return first, second, bad, missing
+
+    first, second, bad, missing = run_with_service(service, scenario)
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = extract_workbook(workbook_path)
+
+    assert first[0] == 200 and first[1]["x-cache"] == "miss"
+    assert json.loads(first[2]) == expected
+    assert second[0] == 200 and second[1]["x-cache"] == "hit"
+    assert bad[0] == 422
+    assert missing[0] == 404
+
+
+def slow_job(payload, reader, parse_fields):
+    time.sleep(float(payload.decode()))
+    return b'{"slept": true}'
+
+
+def test_saturated_service_rejects_with_retry_after():
+    service = ExtractionService(workers=1, max_queue=1, cache_ttl=0,
+                                executor=ThreadPoolExecutor(1), job=slow_job)
+
+    async def scenario(port):
+        # Distinct payloads: one runs, one queues, the rest are turned away
+        uploads = [http_request("127.0.0.1", port, "POST", "/extract", f"0.3{i}".encode()) for i in range(4)]
+        return await asyncio.gather(*uploads)
+
+    responses = run_with_service(service, scenario)
+    statuses = sorted(status for status, _, _ in responses)
+    assert statuses == [200, 200, 503, 503]
+    assert all(headers["retry-after"] == "1" for status, headers, _ in responses if status == 503)
+    assert service.counters["rejected"] == 2
+
+
+def test_timeout_answers_504_and_keeps_the_slot_until_the_worker_finishes():
+    release = threading.Event()
+
+    def blocked_job(payload, reader, parse_fields):
+        release.wait(5)
+        return b"{}"
+
+    service = ExtractionService(workers=1, max_queue=2, timeout=0.2, executor=ThreadPoolExecutor(1),
+                                job=blocked_job)
+
+    async def scenario(port):
+        status, _, _ = await http_request("127.0.0.1", port, "POST", "/extract", b"a")
+        _, _, health = await http_request("127.0.0.1", port, "GET", "/health")
+        release.set()
+        return status, json.loads(health)
+
+    status, health = run_with_service(service, scenario)
+    assert status == 504
+    assert health["running"] == 1 and health["timeouts"] == 1
+
+
+def test_identical_uploads_share_one_parse():
+    calls = []
+
+    def counted_job(payload, reader, parse_fields):
+        calls.append(payload)
+        time.sleep(0.2)
+        return b"{}"
+
+    service = ExtractionService(workers=2, executor=ThreadPoolExecutor(2), job=counted_job)
+
+    async def scenario(port):
+        return await asyncio.gather(*(http_request("127.0.0.1", port, "POST", "/extract", b"same")
+                                      for _ in range(5)))
+
+    responses = run_with_service(service, scenario)
+    assert [status for status, _, _ in responses] == [200] * 5
+    assert len(calls) == 1
+    assert sorted(headers["x-cache"] for _, headers, _ in responses) == ["coalesced"] * 4 + ["miss"]
+
+
+def crashing_job(payload, reader, parse_fields):
+    if payload == b"crash":
+        os._exit(1)  # like a worker killed for memory
+    return b'{"parsed": true}'
+
+
+def test_dead_worker_pool_is_replaced():
+    factory_calls = []
+
+    def factory():
+        factory_calls.append(len(factory_calls))
+        if len(factory_calls) == 2:
+            raise OSError("no processes left")  # the first restart fails
+        return ProcessPoolExecutor(1)
+
+    service = ExtractionService(workers=1, cache_ttl=0, job=crashing_job, executor_factory=factory)
+
+    async def scenario(port):
+        crashed = await http_request("127.0.0.1", port, "POST", "/extract", b"crash")
+        degraded = await http_request("127.0.0.1", port, "GET", "/health")
+        later = [await http_request("127.0.0.1", port, "POST", "/extract", f"upload {i}".encode()) for i in range(2)]
+        healthy = await http_request("127.0.0.1", port, "GET", "/health")
+        return crashed, degraded, later, healthy
+
+    with contextlib.redirect_stderr(io.StringIO()):
+        crashed, degraded, later, healthy = run_with_service(service, scenario)
+
+    assert crashed[0] == 500
+    assert json.loads(degraded[2])["status"] == "degraded"
+    assert [status for status, _, _ in later] == [200, 200]
+    health = json.loads(healthy[2])
+    assert health["status"] == "ok" and health["pool_restarts"] == 1
+    assert len(factory_calls) == 3
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) is None
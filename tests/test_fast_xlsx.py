@@ -0,0 +1,122 @@
+"""Tests for scripts/fast_xlsx.py (values-only xlsx reader)."""
+
+import datetime
+import re
+import zipfile
+
+import openpyxl
+
+import fast_xlsx
+
+
+def openpyxl_rows(path, data_only=False):
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=data_only)
+    try:
+        rows = {}
+        for ws in workbook.worksheets:
+            if ws.max_column is None:
+                ws.calculate_dimension(force=True)
+            rows[ws.title] = list(ws.iter_rows(values_only=True))
+        return rows
+    finally:
+        workbook.close()
+
+
+def fast_rows(path, data_only=False):
+    workbook = fast_xlsx.load_workbook(path, data_only=data_only)
+    try:
+        return {ws.title: list(ws.iter_rows(values_only=True)) for ws in workbook.worksheets}, workbook.fallbacks
+    finally:
+        workbook.close()
+
+
+def rewrite_sheet(path, transform):
+    """Apply ``transform`` to every worksheet XML part in place."""
+    with zipfile.ZipFile(path) as src:
+        items = [(item, src.read(item.filename)) for item in src.infolist()]
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as dst:
+        for item, data in items:
+            if item.filename.startswith("xl/worksheets/"):
+                data = transform(data)
+            dst.writestr(item, data)
+
+
+def test_shared_strings_workbook_matches_openpyxl(workbook_path):
+    rows, fallbacks = fast_rows(workbook_path)
+
+    assert rows == openpyxl_rows(workbook_path)
+    assert fallbacks == []
+
+
+def test_mixed_value_types_match_openpyxl(tmp_path):
+    path = str(tmp_path / "mixed.xlsx")
+    workbook = openpyxl.Workbook()
+    ws = workbook.active
+    ws.append(["A & B", "<tag>", 1.5, 2, True, "=C1+D1", datetime.datetime(2024, 1, 2, 3, 4)])
+    for i in range(50):
+        ws.append([f"row {i}", i, i * 0.25, None, "x"])
+    ws["H40"] = "tail"
+    workbook.save(path)
+
+    for data_only in (False, True):
+        rows, fallbacks = fast_rows(path, data_only)
+        assert rows == openpyxl_rows(path, data_only)
+        assert fallbacks == []
+
+
+def test_prefixed_row_attributes_and_inline_strings(workbook_path):
+    ns = b'xmlns:x14ac="http://schemas.microsoft.com/office/spreadsheetml/2009/9/ac" '
+
+    def excel_like(xml):
+        xml = xml.replace(b"<worksheet ", b"<worksheet " + ns, 1)
+        xml = re.sub(rb'<row r="(\d+)"', rb'<row r="\1" x14ac:dyDescent="0.25"', xml)
+        return xml.replace(b'<c r="B4" t="s"><v>', b'<c r="B4" t="inlineStr"><is><t>Inline</t></is></c>'
+                                                    b'<c r="C4" t="s"><v>', 1)
+
+    rewrite_sheet(workbook_path, excel_like)
+    rows, _ = fast_rows(workbook_path)
+
+    assert rows["Sheet1"][3][1] == "Inline"
+    assert rows == openpyxl_rows(workbook_path)
+
+
+def test_cells_past_a_too_small_dimension_tag_are_read(workbook_path):
+    expected = openpyxl_rows(workbook_path)
+    rewrite_sheet(workbook_path, lambda xml: xml.replace(
+        b"<sheetViews>", b'<dimension ref="A1:B2"/><sheetViews>', 1))
+
+    workbook = fast_xlsx.load_workbook(workbook_path)
+    try:
+        ws = workbook["Sheet1"]
+        assert (ws.max_row, ws.max_column) == (2, 2)
+        rows = list(ws.iter_rows(values_only=True))
+        # A full read sizes the sheet from the cells it found
+        assert (ws.max_row, ws.max_column) == (len(expected["Sheet1"]), len(expected["Sheet1"][0]))
+
+        ws.reset_dimensions()
+        ragged = list(ws.iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+    def trimmed(row):
+        return tuple(row[:max((i + 1 for i, value in enumerate(row) if value is not None), default=0)])
+
+    assert [trimmed(row) for row in rows] == [trimmed(row) for row in expected["Sheet1"]]
+    assert ragged == [trimmed(row) for row in expected["Sheet1"]]
+
+
+def test_array_formulas_fall_back_to_openpyxl(tmp_path):
+    path = str(tmp_path / "array.xlsx")
+    workbook = openpyxl.Workbook()
+    workbook.active.append([1, 2])
+    workbook.save(path)
+    rewrite_sheet(path, lambda xml: xml.replace(
+        b'<c r="B1" t="n"><v>2</v></c>',
+        b'<c r="B1"><f t="array" ref="B1">A1*2</f><v>2</v></c>'))
+
+    rows, fallbacks = fast_rows(path)
+
+    assert fallbacks == ["Sheet"]
+    # openpyxl hands back its ArrayFormula object, which has no __eq__
+    assert rows["Sheet"][0][0] == 1
+    assert rows["Sheet"][0][1].text == openpyxl_rows(path)["Sheet"][0][1].text
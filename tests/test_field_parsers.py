@@ -0,0 +1,83 @@
+"""Tests for typed field parsing (scripts/field_parsers.py)."""
+
+import contextlib
+import io
+
+import pytest
+
+from extract_workouts import WorkoutExtractor
+from field_parsers import parse_count, parse_rest, parse_results, parse_sets_reps, parse_tempo, parsed_fields
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("115x10,115x7,115x7,95x10", ((115, 10), (115, 7), (115, 7), (95, 10))),
+    ("35x15, 25x14", ((35, 15), (25, 14))),
+    ("42.5x10,", ((42.5, 10),)),
+    ("7,3", ((None, 7), (None, 3))),
+    ("", ()),
+])
+def test_results(text, expected):
+    assert parse_results(text) == expected
+
+
+@pytest.mark.parametrize("text, sets, reps, unit, each_side, to_failure", [
+    ("4x10-12", 4, (10, 12), "reps", False, False),
+    ("2x10ea", 2, (10, 10), "reps", True, False),
+    ("2x12-15 ea", 2, (12, 15), "reps", True, False),
+    ("2x25 sec ea", 2, (25, 25), "seconds", True, False),
+    ("4 x Max", 4, (None, None), "reps", False, True),
+    ("", None, (None, None), "reps", False, False),
+])
+def test_sets_reps(text, sets, reps, unit, each_side, to_failure):
+    parsed = parse_sets_reps(text)
+    assert (parsed["sets_min"], parsed["sets_max"]) == (sets, sets)
+    assert (parsed["reps_min"], parsed["reps_max"]) == reps
+    assert parsed["rep_unit"] == unit
+    assert parsed["each_side"] is each_side
+    assert parsed["to_failure"] is to_failure
+
+
+def test_sheet4_counts_tempo_and_rest():
+    assert parse_count("3,4") == (3, 4)
+    assert parse_count("03-04") == (3, 4)
+    assert parse_count("4.0") == (4, 4)
+    assert parse_tempo("311") == (3, 1, 1)
+    assert parse_tempo("CTRL") is None
+    assert parse_rest("1-2m") == (60, 120)
+    assert parse_rest("1:30 m") == (90, 90)
+    assert parse_rest("01:30:00") == (90, 90)
+    assert parse_rest("30s") == (30, 30)
+    assert parse_rest("") == (None, None)
+
+
+def test_open_ended_reps_have_no_maximum():
+    parsed = parsed_fields({"sets": "3.0", "reps": "20 +", "tempo": "211", "results": ""})
+    assert (parsed["sets_min"], parsed["reps_min"], parsed["reps_max"]) == (3, 20, None)
+
+
+def test_extractor_emits_raw_and_parsed_fields(workbook_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        plain = WorkoutExtractor(workbook_path)
+        raw = plain.extract_all_sheets()
+        plain.close()
+        extractor = WorkoutExtractor(workbook_path, parse_fields=True)
+        data = extractor.extract_all_sheets()
+        extractor.close()
+
+    exercise = data["sheets"][0]["days"][0]["weeks"][0]["exercises"][0]
+    assert exercise["parsed"] == parsed_fields(exercise)
+    assert exercise["parsed"]["sets_min"] == parse_sets_reps(exercise["sets_reps"])["sets_min"]
+
+    sheet4_exercise = data["sheets"][3]["days"][0]["blocks"][0]["exercises"][0]
+    assert set(sheet4_exercise["week_1_2"]["parsed"]) == set(exercise["parsed"])
+
+    # Dropping "parsed" gives back exactly the raw extraction
+    for sheet in data["sheets"]:
+        for day in sheet["days"]:
+            for group in day.get("weeks", []) + day.get("blocks", []):
+                for item in group["exercises"]:
+                    item.pop("parsed", None)
+                    for key in ("week_1_2", "week_3_4"):
+                        if key in item:
+                            item[key].pop("parsed")
+    assert data == raw
@@ -0,0 +1,83 @@
+"""Tests for scripts/incremental_extract.py (per-sheet incremental re-extraction)."""
+
+import zipfile
+
+import openpyxl
+import pytest
+
+from extract_workouts import extract_workbook, write_json
+from incremental_extract import extract_incremental, sheet_fingerprints
+
+
+def full_run_bytes(excel_path, output_path):
+    write_json(extract_workbook(excel_path), str(output_path))
+    return output_path.read_bytes()
+
+
+def test_incremental_output_is_identical_to_full_run(tmp_path, workbook_path):
+    output = tmp_path / "workout-data.json"
+
+    # Save through the same writer as the edited copy below
+    original = tmp_path / "original.xlsx"
+    wb = openpyxl.load_workbook(workbook_path)
+    wb.save(original)
+    workbook_path = str(original)
+
+    first = extract_incremental(workbook_path, str(output))
+    assert first["changed"] == ["Sheet1", "Sheet2", "Sheet3", "Sheet4"]
+    assert output.read_bytes() == full_run_bytes(workbook_path, tmp_path / "full-a.json")
+
+    # Coach edits one result on the Sheet2 tab
+    edited = tmp_path / "edited.xlsx"
+    wb["Sheet2"]["G4"] = "135x12,135x10"
+    wb.save(edited)
+
+    second = extract_incremental(str(edited), str(output))
+    assert second["changed"] == ["Sheet2"]
+    assert second["reused"] == ["Sheet1", "Sheet3", "Sheet4"]
+    assert output.read_bytes() == full_run_bytes(str(edited), tmp_path / "full-b.json")
+
+    third = extract_incremental(str(edited), str(output))
+    assert third["changed"] == [] and third["written"] is False
+
+
+def write_xlsx_parts(path, shared_strings, prefix=""):
+    """
+    Minimal two-sheet package whose sheets reference shared strings 0 and 1.
+
+    With a prefix such as "x:", spreadsheetml elements are written with it
+    (``<x:si>``), as some non-Excel writers do.
+    """
+    main = f'xmlns{":" + prefix[:-1] if prefix else ""}="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+    sheet = (f'<{prefix}worksheet {main}><{prefix}sheetData><{prefix}row r="1">'
+             f'<{prefix}c r="A1" t="s"><{prefix}v>{{}}</{prefix}v></{prefix}c>'
+             f'</{prefix}row></{prefix}sheetData></{prefix}worksheet>')
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("xl/workbook.xml", (
+            f'<{prefix}workbook {main} '
+            f'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><{prefix}sheets>'
+            f'<{prefix}sheet name="Sheet1" sheetId="1" r:id="rId1"/>'
+            f'<{prefix}sheet name="Sheet2" sheetId="2" r:id="rId2"/>'
+            f'</{prefix}sheets></{prefix}workbook>'))
+        zf.writestr("xl/_rels/workbook.xml.rels", (
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/>'
+            '<Relationship Id="rId2" Target="/xl/worksheets/sheet2.xml"/></Relationships>'))
+        zf.writestr("xl/worksheets/sheet1.xml", sheet.format(0))
+        zf.writestr("xl/worksheets/sheet2.xml", sheet.format(1))
+        zf.writestr("xl/sharedStrings.xml", (
+            f'<{prefix}sst {main}>'
+            + "".join(f"<{prefix}si><{prefix}t>{s}</{prefix}t></{prefix}si>" for s in shared_strings)
+            + f"</{prefix}sst>"))
+
+
+@pytest.mark.parametrize("prefix", ["", "x:"])
+def test_fingerprint_follows_referenced_shared_strings_only(tmp_path, prefix):
+    before, after = tmp_path / "before.xlsx", tmp_path / "after.xlsx"
+    write_xlsx_parts(before, ["Barbell Bench", "115x10"], prefix)
+    write_xlsx_parts(after, ["Barbell Bench", "120x10"], prefix)
+
+    old, new = sheet_fingerprints(str(before)), sheet_fingerprints(str(after))
+
+    assert old["Sheet1"] == new["Sheet1"]
+    assert old["Sheet2"] != new["Sheet2"]
@@ -0,0 +1,133 @@
+"""Tests for scripts/json_delta.py (versioned JSON Patch deltas)."""
+
+import contextlib
+import hashlib
+import io
+import json
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+from extract_workouts import extract_workbook
+from incremental_extract import extract_incremental
+from json_delta import (PatchError, apply_patch, delta_chain, diff, document_text, load_version_info,
+                        text_version, write_with_delta)
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+def extract(path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return extract_workbook(str(path))
+
+
+def write(workout_data, output, **options):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return write_with_delta(workout_data, str(output), **options)
+
+
+def edit_results(path, cell, value):
+    workbook = openpyxl.load_workbook(path)
+    workbook.worksheets[0][cell] = value
+    workbook.save(path)
+
+
+def test_lists_are_matched_by_key_not_position(workbook_path):
+    old = extract(workbook_path)
+    new = json.loads(json.dumps(old))
+    days = new["sheets"][0]["days"]
+    exercises = days[0]["weeks"][0]["exercises"]
+    exercises.insert(0, exercises.pop())
+    days.insert(1, {"day_name": "DAY 9: Extra", "weeks": []})
+    days[2]["weeks"][1]["exercises"][0]["results"] = "120x5"
+
+    patch = diff(old, new)
+
+    assert [op["op"] for op in patch] == ["add", "move", "replace"]
+    assert patch[1] == {"op": "move", "from": "/sheets/0/days/0/weeks/0/exercises/3",
+                        "path": "/sheets/0/days/0/weeks/0/exercises/0"}
+    assert patch[2]["path"] == "/sheets/0/days/2/weeks/1/exercises/0/results"
+    assert apply_patch(old, patch) == new
+
+
+def test_reordered_keys_are_replaced_where_they_changed():
+    old = {"sheets": [{"sheet_name": "S", "days": [{"day_name": "D", "weeks": []}]}]}
+    new = {"sheets": [{"sheet_name": "S", "days": [{"day_name": "D", "week_range": None, "weeks": []}]}]}
+
+    patch = diff(old, new)
+
+    assert patch == [{"op": "replace", "path": "/sheets/0/days/0", "value": new["sheets"][0]["days"][0]}]
+    assert json.dumps(apply_patch(old, patch)) == json.dumps(new)
+
+
+def test_writes_a_delta_that_reproduces_the_new_bytes(tmp_path, workbook_path):
+    output = tmp_path / "workout-data.json"
+    first = write(extract(workbook_path), output)
+    assert first["deltas"] == [] and first["version"] == text_version(output.read_text(encoding="utf-8"))
+    previous_text = output.read_text(encoding="utf-8")
+
+    edit_results(workbook_path, "G4", "200x5,200x5")
+    info = write(extract(workbook_path), output)
+
+    [entry] = info["deltas"]
+    assert (entry["from"], entry["to"]) == (first["version"], info["version"])
+    assert info["version"] == hashlib.sha256(output.read_bytes()).hexdigest()[:16]
+    delta = json.loads((tmp_path / entry["file"]).read_text(encoding="utf-8"))
+    assert delta["patch"] == [{"op": "replace", "path": "/sheets/0/days/0/weeks/0/exercises/0/results",
+                               "value": "200x5,200x5"}]
+    assert entry["bytes"] < len(previous_text) // 20
+    assert document_text(apply_patch(json.loads(previous_text), delta["patch"])) == output.read_text(
+        encoding="utf-8")
+
+
+def test_chain_is_kept_and_pruned(tmp_path, workbook_path):
+    output = tmp_path / "workout-data.json"
+    versions = [write(extract(workbook_path), output)["version"]]
+    for value in ("1x1", "2x2", "3x3"):
+        edit_results(workbook_path, "G4", value)
+        versions.append(write(extract(workbook_path), output, keep=2)["version"])
+
+    unchanged = write(extract(workbook_path), output, keep=2)
+    info = load_version_info(str(output))
+
+    assert unchanged == info and info["version"] == versions[-1]
+    assert [(d["from"], d["to"]) for d in info["deltas"]] == list(zip(versions[1:], versions[2:]))
+    assert sorted(p.name for p in tmp_path.glob("workout-data.delta.*")) == sorted(d["file"] for d in info["deltas"])
+    assert [d["to"] for d in delta_chain(info, versions[1])] == versions[2:]
+    assert delta_chain(info, versions[0]) is None and delta_chain(info, versions[-1]) == []
+
+
+def test_incremental_runs_can_write_deltas(tmp_path, workbook_path):
+    output = str(tmp_path / "workout-data.json")
+    with contextlib.redirect_stdout(io.StringIO()):
+        extract_incremental(workbook_path, output, delta=True)
+        edit_results(workbook_path, "G4", "150x3")
+        extract_incremental(workbook_path, output, delta=True)
+
+    info = load_version_info(output)
+    assert len(info["deltas"]) == 1 and info["deltas"][0]["operations"] == 1
+
+
+@pytest.mark.parametrize("op", [
+    {"op": "remove", "path": "/sheets/9"},
+    {"op": "replace", "path": "/nope", "value": 1},
+    {"op": "test", "path": "/program_name", "value": "other"},
+    {"op": "jump", "path": ""},
+])
+def test_bad_operations_raise(op):
+    with pytest.raises(PatchError):
+        apply_patch({"program_name": "P", "sheets": []}, [op])
+
+
+def test_js_fixture_is_json_delta_output():
+    """tests/workoutDelta.test.js applies these deltas; they must match what this module writes."""
+    with open(FIXTURES / "workout-delta.json", encoding="utf-8") as f:
+        fixture = json.load(f)
+    texts, info = fixture["texts"], fixture["version_info"]
+
+    assert [text_version(text) for text in texts] == [info["deltas"][0]["from"]] + [d["to"] for d in info["deltas"]]
+    for old, new, entry in zip(texts, texts[1:], info["deltas"]):
+        delta = fixture["deltas"][entry["file"]]
+        assert delta["patch"] == diff(json.loads(old), json.loads(new))
+        assert document_text(apply_patch(json.loads(old), delta["patch"])) == new
@@ -0,0 +1,144 @@
+"""Tests for scripts/layout_schema.py (layout detection and cached schemas)."""
+
+import contextlib
+import io
+
+import openpyxl
+
+from extract_sheet1 import extract_sheet1_data
+from extraction_cache import ExtractionCache
+from layout_schema import (CACHED_KEYS, KEY_PREFIX, detect_layout, extract_with_layout, header_rows, header_schema,
+                           layout_fingerprint)
+from synthetic_workbook import build_workbook
+from week_engine import extract_weeks, find_sub_columns, find_week_columns
+
+
+def first_sheet(path):
+    return openpyxl.load_workbook(path, data_only=True).worksheets[0]
+
+
+def test_detects_day_rows_and_week_blocks(workbook_path):
+    schema = detect_layout(first_sheet(workbook_path).iter_rows(values_only=True))
+
+    # Program row, WEEK header row, then per day: header + 4 exercises + blank
+    assert schema["day_rows"] == [3, 9, 15]
+    assert schema["weeks"] == [[1, 3, 4, 5, 6], [2, 8, 9, 10, 11]]
+    assert schema["week_changes"] == []
+    assert (schema["first_row"], schema["last_row"], schema["max_column"]) == (3, 19, 12)
+
+
+def test_same_structure_reuses_cached_schema(workbook_path, tmp_path):
+    cache = ExtractionCache(str(tmp_path / "layouts"))
+    first = extract_with_layout(first_sheet(workbook_path), cache)
+
+    # Same template, different athlete results
+    other_path = str(tmp_path / "other.xlsx")
+    build_workbook(other_path, days=3, exercises_per_day=4, weeks=2)
+    other = openpyxl.load_workbook(other_path)
+    other.worksheets[0]["G4"] = "200x5,200x5"
+    other.save(other_path)
+
+    sheet = first_sheet(other_path)
+    second = extract_with_layout(sheet, cache)
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert second == extract_weeks(first_sheet(other_path).iter_rows(values_only=True))
+    assert second["days"][0]["weeks"][1][0]["results"] == "200x5,200x5"
+    assert second != first
+
+
+def test_schema_is_shared_by_workbooks_of_any_length(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "layouts"))
+    short = build_workbook(str(tmp_path / "short.xlsx"), days=2, exercises_per_day=3, weeks=2)
+    long = build_workbook(str(tmp_path / "long.xlsx"), days=6, exercises_per_day=5, weeks=2)
+
+    extract_with_layout(first_sheet(short), cache)
+    extracted = extract_with_layout(first_sheet(long), cache)
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert extracted == extract_weeks(first_sheet(long).iter_rows(values_only=True))
+    assert len(extracted["days"]) == 6
+
+
+def test_cached_read_follows_a_week_header_row_the_schema_lacks(workbook_path, tmp_path):
+    cache = ExtractionCache(str(tmp_path / "layouts"))
+    sheet = first_sheet(workbook_path)
+    extract_with_layout(sheet, cache)
+
+    # Same headers; from the third day on the week blocks sit one column further right
+    rows = [list(row) for row in sheet.iter_rows(values_only=True)]
+    moved = openpyxl.Workbook()
+    for number, row in enumerate(rows, start=1):
+        if number == 15:
+            moved.active.append([None] * 4 + ["WEEK 1"] + [None] * 4 + ["WEEK 2"])
+        moved.active.append(row if number < 15 else row[:3] + [None] + row[3:])
+    moved_path = str(tmp_path / "moved.xlsx")
+    moved.save(moved_path)
+
+    extracted = extract_with_layout(first_sheet(moved_path), cache)
+
+    assert cache.hits == 1
+    assert extracted == extract_with_layout(first_sheet(moved_path))
+    assert extracted == extract_weeks(sheet.iter_rows(values_only=True))
+
+
+def test_stale_schema_is_detected_again(workbook_path, tmp_path):
+    cache = ExtractionCache(str(tmp_path / "layouts"))
+    sheet = first_sheet(workbook_path)
+    fingerprint = layout_fingerprint(header_rows(sheet))
+    schema = detect_layout(sheet.iter_rows(values_only=True))
+    schema["first_row"] = 4  # an exercise row, not the first day header
+    cache.put(KEY_PREFIX + fingerprint, schema)
+
+    extracted = extract_with_layout(sheet, cache)
+
+    assert extracted == extract_weeks(sheet.iter_rows(values_only=True))
+    assert cache.get(KEY_PREFIX + fingerprint) == {"version": schema["version"], "fingerprint": fingerprint,
+                                                   "weeks": schema["weeks"], "first_row": 3}
+
+
+def test_label_row_moves_sub_columns():
+    header = (None, None, None, "WEEK 1", None, None, None, None, "WEEK 2")
+    labels = (None, None, None, "Tempo", "Notes", "Sets/Reps", "Rest", "Results",
+              "Tempo", "Sets/Reps", "Rest", "Results")
+
+    weeks = find_sub_columns(labels, find_week_columns(header))
+
+    assert [list(w) for w in weeks] == [[1, 3, 5, 6, 7], [2, 8, 9, 10, 11]]
+    assert find_sub_columns(labels[:10], find_week_columns(header)) == []
+
+
+def test_label_rows_read_the_same_with_and_without_the_cache(tmp_path):
+    # Each week block has a NOTES column before RESULTS, placed by a label row
+    labels = ["TEMPO", "SETS", "REPS", "REST", "NOTES", "RESULTS"]
+    workbook = openpyxl.Workbook()
+    for row in (["Label Program"],
+                [None] * 3 + ["WEEK 1"] + [None] * 5 + ["WEEK 2"],
+                [None] * 3 + labels + labels,
+                ["DAY 1: Legs"],
+                ["A1", "Squat", None, 211, "3x8", None, "2m", "n1", "100x8", 211, "3x8", None, "2m", "n2", "110x8"],
+                ["DAY 2: Push"],
+                ["B1", "Bench", None, 311, "4x6", None, "90s", None, "80x6", 311, "4x6", None, "90s", None, "85x6"]):
+        workbook.active.append(row)
+    path = str(tmp_path / "labels.xlsx")
+    workbook.save(path)
+    cache = ExtractionCache(str(tmp_path / "layouts"))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        uncached = extract_sheet1_data(path)
+        cold = extract_sheet1_data(path, layout_cache=cache)
+        warm = extract_sheet1_data(path, layout_cache=cache)
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert cold == uncached and warm == uncached
+    results = [[e["results"] for d in w["days"] for e in d["exercises"]] for w in uncached["weeks"]]
+    assert results == [["100x8", "80x6"], ["110x8", "85x6"]]
+
+
+def test_header_rows_give_the_cached_part_of_a_detected_schema(workbook_path):
+    sheet = first_sheet(workbook_path)
+    headers = header_rows(sheet)
+    detected = detect_layout(sheet.iter_rows(values_only=True))
+    detected["fingerprint"] = layout_fingerprint(headers)
+
+    assert header_schema(headers) == {key: detected[key] for key in CACHED_KEYS}
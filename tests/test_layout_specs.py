@@ -0,0 +1,152 @@
+"""Tests for scripts/layout_specs.py (declarative sheet layouts)."""
+
+import contextlib
+import io
+import json
+import sys
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+from columnar_export import encode
+from extract_workouts import extract_workbook
+from extract_workouts import main as extract_main
+from extraction_cache import ExtractionCache
+from layout_specs import (DAY, EXERCISE, LAYOUT_DIR, WEEK_HEADER, LayoutSpec, LayoutSpecError, load_layouts,
+                          read_spec)
+from lookup_index import build_index
+from ndjson_sink import iter_records
+from workout_model import Program, to_dict
+
+
+def three_range_spec():
+    spec = json.loads((Path(LAYOUT_DIR) / "sheet4.json").read_text(encoding="utf-8"))
+    spec.update({"name": "three-ranges", "sheets": ["Coach"], "program_name": "Coach Blocks"})
+    spec["week_ranges"].append({"key": "week_5_6", "fields": [
+        {"field": "tempo", "column": 16, "format": "tempo"},
+        {"field": "sets", "column": 17},
+        {"field": "reps", "column": 18},
+        {"field": "results", "column": 19},
+        {"field": "pump_rating", "column": 21, "format": "raw"},
+    ]})
+    return spec
+
+
+@pytest.fixture
+def coach_workbook(tmp_path):
+    """One block-format sheet with three week ranges, and a spec for it."""
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Coach"
+    sheet.append(["Weeks 1-6"])
+    sheet.append(["Day 1 - Push"])
+    sheet.append(["Block A"])
+    sheet.append(["Bench Press", None, 3010, 4, "8", "100x8", None, 7,
+                  None, 3010, 4, "6", "105x6", None, 8,
+                  None, 3010.0, 5, "5", "110x5", None, 9])
+    sheet.append(["xy"])  # too short to be an exercise
+    path = tmp_path / "coach.xlsx"
+    workbook.save(path)
+
+    spec_path = tmp_path / "coach.json"
+    spec_path.write_text(json.dumps(three_range_spec()), encoding="utf-8")
+    return str(path), str(spec_path)
+
+
+def test_builtin_specs_cover_the_standard_and_sheet4_layouts():
+    layouts = load_layouts()
+
+    assert layouts.for_sheet("Sheet1").name == "weeks"
+    assert layouts.for_sheet("Sheet4").range_keys == ("week_1_2", "week_3_4")
+
+    weeks = layouts.for_sheet("Sheet2")
+    rows = [("Program",), (None, None, None, "WEEK 1", None, None, None, "Week 2"),
+            ("DAY 1: Upper",), ("A1", "Squat", 1, 2.0, "3x5", "90s", "100x5", 1, "3x3", "2min", None)]
+    events = list(weeks.read(rows))
+
+    assert [kind for kind, _, _ in events] == [WEEK_HEADER, DAY, EXERCISE]
+    assert events[0][1] == [(1, 3), (2, 7)]
+    assert events[2][1:] == ("A1", ("Squat", [("2", "3x5", "90s", "100x5"), ("1", "3x3", "2min", "")]))
+
+
+def test_rules_match_in_order_and_short_rows_are_padded():
+    sheet4 = load_layouts().for_sheet("Sheet4")
+
+    # "Week" is tried before "Day", so this row is a week range label
+    assert sheet4.classify(("  Week 1 Day 2  ",)) == ("week_range", "Week 1 Day 2")
+    assert sheet4.classify((12, "Bench")) == (None, None)
+    assert list(sheet4.read([("Bench Press", None, "21X0")])) == [
+        (EXERCISE, "Bench Press", [("21X0", "", "", "", None), ("", "", "", "", None)])]
+
+
+def test_spec_with_three_week_ranges(coach_workbook):
+    path, spec_path = coach_workbook
+    with contextlib.redirect_stdout(io.StringIO()):
+        workout_data = extract_workbook(path, layouts=[spec_path])
+
+    sheet = workout_data["sheets"][0]
+    assert sheet["program_name"] == "Coach Blocks"
+    assert sheet["days"][0]["week_range"] == "Weeks 1-6"
+    [exercise] = sheet["days"][0]["blocks"][0]["exercises"]
+    assert list(exercise) == ["exercise_name", "week_1_2", "week_3_4", "week_5_6"]
+    assert exercise["week_5_6"] == {"tempo": "3010", "sets": "5", "reps": "5", "results": "110x5",
+                                    "pump_rating": 9}
+
+    assert [r["week"] for r in iter_records(workout_data)] == ["1-2", "3-4", "5-6"]
+    assert list(build_index(workout_data)["programs"]["Coach"]["days"]["1"]["weeks"]) == ["1-2", "3-4", "5-6"]
+    assert to_dict(Program.from_dict(workout_data)) == workout_data
+    with pytest.raises(ValueError, match="week ranges"):
+        encode(workout_data)
+
+
+def test_columnar_output_rejects_extra_week_ranges_before_extracting(coach_workbook, tmp_path, monkeypatch):
+    path, spec_path = coach_workbook
+    output = tmp_path / "coach.columnar.json"
+    monkeypatch.setattr(sys, "argv", ["extract_workouts.py", path, str(output), "--format", "columnar",
+                                      "--layouts", spec_path])
+    stderr = io.StringIO()
+
+    with pytest.raises(SystemExit) as exit_info, contextlib.redirect_stderr(stderr), \
+            contextlib.redirect_stdout(io.StringIO()) as stdout:
+        extract_main()
+
+    assert exit_info.value.code == 2
+    assert "week_1_2, week_3_4 only" in stderr.getvalue() and "week_5_6" in stderr.getvalue()
+    assert "Starting workout data extraction" not in stdout.getvalue() and not output.exists()
+
+
+def test_extra_layouts_are_part_of_the_cache_key(coach_workbook, tmp_path):
+    path, spec_path = coach_workbook
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        default = extract_workbook(path, cache=cache)
+        custom = extract_workbook(path, cache=cache, layouts=[spec_path])
+
+    assert cache.misses == 2
+    assert "days" in default["sheets"][0] and "weeks" in default["sheets"][0]["days"][0]
+    assert "blocks" in custom["sheets"][0]["days"][0]
+
+
+@pytest.mark.parametrize("change, message", [
+    (lambda spec: spec.update(layout="grid"), "unknown layout"),
+    (lambda spec: spec["rows"].pop(), "take rows of kind"),
+    (lambda spec: spec["rows"][0].update(pattern="("), "bad pattern"),
+    (lambda spec: spec["week_ranges"][0].update(key="block_1"), "look like week_1_2"),
+    (lambda spec: spec["week_ranges"][0]["fields"].pop(), "missing fields pump_rating"),
+    (lambda spec: spec["week_ranges"][0]["fields"][0].update(format="upper"), "bad field"),
+])
+def test_malformed_specs_are_rejected(change, message):
+    spec = three_range_spec()
+    change(spec)
+
+    with pytest.raises(LayoutSpecError, match=message):
+        LayoutSpec(spec, "coach.json")
+
+
+def test_unreadable_spec_names_the_file(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text("{", encoding="utf-8")
+
+    with pytest.raises(LayoutSpecError, match="broken.json"):
+        read_spec(str(path))
@@ -0,0 +1,67 @@
+"""Tests for the lookup index sidecar (scripts/lookup_index.py)."""
+
+import contextlib
+import io
+import json
+import subprocess
+import sys
+
+from extract_workouts import WorkoutExtractor
+from lookup_index import build_index, index_path_for, lookup
+from conftest import SCRIPTS_DIR
+
+
+def extract(workbook_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractor = WorkoutExtractor(workbook_path)
+        data = extractor.extract_all_sheets()
+        extractor.close()
+    return data
+
+
+def test_every_exercise_is_reachable_by_key(workbook_path):
+    data = extract(workbook_path)
+    index = build_index(data)
+
+    for sheet in data["sheets"][:3]:
+        for d, day in enumerate(sheet["days"], start=1):
+            for week in day["weeks"]:
+                counts = index["programs"][sheet["sheet_name"]]["days"][str(d)]["counts"]
+                assert counts[str(week["week_number"])] == len(week["exercises"])
+                for exercise in week["exercises"]:
+                    found = lookup(data, index, sheet["sheet_name"], d, week["week_number"], exercise["exercise_id"])
+                    assert found == [exercise]
+
+    block = data["sheets"][3]["days"][0]["blocks"][0]
+    assert lookup(data, index, "Sheet4", 1, "3-4", f"{block['block_name']}#1") == [block["exercises"][1]["week_3_4"]]
+
+
+def test_names_list_every_occurrence(workbook_path):
+    data = extract(workbook_path)
+    index = build_index(data)
+    name = data["sheets"][0]["days"][0]["weeks"][0]["exercises"][0]["exercise_name"]
+
+    occurrences = index["names"][name]
+    assert len(occurrences) >= 2
+    for program, day, week, exercise_id in occurrences:
+        assert [e["exercise_name"] for e in lookup(data, index, program, int(day), week, exercise_id)] == [name]
+
+
+def test_duplicate_ids_keep_every_position():
+    data = {"program_name": "P", "sheets": [{"sheet_name": "Sheet2", "program_name": "P", "days": [{
+        "day_name": "DAY 2", "weeks": [{"week_number": 1, "exercises": [
+            {"exercise_id": "B1", "exercise_name": "Row"}, {"exercise_id": "B1", "exercise_name": "RDL"}]}]}]}]}
+    index = build_index(data)
+    assert index["programs"]["Sheet2"]["days"]["1"]["weeks"]["1"]["exercises"]["B1"] == [[0, 0, 0, 0], [0, 0, 0, 1]]
+    assert [e["exercise_name"] for e in lookup(data, index, "Sheet2", 1, 1, "B1")] == ["Row", "RDL"]
+
+
+def test_cli_writes_sidecar_with_output(workbook_path, tmp_path):
+    output = tmp_path / "workout-data.json"
+    subprocess.run([sys.executable, str(SCRIPTS_DIR / "extract_workouts.py"), workbook_path, str(output)],
+                   check=True, capture_output=True)
+
+    with open(index_path_for(str(output)), encoding="utf-8") as f:
+        index = json.load(f)
+    with open(output, encoding="utf-8") as f:
+        assert index == build_index(json.load(f))
@@ -0,0 +1,77 @@
+"""Tests for NDJSON output (scripts/ndjson_sink.py and the extractor sinks)."""
+
+import contextlib
+import io
+import json
+import shutil
+
+from batch_extract import run_batch
+from extract_sheet1 import extract_sheet1_data, sheet1_records
+from extract_workouts import WorkoutExtractor, extract_to_ndjson
+from extraction_cache import ExtractionCache
+from ndjson_sink import iter_records
+
+
+def canonical(records):
+    return sorted(json.dumps(r, sort_keys=True) for r in records)
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_sink_streams_the_same_records_as_the_tree(workbook_path):
+    full = WorkoutExtractor(workbook_path)
+    tree = full.extract_all_sheets()
+    full.close()
+
+    records = []
+    streaming = WorkoutExtractor(workbook_path, streaming=True, sink=records.append)
+    skeleton = streaming.extract_all_sheets()
+    streaming.close()
+
+    assert canonical(records) == canonical(iter_records(tree))
+    assert {r["sheet"] for r in records} == {"Sheet1", "Sheet2", "Sheet3", "Sheet4"}
+    assert {r["week"] for r in records if r["sheet"] == "Sheet4"} == {"1-2", "3-4"}
+    # Only the day/week skeleton is kept in memory
+    assert all(not week["exercises"] for day in skeleton["sheets"][0]["days"] for week in day["weeks"])
+
+
+def test_cached_extraction_writes_identical_ndjson(workbook_path, tmp_path):
+    streamed, cached = tmp_path / "streamed.ndjson", tmp_path / "cached.ndjson"
+    with contextlib.redirect_stdout(io.StringIO()):
+        count = extract_to_ndjson(workbook_path, str(streamed), streaming=True)
+        extract_to_ndjson(workbook_path, str(cached), cache=ExtractionCache(str(tmp_path / "cache")))
+
+    assert count == len(read_lines(streamed))
+    assert canonical(read_lines(streamed)) == canonical(read_lines(cached))
+
+
+def test_batch_appends_every_workbook_to_one_file(workbook_path, tmp_path):
+    source = tmp_path / "athletes"
+    source.mkdir()
+    for name in ("alice", "bob"):
+        shutil.copy(workbook_path, source / f"{name}.xlsx")
+    combined = tmp_path / "all.ndjson"
+
+    summary = run_batch(str(source), str(tmp_path / "out"), workers=2, ndjson_path=str(combined))
+
+    lines = read_lines(combined)
+    assert summary["records"] == len(lines) == 2 * summary["files"][0]["records"]
+    assert not list((tmp_path / "out").glob("*.part"))
+
+
+def test_sheet1_sink_matches_flattened_output(workbook_path, tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        tree = extract_sheet1_data(workbook_path)
+        records = []
+        extract_sheet1_data(workbook_path, sink=records.append)
+        layout_records = []
+        layouts = ExtractionCache(str(tmp_path / "layouts"))
+        extract_sheet1_data(workbook_path, layout_cache=layouts)  # prime the schema
+        extract_sheet1_data(workbook_path, layout_cache=layouts, sink=layout_records.append)
+
+    expected = canonical(sheet1_records(tree))
+    assert canonical(records) == expected
+    assert canonical(layout_records) == expected
@@ -0,0 +1,144 @@
+"""Tests for the offline suggestion engine (scripts/overload_suggestions.py)."""
+
+import contextlib
+import io
+import json
+import random
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from batch_extract import run_batch
+from extract_workouts import WorkoutExtractor
+from overload_suggestions import main as suggestions_main
+from overload_suggestions import suggest, suggest_many, week_transitions
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURE = ROOT / "tests" / "fixtures" / "performance-data.json"
+ENGINE_JS = ROOT / "src" / "utils" / "weightSuggestions.js"
+
+
+def fixture_items():
+    with open(FIXTURE, encoding="utf-8") as f:
+        benchmarks = json.load(f)["benchmarks"]
+    single = benchmarks["single_calculation"]
+    cases = [{"name": single["exercise"], "targetRange": single["targetRange"], "week1Data": single["week1Data"]}]
+    cases += benchmarks["bulk_calculation"]["exercises"]
+    return [{"exercise_id": c["name"], "sets": c["week1Data"]["sets"], "target": c["targetRange"]} for c in cases]
+
+
+def strip(suggestion):
+    return {k: v for k, v in suggestion.items() if k not in ("stats", "calculatedAt")}
+
+
+def test_fixture_suggestions_match_the_js_engine():
+    results = suggest(fixture_items())
+    # Values produced by SuggestionEngine.calculateSuggestedWeight; sets
+    # without a ``completed`` flag count as failed there
+    expected = [(140, -5, -3.4, "low"), (140, -5, -3.4, "low"), (45, -5, -10, "low"),
+                (180, -5, -2.7, "low"), (107.5, -2.5, -2.3, "medium"), (92.5, -2.5, -2.6, "medium")]
+    assert [(r["suggestedWeight"], r["increaseAmount"], r["increasePercentage"], r["confidence"])
+            for r in results] == expected
+    assert results[2]["week1Results"] == {"sets": [{"weight": 50, "reps": 19}, {"weight": 50, "reps": 18}],
+                                          "avgWeight": 50, "avgReps": 18.5, "targetRange": "18-20"}
+
+
+def test_levels_stats_and_invalid_input():
+    completed = [{"weight": 100, "reps": 20, "completed": True}, {"weight": 100, "reps": 19, "completed": True}]
+    exceeded, strong, invalid_weight, invalid_target, empty = suggest([
+        {"exercise_id": "Back Squat", "sets": completed[:1] * 2, "target": "3x18-20"},
+        {"exercise_id": "A1", "sets": completed, "target": "3x18-20"},
+        {"exercise_id": "A1", "sets": [{"weight": 0, "reps": 10}], "target": "3x8"},
+        {"exercise_id": "A1", "sets": completed, "target": "??"},
+        {"exercise_id": "A1", "sets": [], "target": "3x8"},
+    ])
+    assert (exceeded["suggestedWeight"], exceeded["stats"]["level"], exceeded["stats"]["hitRate"]) == (110, "EXCEEDED", 1)
+    assert (strong["suggestedWeight"], strong["stats"]["level"], strong["stats"]["repStd"]) == (102.5, "STRONG", 0.5)
+    assert invalid_weight == {"error": "Invalid weight value: weight must be positive"}
+    assert invalid_target == {"error": "Invalid target range format"}
+    assert empty is None
+
+
+def test_parsed_targets_match_strings():
+    sets = [{"weight": 60, "reps": 12, "completed": True}]
+    by_string, by_parsed = suggest([
+        {"exercise_id": "A1", "sets": sets, "target": "4x10-12"},
+        {"exercise_id": "A1", "sets": sets, "target": {"reps_min": 10, "reps_max": 12, "to_failure": False}},
+    ])
+    assert strip(by_string) == {**strip(by_parsed), "week2Target": "4x10-12"}
+
+
+def test_transitions_from_extracted_workbook(workbook_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractor = WorkoutExtractor(workbook_path, parse_fields=True)
+        data = extractor.extract_all_sheets()
+        extractor.close()
+
+    items = list(week_transitions(data))
+    assert {(i["from_week"], i["to_week"]) for i in items} == {("1", "2"), ("1-2", "3-4")}
+    assert all(s["completed"] for i in items for s in i["sets"])
+
+    suggestions = suggest_many({"alice": data, "bob": data})
+    assert suggestions and {s["athlete"] for s in suggestions} == {"alice", "bob"}
+    assert all("suggestedWeight" in s["suggestion"] or "error" in s["suggestion"] for s in suggestions)
+
+
+def test_runs_on_a_batch_output_directory(tmp_path, workbook_path, monkeypatch):
+    source = tmp_path / "athletes"
+    source.mkdir()
+    shutil.copy(workbook_path, source / "alice.xlsx")
+    shutil.copy(workbook_path, source / "bob.xlsx")
+    out = tmp_path / "out"
+    output = tmp_path / "suggestions.json"
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_batch(str(source), str(out), workers=1)
+    # Sidecars the other tools leave next to an output
+    (out / "alice.index.json").write_text('{"format": "workout-index"}', encoding="utf-8")
+    (out / "alice.json.sheets.json").write_text('{"Sheet1": "abc"}', encoding="utf-8")
+
+    monkeypatch.setattr(sys, "argv", ["overload_suggestions.py", str(out), "-o", str(output)])
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()) as warnings:
+        assert suggestions_main() == 0
+
+    assert (out / "batch-summary.json").exists() and "batch-summary.json" in warnings.getvalue()
+    suggestions = json.loads(output.read_text(encoding="utf-8"))["suggestions"]
+    assert suggestions and {s["athlete"] for s in suggestions} == {"alice", "bob"}
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_random_inputs_match_the_js_engine(tmp_path):
+    rng = random.Random(7)
+    items = []
+    for _ in range(500):
+        sets = []
+        for _ in range(rng.randint(0, 5)):
+            s = {"weight": rng.choice([rng.randint(5, 300), rng.randint(5, 300) + 0.5]), "reps": rng.randint(0, 25)}
+            if rng.random() < 0.5:
+                s["completed"] = rng.random() < 0.85
+            sets.append(s)
+        items.append({"exercise_id": rng.choice(["A1", "Goblet Squat", "Leg Curl", "Bench Press"]), "sets": sets,
+                      "target": rng.choice(["2x18-20", "3x10-12", "4x8", "10ea", "2xMax Reps", "4 x Max", ""])})
+
+    module = tmp_path / "weightSuggestions.mjs"
+    shutil.copy(ENGINE_JS, module)
+    script = f"""
+import Engine from {json.dumps(module.as_uri())};
+import fs from 'fs';
+const engine = new Engine();
+const out = JSON.parse(fs.readFileSync(0)).map(item => {{
+  try {{ return engine.calculateSuggestedWeight(item.exercise_id, item.sets, item.target); }}
+  catch (error) {{ return {{ error: error.message }}; }}
+}});
+console.log(JSON.stringify(out));
+"""
+    completed = subprocess.run(["node", "--input-type=module", "-e", script], input=json.dumps(items),
+                               capture_output=True, text=True, check=True)
+
+    for ours, theirs in zip(suggest(items), json.loads(completed.stdout)):
+        if ours is None or "error" in ours:
+            assert ours == theirs
+        else:
+            assert strip(ours) == strip(theirs)
@@ -0,0 +1,123 @@
+"""Tests for scripts/performance_series.py (cross-athlete time series)."""
+
+import contextlib
+import io
+import json
+import math
+import sys
+
+import numpy as np
+import pytest
+
+from extract_workouts import extract_workbook
+from incremental_extract import extract_incremental
+from field_parsers import parse_results
+from ndjson_sink import iter_records
+from performance_series import PerformanceSeries, aggregate, file_sessions
+from performance_series import main as series_main
+from shard_output import write_shards
+
+
+@pytest.fixture
+def athlete_files(tmp_path, workbook_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        workout_data = extract_workbook(workbook_path)
+    paths = []
+    for name in ("bob", "alice"):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps(workout_data))
+        paths.append(str(path))
+    return workout_data, paths
+
+
+def expected_session(results):
+    logged = parse_results(results)
+    weighted = [(w, r) for w, r in logged if w is not None]
+    return {
+        "sets": len(logged),
+        "reps": sum(r for _, r in logged),
+        "top_weight": max(w for w, _ in weighted) if weighted else None,
+        "volume": sum(w * r for w, r in weighted) if weighted else None,
+        "e1rm": max(w if r == 1 else w * (1 + r / 30) for w, r in weighted) if weighted else None,
+    }
+
+
+def test_sessions_match_the_logged_results(tmp_path, athlete_files):
+    workout_data, paths = athlete_files
+    series = PerformanceSeries(aggregate(paths, str(tmp_path / "series.npz")))
+
+    records = [r for r in iter_records(workout_data) if parse_results(r["results"] or "")]
+    name = records[0]["exercise_name"]
+    expected = [expected_session(r["results"]) for r in records if r["exercise_name"] == name]
+    rows = series.records(name, "alice")
+
+    assert len(rows) == len(expected)
+    assert sorted((r["sets"], r["reps"]) for r in rows) == sorted((e["sets"], e["reps"]) for e in expected)
+    for column in ("top_weight", "volume", "e1rm"):
+        assert sorted(r[column] for r in rows) == pytest.approx(sorted(e[column] for e in expected), abs=0.01)
+
+
+def test_rows_are_grouped_by_exercise_and_ordered(tmp_path, athlete_files):
+    _, paths = athlete_files
+    arrays = aggregate(paths, str(tmp_path / "series.npz"))
+
+    offsets = arrays["offsets"]
+    assert offsets[0] == 0 and offsets[-1] == len(arrays["exercise"])
+    for code in range(len(arrays["exercise_names"])):
+        assert (arrays["exercise"][offsets[code]:offsets[code + 1]] == code).all()
+
+    rows = PerformanceSeries.load(str(tmp_path / "series.npz")).records(str(arrays["exercise_names"][0]))
+    # Athletes in input order (bob's file came first), then program, week and day
+    assert [r["athlete"] for r in rows] == ["bob"] * (len(rows) // 2) + ["alice"] * (len(rows) // 2)
+    bob = [(r["program"], r["week_start"], r["day"]) for r in rows if r["athlete"] == "bob"]
+    assert bob == sorted(bob, key=lambda key: (arrays["program_names"].tolist().index(key[0]), key[1], key[2]))
+
+
+def test_written_file_round_trips(tmp_path, athlete_files):
+    _, paths = athlete_files
+    output = tmp_path / "series.npz"
+    arrays = aggregate(paths, str(output))
+
+    loaded = PerformanceSeries.load(str(output))
+
+    for column, values in arrays.items():
+        np.testing.assert_array_equal(loaded.arrays[column], values)
+    assert loaded.arrays["e1rm"].dtype == np.float32
+    assert loaded.exercise("No Such Exercise")["sets"].size == 0
+
+
+def test_bodyweight_sets_count_reps_but_no_load(tmp_path):
+    path = tmp_path / "carol.json"
+    path.write_text(json.dumps({"sheets": [{"sheet_name": "Sheet1", "program_name": "P", "days": [
+        {"day_name": "DAY 1", "weeks": [{"week_number": 1, "exercises": [
+            {"exercise_name": "Pull Up", "results": "BWx8, 7"},
+            {"exercise_name": "Squat", "results": "100x1, 90x5"},
+            {"exercise_name": "Skipped", "results": ""}]}]}]}]}))
+
+    sessions = file_sessions(str(path))
+
+    assert sessions["tables"]["exercise"] == ["Pull Up", "Squat"]
+    assert sessions["reps"].tolist() == [15, 6]
+    assert math.isnan(sessions["top_weight"][0]) and math.isnan(sessions["volume"][0])
+    assert sessions["e1rm"][1] == pytest.approx(105.0)
+    assert sessions["volume"][1] == pytest.approx(550.0)
+
+
+def test_cli_reads_an_incremental_output_directory(tmp_path, workbook_path, monkeypatch):
+    out = tmp_path / "out"
+    out.mkdir()
+    alice = str(out / "alice.json")
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = extract_incremental(workbook_path, alice, delta=True)
+        write_shards(result["workout_data"], alice)
+    (out / "batch-summary.json").write_text('{"files": []}', encoding="utf-8")
+    series_path = str(tmp_path / "series.npz")
+
+    monkeypatch.setattr(sys, "argv", ["performance_series.py", str(out), "-o", series_path])
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        assert series_main() == 0
+
+    expected = aggregate([alice])
+    written = PerformanceSeries.load(series_path).arrays
+    assert list(written["athlete_names"]) == ["alice"]
+    assert np.array_equal(written["exercise"], expected["exercise"])
@@ -0,0 +1,81 @@
+"""Tests for scripts/publish_artifacts.py (content-hashed data artifacts)."""
+
+import contextlib
+import gzip
+import hashlib
+import io
+import json
+import sys
+
+from extract_workouts import main as extract_main
+from publish_artifacts import MANIFEST_NAME, PRECACHE_SCRIPT, load_manifest, publish
+
+
+def write_output(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+def test_publishes_hashed_file_gzip_sibling_and_manifests(tmp_path):
+    site = tmp_path / "site"
+    output = write_output(tmp_path / "workout-data.json", {"sheets": []})
+    data = (tmp_path / "workout-data.json").read_bytes()
+
+    manifest = publish([output], str(site))
+
+    entry = manifest["files"]["workout-data.json"]
+    digest = hashlib.sha256(data).hexdigest()
+    assert entry["url"] == f"data/workout-data.{digest[:12]}.json" and entry["sha256"] == digest
+    assert (site / entry["url"]).read_bytes() == data
+    assert gzip.decompress((site / entry["gzip_url"]).read_bytes()) == data
+    assert entry["gzip_bytes"] == (site / entry["gzip_url"]).stat().st_size
+    assert load_manifest(str(site)) == manifest
+
+    script = (site / PRECACHE_SCRIPT).read_text(encoding="utf-8")
+    prefix = "self.PRECACHE_MANIFEST = "
+    assert json.loads(script[script.index(prefix) + len(prefix):].rstrip().rstrip(";")) == manifest
+
+
+def test_republishing_the_same_content_changes_nothing(tmp_path):
+    site = tmp_path / "site"
+    output = write_output(tmp_path / "workout-data.json", {"sheets": []})
+    first = publish([output], str(site))
+    before = {p.name: p.stat().st_mtime_ns for p in site.rglob("*")}
+
+    assert publish([output], str(site)) == first
+    assert {p.name: p.stat().st_mtime_ns for p in site.rglob("*")} == before
+
+
+def test_merges_entries_and_keeps_one_previous_generation(tmp_path):
+    site = tmp_path / "site"
+    (site / "data").mkdir(parents=True)
+    (site / "data" / "notes.txt").write_text("not ours", encoding="utf-8")
+    sheet1 = write_output(tmp_path / "sheet1-workout-data.json", {"weeks": []})
+    output = tmp_path / "workout-data.json"
+
+    urls = []
+    for version in range(3):
+        manifest = publish([write_output(output, {"version": version}), sheet1], str(site))
+        urls.append(manifest["files"]["workout-data.json"]["url"])
+    manifest = publish([write_output(output, {"version": 3})], str(site))
+
+    assert list(manifest["files"]) == ["sheet1-workout-data.json", "workout-data.json"]
+    assert len(set(urls)) == 3
+    kept = sorted(p.name for p in (site / "data").iterdir())
+    expected = [manifest["files"]["sheet1-workout-data.json"]["url"], urls[2],
+                manifest["files"]["workout-data.json"]["url"]]
+    assert kept == sorted(["notes.txt"] + [name.split("/")[1] + suffix for name in expected
+                                           for suffix in ("", ".gz")])
+
+
+def test_extract_workouts_can_publish(tmp_path, workbook_path, monkeypatch):
+    site = tmp_path / "site"
+    output = str(tmp_path / "workout-data.json")
+    monkeypatch.setattr(sys, "argv", ["extract_workouts.py", str(workbook_path), output, "--publish", str(site)])
+    with contextlib.redirect_stdout(io.StringIO()):
+        extract_main()
+
+    manifest = json.loads((site / MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert list(manifest["files"]) == ["workout-data.index.json", "workout-data.json"]
+    with open(output, "rb") as f:
+        assert (site / manifest["files"]["workout-data.json"]["url"]).read_bytes() == f.read()
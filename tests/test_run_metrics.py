@@ -0,0 +1,126 @@
+"""Tests for extraction run metrics (scripts/run_metrics.py)."""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+
+from extract_sheet1 import extract_sheet1_data
+from extract_workouts import WorkoutExtractor
+from run_metrics import NO_METRICS, Recorder, metrics_mode, metrics_path_for
+from conftest import SCRIPTS_DIR
+
+
+def extract(workbook_path, **options):
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractor = WorkoutExtractor(workbook_path, **options)
+        data = extractor.extract_all_sheets()
+        extractor.close()
+    return extractor, data
+
+
+def test_disabled_metrics_leave_the_row_path_alone(workbook_path):
+    extractor, _ = extract(workbook_path)
+
+    assert extractor.metrics is NO_METRICS
+    assert NO_METRICS.phase("load_workbook") is NO_METRICS.phase("write_json", sheet="Sheet1")
+    # No per-instance wrappers: the class methods run unchanged
+    assert "_add_exercise_to_day" not in vars(extractor)
+    rows = iter([(1,), (2,)])
+    assert NO_METRICS.count_rows(rows) is rows
+
+
+def test_phases_per_sheet_with_rows_and_parse_time(workbook_path):
+    recorder = Recorder("extract_workouts")
+    try:
+        _, data = extract(workbook_path, metrics=recorder)
+    finally:
+        recorder.close()
+    _, plain = extract(workbook_path)
+    assert data == plain
+
+    phases = recorder.phases
+    assert [p["name"] for p in phases] == ["load_workbook"] + ["extract_sheet"] * 4
+    sheets = {p["sheet"]: p for p in phases[1:]}
+    assert list(sheets) == ["Sheet1", "Sheet2", "Sheet3", "Sheet4"]
+
+    # 3 days x (header + 4 exercises) below the title and week header rows
+    assert sheets["Sheet1"]["functions"]["_add_exercise_to_day"]["calls"] == 12
+    assert sheets["Sheet1"]["rows"] >= 17
+    assert "_parse_sheet4_exercise" in sheets["Sheet4"]["functions"]
+    for phase in phases:
+        assert phase["seconds"] >= 0
+        assert phase["peak_bytes"] > 0
+    sheet1 = sheets["Sheet1"]
+    parse_seconds = sheet1["functions"]["_add_exercise_to_day"]["seconds"]
+    assert abs(sheet1["iteration_seconds"] + parse_seconds - sheet1["seconds"]) < 1e-5
+
+
+def test_nested_phase_peak_counts_towards_outer_phase():
+    recorder = Recorder("test")
+    try:
+        with recorder.phase("outer"):
+            with recorder.phase("inner"):
+                block = bytearray(2_000_000)
+                del block
+        report = recorder.report()
+    finally:
+        recorder.close()
+
+    outer, inner = report["phases"]
+    assert inner["peak_bytes"] >= 2_000_000
+    assert outer["peak_bytes"] >= inner["peak_bytes"]
+    assert report["peak_bytes"] >= outer["peak_bytes"]
+
+
+def test_time_only_mode_skips_tracemalloc(workbook_path):
+    recorder = Recorder("extract_sheet1", memory=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        extract_sheet1_data(workbook_path, metrics=recorder)
+
+    assert [p["name"] for p in recorder.phases] == ["load_workbook", "extract_sheet", "build_weeks"]
+    assert recorder.phases[1]["rows"] > 0
+    assert all("peak_bytes" not in p for p in recorder.phases)
+    assert recorder.report()["memory_traced"] is False
+
+
+def test_mode_from_flag_or_environment(monkeypatch):
+    monkeypatch.delenv("WORKOUT_METRICS", raising=False)
+    assert metrics_mode() is None
+    assert metrics_mode("time") == "time"
+
+    monkeypatch.setenv("WORKOUT_METRICS", "1")
+    assert metrics_mode() == "full"
+    monkeypatch.setenv("WORKOUT_METRICS", "time")
+    assert metrics_mode() == "time"
+    monkeypatch.setenv("WORKOUT_METRICS", "0")
+    assert metrics_mode() is None
+
+
+def test_cli_writes_report_next_to_output(workbook_path, tmp_path):
+    output = tmp_path / "workout-data.json"
+    env = {**os.environ, "WORKOUT_METRICS": "1"}
+    subprocess.run([sys.executable, str(SCRIPTS_DIR / "extract_workouts.py"), workbook_path, str(output)],
+                   check=True, capture_output=True, env=env)
+
+    assert metrics_path_for(str(output)) == str(tmp_path / "workout-data.metrics.json")
+    with open(metrics_path_for(str(output)), encoding="utf-8") as f:
+        report = json.load(f)
+    assert report["format"] == "workout-metrics"
+    assert report["output_format"] == "json"
+    names = [p["name"] for p in report["phases"]]
+    assert names[0] == "load_workbook"
+    assert names[-2:] == ["write_json", "write_index"]
+    assert report["peak_bytes"] > 0
+
+
+def test_cli_without_metrics_writes_no_report(workbook_path, tmp_path):
+    output = tmp_path / "workout-data.json"
+    env = {k: v for k, v in os.environ.items() if k != "WORKOUT_METRICS"}
+    subprocess.run([sys.executable, str(SCRIPTS_DIR / "extract_sheet1.py"), workbook_path, str(output)],
+                   check=True, capture_output=True, env=env)
+
+    assert output.exists()
+    assert not os.path.exists(metrics_path_for(str(output)))
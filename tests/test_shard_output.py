@@ -0,0 +1,99 @@
+"""Tests for scripts/shard_output.py (per-program, per-week shards and catalog)."""
+
+import contextlib
+import io
+import json
+import sys
+
+from extract_sheet1 import extract_sheet1_data
+from extract_workouts import extract_workbook
+from extract_workouts import main as extract_main
+from lookup_index import build_index
+from shard_output import build_shards, catalog_path_for, write_shards
+from workout_model import Program, to_dict
+
+
+def extract(path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return extract_workbook(str(path))
+
+
+def write(workout_data, output):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return write_shards(workout_data, str(output))
+
+
+def test_shards_cover_every_program_and_week(workbook_path):
+    workout_data = extract(workbook_path)
+    index = build_index(workout_data)
+
+    shards = list(build_shards(workout_data))
+
+    assert [(s["program"], s["week"]) for s in shards] == [
+        (program, week) for program, entry in index["programs"].items() for week in entry["days"]["1"]["weeks"]]
+    assert sum(s["exercises"] for s in shards) == sum(
+        count for entry in index["programs"].values() for day in entry["days"].values()
+        for count in day["counts"].values())
+
+
+def test_a_shard_is_the_output_cut_to_one_week(workbook_path):
+    workout_data = extract(workbook_path)
+    shards = {(s["program"], s["week"]): s["shard"] for s in build_shards(workout_data)}
+
+    week2 = shards["Sheet1", "2"]
+    [sheet] = week2["sheets"]
+    assert week2["program_name"] == workout_data["program_name"]
+    assert len(sheet["days"]) == len(workout_data["sheets"][0]["days"])
+    assert all([week["week_number"] for week in day["weeks"]] == [2] for day in sheet["days"])
+    assert sheet["days"][0]["weeks"][0] == workout_data["sheets"][0]["days"][0]["weeks"][1]
+
+    [block_sheet] = shards["Sheet4", "3-4"]["sheets"]
+    exercise = block_sheet["days"][0]["blocks"][0]["exercises"][0]
+    assert list(exercise) == ["exercise_name", "week_3_4"]
+    assert to_dict(Program.from_dict(shards["Sheet4", "3-4"])) == shards["Sheet4", "3-4"]
+
+
+def test_writes_catalog_and_prunes_stale_shards(tmp_path, workbook_path):
+    output = tmp_path / "workout-data.json"
+    workout_data = extract(workbook_path)
+    output.write_text(json.dumps(workout_data), encoding="utf-8")
+
+    catalog = write(workout_data, output)
+
+    assert catalog == json.loads((tmp_path / "workout-data.catalog.json").read_text(encoding="utf-8"))
+    assert catalog["source"] == {"file": "workout-data.json", "bytes": output.stat().st_size}
+    sheet1 = catalog["programs"]["Sheet1"]
+    assert sheet1["days"] == [day["day_name"] for day in workout_data["sheets"][0]["days"]]
+    entry = sheet1["weeks"]["1"]
+    assert entry["file"] == "workout-data.shard.Sheet1.1.json"
+    assert entry["bytes"] == (tmp_path / entry["file"]).stat().st_size < output.stat().st_size // 4
+
+    workout_data["sheets"] = workout_data["sheets"][:1]
+    write(workout_data, output)
+    assert sorted(p.name for p in tmp_path.glob("workout-data.shard.*")) == [
+        "workout-data.shard.Sheet1.1.json", "workout-data.shard.Sheet1.2.json"]
+
+
+def test_sheet1_output_is_sharded_by_week(tmp_path, workbook_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        workout_data = extract_sheet1_data(workbook_path)
+
+    catalog = write(workout_data, tmp_path / "sheet1-workout-data.json")
+
+    [(program, entry)] = catalog["programs"].items()
+    assert (program, entry["program_name"]) == ("Sheet1", workout_data["program"])
+    assert list(entry["weeks"]) == ["1", "2"]
+    shard = json.loads((tmp_path / entry["weeks"]["2"]["file"]).read_text(encoding="utf-8"))
+    assert shard == {**workout_data, "weeks": [workout_data["weeks"][1]]}
+
+
+def test_extract_workouts_writes_shards_in_the_same_run(tmp_path, workbook_path, monkeypatch):
+    output = str(tmp_path / "workout-data.json")
+    monkeypatch.setattr(sys, "argv", ["extract_workouts.py", str(workbook_path), output, "--shards"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        extract_main()
+
+    catalog = json.loads(open(catalog_path_for(output), encoding="utf-8").read())
+    assert list(catalog["programs"]) == ["Sheet1", "Sheet2", "Sheet3", "Sheet4"]
+    assert all((tmp_path / week["file"]).exists()
+               for program in catalog["programs"].values() for week in program["weeks"].values())
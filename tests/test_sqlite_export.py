@@ -0,0 +1,128 @@
+"""Tests for scripts/sqlite_export.py (normalized SQLite export)."""
+
+import contextlib
+import io
+import json
+import shutil
+import sqlite3
+import sys
+
+import pytest
+
+from batch_extract import run_batch
+from extract_workouts import extract_workbook
+from ndjson_sink import iter_records
+from sqlite_export import SQLiteExporter, exercise_history, export_sqlite
+from sqlite_export import main as export_main
+
+
+@pytest.fixture
+def workout_data(workbook_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return extract_workbook(workbook_path)
+
+
+def query(db_path, sql, *params):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def test_export_matches_the_flat_records(tmp_path, workout_data):
+    db_path = str(tmp_path / "workouts.sqlite")
+    counts = export_sqlite([("alice", workout_data, None), ("bob", workout_data, None)], db_path)
+
+    records = list(iter_records(workout_data))
+    assert counts["athletes"] == 2
+    assert counts["programs"] == 2 * len(workout_data["sheets"])
+    assert counts["exercises"] == 2 * len(records)
+    assert query(db_path, "PRAGMA journal_mode") == [("wal",)]
+
+    rows = query(db_path, """
+        SELECT p.sheet, w.week, e.name, e.results FROM exercises e
+        JOIN weeks w ON w.id = e.week_id JOIN days d ON d.id = w.day_id
+        JOIN programs p ON p.id = d.program_id JOIN athletes a ON a.id = p.athlete_id
+        WHERE a.name = 'alice' ORDER BY e.id""")
+    assert sorted(rows) == sorted((r["sheet"], str(r["week"]), r["exercise_name"], r["results"] or None)
+                                  for r in records)
+
+
+def test_sets_are_parsed_from_results(tmp_path, workout_data):
+    db_path = str(tmp_path / "workouts.sqlite")
+    export_sqlite([("alice", workout_data, None)], db_path)
+
+    for results, weights in query(db_path, """
+            SELECT e.results, group_concat(s.weight || 'x' || s.reps, ', ') FROM exercises e
+            JOIN sets s ON s.exercise_id = e.id GROUP BY e.id ORDER BY e.id LIMIT 5"""):
+        assert weights.replace(".0x", "x") == ", ".join(part.strip() for part in results.split(","))
+
+
+def test_reexport_replaces_an_athlete(tmp_path, workout_data):
+    db_path = str(tmp_path / "workouts.sqlite")
+    export_sqlite([("alice", workout_data, None), ("bob", workout_data, None)], db_path)
+    before = query(db_path, "SELECT count(*) FROM exercises")[0][0]
+
+    export_sqlite([("alice", workout_data, None)], db_path)
+
+    assert query(db_path, "SELECT count(*) FROM exercises")[0][0] == before
+    assert query(db_path, "SELECT name FROM athletes ORDER BY name") == [("alice",), ("bob",)]
+    orphans = query(db_path, "SELECT count(*) FROM sets WHERE exercise_id NOT IN (SELECT id FROM exercises)")
+    assert orphans == [(0,)]
+
+
+def test_failed_export_rolls_back(tmp_path, workout_data):
+    db_path = str(tmp_path / "workouts.sqlite")
+    with pytest.raises(KeyError):
+        with SQLiteExporter(db_path) as exporter:
+            exporter.add("alice", workout_data)
+            exporter.add("broken", {"sheets": [{}]})
+
+    assert query(db_path, "SELECT count(*) FROM athletes") == [(0,)]
+
+
+def test_history_is_an_indexed_lookup(tmp_path, workout_data):
+    db_path = str(tmp_path / "workouts.sqlite")
+    export_sqlite([("alice", workout_data, None), ("bob", workout_data, None)], db_path)
+    name = workout_data["sheets"][0]["days"][0]["weeks"][0]["exercises"][0]["exercise_name"]
+
+    rows = exercise_history(db_path, name)
+
+    assert {row["athlete"] for row in rows} == {"alice", "bob"}
+    plan = " ".join(row[3] for row in query(db_path, "EXPLAIN QUERY PLAN SELECT * FROM exercises WHERE name = ?",
+                                            name))
+    assert "USING INDEX idx_exercises_name" in plan
+
+
+def test_batch_loads_every_workbook(tmp_path, workbook_path):
+    source = tmp_path / "athletes"
+    source.mkdir()
+    shutil.copy(workbook_path, source / "alice.xlsx")
+    shutil.copy(workbook_path, source / "bob.xlsx")
+    db_path = str(tmp_path / "batch.sqlite")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = run_batch(str(source), str(tmp_path / "out"), workers=1, sqlite_path=db_path)
+
+    assert summary["sqlite_rows"]["athletes"] == 2
+    alice = json.loads((tmp_path / "out" / "alice.json").read_text())
+    assert summary["sqlite_rows"]["exercises"] == 2 * len(list(iter_records(alice)))
+    assert query(db_path, "SELECT name, source FROM athletes ORDER BY name") == [
+        ("alice", str(source / "alice.xlsx")), ("bob", str(source / "bob.xlsx"))]
+
+
+def test_cli_skips_sidecars_in_an_input_directory(tmp_path, workout_data, monkeypatch):
+    source = tmp_path / "extracted"
+    source.mkdir()
+    (source / "alice.json").write_text(json.dumps(workout_data), encoding="utf-8")
+    (source / "alice.index.json").write_text('{"format": "workout-index"}', encoding="utf-8")
+    (source / "a.metrics.json").write_text('{"format": "workout-metrics", "phases": []}', encoding="utf-8")
+    db_path = str(tmp_path / "workouts.sqlite")
+
+    monkeypatch.setattr(sys, "argv", ["sqlite_export.py", str(source), "-o", db_path])
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()) as warnings:
+        assert export_main() == 0
+
+    assert "a.metrics.json" in warnings.getvalue()
+    assert query(db_path, "SELECT name FROM athletes") == [("alice",)]
@@ -0,0 +1,103 @@
+"""Tests for watch mode (scripts/watch_extract.py)."""
+
+import contextlib
+import io
+import json
+import os
+
+import openpyxl
+
+from extract_workouts import extract_workbook, write_json
+from lookup_index import build_index, index_path_for
+from watch_extract import WorkbookWatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def save(workbook, path, mtime):
+    """Save and pin the modification time, so saves within one clock tick still differ."""
+    workbook.save(path)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def quiet(func, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+def test_debounced_refresh_reparses_only_the_edited_sheet(tmp_path, workbook_path):
+    excel = str(tmp_path / "live.xlsx")
+    output = tmp_path / "workout-data.json"
+    wb = openpyxl.load_workbook(workbook_path)
+    save(wb, excel, 1_000_000_000)
+
+    clock = FakeClock()
+    watcher = WorkbookWatcher(excel, str(output), debounce=1.0, clock=clock)
+    first = quiet(watcher.refresh)
+    assert first["changed"] == ["Sheet1", "Sheet2", "Sheet3", "Sheet4"]
+
+    # A burst of three saves, each inside the debounce window of the last
+    for i, value in enumerate(["135x12", "135x12,135x10", "135x12,135x10,115x8"]):
+        wb["Sheet2"]["G4"] = value
+        save(wb, excel, 2_000_000_000 + i)
+        assert quiet(watcher.poll) is None
+        clock.now += 0.5
+        assert quiet(watcher.poll) is None
+
+    clock.now += 0.6
+    report = quiet(watcher.poll)
+    assert report["changed"] == ["Sheet2"]
+    assert report["reused"] == ["Sheet1", "Sheet3", "Sheet4"]
+    assert watcher.refreshes == 2
+
+    full = tmp_path / "full.json"
+    quiet(write_json, extract_workbook(excel), str(full))
+    assert output.read_bytes() == full.read_bytes()
+    with open(index_path_for(str(output)), encoding="utf-8") as f:
+        assert json.load(f) == build_index(watcher.state["workout_data"])
+
+    clock.now += 5
+    assert quiet(watcher.poll) is None
+
+
+def test_touch_without_content_change_writes_nothing(tmp_path, workbook_path):
+    output = tmp_path / "workout-data.json"
+    clock = FakeClock()
+    watcher = WorkbookWatcher(workbook_path, str(output), debounce=0.5, index=False, clock=clock)
+    quiet(watcher.refresh)
+    written = output.stat().st_mtime_ns
+
+    os.utime(workbook_path, ns=(3_000_000_000, 3_000_000_000))
+    quiet(watcher.poll)
+    clock.now += 1
+    report = quiet(watcher.poll)
+    assert report["written"] is False and report["changed"] == []
+    assert output.stat().st_mtime_ns == written
+    assert not os.path.exists(index_path_for(str(output)))
+
+
+def test_truncated_save_is_skipped_until_the_next_change(tmp_path, workbook_path):
+    excel = tmp_path / "live.xlsx"
+    excel.write_bytes(open(workbook_path, "rb").read())
+    output = tmp_path / "workout-data.json"
+    clock = FakeClock()
+    watcher = WorkbookWatcher(str(excel), str(output), debounce=0.5, clock=clock)
+    quiet(watcher.refresh)
+    before = output.read_bytes()
+
+    excel.write_bytes(excel.read_bytes()[:100])
+    quiet(watcher.poll)
+    clock.now += 1
+    assert quiet(watcher.poll) is None
+    assert output.read_bytes() == before
+
+    excel.write_bytes(open(workbook_path, "rb").read())
+    quiet(watcher.poll)
+    clock.now += 1
+    assert quiet(watcher.poll)["written"] is False
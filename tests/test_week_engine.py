@@ -0,0 +1,79 @@
+"""Tests for scripts/week_engine.py (single-pass multi-week engine)."""
+
+import contextlib
+import io
+import json
+from pathlib import Path
+
+from extract_sheet1 import extract_sheet1_data
+from week_engine import extract_weeks, find_week_columns
+from workout_model import to_dict
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+ROWS = [
+    ("Davey Jone's Pump", None, None, None, None, None, None, None, None, None, None, None),
+    (None, None, None, "WEEK 1", None, None, None, None, "WEEK 2", None, None, None),
+    ("DAY 1: Upper Pull", None, None, None, None, None, None, None, None, None, None, None),
+    ("TEMPO", "Exercise", None, None, None, None, None, None, None, None, None, None),
+    ("A1", "Barbell Bench", None, 211, "2x18-20", "1m", "105x15,95x10", None, 211, "3x18-20", "1m", "95x18"),
+    ("A2", "DB Shrug", None, 121, "2x18-20", None, None, None, 121, "3x18-20"),
+    (None,) * 12,
+    ("DAY 2: Lower", None, None, None, None, None, None, None, None, None, None, None),
+    ("B1", "Leg Press", None, 311, "3x10", "2m", "200x10", None, 311, "4x10", "2m", None),
+]
+
+
+def test_find_week_columns_uses_header_positions():
+    weeks = find_week_columns(ROWS[1])
+    assert [(w.week_number, w.tempo, w.results) for w in weeks] == [(1, 3, 6), (2, 8, 11)]
+
+
+def test_single_pass_projects_every_week():
+    consumed = []
+
+    def rows():
+        for row in ROWS:
+            consumed.append(row)
+            yield row
+
+    extracted = extract_weeks(rows())
+
+    assert len(consumed) == len(ROWS)
+    assert extracted["weeks"] == [1, 2]
+    assert [d["header"] for d in extracted["days"]] == ["DAY 1: Upper Pull", "DAY 2: Lower"]
+
+    day1 = extracted["days"][0]["weeks"]
+    assert [e["exercise_id"] for e in day1[1]] == ["A1", "A2"]
+    assert day1[2][0]["sets_reps"] == "3x18-20"
+    assert day1[2][0]["results"] == "95x18"
+    # Short rows are padded rather than raising
+    assert day1[2][1]["rest"] is None
+    assert extracted["days"][1]["weeks"][1][0]["tempo"] == 311
+
+
+def test_any_number_of_week_blocks():
+    header = (None, None, None) + sum(((f"WEEK {n}", None, None, None, None) for n in range(1, 13)), ())
+    row = ("A1", "Squat", None) + sum(((200, f"{n}x5", "2m", f"{n}x5", None) for n in range(1, 13)), ())
+
+    extracted = extract_weeks([header, ("DAY 1: Legs",), row])
+
+    assert extracted["weeks"] == list(range(1, 13))
+    assert extracted["days"][0]["weeks"][12][0]["sets_reps"] == "12x5"
+
+
+def test_sheet1_output_is_pinned(workbook_path):
+    """Week blocks start at their WEEK N header; ID and name always come from columns A/B."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        workout_data = extract_sheet1_data(workbook_path)
+
+    with open(FIXTURES / "sheet1-synthetic.json", encoding="utf-8") as f:
+        assert to_dict(workout_data) == json.load(f)
+
+    week1, week2 = (week["days"][0]["exercises"][0] for week in workout_data["weeks"])
+    # Row 4 of the fixture: A1, Leg Press Machine, -, 221, 3x18-20, 90s, 55x11..., -, 221, 4x10-12, 90s, 60x12...
+    assert (week1["id"], week1["name"], week1["tempo"], week1["setsReps"], week1["rest"]) == (
+        "A1", "Leg Press Machine", "221", "3x18-20", "90s")
+    assert (week2["id"], week2["name"], week2["setsReps"], week2["results"]) == (
+        "A1", "Leg Press Machine", "4x10-12", "60x12,60x13,60x14,60x15")
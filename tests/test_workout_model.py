@@ -0,0 +1,74 @@
+"""Tests for scripts/workout_model.py (slots model behind the extractors)."""
+
+import contextlib
+import io
+import json
+
+from extract_sheet1 import extract_sheet1_data
+from extract_workouts import WorkoutExtractor, extract_workbook, write_json
+from extraction_cache import ExtractionCache
+from workout_model import Program, Sheet1Program, to_dict
+
+
+def extract_model(workbook_path, **options):
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractor = WorkoutExtractor(workbook_path, **options)
+        try:
+            return extractor.extract_model()
+        finally:
+            extractor.close()
+
+
+def test_model_writes_the_same_bytes_as_dicts(tmp_path, workbook_path):
+    program = extract_model(workbook_path, parse_fields=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        write_json(program, str(tmp_path / "model.json"))
+        write_json(json.loads(json.dumps(to_dict(program))), str(tmp_path / "dicts.json"))
+
+    assert (tmp_path / "model.json").read_bytes() == (tmp_path / "dicts.json").read_bytes()
+    sheet4 = to_dict(program)["sheets"][3]["days"][0]["blocks"][0]["exercises"][0]
+    assert list(sheet4) == ["exercise_name", "week_1_2", "week_3_4"]
+    assert list(sheet4["week_1_2"]) == ["tempo", "sets", "reps", "results", "pump_rating", "parsed"]
+
+
+def test_objects_have_slots_and_share_strings(workbook_path):
+    program = extract_model(workbook_path)
+    day = program.sheets[0].days[0]
+    first, second = day.weeks[0].exercises[0], day.weeks[1].exercises[0]
+
+    assert not hasattr(first, "__dict__")
+    assert first.exercise_name is second.exercise_name
+    # Equal prescriptions from different cells are one object
+    tempos = {id(e.tempo) for week in day.weeks for e in week.exercises if e.tempo == first.tempo}
+    assert len(tempos) == 1
+    assert program.exercise_count() == sum(len(group["exercises"]) for sheet in to_dict(program)["sheets"]
+                                           for day in sheet["days"]
+                                           for group in day.get("weeks", []) + day.get("blocks", []))
+
+
+def test_from_dict_round_trips(tmp_path, workbook_path):
+    program = extract_model(workbook_path, parse_fields=True)
+
+    assert Program.from_dict(json.loads(json.dumps(to_dict(program)))) == program
+
+
+def test_cached_results_load_back_into_the_model(tmp_path, workbook_path):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = extract_workbook(workbook_path, cache=cache, model=True)
+        second = extract_workbook(workbook_path, cache=cache, model=True)
+
+    assert cache.hits == 1
+    assert isinstance(second, Program) and second == first
+
+
+def test_sheet1_model_matches_dict_output(workbook_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = extract_sheet1_data(workbook_path, model=True)
+        plain = extract_sheet1_data(workbook_path)
+
+    assert isinstance(model, Sheet1Program)
+    assert to_dict(model) == plain
+    assert list(plain["weeks"][0]["days"][0]) == ["dayNumber", "dayName", "exercises"]
+    assert list(plain["weeks"][0]["days"][0]["exercises"][0]) == ["id", "name", "tempo", "setsReps", "rest",
+                                                                   "results"]
@@ -0,0 +1,91 @@
+/**
+ * Workout Delta Tests
+ *
+ * Checks src/utils/workoutDelta.js against deltas written by
+ * scripts/json_delta.py. tests/fixtures/workout-delta.json holds three
+ * consecutive workout-data.json texts, the version file after the last one
+ * and the two delta files between them:
+ * - applyPatch turns each text into the next one
+ * - deltaChain finds the deltas from any listed version
+ * - fetchWorkoutData patches a cached copy, and labels a full download with
+ *   the version of the text it received
+ *
+ * Run with: node --experimental-detect-module --test tests/workoutDelta.test.js
+ */
+
+import { describe, it } from 'node:test';
+import assert from 'node:assert/strict';
+import fs from 'node:fs';
+
+import { applyPatch, deltaChain, fetchWorkoutData, textVersion } from '../src/utils/workoutDelta.js';
+
+const FIXTURE = JSON.parse(fs.readFileSync(new URL('./fixtures/workout-delta.json', import.meta.url), 'utf8'));
+const { texts, version_info: versionInfo, deltas } = FIXTURE;
+const [first, second] = versionInfo.deltas;
+
+globalThis.location = { href: 'https://app.test/' };
+
+/**
+ * Serve workout-data.json, its version file and the fixture deltas
+ *
+ * @param {Object} files - { 'workout-data.json': text, 'workout-data.version.json': info }
+ * @returns {Array<string>} Paths requested, in order
+ */
+function serve(files) {
+  const requested = [];
+  globalThis.fetch = async (url) => {
+    const path = new URL(String(url), location.href).pathname.slice(1);
+    requested.push(path);
+    const body = path in files ? files[path] : deltas[path];
+    const text = typeof body === 'string' ? body : JSON.stringify(body);
+    return { ok: body !== undefined, text: async () => text, json: async () => JSON.parse(text) };
+  };
+  return requested;
+}
+
+describe('applyPatch', () => {
+  it('applies json_delta.py patches', () => {
+    for (const [index, entry] of versionInfo.deltas.entries()) {
+      const patched = applyPatch(JSON.parse(texts[index]), deltas[entry.file].patch);
+      assert.equal(JSON.stringify(patched, null, 2), texts[index + 1]);
+    }
+  });
+
+  it('rejects an operation that does not fit the document', () => {
+    const patch = [{ op: 'remove', path: '/sheets/0/days/9' }];
+    assert.throws(() => applyPatch(JSON.parse(texts[0]), patch), /out of range/);
+  });
+});
+
+describe('deltaChain', () => {
+  it('follows the chain back from the current version', async () => {
+    assert.equal(await textVersion(texts[2]), versionInfo.version);
+    assert.deepEqual(deltaChain(versionInfo, await textVersion(texts[0])), [first, second]);
+    assert.deepEqual(deltaChain(versionInfo, await textVersion(texts[1])), [second]);
+    assert.deepEqual(deltaChain(versionInfo, versionInfo.version), []);
+    assert.equal(deltaChain(versionInfo, '0000000000000000'), null);
+  });
+});
+
+describe('fetchWorkoutData', () => {
+  it('patches a cached copy instead of downloading the file', async () => {
+    const requested = serve({ 'workout-data.version.json': versionInfo });
+    const cached = { version: first.from, data: JSON.parse(texts[0]) };
+
+    const latest = await fetchWorkoutData('workout-data.json', cached);
+
+    assert.deepEqual(latest, { version: versionInfo.version, data: JSON.parse(texts[2]), patched: true });
+    assert.deepEqual(requested, ['workout-data.version.json', first.file, second.file]);
+    assert.deepEqual(cached.data, JSON.parse(texts[0]));
+  });
+
+  it('labels a full download with the version it received', async () => {
+    // The version file was read before a new run replaced workout-data.json
+    serve({ 'workout-data.version.json': { ...versionInfo, version: first.to, deltas: [first] },
+            'workout-data.json': texts[2] });
+
+    const latest = await fetchWorkoutData('workout-data.json', null);
+
+    assert.deepEqual(latest, { version: versionInfo.version, data: JSON.parse(texts[2]), patched: false });
+  });
+});
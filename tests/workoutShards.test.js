@@ -0,0 +1,114 @@
+/**
+ * Workout Shard Tests
+ *
+ * Checks src/utils/workoutShards.js with shards cut from
+ * tests/fixtures/sheet1-synthetic.json (extract_sheet1.py output) the way
+ * scripts/shard_output.py cuts them, served by a fake network:
+ * - Catalogs of another format are ignored
+ * - Overlapping requests for a week share one download, and a failed one
+ *   is retried
+ * - Merging a week twice (two quick week changes) keeps one copy
+ *
+ * Run with: node --experimental-detect-module --test tests/workoutShards.test.js
+ */
+
+import { describe, it } from 'node:test';
+import assert from 'node:assert/strict';
+import fs from 'node:fs';
+
+import { catalogWeeks, createWeekLoader, loadCatalog, loadShard, mergeShard } from '../src/utils/workoutShards.js';
+
+const SHEET1 = JSON.parse(fs.readFileSync(new URL('./fixtures/sheet1-synthetic.json', import.meta.url), 'utf8'));
+const CATALOG_URL = 'sheet1-workout-data.catalog.json';
+
+const SHARDS = Object.fromEntries(SHEET1.weeks.map((week) => [
+  `sheet1-workout-data.shard.Sheet1.${week.week}.json`, { ...SHEET1, weeks: [week] }
+]));
+const CATALOG = {
+  format: 'workout-catalog',
+  version: 1,
+  programs: {
+    Sheet1: {
+      program_name: SHEET1.program,
+      weeks: Object.fromEntries(SHEET1.weeks.map((week) => [
+        String(week.week), { file: `sheet1-workout-data.shard.Sheet1.${week.week}.json` }
+      ]))
+    }
+  }
+};
+
+globalThis.location = { href: 'https://app.test/' };
+
+/**
+ * Serve the catalog and shards (no data manifest: names resolve to themselves)
+ *
+ * @param {Object} options - { catalog, failing: Set of paths answered with 500 }
+ * @returns {Array<string>} Paths requested, in order
+ */
+function serve({ catalog = CATALOG, failing = new Set() } = {}) {
+  const files = { [CATALOG_URL]: catalog, ...SHARDS };
+  const requested = [];
+  globalThis.fetch = async (url) => {
+    const path = new URL(String(url), location.href).pathname.slice(1);
+    requested.push(path);
+    const ok = path in files && !failing.has(path);
+    return { ok, statusText: ok ? 'OK' : 'Not Found', json: async () => structuredClone(files[path]) };
+  };
+  return requested;
+}
+
+describe('catalog', () => {
+  it('lists the weeks of a program and ignores other formats', async () => {
+    serve();
+    const catalog = await loadCatalog(CATALOG_URL);
+    assert.deepEqual(catalogWeeks(catalog, 'Sheet1'), ['1', '2']);
+    assert.deepEqual(await loadShard(catalog, CATALOG_URL, 'Sheet1', 2), SHARDS['sheet1-workout-data.shard.Sheet1.2.json']);
+    assert.equal(await loadShard(catalog, CATALOG_URL, 'Sheet1', 3), null);
+
+    serve({ catalog: { ...CATALOG, version: 2 } });
+    assert.equal(await loadCatalog(CATALOG_URL), null);
+  });
+});
+
+describe('createWeekLoader', () => {
+  it('downloads a week once when requests overlap', async () => {
+    const requested = serve();
+    const loadWeek = createWeekLoader(CATALOG, CATALOG_URL, 'Sheet1');
+
+    const [first, second] = await Promise.all([loadWeek(2), loadWeek('2')]);
+    await loadWeek(2);
+
+    assert.equal(first, second);
+    assert.deepEqual(requested.filter((path) => path.includes('.shard.')),
+      ['sheet1-workout-data.shard.Sheet1.2.json']);
+  });
+
+  it('retries a week whose download failed', async () => {
+    const failing = new Set(['sheet1-workout-data.shard.Sheet1.1.json']);
+    const requested = serve({ failing });
+    const loadWeek = createWeekLoader(CATALOG, CATALOG_URL, 'Sheet1');
+
+    await assert.rejects(loadWeek(1), /Failed to load/);
+    failing.clear();
+    assert.deepEqual((await loadWeek(1)).weeks, [SHEET1.weeks[0]]);
+    assert.equal(requested.filter((path) => path.endsWith('.Sheet1.1.json')).length, 2);
+  });
+});
+
+describe('mergeShard', () => {
+  it('adds each week once, in week order', async () => {
+    serve();
+    const loadWeek = createWeekLoader(CATALOG, CATALOG_URL, 'Sheet1');
+    let workoutData = null;
+    const load = async (week) => {
+      const shard = await loadWeek(week);
+      workoutData = mergeShard(workoutData, shard);
+    };
+
+    // Start on week 2, then switch to week 1 and back before anything arrives
+    await Promise.all([load(2), load(1), load(2)]);
+
+    assert.deepEqual(workoutData.weeks.map((week) => week.week), [1, 2]);
+    assert.deepEqual(workoutData, SHEET1);
+  });
+});